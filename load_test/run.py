@@ -2,10 +2,12 @@
 
 Runs against http://127.0.0.1:8002 (loopback on .71 — Cloudflare excluded).
 
-Three scenarios:
+Four scenarios:
   A — single-endpoint sequential baseline (50 calls each)
-  B — concurrency sweep on one heavy endpoint
+  B — concurrency sweep on the DuckDB-backed endpoints (one at a time)
   C — mixed-workload sessions (N users * 6-screen loop * 5 min)
+  D — row vs columnar (?format=columnar) payloads on the time-series
+      endpoints: latency, wire/JSON bytes and encode time
 
 Emits a markdown table per run into load_test/results/<timestamp>_<label>.md.
 
@@ -15,6 +17,7 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import json
 import os
 import random
 import statistics
@@ -77,6 +80,30 @@ SESSION_FLOW: tuple[Endpoint, ...] = (
 
 HEAVY_ENDPOINT = next(e for e in ENDPOINTS if e.label == 'station_eraring_90d')
 
+# Scenario B sweeps each of these: the handlers that used to run blocking
+# queries / file reads on the event loop, plus the heavy station series.
+CONCURRENCY_ENDPOINTS: tuple[Endpoint, ...] = (
+    HEAVY_ENDPOINT,
+    next(e for e in ENDPOINTS if e.label == 'station_tod_eraring'),
+    next(e for e in ENDPOINTS if e.label == 'batteries_overview'),
+    Endpoint('batteries_fleet_30d',
+             '/v1/batteries/fleet-timeseries?regions=NSW1,VIC1&frequency=1h',                          'heavy'),
+    next(e for e in ENDPOINTS if e.label == 'gen_mix_30d'),
+    Endpoint('gas_prices',         '/v1/gas/prices?hub=AVG',                                            'medium'),
+    next(e for e in ENDPOINTS if e.label == 'futures_forward'),
+    Endpoint('futures_expect',     '/v1/futures/expectations?region=NSW1',                              'cheap'),
+)
+
+# Endpoints that accept ?format=columnar (scenario D)
+COLUMNAR_ENDPOINTS: tuple[Endpoint, ...] = (
+    next(e for e in ENDPOINTS if e.label == 'prices_spot_24h'),
+    Endpoint('prices_spot_1y',
+             '/v1/prices/spot?regions=NSW1,QLD1,VIC1,SA1,TAS1&from=2025-05-01T00:00:00Z',      'heavy'),
+    next(e for e in ENDPOINTS if e.label == 'gen_mix_30d'),
+    Endpoint('gen_mix_nsw_24h',    '/v1/generation/mix?region=NSW1',                                    'medium'),
+    HEAVY_ENDPOINT,
+)
+
 
 # ---------- helpers ----------
 
@@ -158,7 +185,7 @@ async def _hammer(client: httpx.AsyncClient, ep: Endpoint, concurrency: int,
 
 async def scenario_b(client: httpx.AsyncClient, ep: Endpoint = HEAVY_ENDPOINT,
                      levels=(1, 5, 10, 20, 50), duration_s: int = 20) -> str:
-    rows = [f'## Scenario B — concurrency sweep on  ({ep.tier})\n',
+    rows = [f'### {ep.label} ({ep.tier})\n',
             'Each level closed-loop for {} s. Throughput = completed / duration.\n'.format(duration_s),
             '| concurrency | N | mean ms | p50 | p95 | p99 | req/s |',
             '|---:|---:|---:|---:|---:|---:|---:|']
@@ -176,6 +203,15 @@ async def scenario_b(client: httpx.AsyncClient, ep: Endpoint = HEAVY_ENDPOINT,
     return '\n'.join(rows)
 
 
+async def scenario_b_all(client: httpx.AsyncClient, endpoints=CONCURRENCY_ENDPOINTS,
+                         levels=(1, 5, 10, 20, 50), duration_s: int = 20) -> str:
+    sections = ['## Scenario B — concurrency sweep per endpoint\n']
+    for ep in endpoints:
+        sections.append(await scenario_b(client, ep, levels, duration_s))
+        sections.append('')
+    return '\n'.join(sections)
+
+
 # ---------- scenario C: mixed workload ----------
 
 async def _user_session(client: httpx.AsyncClient, end_t: float,
@@ -212,6 +248,73 @@ async def scenario_c(client: httpx.AsyncClient, users_levels=(10, 20, 30),
     return '\n'.join(rows)
 
 
+# ---------- scenario D: row vs columnar payloads ----------
+
+def _encode_rows(body: dict) -> bytes:
+    """What FastAPI does with a returned dict: jsonable_encoder + JSONResponse.render."""
+    try:
+        from fastapi.encoders import jsonable_encoder
+        body = jsonable_encoder(body)
+    except ImportError:
+        pass
+    return json.dumps(body, ensure_ascii=False, allow_nan=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def _encode_columnar(body: dict) -> bytes:
+    """What ColumnarJSONResponse does: orjson straight from NumPy arrays."""
+    import numpy as np
+    import orjson
+    series = [{k: np.asarray(v) if isinstance(v, list) else v for k, v in s.items()}
+              for s in body['series']]
+    return orjson.dumps({**body, 'series': series},
+                        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def _encode_ms(encode, body: dict, repeat: int = 20) -> float:
+    encode(body)  # warm imports
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        encode(body)
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+async def scenario_d(client: httpx.AsyncClient, calls: int = 20) -> str:
+    """Server latency and gzip wire size come from the live API. Encode time
+    is measured locally by re-encoding the received payload the way the
+    server does for each format, since it isn't visible from outside."""
+    rows = ['## Scenario D — row vs columnar response format\n',
+            '| Endpoint | format | p50 ms | wire KB (gzip) | JSON KB | encode ms | client decode ms |',
+            '|---|---|---:|---:|---:|---:|---:|']
+    for ep in COLUMNAR_ENDPOINTS:
+        for fmt, encode in (('rows', _encode_rows), ('columnar', _encode_columnar)):
+            url = ep.url + ('&format=columnar' if fmt == 'columnar' else '')
+            latencies: list[float] = []
+            resp = None
+            for _ in range(calls + 1):  # first call is warmup
+                t0 = time.perf_counter()
+                try:
+                    r = await client.get(url)
+                except Exception:
+                    continue
+                if r.status_code == 200:
+                    latencies.append(time.perf_counter() - t0)
+                    resp = r
+            if resp is None:
+                rows.append(f'| {ep.label} | {fmt} | — | — | — | — | — |')
+                continue
+            latencies = latencies[1:] or latencies
+            t0 = time.perf_counter()
+            body = json.loads(resp.content)
+            decode_ms = (time.perf_counter() - t0) * 1000
+            p50 = _percentiles(latencies, [0.5])[0.5]
+            rows.append(
+                f'| {ep.label} | {fmt} | {p50*1000:6.0f} | {resp.num_bytes_downloaded/1024:7.1f} | '
+                f'{len(resp.content)/1024:7.1f} | {_encode_ms(encode, body):6.2f} | {decode_ms:6.2f} |'
+            )
+    return '\n'.join(rows)
+
+
 # ---------- main ----------
 
 async def main(scenario: str, label: str) -> None:
@@ -226,17 +329,22 @@ async def main(scenario: str, label: str) -> None:
         '',
     ]
 
+    # Ask for gzip explicitly so scenario D's wire sizes match what the app sees
+    headers['Accept-Encoding'] = 'gzip'
+
     async with httpx.AsyncClient(headers=headers, timeout=timeout, http2=False) as client:
         if scenario == 'A':
             out_lines.append(await scenario_a(client))
         elif scenario == 'B':
-            out_lines.append(await scenario_b(client))
+            out_lines.append(await scenario_b_all(client))
         elif scenario == 'C':
             out_lines.append(await scenario_c(client))
+        elif scenario == 'D':
+            out_lines.append(await scenario_d(client))
         elif scenario == 'ALL':
             out_lines.append(await scenario_a(client))
             out_lines.append('')
-            out_lines.append(await scenario_b(client))
+            out_lines.append(await scenario_b_all(client))
             out_lines.append('')
             out_lines.append(await scenario_c(client))
         else:
@@ -252,7 +360,7 @@ async def main(scenario: str, label: str) -> None:
 
 if __name__ == '__main__':
     p = argparse.ArgumentParser()
-    p.add_argument('--scenario', choices=['A', 'B', 'C', 'ALL'], default='A')
+    p.add_argument('--scenario', choices=['A', 'B', 'C', 'D', 'ALL'], default='A')
     p.add_argument('--label',    default='baseline')
     args = p.parse_args()
     asyncio.run(main(args.scenario, args.label))
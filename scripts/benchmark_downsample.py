@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: NumPy LTTB / LOESS in api/downsample.py vs the previous loops.
+
+Runs both implementations over synthetic spot-price series shaped like the
+/v1/prices/spot inputs (5 regions, 5-minute or 30-minute history) and
+reports the median time per call. The "legacy" functions reproduce the
+per-point Python loops the API used before it was vectorised.
+
+Usage:
+    python scripts/benchmark_downsample.py [--repeat 20] [--points 8640 52560]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+# Add src to path
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from aemo_dashboard.api.downsample import lttb, lttb_many, loess, loess_smooth  # noqa: E402
+
+REGIONS = 5
+MAX_POINTS = 1500
+
+
+# ---------------------------------------------------------------------------
+# Previous implementations (as they were in api/downsample.py)
+# ---------------------------------------------------------------------------
+
+def legacy_lttb(timestamps, values, target):
+    n = len(timestamps)
+    if target >= n or n <= 2:
+        return list(timestamps), list(values)
+    bucket_size = (n - 2) / (target - 2)
+    out_t = [timestamps[0]]
+    out_v = [values[0]]
+    a_t = float(timestamps[0])
+    a_v = float(values[0])
+    for i in range(target - 2):
+        next_lo = int((i + 1) * bucket_size) + 1
+        next_hi = min(int((i + 2) * bucket_size) + 1, n)
+        if next_lo >= next_hi:
+            next_lo = next_hi - 1
+        avg_t = sum(float(timestamps[k]) for k in range(next_lo, next_hi)) / (next_hi - next_lo)
+        avg_v = sum(float(values[k]) for k in range(next_lo, next_hi)) / (next_hi - next_lo)
+        cur_lo = int(i * bucket_size) + 1
+        cur_hi = min(int((i + 1) * bucket_size) + 1, n - 1)
+        max_area = -1.0
+        chosen = cur_lo
+        for k in range(cur_lo, cur_hi):
+            area = abs((a_t - avg_t) * (float(values[k]) - a_v)
+                       - (a_t - float(timestamps[k])) * (avg_v - a_v))
+            if area > max_area:
+                max_area = area
+                chosen = k
+        out_t.append(float(timestamps[chosen]))
+        out_v.append(float(values[chosen]))
+        a_t = float(timestamps[chosen])
+        a_v = float(values[chosen])
+    out_t.append(float(timestamps[-1]))
+    out_v.append(float(values[-1]))
+    return out_t, out_v
+
+
+def legacy_loess(x, y, frac=0.05):
+    n = len(x)
+    r = min(max(3, int(round(frac * n))), n)
+    xa = np.asarray(x, dtype=float)
+    ya = np.asarray(y, dtype=float)
+    out = np.empty(n, dtype=float)
+    for i in range(n):
+        half = r // 2
+        lo = max(0, i - half)
+        hi = min(n, lo + r)
+        lo = max(0, hi - r)
+        xs = xa[lo:hi]
+        ys = ya[lo:hi]
+        d = np.abs(xs - xa[i])
+        h = max(d.max(), 1e-12)
+        w = (1.0 - (d / h) ** 3) ** 3
+        sw = w.sum()
+        if sw < 1e-12:
+            out[i] = ya[i]
+            continue
+        wx = (w * xs).sum() / sw
+        wy = (w * ys).sum() / sw
+        b_num = (w * (xs - wx) * (ys - wy)).sum()
+        b_den = (w * (xs - wx) ** 2).sum()
+        out[i] = wy if abs(b_den) < 1e-12 else wy - (b_num / b_den) * wx + (b_num / b_den) * xa[i]
+    return out.tolist()
+
+
+# ---------------------------------------------------------------------------
+
+def price_series(points, seed):
+    """Random-walk prices with occasional spikes"""
+    rng = np.random.default_rng(seed)
+    prices = 80 + np.cumsum(rng.normal(0, 3, points))
+    spikes = rng.random(points) < 0.002
+    prices[spikes] += rng.uniform(1000, 15000, spikes.sum())
+    return prices.tolist()
+
+
+def median_ms(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--points', type=int, nargs='+', default=[8640, 52560],
+                        help='points per region (8640 = 30 days at 5 min, 52560 = 3 years at 30 min)')
+    args = parser.parse_args()
+
+    print(f"{'case':<38}{'legacy ms':>12}{'numpy ms':>12}{'speedup':>10}")
+    for points in args.points:
+        series = [price_series(points, seed) for seed in range(REGIONS)]
+        xs = [float(i) for i in range(points)]
+        binned = [s[:MAX_POINTS] for s in series]
+        bx = [float(i) for i in range(MAX_POINTS)]
+
+        cases = [
+            (f'lttb {REGIONS}x{points} -> {MAX_POINTS}',
+             lambda: [legacy_lttb(xs, s, MAX_POINTS) for s in series],
+             lambda: [lttb(xs, s, MAX_POINTS) for s in series]),
+            (f'lttb_many {REGIONS}x{points} -> {MAX_POINTS}',
+             lambda: [legacy_lttb(xs, s, MAX_POINTS) for s in series],
+             lambda: lttb_many(series, MAX_POINTS)),
+            (f'loess {REGIONS}x{MAX_POINTS} frac=0.08',
+             lambda: [legacy_loess(bx, s, 0.08) for s in binned],
+             lambda: [loess(bx, s, 0.08) for s in binned]),
+            (f'loess_smooth batch {REGIONS}x{MAX_POINTS}',
+             lambda: [legacy_loess(bx, s, 0.08) for s in binned],
+             lambda: loess_smooth(bx, np.array(binned), 0.08)),
+        ]
+        for name, legacy, vectorised in cases:
+            old = median_ms(legacy, max(1, args.repeat // 5))
+            new = median_ms(vectorised, args.repeat)
+            print(f"{name:<38}{old:>12.1f}{new:>12.1f}{old / new:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: shared MMS parser vs the per-collector line-splitting parsers.
+
+Runs each parser over the bundled PUBLIC_DISPATCHIS_*.CSV sample (and the
+same file inside dispatchis_sample.zip) and reports the median time per call.
+The "legacy" functions reproduce the loops the collectors used before they
+moved to aemo_data_service.shared.mms_parser.
+
+Usage:
+    python scripts/benchmark_mms_parser.py [--repeat 50] [--scale 1]
+
+--scale N concatenates the data rows N times to approximate larger
+Dispatch_SCADA / MMSDM files.
+"""
+import argparse
+import csv
+import glob
+import io
+import os
+import statistics
+import sys
+import time
+import zipfile
+from io import StringIO
+
+import pandas as pd
+
+# Add src to path
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from aemo_data_service.shared.mms_parser import (  # noqa: E402
+    DISPATCH_INTERCONNECTORRES,
+    DISPATCH_PRICE,
+    read_mms_csv,
+    read_mms_zip,
+)
+
+CONSTRAINT = ('DISPATCH', 'CONSTRAINT')
+
+
+# ---------------------------------------------------------------------------
+# Previous parsers (as they were in the collectors / backfill script)
+# ---------------------------------------------------------------------------
+
+def legacy_price(csv_content: str) -> pd.DataFrame:
+    """PriceCollector._parse_dispatch_data: csv.reader per line"""
+    records = []
+    for line in csv_content.strip().split('\n'):
+        if not line.strip():
+            continue
+        fields = next(csv.reader(StringIO(line)))
+        if len(fields) >= 9 and fields[0] == 'D' and fields[1] == 'DISPATCH' and fields[2] == 'PRICE':
+            records.append({
+                'SETTLEMENTDATE': pd.to_datetime(fields[4]),
+                'REGIONID': fields[6],
+                'RRP': float(fields[9]),
+            })
+    return pd.DataFrame(records)
+
+
+def legacy_interconnector(csv_content: str) -> pd.DataFrame:
+    """TransmissionCollector._download_and_parse_file: str.split per line"""
+    rows = []
+    for line in csv_content.strip().split('\n'):
+        if line.startswith('D,DISPATCH,INTERCONNECTORRES'):
+            f = line.split(',')
+            if len(f) >= 17:
+                rows.append({
+                    'settlementdate': f[4].strip('"'),
+                    'interconnectorid': f[6].strip('"'),
+                    'meteredmwflow': float(f[9] or 0),
+                    'mwflow': float(f[10] or 0),
+                    'mwlosses': float(f[11] or 0),
+                    'exportlimit': float(f[15] or 0),
+                    'importlimit': float(f[16] or 0),
+                })
+    df = pd.DataFrame(rows)
+    df['settlementdate'] = pd.to_datetime(df['settlementdate'])
+    return df
+
+
+def legacy_generic(content: bytes, subreport: str) -> pd.DataFrame:
+    """backfill_scada30_mmsdm.parse_mms_csv: header + list of lists"""
+    header, rows = None, []
+    for line in content.decode('utf-8', errors='ignore').strip().split('\n'):
+        parts = line.split(',')
+        if parts[0] == 'I' and len(parts) > 2 and parts[2] == subreport:
+            header = [c.strip() for c in parts[4:]]
+        elif parts[0] == 'D' and len(parts) > 2 and parts[2] == subreport and header:
+            rows.append(parts[4:4 + len(header)])
+    df = pd.DataFrame(rows, columns=header)
+    df['SETTLEMENTDATE'] = pd.to_datetime(df['SETTLEMENTDATE'].str.strip('"'), format='%Y/%m/%d %H:%M:%S')
+    return df
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+def scale_sample(content: bytes, factor: int) -> bytes:
+    """Repeat the D rows of every table factor times"""
+    if factor <= 1:
+        return content
+    out = []
+    for line in content.splitlines(keepends=True):
+        out.extend([line] * (factor if line.startswith(b'D,') else 1))
+    return b''.join(out)
+
+
+def time_call(fn, repeat: int) -> float:
+    fn()  # warm up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--scale', type=int, default=1)
+    args = parser.parse_args()
+
+    samples = sorted(glob.glob(os.path.join(REPO_ROOT, 'PUBLIC_DISPATCHIS_*.CSV')))
+    if not samples:
+        print("No PUBLIC_DISPATCHIS_*.CSV sample found in the repository root")
+        return 1
+
+    raw = scale_sample(open(samples[0], 'rb').read(), args.scale)
+    text = raw.decode('utf-8')
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(os.path.basename(samples[0]), raw)
+    zipped = zip_buffer.getvalue()
+
+    data_rows = raw.count(b'\nD,')
+    print(f"Sample: {os.path.basename(samples[0])} x{args.scale} "
+          f"({len(raw) / 1024:.0f} KB, {data_rows} data rows)")
+    print(f"Median of {args.repeat} runs\n")
+
+    cases = [
+        ('PRICE', DISPATCH_PRICE,
+         lambda: legacy_price(text)),
+        ('INTERCONNECTORRES', DISPATCH_INTERCONNECTORRES,
+         lambda: legacy_interconnector(text)),
+        ('CONSTRAINT', CONSTRAINT,
+         lambda: legacy_generic(raw, 'CONSTRAINT')),
+    ]
+
+    print(f"{'table':<20}{'rows':>8}{'legacy ms':>12}{'mms csv ms':>12}{'mms zip ms':>12}{'speedup':>9}")
+    for name, key, legacy in cases:
+        legacy_rows = len(legacy())
+        new_rows = len(read_mms_csv(raw, [key])[key])
+        if legacy_rows != new_rows:
+            print(f"  warning: {name} row count differs (legacy {legacy_rows}, new {new_rows})")
+
+        legacy_ms = time_call(legacy, args.repeat)
+        csv_ms = time_call(lambda: read_mms_csv(raw, [key]), args.repeat)
+        zip_ms = time_call(lambda: read_mms_zip(zipped, [key]), args.repeat)
+        print(f"{name:<20}{new_rows:>8}{legacy_ms:>12.2f}{csv_ms:>12.2f}{zip_ms:>12.2f}{legacy_ms / csv_ms:>8.1f}x")
+
+    # All three tables in a single pass, as a backfill would read them
+    keys = [key for _, key, _ in cases]
+    all_ms = time_call(lambda: read_mms_csv(raw, keys), args.repeat)
+    legacy_all_ms = time_call(lambda: [legacy() for _, _, legacy in cases], args.repeat)
+    print(f"{'all three':<20}{'':>8}{legacy_all_ms:>12.2f}{all_ms:>12.2f}{'':>12}{legacy_all_ms / all_ms:>8.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
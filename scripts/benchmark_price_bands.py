@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: grouped price-band totals vs the per-region, per-band loops.
+
+Builds a synthetic year of 5-minute prices for all five regions and times:
+
+- the prices tab: compute_price_bands' previous mask per (region, band)
+  (reproduced below) against the one-pass prices.bands totals;
+- the API's /v1/prices/bands query in an in-memory DuckDB: the previous
+  range join of every price against a bands CTE against one CASE per row
+  and a single GROUP BY.
+
+Usage:
+    python scripts/benchmark_price_bands.py [--days 365] [--repeat 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+# Add src to path
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from aemo_dashboard.prices.bands import band_totals_sql, bands_from_edges, summarise_bands  # noqa: E402
+from aemo_dashboard.prices.price_bands import PRICE_BANDS, compute_price_bands  # noqa: E402
+
+REGIONS = ['NSW1', 'QLD1', 'SA1', 'TAS1', 'VIC1']
+API_EDGES = [-1000.0, 0.0, 25.0, 50.0, 100.0, 200.0, 300.0, 500.0, 1000.0, 5000.0, 17500.0]
+
+
+def legacy_price_bands(df, regions):
+    """compute_price_bands as the prices tab ran it: a mask per (region, band)"""
+    rows = []
+    for region in regions:
+        prices = df[df['REGIONID'] == region]['RRP']
+        for name, low, high in PRICE_BANDS:
+            if low == -float('inf'):
+                mask = prices < high
+            elif high == float('inf'):
+                mask = prices >= low
+            else:
+                mask = (prices >= low) & (prices < high)
+            band = prices[mask]
+            if len(band) > 0:
+                rows.append((region, name, len(band) / len(prices) * band.mean()))
+    return rows
+
+
+def legacy_bands_sql(regions, edges):
+    """The API's bands query before the grouped CASE: a range join against a bands CTE"""
+    values = ", ".join(f"({i + 1}, {lo}, {hi})" for i, (lo, hi) in enumerate(zip(edges, edges[1:])))
+    return f"""
+        WITH bands(idx, lower, upper) AS (VALUES {values}),
+        prices AS (
+            SELECT regionid, rrp FROM prices5
+            WHERE regionid IN ({', '.join('?' * len(regions))})
+              AND settlementdate >= ? AND settlementdate <= ? AND rrp IS NOT NULL
+        )
+        SELECT p.regionid, b.idx, COUNT(*) AS cnt, SUM(p.rrp) AS sum_rrp
+        FROM prices p JOIN bands b ON p.rrp >= b.lower AND p.rrp < b.upper
+        GROUP BY p.regionid, b.idx
+    """
+
+
+def synthetic_prices(days, seed=0):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2025-01-01', periods=days * 288, freq='5min')
+    return pd.DataFrame({
+        'SETTLEMENTDATE': np.tile(times, len(REGIONS)),
+        'REGIONID': np.repeat(REGIONS, len(times)),
+        'RRP': rng.gamma(2.0, 45.0, len(times) * len(REGIONS)) - 20 + rng.pareto(2.5, len(times) * len(REGIONS)) * 50,
+    })
+
+
+def median_ms(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=365, help='days of 5-minute prices per region')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = synthetic_prices(args.days)
+    print(f"{len(df):,} price rows ({args.days} days x {len(REGIONS)} regions)")
+
+    con = duckdb.connect()
+    con.register('prices_df', df)
+    con.execute("CREATE TABLE prices5 AS SELECT SETTLEMENTDATE AS settlementdate, "
+                "REGIONID AS regionid, RRP AS rrp FROM prices_df")
+    window = [df['SETTLEMENTDATE'].min(), df['SETTLEMENTDATE'].max()]
+    bands = bands_from_edges(API_EDGES)
+    sql, params = band_totals_sql('prices5', REGIONS, bands)
+
+    cases = [
+        ('prices tab (pandas)',
+         lambda: legacy_price_bands(df, REGIONS),
+         lambda: compute_price_bands(df, REGIONS)),
+        ('API bands (DuckDB)',
+         lambda: con.execute(legacy_bands_sql(REGIONS, API_EDGES), REGIONS + window).fetchall(),
+         lambda: summarise_bands(con.execute(sql, params + window).fetchdf(), bands)),
+    ]
+    print(f"{'case':<24}{'per-band ms':>13}{'grouped ms':>12}{'speedup':>10}")
+    for name, legacy, grouped in cases:
+        before = median_ms(legacy, args.repeat)
+        after = median_ms(grouped, args.repeat)
+        print(f"{name:<24}{before:>13.1f}{after:>12.1f}{before / after:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: shared.smoothing.loess vs statsmodels lowess.
+
+Times the LOESS calls the dashboard makes on synthetic series of the same
+shape: the generation tab and prices tab smoothing five regions of 30-minute
+prices (previously one lowess call per region, now one smooth_groups call),
+the penetration and insights tabs smoothing years of daily values against
+epoch seconds, and the fuel relatives chart with gaps. Also reports the
+largest difference from statsmodels and the time of a cached repeat.
+
+Usage:
+    python scripts/benchmark_smoothing.py [--days 90] [--repeat 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from statsmodels.nonparametric.smoothers_lowess import lowess
+
+# Add src to path
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from aemo_dashboard.shared.smoothing import clear_loess_cache, loess, smooth_groups  # noqa: E402
+
+REGIONS = ['NSW1', 'QLD1', 'SA1', 'TAS1', 'VIC1']
+
+
+def legacy_region_loop(df, frac):
+    """LOESS (7 days) as the prices tab ran it: one lowess call per region"""
+    out = df['RRP'].to_numpy(dtype=float).copy()
+    for region in REGIONS:
+        mask = (df['REGIONID'] == region).to_numpy()
+        values = out[mask]
+        valid = ~np.isnan(values)
+        x = np.arange(valid.sum())
+        result = lowess(values[valid], x, frac=frac, it=0,
+                        delta=0.01 * len(x) if len(x) > 100 else 0)
+        smoothed = np.full(len(values), np.nan)
+        smoothed[valid] = result[:, 1]
+        out[mask] = smoothed
+    return out
+
+
+def synthetic_prices(days, seed=0):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2025-01-01', periods=days * 48, freq='30min')
+    frames = []
+    for i, region in enumerate(REGIONS):
+        daily = 30 * np.sin(np.arange(len(times)) * 2 * np.pi / 48 + i)
+        frames.append(pd.DataFrame({'SETTLEMENTDATE': times, 'REGIONID': region,
+                                    'RRP': 90 + daily + rng.normal(0, 25, len(times))}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def daily_series(days, seed=1):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2018-01-01', periods=days, freq='D')
+    x = dates.astype(np.int64) / 1e9
+    y = 5000 + 1000 * np.sin(np.arange(days) * 2 * np.pi / 365) + rng.normal(0, 300, days)
+    return np.asarray(x), y
+
+
+def median_ms(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=90, help='days of 30-minute prices per region')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    prices = synthetic_prices(args.days)
+    x_daily, y_daily = daily_series(7 * 365)
+    y_gaps = y_daily.copy()
+    y_gaps[np.random.default_rng(2).choice(len(y_gaps), 60, replace=False)] = np.nan
+    x_index = np.arange(len(y_gaps), dtype=float)
+
+    cases = [
+        (f'prices LOESS 7d, {len(REGIONS)} regions x {args.days * 48}',
+         lambda: legacy_region_loop(prices, 0.05),
+         lambda: smooth_groups(prices['RRP'], prices['REGIONID'], loess, frac=0.05,
+                               delta=lambda n: 0.01 * n if n > 100 else 0.0)),
+        (f'penetration daily x {len(y_daily)}, frac 0.05',
+         lambda: lowess(y_daily, x_daily, frac=0.05, it=0, return_sorted=False),
+         lambda: loess(y_daily, x_daily, frac=0.05)),
+        (f'insights daily x {len(y_daily)}, frac 0.15',
+         lambda: lowess(y_daily, x_daily, frac=0.15, it=0, return_sorted=False),
+         lambda: loess(y_daily, x_daily, frac=0.15)),
+        (f'fuel relatives x {len(y_gaps)} with gaps',
+         lambda: lowess(y_gaps, x_index, frac=0.035, it=0, return_sorted=False),
+         lambda: loess(y_gaps, x_index, frac=0.035)),
+    ]
+
+    print(f"{'case':<40}{'statsmodels ms':>16}{'shared ms':>11}{'speedup':>9}{'max diff':>11}")
+    for name, legacy, shared in cases:
+        diff = np.nanmax(np.abs(legacy() - shared()))
+        before = median_ms(legacy, args.repeat)
+        after = median_ms(shared, args.repeat)
+        print(f"{name:<40}{before:>16.1f}{after:>11.2f}{before / after:>8.1f}x{diff:>11.1e}")
+
+    clear_loess_cache()
+    loess(y_daily, x_daily, frac=0.15, cache_key=('benchmark', 'v1'))
+    cached = median_ms(lambda: loess(y_daily, x_daily, frac=0.15, cache_key=('benchmark', 'v1')), args.repeat)
+    print(f"{'insights repeat (cached)':<40}{'':>16}{cached:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
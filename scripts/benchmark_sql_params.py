@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: bound, parse-cached SQL vs f-string literal SQL.
+
+Builds an in-memory DuckDB with generation / prices / duid_mapping tables
+shaped like the production ones and replays dashboard refreshes: the station
+tab's DUID filter, the fuel-by-region join and the price window, each with a
+window sliding forward one interval per refresh. Small windows are used so
+the time is dominated by parse/bind/plan rather than the scan. Reports the
+median time per query for:
+
+  literal   values formatted into the SQL text (the previous adapters)
+  bound     ? placeholders, conn.execute(sql, params) - parsed every time
+  cached    shared.sql.execute - parsed statement reused from the LRU
+
+Usage:
+    python scripts/benchmark_sql_params.py [--refreshes 300] [--units 400]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import duckdb
+
+# Add src to path
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from aemo_dashboard.shared import sql  # noqa: E402
+from aemo_dashboard.shared.sql import Where  # noqa: E402
+
+START = datetime(2025, 1, 1)
+REGIONS = ['NSW1', 'QLD1', 'SA1', 'TAS1', 'VIC1']
+FUELS = ['Coal', 'Gas', 'Wind', 'Solar', 'Water', 'Battery Storage']
+
+
+def build_database(units, days):
+    conn = duckdb.connect(':memory:')
+    conn.execute(f"""
+        CREATE TABLE duid_mapping AS
+        SELECT 'UNIT' || range AS duid,
+               {REGIONS}[1 + range % {len(REGIONS)}] AS region,
+               {FUELS}[1 + range % {len(FUELS)}] AS fuel
+        FROM range({units})
+    """)
+    conn.execute(f"""
+        CREATE TABLE generation_5min AS
+        SELECT TIMESTAMP '{START}' + INTERVAL (t * 5) MINUTE AS settlementdate,
+               'UNIT' || u AS duid,
+               random() * 500 AS scadavalue
+        FROM range({days * 288}) r1(t), range({units}) r2(u)
+        ORDER BY settlementdate
+    """)
+    conn.execute(f"""
+        CREATE TABLE prices_5min AS
+        SELECT TIMESTAMP '{START}' + INTERVAL (t * 5) MINUTE AS settlementdate,
+               region AS regionid,
+               random() * 300 AS rrp
+        FROM range({days * 288}) r(t), unnest({REGIONS}) u(region)
+        ORDER BY settlementdate
+    """)
+    return conn
+
+
+def refresh_queries(step, duids):
+    """(sql_with_placeholders, params, literal_sql) for one dashboard refresh"""
+    start = START + timedelta(minutes=5 * step)
+    end = start + timedelta(hours=1)
+
+    station = Where().isin('duid', duids).between('settlementdate', start, end)
+    fuel = Where().between('g.settlementdate', start, end)
+    prices = Where().between('settlementdate', start, end).isin('regionid', ['NSW1', 'VIC1'])
+    templates = [
+        ("SELECT settlementdate, duid, scadavalue FROM generation_5min WHERE {w} "
+         "ORDER BY settlementdate", station),
+        ("SELECT g.settlementdate, d.fuel, d.region, SUM(g.scadavalue) AS scadavalue "
+         "FROM generation_5min g JOIN duid_mapping d ON g.duid = d.duid WHERE {w} "
+         "GROUP BY 1, 2, 3", fuel),
+        ("SELECT settlementdate, regionid, rrp FROM prices_5min WHERE {w} "
+         "ORDER BY settlementdate, regionid", prices),
+    ]
+    queries = []
+    for template, where in templates:
+        literal = str(where)
+        for value in where.params:
+            text = value.strftime('%Y-%m-%d %H:%M:%S') if isinstance(value, datetime) else value
+            literal = literal.replace('?', f"'{text}'", 1)
+        queries.append((template.format(w=where), where.params, template.format(w=literal)))
+    return queries
+
+
+def median_ms(conn, refreshes, run):
+    times = []
+    for queries in refreshes:
+        for query, params, literal in queries:
+            start = time.perf_counter()
+            run(conn, query, params, literal).fetchall()
+            times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--refreshes', type=int, default=300, help='dashboard refreshes to replay')
+    parser.add_argument('--units', type=int, default=400, help='DUIDs in the synthetic mapping')
+    parser.add_argument('--days', type=int, default=7, help='days of 5-minute data')
+    parser.add_argument('--station-duids', type=int, default=4, help='DUIDs in the station filter')
+    args = parser.parse_args()
+
+    conn = build_database(args.units, args.days)
+    duids = [f'UNIT{i}' for i in range(args.station_duids)]
+    refreshes = [refresh_queries(step, duids) for step in range(args.refreshes)]
+    print(f"{args.units} DUIDs x {args.days} days, {args.refreshes} refreshes x {len(refreshes[0])} queries")
+
+    cases = [
+        ('literal (previous)', lambda c, q, p, lit: c.execute(lit)),
+        ('bound, parsed each time', lambda c, q, p, lit: c.execute(q, p)),
+        ('bound, parse cached', lambda c, q, p, lit: sql.execute(c, q, p)),
+    ]
+    # Warm up DuckDB's buffers so the first case isn't penalised
+    median_ms(conn, refreshes[:10], cases[0][1])
+
+    results = [(name, median_ms(conn, refreshes, run)) for name, run in cases]
+    baseline = results[0][1]
+    print(f"{'case':<26}{'ms/query':>10}{'speedup':>10}")
+    for name, ms in results:
+        print(f"{name:<26}{ms:>10.3f}{baseline / ms:>9.2f}x")
+    print(f"statement cache: {sql.statement_cache_stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: indexed StationSearchEngine.fuzzy_search vs the previous scan.
+
+Builds the search engine over the real gen_info mapping (config.gen_info_file,
+or --gen-info) and replays typing every prefix of a sample of station names and
+DUIDs, the way the station search box queries on each keystroke. Reports the
+median time per keystroke for the previous full scan (reproduced below), the
+indexed search, and queries repeated while still in the result LRU, plus how
+many result lists differ from the full scan (the n-gram filter drops marginal
+matches that share no bigram/trigram with the query).
+
+Usage:
+    python scripts/benchmark_station_search.py [--gen-info PATH] [--sample 40] [--mode duid]
+"""
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from fuzzywuzzy import fuzz
+
+# Add src to path
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from aemo_dashboard.station.station_search import RESULT_CACHE_SIZE, StationSearchEngine  # noqa: E402
+
+
+def legacy_fuzzy_search(engine, query, limit=10, min_score=60, mode='duid'):
+    """fuzzy_search as it was before the n-gram index"""
+    if not query or len(query.strip()) < 2:
+        return []
+    query = query.lower().strip()
+    results = []
+    search_data = engine.station_index if mode == 'station' else engine.search_index
+    for entry in search_data:
+        if mode == 'station':
+            name_score = fuzz.partial_ratio(query, entry['station_name'].lower())
+            text_score = fuzz.partial_ratio(query, entry['searchable_text'])
+            best_score = max(name_score, text_score)
+            if query.lower() in entry['station_name'].lower():
+                best_score = min(100, best_score + 20)
+        else:
+            duid_score = fuzz.partial_ratio(query, entry['duid'].lower())
+            name_score = fuzz.partial_ratio(query, entry['station_name'].lower())
+            text_score = fuzz.partial_ratio(query, entry['searchable_text'])
+            best_score = max(duid_score, name_score, text_score)
+            if query.upper() == entry['duid'].upper():
+                best_score = 100
+        if best_score >= min_score:
+            result = entry.copy()
+            result['score'] = best_score
+            results.append(result)
+    results.sort(key=lambda x: x['score'], reverse=True)
+    return results[:limit]
+
+
+def synthetic_gen_info(units=550, seed=0):
+    """gen_info-shaped DataFrame for machines without the production pickle"""
+    rng = np.random.default_rng(seed)
+    words = ['bays', 'water', 'eraring', 'loy', 'yang', 'stock', 'yard', 'hill', 'coopers', 'gap',
+             'tallawarra', 'murray', 'tumut', 'snowy', 'callide', 'gladstone', 'tarong', 'kogan',
+             'creek', 'wind', 'farm', 'solar', 'battery', 'hornsdale', 'macarthur', 'silver',
+             'ton', 'sun', 'vale', 'bungala', 'mount', 'emerald', 'golden', 'plains', 'crookwell']
+    owners = ['AGL Energy', 'Origin Energy', 'EnergyAustralia', 'Snowy Hydro', 'CS Energy',
+              'Stanwell', 'Neoen', 'Alinta Energy', 'Tilt Renewables', 'Iberdrola']
+    fuels = ['Coal', 'Gas', 'Wind', 'Solar', 'Water', 'Battery Storage']
+    rows = []
+    while len(rows) < units:
+        name = ' '.join(w.title() for w in rng.choice(words, 2, replace=False))
+        base = ''.join(w[:3] for w in name.lower().split()).upper()[:6]
+        for unit in range(1, int(rng.integers(1, 5)) + 1):
+            rows.append({
+                'DUID': f'{base}{unit}',
+                'Site Name': f'{name} Power Station',
+                'Owner': str(rng.choice(owners)),
+                'Region': str(rng.choice(['NSW1', 'QLD1', 'SA1', 'TAS1', 'VIC1'])),
+                'Fuel': str(rng.choice(fuels)),
+                'Capacity(MW)': float(rng.integers(5, 720)),
+            })
+    return pd.DataFrame(rows[:units]).drop_duplicates('DUID')
+
+
+def load_gen_info(path):
+    if path and os.path.exists(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f), path
+    print(f"gen_info not found at {path}; using a synthetic mapping")
+    return synthetic_gen_info(), 'synthetic'
+
+
+def keystrokes(engine, sample, seed=1):
+    """Every prefix (2+ chars) of a sample of station names and DUIDs"""
+    rng = np.random.default_rng(seed)
+    entries = engine.search_index
+    picks = rng.choice(len(entries), min(sample, len(entries)), replace=False)
+    queries = []
+    for i in picks:
+        for target in (entries[i]['station_name'], entries[i]['duid']):
+            target = target.lower()[:14]
+            queries.extend(target[:k] for k in range(2, len(target) + 1))
+    return queries
+
+
+def median_us(func, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        times.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--gen-info', default=None, help='gen_info pickle (default: config.gen_info_file)')
+    parser.add_argument('--sample', type=int, default=40, help='station names / DUIDs to type out')
+    parser.add_argument('--mode', choices=['duid', 'station'], default='duid')
+    args = parser.parse_args()
+
+    path = args.gen_info
+    if path is None:
+        from aemo_dashboard.shared.config import config
+        path = config.gen_info_file
+    gen_info, source = load_gen_info(path)
+
+    start = time.perf_counter()
+    engine = StationSearchEngine(gen_info)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    engine._ngram_index(args.mode)
+    index_ms = (time.perf_counter() - start) * 1000
+
+    queries = keystrokes(engine, args.sample)
+    entries = len(engine.station_index if args.mode == 'station' else engine.search_index)
+    print(f"source: {source}, {entries} entries ({args.mode} mode), {len(queries)} keystrokes")
+    print(f"engine build {build_ms:.1f} ms, n-gram index build {index_ms:.1f} ms")
+
+    legacy = median_us(lambda q: legacy_fuzzy_search(engine, q, mode=args.mode), queries)
+    cold = median_us(lambda q: engine.fuzzy_search(q, mode=args.mode), queries)
+    # Queries still in the result LRU, i.e. retyped or repeated keystrokes
+    warm = median_us(lambda q: engine.fuzzy_search(q, mode=args.mode), queries[-RESULT_CACHE_SIZE:])
+    differ = sum(
+        legacy_fuzzy_search(engine, q, mode=args.mode) != engine.fuzzy_search(q, mode=args.mode)
+        for q in queries
+    )
+
+    print(f"{'case':<26}{'us/keystroke':>14}{'speedup':>10}")
+    for name, us in (('full scan (previous)', legacy), ('n-gram index', cold), ('repeated (LRU)', warm)):
+        print(f"{name:<26}{us:>14.0f}{legacy / us:>9.1f}x")
+    print(f"result lists differing from the full scan: {differ}/{len(queries)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,76 +1,175 @@
 #!/usr/bin/env python3
 """
 Profile dashboard startup to find the real performance bottleneck
+
+Import report (default): imports aemo_dashboard.generation.gen_dash in fresh
+interpreters with ``python -X importtime`` and reports the median wall time,
+the slowest modules, and whether any tab module that should load lazily
+(when its tab is first opened) was imported at startup. Run it before and
+after a change to track cold-start time.
+
+Session profile (--session): cProfile of creating the app and one dashboard
+instance, as before.
+
+Usage:
+    python scripts/profile_dashboard_startup.py [--runs 3] [--top 15] [--session]
 """
 
+import argparse
 import cProfile
 import pstats
 import io
+import json
+import os
+import statistics
+import subprocess
 import time
 import sys
 from pathlib import Path
 
 # Add src to path
-sys.path.insert(0, str(Path(__file__).parent / 'src'))
+SRC = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC))
+
+DASHBOARD_MODULE = 'aemo_dashboard.generation.gen_dash'
+
+# Imported by their tab's _create_*_tab method, never at startup
+LAZY_MODULES = [
+    'aemo_dashboard.analysis.price_analysis_ui',
+    'aemo_dashboard.station.station_analysis_ui',
+    'aemo_dashboard.curtailment',
+    'aemo_dashboard.gas',
+    'aemo_dashboard.prices.prices_tab',
+    'aemo_dashboard.penetration',
+    'aemo_dashboard.insights',
+    'aemo_dashboard.futures',
+    'aemo_dashboard.evening_peak',
+    'scipy.ndimage',
+]
+
+_IMPORT_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import {DASHBOARD_MODULE}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'lazy_loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _import_run():
+    """Import the dashboard in a fresh interpreter; returns (result, importtime rows)"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC), os.environ.get('PYTHONPATH')])))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _IMPORT_SCRIPT],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return result, rows
+
+
+def report_imports(runs=3, top=15):
+    """Median cold import time of the dashboard module and its slowest imports"""
+    results = []
+    for _ in range(runs):
+        result, rows = _import_run()
+        results.append(result)
+
+    seconds = statistics.median(r['seconds'] for r in results)
+    print(f"Cold import of {DASHBOARD_MODULE}: {seconds:.2f} s (median of {runs})")
+
+    # Top-level entries of the import tree (one indent level) by cumulative time
+    nested = [(name.strip(), cumulative) for name, _, cumulative in rows
+              if name.startswith('  ') and not name.startswith('    ')]
+    print("\nSlowest direct imports (cumulative ms, last run):")
+    for name, cumulative in sorted(nested, key=lambda r: -r[1])[:top]:
+        print(f"  {cumulative / 1000:8.1f}  {name}")
+
+    lazy_loaded = results[-1]['lazy_loaded']
+    if lazy_loaded:
+        print(f"\nLoaded at startup but should wait for their tab: {', '.join(lazy_loaded)}")
+    else:
+        print(f"\nNo lazy tab modules loaded at startup ({len(LAZY_MODULES)} checked)")
+    return seconds, lazy_loaded
+
 
 def profile_dashboard_startup():
     """Profile the dashboard initialization to find bottlenecks"""
-    
+
     # Start profiling
     profiler = cProfile.Profile()
     profiler.enable()
-    
+
     start_time = time.time()
-    
+
     # Import and initialize dashboard
     print("Starting dashboard profiling...")
     from aemo_dashboard.generation.gen_dash import EnergyDashboard, create_app
-    
+
     print("Creating app factory...")
     app_factory = create_app()
-    
+
     print("Creating dashboard instance...")
     # Call the factory to create a dashboard instance
     dashboard_instance = app_factory()
-    
+
     # Stop profiling
     profiler.disable()
     end_time = time.time()
-    
+
     print(f"\nTotal time: {end_time - start_time:.2f} seconds")
-    
+
     # Create string buffer for stats
     s = io.StringIO()
     ps = pstats.Stats(profiler, stream=s).sort_stats('cumulative')
-    
+
     # Print top 30 time-consuming functions
     ps.print_stats(30)
-    
+
     # Also print callers of the top functions
     print("\n" + "="*80)
     print("TOP TIME CONSUMERS:")
     print("="*80)
     print(s.getvalue())
-    
+
     # Find specific bottlenecks
     s2 = io.StringIO()
     ps2 = pstats.Stats(profiler, stream=s2).sort_stats('time')
     ps2.print_stats('create_', 20)  # Functions with 'create_' in name
-    
+
     print("\n" + "="*80)
     print("CREATE FUNCTIONS:")
     print("="*80)
     print(s2.getvalue())
-    
+
     # Panel-specific functions
     s3 = io.StringIO()
     ps3 = pstats.Stats(profiler, stream=s3).sort_stats('cumulative')
     ps3.print_stats(r'panel|pn\.', 20)
-    
+
     print("\n" + "="*80)
     print("PANEL FUNCTIONS:")
     print("="*80)
     print(s3.getvalue())
 
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3, help='fresh interpreters to time the import in')
+    parser.add_argument('--top', type=int, default=15, help='slowest imports to list')
+    parser.add_argument('--session', action='store_true', help='cProfile app + dashboard creation instead')
+    args = parser.parse_args()
+
+    if args.session:
+        profile_dashboard_startup()
+    else:
+        report_imports(args.runs, args.top)
+
+
 if __name__ == "__main__":
-    profile_dashboard_startup()
\ No newline at end of file
+    main()
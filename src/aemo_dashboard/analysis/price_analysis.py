@@ -9,7 +9,7 @@ import pandas as pd
 import numpy as np
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Callable, Dict, List, Tuple, Optional, Union
 import pickle
 from datetime import datetime
 from ..shared.config import config
@@ -87,7 +87,8 @@ class PriceAnalysisMotor:
             return False
     
     @performance_monitor(threshold=2.0)
-    def integrate_data(self, start_date: Optional[str] = None, end_date: Optional[str] = None, force_reload: bool = False) -> bool:
+    def integrate_data(self, start_date: Optional[str] = None, end_date: Optional[str] = None, force_reload: bool = False,
+                       progress_callback: Optional[Callable[[int], None]] = None) -> bool:
         """
         Load and integrate generation, price, and DUID mapping data using hybrid query manager.
         
@@ -95,6 +96,7 @@ class PriceAnalysisMotor:
             start_date: Filter start date (YYYY-MM-DD format), if None uses available data
             end_date: Filter end date (YYYY-MM-DD format), if None uses available data
             force_reload: Force reload even if data already cached
+            progress_callback: Called with rows loaded so far while the query streams
         
         Returns:
             bool: True if integration successful
@@ -131,7 +133,8 @@ class PriceAnalysisMotor:
                     start_date=start_dt,
                     end_date=end_dt,
                     resolution=self.resolution,
-                    use_cache=not force_reload
+                    use_cache=not force_reload,
+                    progress_callback=progress_callback
                 )
                 
                 if self.integrated_data.empty:
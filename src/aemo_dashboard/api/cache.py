@@ -0,0 +1,296 @@
+"""Response cache for GET /v1 routes, shared by all uvicorn workers.
+
+Clients ask for the same windows ("last 24h, all regions") with ``from`` /
+``to`` a few seconds apart, so nothing could be reused. The middleware here:
+
+1. Maps ``from``/``to`` to a canonical value that selects the same rows.
+   Every table holds rows on 5-minute boundaries, so a bound on a boundary
+   is kept and a bound between two boundaries becomes the midpoint of its
+   5-minute slot: whichever comparison a router uses (``>=``, ``>``, ``<=``,
+   ``<``), no row lies between the requested and the canonical bound. The
+   query string is rewritten, so the handler computes the canonical window
+   and every request sharing a key gets the same body.
+2. Keys the response on path + sorted normalised params + the DuckDB
+   snapshot version (``db.snapshot_version``) + the deployed code version.
+   Routes reading files outside DuckDB (``SOURCE_FILES``) also key on those
+   files' size and mtime. Requests without an explicit ``to`` are relative
+   to now, so their key also carries the current 5-minute slot.
+3. Stores the body gzip-compressed in a file per key under
+   ``AEMO_API_CACHE_DIR``; writes are atomic renames, so every worker reads
+   and fills the same store.
+4. Sends an ETag (a hash of the uncompressed body) and answers a matching
+   ``If-None-Match`` with 304, on hits and misses alike.
+
+Only 200 JSON responses are stored. Entries expire after
+``AEMO_API_CACHE_TTL_S`` and the store is trimmed to
+``AEMO_API_CACHE_MAX_MB``. Set ``AEMO_API_CACHE_TTL_S=0`` to disable.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from .db import snapshot_version
+from .routers import futures, outages
+
+CACHE_DIR = Path(os.environ.get("AEMO_API_CACHE_DIR",
+                                os.path.join(tempfile.gettempdir(), "aemo-api-cache")))
+TTL_S = int(os.environ.get("AEMO_API_CACHE_TTL_S", "900"))
+MAX_BYTES = int(os.environ.get("AEMO_API_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+# Live counters, per-device state and market notices (fetched from AEMO's
+# website, with their own 5-minute cache) are never cached
+UNCACHED_PREFIXES = ("/v1/meta", "/v1/devices", "/v1/notices")
+
+# Routes reading files outside DuckDB: path prefix -> the files it reads
+SOURCE_FILES = {
+    "/v1/futures/": futures.source_files,
+    "/v1/pasa/": outages.source_files,
+}
+
+# Cadence of every table's rows
+FIVE_MIN_S = 300
+
+# Bodies smaller than GZipMiddleware's minimum_size are stored uncompressed
+_GZIP_MIN_BYTES = 1024
+# Seconds between sweeps of expired / excess entries (per worker)
+_SWEEP_INTERVAL_S = 60
+
+
+def _code_version() -> str:
+    """Changes when the API code is redeployed, so stale bodies aren't served."""
+    api_dir = Path(__file__).parent
+    stamps = sorted((p.name, p.stat().st_mtime_ns) for p in api_dir.rglob("*.py"))
+    return hashlib.sha1(repr(stamps).encode()).hexdigest()[:8]
+
+
+_CODE_VERSION = _code_version()
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "not_modified": 0, "stores": 0, "evictions": 0}
+_last_sweep = 0.0
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _lock:
+        _stats[name] += n
+
+
+def cache_stats() -> dict:
+    with _lock:
+        return {"enabled": TTL_S > 0, "ttl_s": TTL_S, **_stats}
+
+
+def _parse_dt(value: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _canonical(dt: datetime, step_s: int = FIVE_MIN_S) -> datetime:
+    """dt if it is on a step_s boundary, else the midpoint of its slot.
+
+    Naive values are taken as-is, aware ones in UTC.
+    """
+    ref = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+    seconds = ref.timestamp()
+    offset = seconds % step_s
+    if offset == 0:
+        return dt
+    mid = datetime.fromtimestamp(seconds - offset + step_s / 2, timezone.utc)
+    return mid.replace(tzinfo=None) if dt.tzinfo is None else mid.astimezone(dt.tzinfo)
+
+
+def _format_dt(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def normalise_query(params: list[tuple[str, str]], now: datetime | None = None
+                    ) -> tuple[list[tuple[str, str]], str | None] | None:
+    """Canonicalise from/to (selecting the same rows) and sort the params.
+
+    Returns (params, now_slot): now_slot is the current 5-minute slot when
+    the window is open-ended (no ``to``), else None. Returns None if
+    from/to don't parse; those requests bypass the cache and the handler
+    reports the error.
+    """
+    now = now or datetime.now(timezone.utc)
+    values = dict(params)
+    parsed = {}
+    for name in ("from", "to"):
+        if name in values:
+            parsed[name] = _parse_dt(values[name])
+            if parsed[name] is None:
+                return None
+
+    out = []
+    for name, value in params:
+        if name in parsed:
+            value = _format_dt(_canonical(parsed[name]))
+        out.append((name, value))
+    now_slot = None if "to" in parsed else str(int(now.timestamp()) // FIVE_MIN_S)
+    return sorted(out), now_slot
+
+
+def source_stamp(path: str) -> str:
+    """Size and mtime of the files outside DuckDB that the route at path reads."""
+    for prefix, files in SOURCE_FILES.items():
+        if path.startswith(prefix):
+            stamps = []
+            for file in files():
+                try:
+                    st = file.stat()
+                    stamps.append((file.name, st.st_size, st.st_mtime_ns))
+                except OSError:
+                    stamps.append((file.name, None))
+            return hashlib.sha1(repr(stamps).encode()).hexdigest()[:12]
+    return ""
+
+
+def _entry_path(key: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.entry"
+
+
+def _read_entry(key: str) -> tuple[dict, bytes] | None:
+    path = _entry_path(key)
+    try:
+        raw = path.read_bytes()
+    except (FileNotFoundError, OSError):
+        return None
+    header, _, body = raw.partition(b"\n")
+    try:
+        meta = json.loads(header)
+    except ValueError:
+        return None
+    if meta.get("key") != key or time.time() - meta.get("stored_at", 0) > TTL_S:
+        return None
+    return meta, body
+
+
+def _write_entry(key: str, meta: dict, body: bytes) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    header = json.dumps({**meta, "key": key, "stored_at": time.time()}).encode()
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header + b"\n" + body)
+        os.replace(tmp, _entry_path(key))
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return
+    _count("stores")
+    _maybe_sweep()
+
+
+def _maybe_sweep() -> None:
+    """Drop expired entries, then the oldest ones while over MAX_BYTES."""
+    global _last_sweep
+    now = time.time()
+    with _lock:
+        if now - _last_sweep < _SWEEP_INTERVAL_S:
+            return
+        _last_sweep = now
+
+    entries = []
+    removed = 0
+    for path in CACHE_DIR.glob("*.entry"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        if now - st.st_mtime > TTL_S:
+            path.unlink(missing_ok=True)
+            removed += 1
+        else:
+            entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= MAX_BYTES:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    if removed:
+        _count("evictions", removed)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip() for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _respond(client_headers, meta: dict, body: bytes, status_header: str) -> Response:
+    headers = {"ETag": meta["etag"], "X-Cache": status_header, "Vary": "Accept-Encoding"}
+    if _etag_matches(client_headers.get("if-none-match", ""), meta["etag"]):
+        _count("not_modified")
+        return Response(status_code=304, headers=headers)
+    if meta.get("gzip"):
+        if "gzip" in client_headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+        else:
+            body = gzip.decompress(body)
+    return Response(content=body, media_type=meta["media_type"], headers=headers)
+
+
+async def response_cache_middleware(request: Request, call_next):
+    if (TTL_S <= 0 or request.method != "GET"
+            or not request.url.path.startswith("/v1/")
+            or request.url.path.startswith(UNCACHED_PREFIXES)):
+        return await call_next(request)
+
+    normalised = normalise_query(parse_qsl(request.url.query, keep_blank_values=True))
+    if normalised is None:
+        return await call_next(request)
+    params, now_slot = normalised
+    try:
+        version = snapshot_version()
+    except RuntimeError:
+        return await call_next(request)
+    query = urlencode(params)
+    key = (f"{request.url.path}?{query}|{version}|{source_stamp(request.url.path)}"
+           f"|{_CODE_VERSION}|{now_slot or ''}")
+    # Headers as the client sent them (the scope is rewritten below)
+    client_headers = request.headers
+
+    entry = _read_entry(key)
+    if entry is not None:
+        _count("hits")
+        return _respond(client_headers, *entry, "HIT")
+    _count("misses")
+
+    # Run the handler on the normalised window, uncompressed: the body is
+    # compressed once here for storage rather than by GZipMiddleware.
+    request.scope["query_string"] = query.encode("latin-1")
+    request.scope["headers"] = [(k, v) for k, v in request.scope["headers"]
+                                if k != b"accept-encoding"]
+    response = await call_next(request)
+    media_type = response.headers.get("content-type", "")
+    if response.status_code != 200 or not media_type.startswith("application/json"):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    meta = {
+        "etag": f'"{hashlib.sha1(body).hexdigest()}"',
+        "media_type": media_type,
+        "gzip": len(body) >= _GZIP_MIN_BYTES,
+    }
+    stored = gzip.compress(body, compresslevel=6, mtime=0) if meta["gzip"] else body
+    _write_entry(key, meta, stored)
+    return _respond(client_headers, meta, stored, "MISS")
@@ -0,0 +1,103 @@
+"""Columnar JSON encoding for the time-series endpoints.
+
+The default response shape is one dict per point::
+
+    {"data": [{"timestamp": "2026-04-28T03:50:00Z", "region": "NSW1", "price": 88.1}, ...]}
+
+which costs a Python dict and an ISO string per point before FastAPI's
+encoder walks it. Clients that send ``?format=columnar`` get parallel arrays
+per series instead::
+
+    {"series": [{"region": "NSW1", "t": [1777348200, ...], "price": [88.1, ...]}],
+     "meta": {..., "format": "columnar"}}
+
+``t`` is UTC epoch seconds. Columns come from DuckDB as NumPy arrays
+(``fetchnumpy``) and are handed to orjson, which serialises the array buffers
+directly; SQL NULLs travel as NaN and are written as ``null``. Without orjson
+installed the standard-library encoder is used on ``tolist()`` copies.
+
+The row shape stays the default so existing app builds are unaffected.
+"""
+from __future__ import annotations
+
+import json
+import math
+from typing import Any
+
+import numpy as np
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+FORMATS = ("rows", "columnar")
+
+# DuckDB stores NEM time (UTC+10, no DST) as naive timestamps
+NEM_OFFSET_S = 10 * 3600
+
+
+def resolve_format(fmt: str) -> str:
+    """Validate a ``format`` query parameter, returning 'rows' or 'columnar'."""
+    fmt = (fmt or "rows").lower().strip()
+    if fmt not in FORMATS:
+        raise HTTPException(400, detail={"code": "INVALID_FORMAT", "message": f"unknown format: {fmt}"})
+    return fmt
+
+
+def fetch_columns(conn, sql: str, params: list) -> dict[str, np.ndarray]:
+    """Run a query and return its columns as NumPy arrays.
+
+    Nullable numeric columns arrive as masked arrays; they are returned as
+    float arrays with NaN in place of NULL.
+    """
+    cols = conn.execute(sql, params).fetchnumpy()
+    for name, col in cols.items():
+        if isinstance(col, np.ma.MaskedArray):
+            if col.dtype.kind in "biuf":
+                cols[name] = col.astype(float).filled(np.nan)
+            else:
+                cols[name] = col.filled(None) if col.dtype == object else col.data
+    return cols
+
+
+def epoch_seconds(ts: np.ndarray, utc_offset_s: int = NEM_OFFSET_S) -> np.ndarray:
+    """Naive datetime64 array -> UTC epoch seconds (int64).
+
+    Timestamps are taken as NEM time by default, as ``db.nem_naive_to_utc``
+    does; pass ``utc_offset_s=0`` where an endpoint stamps them as UTC.
+    """
+    return ts.astype("datetime64[s]").astype(np.int64) - utc_offset_s
+
+
+def _plain(obj: Any) -> Any:
+    """NumPy-free copy of a payload for the standard-library encoder."""
+    if isinstance(obj, dict):
+        return {k: _plain(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_plain(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return [None if isinstance(v, float) and math.isnan(v) else v for v in obj.tolist()]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, float) and math.isnan(obj):
+        return None
+    return obj
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialise a payload that may hold NumPy arrays to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_plain(payload), separators=(",", ":")).encode("utf-8")
+
+
+class ColumnarJSONResponse(Response):
+    """JSON response that serialises NumPy columns without a per-point Python pass."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
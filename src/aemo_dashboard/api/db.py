@@ -1,20 +1,43 @@
 """DuckDB connection helper for the mobile API.
 
-Opens a fresh read-only connection per request. DuckDB's MVCC isolates
-each connection at a snapshot from the time it was opened, so a long-lived
-cached connection wouldn't see new writes from the AEMO data collector.
-Per-request open is ~1ms overhead and always sees the latest data.
+Each worker process keeps a small pool of read-only cursors on one DuckDB
+database instance, so requests share its buffer pool and catalog cache
+instead of starting cold on a fresh ``duckdb.connect`` every time.
+
+A read-only instance never sees writes made after it was opened, so the
+pool watches the database file (inode, mtime, size, plus the WAL if
+present). When the collector publishes a new snapshot the next checkout
+opens a new instance; idle cursors on the old one are closed straight
+away and in-flight ones as they are returned, after which the old
+instance is closed. Requests therefore still see the latest data, as
+they did with per-request connections.
+
+The file is ATTACHed to an in-memory root connection rather than opened
+with ``duckdb.connect(path)``: DuckDB caches instances by path within a
+process, which would hand a recycled pool the stale instance back.
+
+Pool size, wait and recycle counters are served on ``/v1/meta``.
 """
 from __future__ import annotations
 
+import hashlib
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
+from typing import Optional
 
 import duckdb
 
 _DEFAULT_DB = "/Users/davidleitch/aemo_production/data/aemo_readonly.duckdb"
 
+# Cursors checked out at once per worker; further requests wait for one
+POOL_SIZE = int(os.environ.get("AEMO_DB_POOL_SIZE", "8"))
+# Seconds a request waits for a free cursor before failing
+POOL_WAIT_S = float(os.environ.get("AEMO_DB_POOL_WAIT_S", "10"))
+
+_ALIAS = "aemo"
+
 # DuckDB stores AEMO data as naive datetimes representing NEM time (AEST = UTC+10).
 NEM_TZ = timezone(timedelta(hours=10))
 
@@ -23,12 +46,198 @@ def get_db_path() -> str:
     return os.environ.get("AEMO_DUCKDB_PATH", _DEFAULT_DB)
 
 
-def get_connection() -> duckdb.DuckDBPyConnection:
-    """Open a fresh read-only connection. Caller is responsible for closing it."""
-    path = get_db_path()
-    if not Path(path).exists():
-        raise RuntimeError(f"DuckDB file not found at {path}")
-    return duckdb.connect(path, read_only=True)
+def _snapshot_signature(path: str) -> tuple:
+    """Identity of the file's current contents; changes when a snapshot is published."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise RuntimeError(f"DuckDB file not found at {path}") from None
+    signature = (path, st.st_ino, st.st_mtime_ns, st.st_size)
+    try:
+        wal = os.stat(f"{path}.wal")
+        signature += (wal.st_mtime_ns, wal.st_size)
+    except FileNotFoundError:
+        pass
+    return signature
+
+
+def snapshot_version() -> str:
+    """Short id of the database file's current snapshot; changes when one is published."""
+    return hashlib.sha1(repr(_snapshot_signature(get_db_path())).encode()).hexdigest()[:16]
+
+
+class _Generation:
+    """One read-only database instance on one snapshot of the file."""
+
+    def __init__(self, path: str, signature: tuple):
+        self.signature = signature
+        self.opened_at = datetime.now(timezone.utc)
+        self.root = duckdb.connect(":memory:")
+        path_sql = path.replace("'", "''")
+        self.root.execute(f"ATTACH '{path_sql}' AS {_ALIAS} (READ_ONLY)")
+        self.idle: list[duckdb.DuckDBPyConnection] = []
+        self.checked_out = 0
+
+    def new_cursor(self) -> duckdb.DuckDBPyConnection:
+        cursor = self.root.cursor()
+        cursor.execute(f"USE {_ALIAS}")
+        return cursor
+
+    def close(self) -> None:
+        for cursor in self.idle:
+            cursor.close()
+        self.idle.clear()
+        self.root.close()
+
+
+class PooledConnection:
+    """A pooled cursor. Behaves like a DuckDB connection; close() returns it to the pool."""
+
+    def __init__(self, pool: "ConnectionPool", generation: _Generation,
+                 cursor: duckdb.DuckDBPyConnection):
+        self._pool = pool
+        self._generation = generation
+        self._cursor: Optional[duckdb.DuckDBPyConnection] = cursor
+
+    def __getattr__(self, name):
+        cursor = self.__dict__.get("_cursor")
+        if cursor is None:
+            raise duckdb.ConnectionException("Connection already closed!")
+        return getattr(cursor, name)
+
+    def close(self) -> None:
+        cursor, self._cursor = self._cursor, None
+        if cursor is not None:
+            self._pool._release(self._generation, cursor)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    """Per-process pool of read-only cursors, recycled on each new snapshot."""
+
+    def __init__(self, size: int = POOL_SIZE, wait_s: float = POOL_WAIT_S):
+        self.size = max(1, size)
+        self.wait_s = wait_s
+        self._cond = threading.Condition()
+        self._generation: Optional[_Generation] = None
+        self._in_use = 0
+        self._waiting = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_s_total = 0.0
+        self._wait_s_max = 0.0
+        self._timeouts = 0
+        self._recycles = 0
+        self._cursors_opened = 0
+
+    def acquire(self) -> PooledConnection:
+        path = get_db_path()
+        signature = _snapshot_signature(path)
+        t0 = time.monotonic()
+        with self._cond:
+            if self._in_use >= self.size:
+                self._waits += 1
+                self._waiting += 1
+                try:
+                    while self._in_use >= self.size:
+                        remaining = self.wait_s - (time.monotonic() - t0)
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise RuntimeError(
+                                f"DuckDB connection pool exhausted ({self.size} in use "
+                                f"for {self.wait_s:g}s)"
+                            )
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                waited = time.monotonic() - t0
+                self._wait_s_total += waited
+                self._wait_s_max = max(self._wait_s_max, waited)
+
+            generation = self._generation
+            if generation is None or generation.signature != signature:
+                generation = self._recycle(path, signature)
+            if generation.idle:
+                cursor = generation.idle.pop()
+            else:
+                cursor = generation.new_cursor()
+                self._cursors_opened += 1
+            generation.checked_out += 1
+            self._in_use += 1
+            self._checkouts += 1
+        return PooledConnection(self, generation, cursor)
+
+    def _recycle(self, path: str, signature: tuple) -> _Generation:
+        """Open an instance on the current snapshot and retire the previous one."""
+        old = self._generation
+        self._generation = _Generation(path, signature)
+        if old is not None:
+            self._recycles += 1
+            for cursor in old.idle:
+                cursor.close()
+            old.idle.clear()
+            if old.checked_out == 0:
+                old.close()
+        return self._generation
+
+    def _release(self, generation: _Generation, cursor: duckdb.DuckDBPyConnection) -> None:
+        with self._cond:
+            generation.checked_out -= 1
+            self._in_use -= 1
+            if generation is self._generation:
+                generation.idle.append(cursor)
+            else:
+                cursor.close()
+                if generation.checked_out == 0:
+                    generation.close()
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            generation = self._generation
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "idle": len(generation.idle) if generation else 0,
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_ms_total": round(self._wait_s_total * 1000, 1),
+                "wait_ms_max": round(self._wait_s_max * 1000, 1),
+                "timeouts": self._timeouts,
+                "recycles": self._recycles,
+                "cursors_opened": self._cursors_opened,
+                "snapshot_opened_at": generation.opened_at.isoformat() if generation else None,
+            }
+
+    def close(self) -> None:
+        """Close idle cursors and the current instance (in-flight cursors close on return)."""
+        with self._cond:
+            generation, self._generation = self._generation, None
+            if generation is not None and generation.checked_out == 0:
+                generation.close()
+            elif generation is not None:
+                for cursor in generation.idle:
+                    cursor.close()
+                generation.idle.clear()
+
+
+_POOL = ConnectionPool()
+
+
+def get_connection() -> PooledConnection:
+    """Check out a read-only connection from the worker's pool. Caller is
+    responsible for closing it, which returns it to the pool."""
+    return _POOL.acquire()
+
+
+def pool_stats() -> dict:
+    return _POOL.stats()
 
 
 def nem_naive_to_utc(dt: datetime) -> datetime:
@@ -47,5 +256,5 @@ def utc_to_nem_naive(dt: datetime) -> datetime:
 
 
 def reset_connection_for_tests() -> None:
-    """No-op now that we don't cache. Kept for test compatibility."""
-    pass
+    """Drop the pool's current instance so the next request reopens the file."""
+    _POOL.close()
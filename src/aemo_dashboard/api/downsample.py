@@ -1,4 +1,4 @@
-"""Largest-Triangle-Three-Buckets time-series downsampling.
+"""Largest-Triangle-Three-Buckets time-series downsampling and LOESS smoothing.
 
 Used by /v1/prices/spot and other time-series endpoints to keep payload size
 sane on long lookback windows. LTTB preserves visually-significant points
@@ -6,27 +6,227 @@ sane on long lookback windows. LTTB preserves visually-significant points
 previously-selected point and the next bucket's centroid.
 
 Reference: Sveinn Steinarsson, 'Downsampling Time Series for Visual
-Representation' (2013). Pure-Python implementation, no numpy dependency
-to keep the API process light.
+Representation' (2013).
+
+Both algorithms are vectorised with NumPy:
+
+* LTTB gathers every bucket into a padded (buckets x bucket_width) matrix and
+  computes the next-bucket centroids up front. For narrow buckets the best
+  reply to every candidate of the previous bucket is tabulated at once, so
+  the sequential part is an integer lookup per bucket; wide buckets take one
+  NumPy step per output point instead of one Python step per input point.
+  ``lttb_indices`` takes several series sharing an x axis as a 2-D array and
+  picks their points in the same pass; ``lttb_many`` groups independent
+  series (e.g. one per region) by length to do the same.
+* LOESS is ``shared.smoothing.window_loess``, shared with the dashboard's
+  smoothers: all r-point windows form one (n x r) matrix (in row blocks to
+  bound memory) and every local weighted fit is solved at once.
+
+``lttb`` and ``loess`` keep their list-in/list-out signatures and return the
+same points and values as the original pure-Python loops.
 """
 from __future__ import annotations
 
 from typing import Sequence
 
+import numpy as np
+
+from ..shared.smoothing import window_loess
+
+# The best-reply table (see _walk_pairwise) costs series x width^2 areas per
+# bucket; past this it is cheaper to step through the buckets. The table is
+# built in blocks of at most _PAIRWISE_BLOCK_ELEMENTS areas.
+_PAIRWISE_MAX_COST = 300
+_PAIRWISE_BLOCK_ELEMENTS = 1 << 21
+
+
+def _bucket_bounds(n: int, target: int):
+    """Current-bucket [lo, hi) and next-bucket centroid ranges for LTTB."""
+    m = target - 2
+    bucket_size = (n - 2) / (target - 2)
+    steps = np.arange(m + 2, dtype=float) * bucket_size
+    edges = steps.astype(np.int64) + 1  # int(i * bucket_size) + 1
+
+    cur_lo = edges[:m]
+    cur_hi = np.minimum(edges[1:m + 1], n - 1)
+
+    next_lo = edges[1:m + 1]
+    next_hi = np.minimum(edges[2:m + 2], n)
+    next_lo = np.where(next_lo >= next_hi, next_hi - 1, next_lo)
+    return cur_lo, cur_hi, next_lo, next_hi
+
+
+def _padded_buckets(lo: np.ndarray, hi: np.ndarray):
+    """(buckets x widest bucket) index matrix for ranges [lo, hi) and its validity mask."""
+    width = int((hi - lo).max())
+    idx = lo[:, None] + np.arange(width)
+    valid = idx < hi[:, None]
+    return np.where(valid, idx, lo[:, None]), valid
+
+
+def _triangle_argmax(a_x, a_y, avg_x, avg_y, bx, by, valid):
+    """Bucket position maximising the triangle area with point a and the next centroid."""
+    area = np.abs((a_x - avg_x) * (by - a_y) - (a_x - bx) * (avg_y - a_y))
+    # The scalar loop never picks a NaN area; -1 loses to any real area
+    area = np.where(np.isnan(area), -1.0, area)
+    area = np.where(valid, area, -2.0)
+    return area.argmax(axis=-1)
+
+
+def _walk_pairwise(x0, y0, avg_x, avg_y, bx, by, valid) -> np.ndarray:
+    """Choose every bucket's point from a table of best replies.
+
+    The point kept from bucket i depends only on the point kept from bucket
+    i - 1, so the best reply to every candidate of bucket i - 1 is computed
+    in one vectorised pass (blocks of buckets x width x width); the walk
+    through the table is then a cheap integer lookup per bucket.
+    """
+    k = by.shape[0]
+    m, width = bx.shape
+    pos = np.empty((k, m), dtype=np.int64)
+    pos[:, 0] = _triangle_argmax(x0, y0[:, None], avg_x[0], avg_y[:, :1], bx[0], by[:, 0], valid[0])
+    if m == 1:
+        return pos
+
+    best = np.empty((k, m - 1, width), dtype=np.int64)
+    block = max(1, _PAIRWISE_BLOCK_ELEMENTS // (k * width * width))
+    for start in range(1, m, block):
+        cur = slice(start, min(m, start + block))
+        prev = slice(start - 1, cur.stop - 1)
+        best[:, prev] = _triangle_argmax(
+            bx[prev][:, :, None], by[:, prev][..., None],
+            avg_x[cur][:, None, None], avg_y[:, cur][..., None, None],
+            bx[cur][:, None, :], by[:, cur][:, :, None, :], valid[cur][:, None, :],
+        )
+
+    for s, (table, walk) in enumerate(zip(best.tolist(), pos.tolist())):
+        p = walk[0]
+        for i, replies in enumerate(table, start=1):
+            p = walk[i] = replies[p]
+        pos[s] = walk
+    return pos
+
+
+def _walk_sequential(x0, y0, avg_x, avg_y, bx, by, valid) -> np.ndarray:
+    """Choose bucket points one bucket at a time, all series together."""
+    k = by.shape[0]
+    m = bx.shape[0]
+    rows = np.arange(k)
+    pos = np.empty((k, m), dtype=np.int64)
+    a_x = np.full((k, 1), x0)
+    a_y = y0[:, None].copy()
+    # Padding repeats each bucket's first point, so without NaNs the plain
+    # argmax (first maximum) already ignores it
+    exact = not (np.isnan(by).any() or np.isnan(avg_y).any())
+    if exact and k == 1:
+        # 1-D operands keep the per-bucket overhead down for a lone series
+        a_x, a_y = float(x0), float(y0[0])
+        bx1, by1, avg_y1 = bx, by[0], avg_y[0]
+        for i in range(m):
+            area = np.abs((a_x - avg_x[i]) * (by1[i] - a_y) - (a_x - bx1[i]) * (avg_y1[i] - a_y))
+            j = int(area.argmax())
+            pos[0, i] = j
+            a_x, a_y = bx1[i, j], by1[i, j]
+        return pos
+    for i in range(m):
+        if exact:
+            area = np.abs((a_x - avg_x[i]) * (by[:, i] - a_y) - (a_x - bx[i]) * (avg_y[:, i, None] - a_y))
+            j = area.argmax(axis=1)
+        else:
+            j = _triangle_argmax(a_x, a_y, avg_x[i], avg_y[:, i, None], bx[i], by[:, i], valid[i])
+        pos[:, i] = j
+        a_x = bx[i, j][:, None]
+        a_y = by[rows, i, j][:, None]
+    return pos
+
+
+def lttb_indices(x, y, target: int) -> np.ndarray:
+    """Indices of the points LTTB keeps when downsampling to ``target`` points.
+
+    ``y`` is either one series of length n or a (k, n) array of k series
+    sharing the x axis; the result has shape (target,) or (k, target)
+    (fewer columns when ``target`` >= n). Endpoints are always kept. ``x``
+    must be monotonic non-decreasing.
+    """
+    xa = np.asarray(x, dtype=float)
+    ya = np.asarray(y, dtype=float)
+    single = ya.ndim == 1
+    ya = np.atleast_2d(ya)
+    k, n = ya.shape
+    if n != len(xa):
+        raise ValueError("timestamps and values length mismatch")
+
+    if target >= n or n <= 2:
+        keep = np.arange(n)
+    elif target == 2:
+        keep = np.array([0, n - 1])
+    elif target < 2:
+        keep = np.array([0])
+    else:
+        keep = None
+    if keep is not None:
+        out = np.broadcast_to(keep, (k, len(keep)))
+        return out[0].copy() if single else out.copy()
+
+    cur_lo, cur_hi, next_lo, next_hi = _bucket_bounds(n, target)
+    m = len(cur_lo)
+
+    # Next-bucket centroids for every bucket at once
+    nidx, nvalid = _padded_buckets(next_lo, next_hi)
+    counts = next_hi - next_lo
+    avg_x = np.where(nvalid, xa[nidx], 0.0).sum(axis=-1) / counts
+    avg_y = np.where(nvalid, ya[:, nidx], 0.0).sum(axis=-1) / counts  # (k, m)
+
+    # Padded bucket matrix; padding scores below any real (or NaN) area
+    idx, valid = _padded_buckets(cur_lo, cur_hi)
+    bx = xa[idx]            # (m, width)
+    by = ya[:, idx]         # (k, m, width)
+
+    # Position (within its bucket) of the point kept from each bucket
+    if k * idx.shape[1] ** 2 <= _PAIRWISE_MAX_COST:
+        pos = _walk_pairwise(xa[0], ya[:, 0], avg_x, avg_y, bx, by, valid)
+    else:
+        pos = _walk_sequential(xa[0], ya[:, 0], avg_x, avg_y, bx, by, valid)
+    chosen = idx[np.arange(m), pos]
+
+    out = np.empty((k, m + 2), dtype=np.int64)
+    out[:, 0] = 0
+    out[:, 1:-1] = chosen
+    out[:, -1] = n - 1
+    return out[0] if single else out
+
+
+def lttb_many(series: Sequence[Sequence[float]], target: int) -> list[np.ndarray]:
+    """LTTB indices for several independent series, x being each point's position.
+
+    Series of equal length (e.g. regions over the same window) are stacked
+    and downsampled in a single pass.
+    """
+    arrays = [np.asarray(s, dtype=float) for s in series]
+    out: list[np.ndarray] = [None] * len(arrays)  # type: ignore[list-item]
+    by_length: dict[int, list[int]] = {}
+    for pos, arr in enumerate(arrays):
+        by_length.setdefault(len(arr), []).append(pos)
+    for n, positions in by_length.items():
+        keep = lttb_indices(np.arange(n, dtype=float), np.stack([arrays[p] for p in positions]), target)
+        for row, pos in enumerate(positions):
+            out[pos] = keep[row]
+    return out
+
 
 def lttb(
     timestamps: Sequence[float],
     values: Sequence[float],
     target: int,
 ) -> tuple[list[float], list[float]]:
-    """Return (timestamps, values) downsampled to at most  points.
+    """Return (timestamps, values) downsampled to at most ``target`` points.
 
-    Endpoints are always preserved.  must be >= 2 to use the
+    Endpoints are always preserved. ``target`` must be >= 2 to use the
     triangle algorithm; smaller targets are clamped or returned verbatim.
 
-    The two input sequences must be the same length and  must
+    The two input sequences must be the same length and ``timestamps`` must
     be monotonic non-decreasing. Timestamps are treated as floats (seconds-
-    since-epoch is fine).
+    since-epoch is fine). Array callers should use ``lttb_indices``.
     """
     n = len(timestamps)
     if n != len(values):
@@ -34,107 +234,39 @@ def lttb(
 
     if target >= n or n <= 2:
         return list(timestamps), list(values)
-    if target == 2:
-        return [float(timestamps[0]), float(timestamps[-1])], [float(values[0]), float(values[-1])]
     if target < 2:
         # Degenerate ask — preserve at least the first point so callers
         # don't fall over downstream.
         return [timestamps[0]], [values[0]]
 
-    bucket_size = (n - 2) / (target - 2)
-
-    out_t: list[float] = [timestamps[0]]
-    out_v: list[float] = [values[0]]
-
-    a_t = float(timestamps[0])
-    a_v = float(values[0])
-
-    for i in range(target - 2):
-        # Range of points in the *next* bucket (used for centroid).
-        next_lo = int((i + 1) * bucket_size) + 1
-        next_hi = int((i + 2) * bucket_size) + 1
-        next_hi = min(next_hi, n)
-        if next_lo >= next_hi:
-            next_lo = next_hi - 1
-        avg_t = sum(float(timestamps[k]) for k in range(next_lo, next_hi)) / (next_hi - next_lo)
-        avg_v = sum(float(values[k]) for k in range(next_lo, next_hi)) / (next_hi - next_lo)
-
-        # Range of points in the *current* bucket — pick one that maximises
-        # triangle area with (a_t, a_v) and (avg_t, avg_v).
-        cur_lo = int(i * bucket_size) + 1
-        cur_hi = int((i + 1) * bucket_size) + 1
-        cur_hi = min(cur_hi, n - 1)
-
-        max_area = -1.0
-        chosen = cur_lo
-        for k in range(cur_lo, cur_hi):
-            area = abs(
-                (a_t - avg_t) * (float(values[k]) - a_v)
-                - (a_t - float(timestamps[k])) * (avg_v - a_v)
-            )
-            if area > max_area:
-                max_area = area
-                chosen = k
-
-        out_t.append(float(timestamps[chosen]))
-        out_v.append(float(values[chosen]))
-        a_t = float(timestamps[chosen])
-        a_v = float(values[chosen])
-
-    out_t.append(float(timestamps[-1]))
-    out_v.append(float(values[-1]))
+    xa = np.asarray(timestamps, dtype=float)
+    ya = np.asarray(values, dtype=float)
+    keep = lttb_indices(xa, ya, target)
+    out_t = xa[keep].tolist()
+    out_v = ya[keep].tolist()
+    if target > 2:
+        out_t[0], out_v[0] = timestamps[0], values[0]
     return out_t, out_v
 
 
-import numpy as np
+def loess_smooth(x, y, frac: float = 0.05) -> np.ndarray:
+    """Locally-weighted regression smoother (degree-1, tricube weights).
+
+    ``y`` is one series or a (k, n) array of series sharing ``x``; returns
+    smoothed values of the same shape. See ``shared.smoothing.window_loess``.
+    """
+    return window_loess(x, y, frac)
 
 
 def loess(x: Sequence[float], y: Sequence[float], frac: float = 0.05) -> list[float]:
     """Locally-weighted regression smoother (degree-1, tricube weights).
 
     Returns a list of smoothed y-values at the same x positions. `x` must be
-    monotonic non-decreasing (we exploit this for an O(n*r) sliding window
-    rather than O(n^2)).
+    monotonic non-decreasing. Array callers should use ``loess_smooth``.
 
     `frac` is the fraction of points used in each local fit; 0.05 ≈ "1/20th
     of the data" which feels like a few cycles' average for AEMO spot prices.
     """
-    n = len(x)
-    if n != len(y):
+    if len(x) != len(y):
         raise ValueError("x and y length mismatch")
-    if n < 3:
-        return list(map(float, y))
-    r = max(3, int(round(frac * n)))
-    if r >= n:
-        r = n
-
-    xa = np.asarray(x, dtype=float)
-    ya = np.asarray(y, dtype=float)
-    out = np.empty(n, dtype=float)
-
-    for i in range(n):
-        # Symmetric window of size r centred on i, clamped to [0, n).
-        half = r // 2
-        lo = max(0, i - half)
-        hi = min(n, lo + r)
-        lo = max(0, hi - r)
-        xs = xa[lo:hi]
-        ys = ya[lo:hi]
-        d = np.abs(xs - xa[i])
-        h = max(d.max(), 1e-12)
-        w = (1.0 - (d / h) ** 3) ** 3
-        sw = w.sum()
-        if sw < 1e-12:
-            out[i] = ya[i]
-            continue
-        wx = (w * xs).sum() / sw
-        wy = (w * ys).sum() / sw
-        b_num = (w * (xs - wx) * (ys - wy)).sum()
-        b_den = (w * (xs - wx) ** 2).sum()
-        if abs(b_den) < 1e-12:
-            out[i] = wy
-        else:
-            b = b_num / b_den
-            out[i] = wy - b * wx + b * xa[i]
-
-    return out.tolist()
+    return loess_smooth(x, y, frac).tolist()
@@ -0,0 +1,90 @@
+"""Execution model for blocking API handlers.
+
+Handlers that query DuckDB or read data files are plain ``def`` functions
+decorated with ``@blocking``::
+
+    @router.get("/prices/spot")
+    @blocking
+    def spot_price(...) -> dict:
+
+The decorator turns them into ``async`` endpoints that run the body on a
+bounded, per-worker thread pool, so the event loop never waits on a query
+and requests beyond the pool's size queue in FIFO order instead of piling
+more concurrent scans onto DuckDB. The pool defaults to the smaller of the
+connection-pool size and the CPU count (DuckDB's default thread budget),
+so a handler thread never has to wait for a cursor. Override with
+``AEMO_API_DB_THREADS``.
+
+Other blocking work that doesn't touch the database (the NEMweb notices
+fetch, device registration) stays a plain ``def`` on FastAPI's default
+threadpool, and non-blocking handlers stay ``async def``.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .db import POOL_SIZE
+
+DB_THREADS = int(os.environ.get("AEMO_API_DB_THREADS", min(POOL_SIZE, os.cpu_count() or 4)))
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_lock = threading.Lock()
+_queued = 0
+_running = 0
+_completed = 0
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DB_THREADS, thread_name_prefix="api-db")
+    return _executor
+
+
+def _run(func, args, kwargs):
+    global _queued, _running, _completed
+    with _lock:
+        _queued -= 1
+        _running += 1
+    try:
+        return func(*args, **kwargs)
+    finally:
+        with _lock:
+            _running -= 1
+            _completed += 1
+
+
+def blocking(func):
+    """Run a sync handler on the bounded DB executor (see module docstring)."""
+    @functools.wraps(func)
+    async def endpoint(*args, **kwargs):
+        global _queued
+        with _lock:
+            _queued += 1
+        future = _get_executor().submit(_run, func, args, kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Client went away; a job that hasn't started is dropped
+            if future.cancel():
+                with _lock:
+                    _queued -= 1
+            raise
+    return endpoint
+
+
+def executor_stats() -> dict:
+    with _lock:
+        return {
+            "threads": DB_THREADS,
+            "running": _running,
+            "queued": _queued,
+            "completed": _completed,
+        }
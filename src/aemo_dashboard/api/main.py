@@ -12,6 +12,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 
 from .auth import bearer_token_middleware
+from .cache import response_cache_middleware
 from .routers import batteries, devices, evening_peak, futures, gas, gauges, generation, generation_comparison, meta, outages, prices, stations, today, trends
 
 
@@ -23,7 +24,10 @@ def create_app() -> FastAPI:
         redoc_url=None,
     )
 
+    # Added innermost first: auth -> CORS -> response cache -> gzip -> routes.
+    # The cache sits outside gzip so it stores (and serves) compressed bodies.
     app.add_middleware(GZipMiddleware, minimum_size=1024)
+    app.middleware("http")(response_cache_middleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["https://*.itkservices2.com"],
@@ -55,11 +59,15 @@ def create_app() -> FastAPI:
 app = create_app()
 
 @app.on_event("startup")
-def _prewarm_caches() -> None:
-    """Pre-populate the gauges cache on each worker's startup so the
-    first user-facing request never pays the cold-DB scan cost."""
-    try:
-        from .routers.gauges import gauges_today
-        gauges_today()
-    except Exception:
-        pass  # Soft fail — cache will populate on first real call.
+def _start_background_refresh() -> None:
+    """Build the gauges payload on each worker's startup and keep it
+    refreshed off the request path, so no user-facing request ever pays
+    the cold-DB scan cost."""
+    from .routers.gauges import start_background_refresh
+    start_background_refresh()
+
+
+@app.on_event("shutdown")
+def _stop_background_refresh() -> None:
+    from .routers.gauges import stop_background_refresh
+    stop_background_refresh()
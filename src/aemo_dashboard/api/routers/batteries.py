@@ -24,6 +24,7 @@ from typing import Literal, Optional
 from fastapi import APIRouter, HTTPException, Query
 
 from ..db import get_connection, nem_naive_to_utc
+from ..executor import blocking
 
 router = APIRouter()
 
@@ -70,7 +71,8 @@ def _naive(dt: Optional[datetime]) -> Optional[datetime]:
 
 
 @router.get('/batteries/overview')
-async def batteries_overview(
+@blocking
+def batteries_overview(
     region: str = Query('NEM'),
     metric: OverviewMetric = Query('discharge_revenue'),
     from_: Optional[datetime] = Query(None, alias='from'),
@@ -183,7 +185,8 @@ async def batteries_overview(
 # ----------------------------------------------------------------------
 
 @router.get('/batteries/owners')
-async def batteries_owners() -> dict:
+@blocking
+def batteries_owners() -> dict:
     """Distinct owners across battery DUIDs, alphabetical."""
     sql = '''
         SELECT DISTINCT "Owner" AS owner
@@ -207,7 +210,8 @@ PHYSICAL_REGIONS = {'NSW1', 'QLD1', 'SA1', 'TAS1', 'VIC1'}
 
 
 @router.get('/batteries/list')
-async def batteries_list(
+@blocking
+def batteries_list(
     regions: Optional[str] = Query(None),
     owners: Optional[str] = Query(None),
 ) -> dict:
@@ -282,7 +286,7 @@ async def batteries_list(
 # /v1/batteries/fleet-timeseries — per-DUID series, LTTB-downsampled (B4)
 # ----------------------------------------------------------------------
 
-from ..downsample import lttb
+from ..downsample import lttb_many
 
 FREQ_TO_TABLE = {'5m': 'scada5', '30m': 'scada30', '1h': 'scada30', 'D': 'scada30'}
 FREQ_BUCKET   = {'1h': "INTERVAL '1 hour'", 'D': "INTERVAL '1 day'"}
@@ -327,7 +331,8 @@ def _resolve_target_duids(
 
 
 @router.get('/batteries/fleet-timeseries')
-async def batteries_fleet_timeseries(
+@blocking
+def batteries_fleet_timeseries(
     regions: Optional[str] = Query(None),
     owners: Optional[str] = Query(None),
     batteries: Optional[str] = Query(None),
@@ -392,14 +397,14 @@ async def batteries_fleet_timeseries(
     out: list[dict] = []
     downsampled = False
     source_rows = sum(len(v) for v in by_duid.values())
+    # Downsample every long series in one batched pass
+    long_duids = [d for d in sorted(by_duid) if len(by_duid[d]) > MAX_POINTS]
+    keep = dict(zip(long_duids, lttb_many(
+        [[v for (_, v) in by_duid[d]] for d in long_duids], MAX_POINTS)))
     for duid in sorted(by_duid):
         series = by_duid[duid]
-        if len(series) > MAX_POINTS:
-            ts_idx = list(range(len(series)))
-            vals = [v for (_, v) in series]
-            keep_idx, _ = lttb(ts_idx, vals, MAX_POINTS)
-            keep = {int(i) for i in keep_idx}
-            series = [series[i] for i in range(len(series)) if i in keep]
+        if duid in keep:
+            series = [series[i] for i in keep[duid]]
             downsampled = True
         for (t, value) in series:
             out.append({'duid': duid, 't': _utc_iso(t), 'value': round(value, 4)})
@@ -440,7 +445,8 @@ def _ts_empty(frequency: str, from_dt: datetime, to_dt: datetime, duids: list[st
 # ----------------------------------------------------------------------
 
 @router.get('/batteries/fleet-tod')
-async def batteries_fleet_tod(
+@blocking
+def batteries_fleet_tod(
     regions: Optional[str] = Query(None),
     owners: Optional[str] = Query(None),
     batteries: Optional[str] = Query(None),
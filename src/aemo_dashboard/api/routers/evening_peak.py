@@ -19,6 +19,7 @@ import pandas as pd
 from fastapi import APIRouter, HTTPException, Query
 
 from ..db import get_connection
+from ..executor import blocking
 
 router = APIRouter()
 
@@ -241,6 +242,7 @@ def _empty_window() -> dict:
 
 
 @router.get('/evening-peak')
+@blocking
 def evening_peak(
     region: str = Query('NEM'),
     period_days: int = Query(30, ge=7, le=365),
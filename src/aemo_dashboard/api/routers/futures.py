@@ -17,6 +17,8 @@ from typing import Optional
 import pandas as pd
 from fastapi import APIRouter, HTTPException, Query
 
+from ..executor import blocking
+
 router = APIRouter()
 
 # ASX has no Tasmania contract.
@@ -33,8 +35,13 @@ COL_RE = re.compile(
 )
 
 
+def source_files() -> list[Path]:
+    """Files the /futures routes read (outside DuckDB; the response cache stamps them)."""
+    return [Path(os.environ.get("AEMO_DATA_PATH", str(DEFAULT_DATA_PATH))) / "futures.csv"]
+
+
 def _read_futures_csv() -> pd.DataFrame:
-    path = Path(os.environ.get("AEMO_DATA_PATH", str(DEFAULT_DATA_PATH))) / "futures.csv"
+    path, = source_files()
     if not path.exists():
         return pd.DataFrame()
     df = pd.read_csv(path, parse_dates=["Time (UTC+10)"])
@@ -59,7 +66,8 @@ def _quarter_label(year: int, q: int) -> str:
 
 
 @router.get("/futures/forward-curve")
-async def forward_curve(
+@blocking
+def forward_curve(
     region: str = Query(..., min_length=2, max_length=8),
 ) -> dict:
     region = region.upper()
@@ -152,7 +160,8 @@ def _cal_year_avg(df: pd.DataFrame, contracts: dict, year: int) -> pd.Series:
 
 
 @router.get('/futures/expectations')
-async def futures_expectations(
+@blocking
+def futures_expectations(
     region: str = Query(..., min_length=2, max_length=8),
 ) -> dict:
     region = region.upper()
@@ -207,7 +216,8 @@ async def futures_expectations(
 # ----------------------------------------------------------------------
 
 @router.get('/futures/contracts')
-async def futures_contracts() -> dict:
+@blocking
+def futures_contracts() -> dict:
     df = _read_futures_csv()
     if df.empty:
         return {'data': [], 'meta': {'as_of': datetime.now(timezone.utc).isoformat()}}
@@ -226,7 +236,8 @@ async def futures_contracts() -> dict:
 # ----------------------------------------------------------------------
 
 @router.get('/futures/contract')
-async def futures_contract(
+@blocking
+def futures_contract(
     year: int = Query(...),
     quarter: int = Query(..., ge=1, le=4),
 ) -> dict:
@@ -19,6 +19,7 @@ from fastapi import APIRouter, HTTPException, Query
 
 from ..db import get_connection
 from ..downsample import loess
+from ..executor import blocking
 
 router = APIRouter()
 
@@ -54,7 +55,8 @@ def _safe_query(sql: str, params: list) -> list[tuple]:
 
 
 @router.get("/gas/prices")
-async def gas_prices(
+@blocking
+def gas_prices(
     hub: str = Query("AVG"),
     smoothing: Optional[str] = Query(None),
 ) -> dict:
@@ -180,7 +182,8 @@ async def gas_prices(
 
 
 @router.get("/gas/demand")
-async def gas_demand(
+@blocking
+def gas_demand(
     hub: str = Query("ALL"),
 ) -> dict:
     """7-day MA TJ/day, last 3 calendar years overlaid by day-of-year.
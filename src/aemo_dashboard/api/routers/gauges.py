@@ -2,9 +2,10 @@
 
 Definitions match the existing Panel dashboard's nem_dash_tab.py:
   - demand     = SUM(demand30.demand) + SUM(rooftop30.power) across 5 mainland regions.
-                 alltime / hour records computed over all history of demand30+rooftop30.
+                 alltime / hour records computed over all history of demand30+rooftop30,
+                 maintained incrementally by DemandRecords.
                  forecast_peak_mw = MAX over latest predispatch run of summed demand_forecast.
-  - renewable  = (Hydro + Wind + Solar + Rooftop) / total at latest generation_by_fuel_5min,
+  - renewable  = (Hydro + Wind + Solar + Rooftop) / total at latest scada5 interval,
                  excluding Battery Storage and Transmission. Biomass is omitted from
                  the displayed breakdown to match the stacked-gauge convention.
                  Rooftop is sourced from rooftop30 at the latest 30-min bucket on
@@ -15,21 +16,45 @@ Definitions match the existing Panel dashboard's nem_dash_tab.py:
 """
 from __future__ import annotations
 
+import json
+import os
+import tempfile
+import threading
 import time
 from datetime import datetime, timezone
+from pathlib import Path
 
 from fastapi import APIRouter
 
-from ..db import get_connection, nem_naive_to_utc
+from ..db import get_connection, get_db_path, nem_naive_to_utc
+from ..executor import blocking
 
 router = APIRouter()
 
-# In-process TTL cache: gauges_today does several full table scans
-# (all-time hour record + min/max), and the answer changes at most every
-# 30 minutes when a new settlement period lands. 30 s TTL collapses
-# concurrent traffic to a single DB read.
-_GAUGES_CACHE: dict = {"fetched_at": 0.0, "payload": None}
+# gauges_today is served from memory. A background thread (started by
+# start_background_refresh on app startup) rebuilds the payload whenever the
+# data version - MAX(settlementdate) of every source table, read from DuckDB
+# zone maps - moves, so requests never wait on the database. Without the
+# thread (tests, scripts) requests refresh inline, rechecking the version at
+# most every _VERSION_POLL_SEC; if the version cannot be read the payload
+# falls back to a plain TTL.
+_GAUGES_CACHE: dict = {"fetched_at": 0.0, "checked_at": 0.0, "version": None, "payload": None}
 _GAUGES_TTL_SEC = 60.0
+_VERSION_POLL_SEC = 5.0
+_REFRESH_INTERVAL_SEC = float(os.environ.get("GAUGES_REFRESH_SEC", "15"))
+
+_refresh_lock = threading.Lock()
+_refresh_stop = threading.Event()
+_refresh_thread: threading.Thread | None = None
+
+# (table, column) pairs whose latest value determines the payload
+_VERSION_SOURCES = (
+    ("demand30", "settlementdate"),
+    ("rooftop30", "settlementdate"),
+    ("scada5", "settlementdate"),
+    ("bdu5", "settlementdate"),
+    ("predispatch", "run_time"),
+)
 
 REGIONS_5 = ("NSW1", "QLD1", "VIC1", "SA1", "TAS1")
 MAINLAND = ("NSW1", "QLD1", "VIC1", "SA1")
@@ -43,6 +68,188 @@ def _utc_iso(dt: datetime | None) -> str | None:
     return nem_naive_to_utc(dt).isoformat().replace("+00:00", "Z")
 
 
+def _period_stats(conn, after: datetime | None, until: datetime | None) -> list:
+    """Per hour of day: MAX of all period totals, and MAX/MIN of the periods
+    with positive demand, for settlement periods in (after, until]."""
+    regs = "('" + "','".join(REGIONS_5) + "')"
+    where = [f"d.regionid IN {regs}"]
+    params = []
+    if after is not None:
+        where.append("d.settlementdate > ?")
+        params.append(after)
+    if until is not None:
+        where.append("d.settlementdate <= ?")
+        params.append(until)
+    return conn.execute(f"""
+        SELECT CAST(EXTRACT(HOUR FROM settlementdate) AS INTEGER),
+               MAX(period_total),
+               MAX(period_total) FILTER (WHERE demand_total > 0),
+               MIN(period_total) FILTER (WHERE demand_total > 0)
+        FROM (
+            SELECT d.settlementdate,
+                   SUM(d.demand) AS demand_total,
+                   SUM(d.demand) + COALESCE(SUM(r.power), 0) AS period_total
+            FROM demand30 d
+            LEFT JOIN rooftop30 r
+              ON d.settlementdate = r.settlementdate AND d.regionid = r.regionid
+            WHERE {" AND ".join(where)}
+            GROUP BY d.settlementdate
+        )
+        GROUP BY 1
+    """, params).fetchall()
+
+
+def _history_signature(conn, until: datetime | None) -> str | None:
+    """Fingerprint of the demand30/rooftop30 rows up to until.
+
+    Row counts plus an order-independent sum of row hashes: a backfill or a
+    rebuilt database that changes any closed period changes the signature.
+    """
+    if until is None:
+        return None
+    regs = "('" + "','".join(REGIONS_5) + "')"
+    parts = []
+    for table, column in (("demand30", "demand"), ("rooftop30", "power")):
+        count, digest = conn.execute(f"""
+            SELECT COUNT(*), SUM(hash(settlementdate, regionid, {column}))
+            FROM {table}
+            WHERE regionid IN {regs} AND settlementdate <= ?
+        """, [until]).fetchone()
+        parts.append(f"{table}:{count}:{digest}")
+    return ";".join(parts)
+
+
+def _fmax(a: float | None, b: float | None) -> float | None:
+    return b if a is None else a if b is None else max(a, b)
+
+
+def _fmin(a: float | None, b: float | None) -> float | None:
+    return b if a is None else a if b is None else min(a, b)
+
+
+class DemandRecords:
+    """All-time and hour-of-day demand records, maintained incrementally.
+
+    Records over *closed* settlement periods - those up to the latest period
+    present in both demand30 and rooftop30, so a late rooftop row can no
+    longer change their totals - are folded in once and kept behind a
+    watermark. Each refresh scans only periods after the watermark: newly
+    closed ones are folded in, and the few open ones are combined on the fly.
+    The closed records are persisted to a small JSON file so a restarted
+    worker does not repeat the full-history scan.
+
+    The closed records are only valid for the history they were folded
+    from, so they carry its _history_signature. Each refresh recomputes it
+    (one pass per table, far cheaper than the join it guards) and starts
+    over with a full scan when the history under the watermark changed -
+    a backfill, or a rebuilt database - in this process or since the file
+    was saved.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.watermark: datetime | None = None
+        self.hour_max: dict[int, float] = {}
+        self.alltime_max: float | None = None
+        self.alltime_min: float | None = None
+        self._closed_hour_max: dict[int, float] = {}
+        self._closed_max: float | None = None
+        self._closed_min: float | None = None
+        self._history: str | None = None
+        self._loaded = False
+
+    def _reset(self) -> None:
+        self.watermark = None
+        self._closed_hour_max = {}
+        self._closed_max = None
+        self._closed_min = None
+        self._history = None
+
+    def _fold(self, rows: list, hour_max: dict, hi: float | None, lo: float | None):
+        hour_max = dict(hour_max)
+        for hour, period_max, positive_max, positive_min in rows:
+            if period_max is not None:
+                hour_max[hour] = _fmax(hour_max.get(hour), float(period_max))
+            if positive_max is not None:
+                hi = _fmax(hi, float(positive_max))
+                lo = _fmin(lo, float(positive_min))
+        return hour_max, hi, lo
+
+    def refresh(self, conn) -> "DemandRecords":
+        """Fold in newly closed periods and recombine with the open ones."""
+        if not self._loaded:
+            self._load()
+        if self.watermark is not None and _history_signature(conn, self.watermark) != self._history:
+            self._reset()
+        regs = "('" + "','".join(REGIONS_5) + "')"
+        closed_until = conn.execute(f"""
+            SELECT (SELECT MAX(settlementdate) FROM demand30 WHERE regionid IN {regs}),
+                   (SELECT MAX(settlementdate) FROM rooftop30 WHERE regionid IN {regs})
+        """).fetchone()
+        closed_until = min((ts for ts in closed_until if ts is not None), default=None)
+
+        if closed_until is not None and (self.watermark is None or closed_until > self.watermark):
+            rows = _period_stats(conn, self.watermark, closed_until)
+            self._closed_hour_max, self._closed_max, self._closed_min = self._fold(
+                rows, self._closed_hour_max, self._closed_max, self._closed_min)
+            self.watermark = closed_until
+            self._history = _history_signature(conn, closed_until)
+            self._save()
+
+        open_rows = _period_stats(conn, self.watermark, None)
+        self.hour_max, self.alltime_max, self.alltime_min = self._fold(
+            open_rows, self._closed_hour_max, self._closed_max, self._closed_min)
+        return self
+
+    def hour_record(self, hour: int) -> float | None:
+        return self.hour_max.get(hour)
+
+    def _load(self) -> None:
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            state = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if state.get("db_path") != get_db_path() or "history" not in state:
+            return
+        self.watermark = datetime.fromisoformat(state["watermark"])
+        self._closed_hour_max = {int(h): v for h, v in state["hour_max"].items()}
+        self._closed_max = state["alltime_max"]
+        self._closed_min = state["alltime_min"]
+        self._history = state["history"]
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        state = {
+            "db_path": get_db_path(),
+            "watermark": self.watermark.isoformat(),
+            "hour_max": self._closed_hour_max,
+            "alltime_max": self._closed_max,
+            "alltime_min": self._closed_min,
+            "history": self._history,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # Persistence is an optimisation; records stay in memory.
+
+
+def _records_path() -> Path | None:
+    path = os.environ.get("GAUGES_RECORDS_FILE")
+    if path == "":
+        return None
+    return Path(path) if path else Path(tempfile.gettempdir()) / "aemo_api_gauge_records.json"
+
+
+_RECORDS = DemandRecords(_records_path())
+
+
 def _load_demand(conn) -> dict:
     regs = "('" + "','".join(REGIONS_5) + "')"
 
@@ -68,34 +275,12 @@ def _load_demand(conn) -> dict:
     current_hour = int(row[1]) if row and row[1] is not None else 0
     latest_ts = row[2] if row else None
 
-    hour_rec = conn.execute(f"""
-        SELECT MAX(period_total) FROM (
-            SELECT d.settlementdate,
-                   SUM(d.demand) + COALESCE(SUM(r.power), 0) AS period_total
-            FROM demand30 d
-            LEFT JOIN rooftop30 r
-              ON d.settlementdate = r.settlementdate AND d.regionid = r.regionid
-            WHERE d.regionid IN {regs}
-              AND EXTRACT(HOUR FROM d.settlementdate) = ?
-            GROUP BY d.settlementdate
-        )
-    """, [current_hour]).fetchone()
-    hour_record_mw = float(hour_rec[0]) if hour_rec and hour_rec[0] is not None else 0.0
-
-    rng = conn.execute(f"""
-        SELECT MAX(period_total), MIN(period_total) FROM (
-            SELECT d.settlementdate,
-                   SUM(d.demand) + COALESCE(SUM(r.power), 0) AS period_total
-            FROM demand30 d
-            LEFT JOIN rooftop30 r
-              ON d.settlementdate = r.settlementdate AND d.regionid = r.regionid
-            WHERE d.regionid IN {regs}
-            GROUP BY d.settlementdate
-            HAVING SUM(d.demand) > 0
-        )
-    """).fetchone()
-    alltime_record = float(rng[0]) if rng and rng[0] is not None else current_mw
-    alltime_min = float(rng[1]) if rng and rng[1] is not None else 0.0
+    records = _RECORDS.refresh(conn)
+    hour_record_mw = records.hour_record(current_hour)
+    if hour_record_mw is None:
+        hour_record_mw = 0.0
+    alltime_record = records.alltime_max if records.alltime_max is not None else current_mw
+    alltime_min = records.alltime_min if records.alltime_min is not None else 0.0
 
     forecast_peak_mw = None
     try:
@@ -234,32 +419,115 @@ def _load_battery(conn) -> dict:
     }
 
 
-@router.get("/gauges/today")
-def gauges_today() -> dict:
-    now = time.time()
-    cached = _GAUGES_CACHE["payload"]
-    if cached is not None and (now - _GAUGES_CACHE["fetched_at"]) < _GAUGES_TTL_SEC:
-        # Refresh  to current wall-clock so clients see liveness;
-        # the data block stays cached.
-        return {**cached, "meta": {"as_of": datetime.now(timezone.utc).isoformat(),
-                                    "cached": True}}
+def _data_version(conn) -> tuple | None:
+    """Latest interval of every source table, or None if one cannot be read.
+
+    predispatch is optional (absent in some environments), so a failure
+    there only drops it from the version.
+    """
+    version = []
+    for table, column in _VERSION_SOURCES:
+        try:
+            version.append(conn.execute(f"SELECT MAX({column}) FROM {table}").fetchone()[0])
+        except Exception:
+            if table != "predispatch":
+                return None
+            version.append(None)
+    return tuple(version)
+
+
+def _cached_response(payload: dict) -> dict:
+    # Refresh  to current wall-clock so clients see liveness;
+    # the data block stays cached.
+    return {**payload, "meta": {"as_of": datetime.now(timezone.utc).isoformat(),
+                                "cached": True}}
+
+
+def refresh_gauges(force: bool = False) -> dict | None:
+    """Rebuild the cached payload if the data version moved (or force).
 
-    conn = get_connection()
+    Only one caller rebuilds at a time; a concurrent caller returns the
+    current payload instead of queueing behind the refresh.
+    """
+    if not _refresh_lock.acquire(blocking=_GAUGES_CACHE["payload"] is None):
+        return _GAUGES_CACHE["payload"]
     try:
-        demand = _load_demand(conn)
-        renewable = _load_renewable(conn)
-        battery = _load_battery(conn)
+        now = time.time()
+        conn = get_connection()
+        try:
+            version = _data_version(conn)
+            cached = _GAUGES_CACHE["payload"]
+            if cached is not None and not force:
+                if version is not None and version == _GAUGES_CACHE["version"]:
+                    _GAUGES_CACHE["checked_at"] = now
+                    return cached
+                if version is None and (now - _GAUGES_CACHE["fetched_at"]) < _GAUGES_TTL_SEC:
+                    _GAUGES_CACHE["checked_at"] = now
+                    return cached
+
+            demand = _load_demand(conn)
+            renewable = _load_renewable(conn)
+            battery = _load_battery(conn)
+        finally:
+            conn.close()
+
+        payload = {
+            "data": {
+                "demand": demand,
+                "renewable_share": renewable,
+                "battery_soc": battery,
+            },
+            "meta": {"as_of": datetime.now(timezone.utc).isoformat(), "cached": False},
+        }
+        _GAUGES_CACHE["fetched_at"] = now
+        _GAUGES_CACHE["checked_at"] = now
+        _GAUGES_CACHE["version"]    = version
+        _GAUGES_CACHE["payload"]    = payload
+        return payload
     finally:
-        conn.close()
-
-    payload = {
-        "data": {
-            "demand": demand,
-            "renewable_share": renewable,
-            "battery_soc": battery,
-        },
-        "meta": {"as_of": datetime.now(timezone.utc).isoformat(), "cached": False},
-    }
-    _GAUGES_CACHE["fetched_at"] = now
-    _GAUGES_CACHE["payload"]    = payload
+        _refresh_lock.release()
+
+
+def _refresh_loop() -> None:
+    while not _refresh_stop.wait(_REFRESH_INTERVAL_SEC):
+        try:
+            refresh_gauges()
+        except Exception:
+            pass  # Keep serving the last payload; retry next interval.
+
+
+def start_background_refresh() -> None:
+    """Warm the payload, then keep it current from a daemon thread."""
+    global _refresh_thread
+    if _refresh_thread is not None and _refresh_thread.is_alive():
+        return
+    try:
+        refresh_gauges()
+    except Exception:
+        pass  # Soft fail — the thread or the first request will populate it.
+    _refresh_stop.clear()
+    _refresh_thread = threading.Thread(target=_refresh_loop, name="gauges-refresh", daemon=True)
+    _refresh_thread.start()
+
+
+def stop_background_refresh() -> None:
+    global _refresh_thread
+    _refresh_stop.set()
+    if _refresh_thread is not None:
+        _refresh_thread.join(timeout=5)
+        _refresh_thread = None
+
+
+@router.get("/gauges/today")
+@blocking
+def gauges_today() -> dict:
+    cached = _GAUGES_CACHE["payload"]
+    background = _refresh_thread is not None and _refresh_thread.is_alive()
+    if cached is not None and (background or
+                               (time.time() - _GAUGES_CACHE["checked_at"]) < _VERSION_POLL_SEC):
+        return _cached_response(cached)
+
+    payload = refresh_gauges()
+    if payload is cached:
+        return _cached_response(payload)
     return payload
@@ -7,15 +7,22 @@ For a single physical region, the response also includes:
 Battery Storage above zero is discharge only.
 
 For NEM (all 5 regions), interconnectors net to zero and are omitted.
+
+``format=columnar`` returns one {fuel, t, mw} array set per fuel instead of
+a dict per (timestamp, fuel) point (see ..columnar).
 """
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import numpy as np
 from fastapi import APIRouter, HTTPException, Query
 
+from ..columnar import ColumnarJSONResponse, epoch_seconds, fetch_columns, resolve_format
 from ..db import get_connection, nem_naive_to_utc, utc_to_nem_naive
+from ..executor import blocking
+from ...transmission.flows import net_flow_sql
 
 router = APIRouter()
 
@@ -46,18 +53,6 @@ FUEL_ORDER = [
     "Gas",
 ]
 
-# From dashboard's calculate_regional_transmission_flows: per-region map of
-# interconnector -> direction ("to_X" = import to X is positive; "from_X" =
-# export from X is positive in raw flow, so we negate).
-INTERCONNECTOR_MAP = {
-    "NSW1": {"NSW1-QLD1": "from", "VIC1-NSW1": "to",   "N-Q-MNSP1": "from"},
-    "QLD1": {"NSW1-QLD1": "to",   "N-Q-MNSP1": "to"},
-    "VIC1": {"VIC1-NSW1": "from", "V-SA": "from",      "V-S-MNSP1": "from", "T-V-MNSP1": "to"},
-    "SA1":  {"V-SA": "to",        "V-S-MNSP1": "to"},
-    "TAS1": {"T-V-MNSP1": "from"},
-}
-
-
 def _utc_iso(dt: datetime) -> str:
     return nem_naive_to_utc(dt).isoformat().replace("+00:00", "Z")
 
@@ -92,15 +87,18 @@ def _pick_resolution(seconds: float) -> tuple[str, str]:
 
 
 @router.get("/generation/mix")
-async def generation_mix(
+@blocking
+def generation_mix(
     region: Optional[str] = Query(None, min_length=2, max_length=8),
     regions: Optional[str] = Query(None),
     from_: Optional[datetime] = Query(None, alias="from"),
     to: Optional[datetime] = Query(None),
     resolution: str = Query("auto"),
-) -> dict:
+    format: str = Query("rows"),
+):
     region_list = _resolve_regions(region, regions)
     is_single_region = (len(region_list) == 1)
+    fmt = resolve_format(format)
 
     now_utc = datetime.now(timezone.utc)
     to_utc = to.astimezone(timezone.utc) if to and to.tzinfo else (
@@ -213,44 +211,40 @@ async def generation_mix(
     else:
         roof_params = list(region_list) + [from_nem, to_nem]
 
-    # Transmission only when a single physical region is selected.
+    # Transmission only when a single physical region is selected. Net
+    # import per period (import-positive, see transmission.flows).
     trans_rows: list[tuple] = []
-    if is_single_region:
-        reg = region_list[0]
-        ic_map = INTERCONNECTOR_MAP.get(reg, {})
-        if ic_map:
-            ic_ids = list(ic_map.keys())
-            ic_placeholders = ",".join(["?"] * len(ic_ids))
-            # CASE WHEN clause to flip sign for 'from' interconnectors
-            from_set = {k for k, v in ic_map.items() if v == "from"}
-            from_list = list(from_set)
-            from_placeholders = ",".join(["?"] * len(from_list)) if from_list else "NULL"
-            sign_clause = (
-                f"CASE WHEN interconnectorid IN ({from_placeholders}) THEN -meteredmwflow ELSE meteredmwflow END"
-                if from_list else "meteredmwflow"
-            )
-            trans_sql = f"""
-                WITH per_period AS (
-                    SELECT settlementdate,
-                           SUM({sign_clause}) AS net_mw
-                    FROM {trans_table}
-                    WHERE interconnectorid IN ({ic_placeholders})
-                      AND settlementdate >= ? AND settlementdate <= ?
-                    GROUP BY 1
-                )
-                SELECT time_bucket(INTERVAL '{ddb_interval}', settlementdate) AS bucket,
-                       AVG(net_mw) AS mw
-                FROM per_period
-                GROUP BY 1
-                ORDER BY 1
-            """
-            trans_params = from_list + ic_ids + [from_nem, to_nem]
+    net_flow = net_flow_sql(region_list[0], trans_table) if is_single_region else None
+    has_transmission = net_flow is not None
+    if has_transmission:
+        per_period_sql, trans_params = net_flow
+        trans_sql = f"""
+            WITH per_period AS ({per_period_sql})
+            SELECT time_bucket(INTERVAL '{ddb_interval}', settlementdate) AS bucket,
+                   AVG(net_mw) AS mw
+            FROM per_period
+            GROUP BY 1
+            ORDER BY 1
+        """
+        trans_params = trans_params + [from_nem, to_nem]
+
+    if fmt == "columnar":
+        return _mix_columnar(
+            (util_sql, util_params), (roof_sql, roof_params),
+            (trans_sql, trans_params) if has_transmission else None,
+            meta={
+                "regions": region_list,
+                "resolution": res_label,
+                "from": from_utc.isoformat().replace("+00:00", "Z"),
+                "to": to_utc.isoformat().replace("+00:00", "Z"),
+            },
+        )
 
     conn = get_connection()
     try:
         util = conn.execute(util_sql, util_params).fetchall()
         roof = conn.execute(roof_sql, roof_params).fetchall()
-        if is_single_region and ic_map:
+        if has_transmission:
             try:
                 trans_rows = conn.execute(trans_sql, trans_params).fetchall()
             except Exception:
@@ -301,8 +295,7 @@ async def generation_mix(
     fuel_rank = {f: i for i, f in enumerate(FUEL_ORDER)}
     data.sort(key=lambda p: (p["timestamp"], fuel_rank.get(p["fuel"], 99)))
 
-    fuels_displayed = [f for f in FUEL_ORDER if f in seen]
-    fuels_displayed += sorted(seen - set(FUEL_ORDER))
+    fuels_displayed = _fuel_display_order(seen)
 
     return {
         "data": data,
@@ -317,8 +310,71 @@ async def generation_mix(
     }
 
 
+def _fuel_display_order(fuels) -> list[str]:
+    ordered = [f for f in FUEL_ORDER if f in fuels]
+    return ordered + sorted(set(fuels) - set(FUEL_ORDER))
+
+
+def _mix_columnar(util_q, roof_q, trans_q, meta: dict) -> ColumnarJSONResponse:
+    """/generation/mix as per-fuel arrays. Applies the same per-point rules
+    as the row shape (battery and transmission split into both signs at
+    every stamp, near-zero points dropped), as array operations."""
+    conn = get_connection()
+    try:
+        util = fetch_columns(conn, *util_q)
+        roof = fetch_columns(conn, *roof_q)
+        trans = None
+        if trans_q is not None:
+            try:
+                trans = fetch_columns(conn, *trans_q)
+            except Exception:
+                # transmission5 absent (e.g., test fixture) — silently omit
+                trans = None
+    finally:
+        conn.close()
+
+    series: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def add(fuel: str, ts: np.ndarray, mw: np.ndarray) -> None:
+        if len(ts):
+            series[fuel] = (epoch_seconds(ts), np.round(mw, 1))
+
+    util_mw = util["mw"].astype(float)
+    for fuel in np.unique(util["fuel"]).tolist():
+        rows = (util["fuel"] == fuel) & ~np.isnan(util_mw)
+        ts, mw = util["bucket"][rows], util_mw[rows]
+        if fuel == "Battery Storage":
+            add("Battery Storage", ts, np.maximum(mw, 0.0))
+            add("Battery Charging", ts, np.minimum(mw, 0.0))
+        else:
+            shown = np.abs(mw) > 0.01
+            add(fuel, ts[shown], np.maximum(mw[shown], 0.0))
+
+    roof_mw = roof["mw"].astype(float)
+    shown = roof_mw > 0.01
+    add("Rooftop", roof["bucket"][shown], roof_mw[shown])
+
+    if trans is not None:
+        trans_mw = trans["mw"].astype(float)
+        rows = ~np.isnan(trans_mw)
+        add("Transmission Imports", trans["bucket"][rows], np.maximum(trans_mw[rows], 0.0))
+        add("Transmission Exports", trans["bucket"][rows], np.minimum(trans_mw[rows], 0.0))
+
+    fuels = _fuel_display_order(series)
+    return ColumnarJSONResponse({
+        "series": [{"fuel": f, "t": series[f][0], "mw": series[f][1]} for f in fuels],
+        "meta": {
+            **meta,
+            "fuels": fuels,
+            "as_of": datetime.now(timezone.utc).isoformat(),
+            "format": "columnar",
+        },
+    })
+
+
 @router.get("/generation/time-of-day")
-async def generation_time_of_day(
+@blocking
+def generation_time_of_day(
     region: Optional[str] = Query(None, min_length=2, max_length=8),
     regions: Optional[str] = Query(None),
     days: int = Query(7, ge=1, le=365),
@@ -398,45 +454,28 @@ async def generation_time_of_day(
     roof_params = list(region_list) + [from_nem, to_nem]
 
     trans_rows: list[tuple] = []
-    ic_map: dict[str, str] = {}
-    if is_single_region:
-        reg = region_list[0]
-        ic_map = INTERCONNECTOR_MAP.get(reg, {})
-        if ic_map:
-            ic_ids = list(ic_map.keys())
-            ic_placeholders = ",".join(["?"] * len(ic_ids))
-            from_set = {k for k, v in ic_map.items() if v == "from"}
-            from_list = list(from_set)
-            from_placeholders = ",".join(["?"] * len(from_list)) if from_list else "NULL"
-            sign_clause = (
-                f"CASE WHEN interconnectorid IN ({from_placeholders}) THEN -meteredmwflow ELSE meteredmwflow END"
-                if from_list else "meteredmwflow"
-            )
-            # Split-before-average so bidirectional flows survive the
-            # hour-of-day reduction.
-            trans_sql = f"""
-                WITH per_period AS (
-                    SELECT settlementdate,
-                           SUM({sign_clause}) AS net_mw
-                    FROM transmission30
-                    WHERE interconnectorid IN ({ic_placeholders})
-                      AND settlementdate >= ? AND settlementdate <= ?
-                    GROUP BY 1
-                )
-                SELECT EXTRACT(HOUR FROM settlementdate)::INT AS hour,
-                       AVG(GREATEST(net_mw, 0)) AS pos_mw,
-                       AVG(LEAST(net_mw, 0))    AS neg_mw
-                FROM per_period
-                GROUP BY 1
-                ORDER BY 1
-            """
-            trans_params = from_list + ic_ids + [from_nem, to_nem]
+    net_flow = net_flow_sql(region_list[0], "transmission30") if is_single_region else None
+    has_transmission = net_flow is not None
+    if has_transmission:
+        per_period_sql, trans_params = net_flow
+        # Split-before-average so bidirectional flows survive the
+        # hour-of-day reduction.
+        trans_sql = f"""
+            WITH per_period AS ({per_period_sql})
+            SELECT EXTRACT(HOUR FROM settlementdate)::INT AS hour,
+                   AVG(GREATEST(net_mw, 0)) AS pos_mw,
+                   AVG(LEAST(net_mw, 0))    AS neg_mw
+            FROM per_period
+            GROUP BY 1
+            ORDER BY 1
+        """
+        trans_params = trans_params + [from_nem, to_nem]
 
     conn = get_connection()
     try:
         util = conn.execute(util_sql, util_params).fetchall()
         roof = conn.execute(roof_sql, roof_params).fetchall()
-        if is_single_region and ic_map:
+        if has_transmission:
             try:
                 trans_rows = conn.execute(trans_sql, trans_params).fetchall()
             except Exception:
@@ -480,8 +519,7 @@ async def generation_time_of_day(
     fuel_rank = {f: i for i, f in enumerate(FUEL_ORDER)}
     data.sort(key=lambda p: (p["hour"], fuel_rank.get(p["fuel"], 99)))
 
-    fuels_displayed = [f for f in FUEL_ORDER if f in seen]
-    fuels_displayed += sorted(seen - set(FUEL_ORDER))
+    fuels_displayed = _fuel_display_order(seen)
 
     return {
         "data": data,
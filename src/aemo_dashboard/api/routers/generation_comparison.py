@@ -23,6 +23,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
 
 from ..db import get_connection
+from ..executor import blocking
 
 router = APIRouter()
 
@@ -250,6 +251,7 @@ def _delta(a: Optional[float], b: Optional[float]) -> Optional[float]:
 
 
 @router.get("/generation/comparison")
+@blocking
 def generation_comparison(
     region: str = Query("NEM"),
     period: str = Query("ytd"),
@@ -1,11 +1,15 @@
-"""GET /v1/meta/freshness — latest update times across the data sources."""
+"""GET /v1/meta — this worker's DuckDB pool, executor and response-cache counters.
+GET /v1/meta/freshness — latest update times across the data sources."""
 from __future__ import annotations
 
+import os
 from datetime import datetime, timezone
 
 from fastapi import APIRouter
 
-from ..db import get_connection, nem_naive_to_utc
+from ..cache import cache_stats
+from ..db import get_connection, nem_naive_to_utc, pool_stats
+from ..executor import blocking, executor_stats
 
 router = APIRouter()
 
@@ -16,8 +20,25 @@ def _utc_iso(dt: datetime | None) -> str | None:
     return nem_naive_to_utc(dt).isoformat().replace("+00:00", "Z")
 
 
+@router.get("/meta")
+async def meta() -> dict:
+    """Counters are per uvicorn worker; ``pid`` says which one answered."""
+    return {
+        "data": {
+            "db_pool": pool_stats(),
+            "db_executor": executor_stats(),
+            "response_cache": cache_stats(),
+        },
+        "meta": {
+            "pid": os.getpid(),
+            "as_of": datetime.now(timezone.utc).isoformat(),
+        },
+    }
+
+
 @router.get("/meta/freshness")
-async def freshness() -> dict:
+@blocking
+def freshness() -> dict:
     conn = get_connection()
     try:
         row = conn.execute("SELECT MAX(settlementdate) FROM prices5").fetchone()
@@ -20,6 +20,7 @@ import pandas as pd
 from fastapi import APIRouter
 
 from ..db import get_connection
+from ..executor import blocking
 
 router = APIRouter()
 
@@ -35,14 +36,18 @@ def _trim_region(region: str | None) -> str:
     return REGION_TRIM.get(region, region.rstrip("1") if region.endswith("1") else region)
 
 
+def source_files() -> list[Path]:
+    """ST-PASA and MT-PASA parquet files (outside DuckDB; the response cache stamps them)."""
+    base = Path(os.environ.get("AEMO_DATA_PATH", str(DEFAULT_DATA_PATH)))
+    return [base / "outages_stpasa.parquet", base / "outages_mtpasa.parquet"]
+
+
 def _load_outages_df() -> tuple[pd.DataFrame, datetime | None]:
     """Return (DataFrame[DUID, max_mw, current_mw, reduction_mw], data_as_of).
 
     Empty DataFrame when neither parquet exists.
     """
-    base = Path(os.environ.get("AEMO_DATA_PATH", str(DEFAULT_DATA_PATH)))
-    stpasa = base / "outages_stpasa.parquet"
-    mtpasa = base / "outages_mtpasa.parquet"
+    stpasa, mtpasa = source_files()
 
     empty = pd.DataFrame(columns=["DUID", "max_mw", "current_mw", "reduction_mw"])
 
@@ -99,7 +104,8 @@ def _load_duid_info(conn) -> dict[str, dict[str, Any]]:
 
 
 @router.get("/pasa/generator-outages")
-async def generator_outages() -> dict:
+@blocking
+def generator_outages() -> dict:
     outages, data_as_of = _load_outages_df()
     conn = get_connection()
     try:
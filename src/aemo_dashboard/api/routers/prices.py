@@ -5,6 +5,9 @@ Multi-region usage:
 
 Server-side LTTB downsampling caps each region at MAX_POINTS so 1Y/All
 windows return a manageable payload.
+
+``format=columnar`` returns one {region, t, price} array set per region
+instead of a dict per point (see ..columnar).
 """
 from __future__ import annotations
 
@@ -13,10 +16,15 @@ import binascii
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import numpy as np
+import pandas as pd
 from fastapi import APIRouter, HTTPException, Query
 
+from ..columnar import ColumnarJSONResponse, epoch_seconds, fetch_columns, resolve_format
 from ..db import get_connection, nem_naive_to_utc, utc_to_nem_naive
-from ..downsample import loess, lttb
+from ..downsample import loess_smooth, lttb_many
+from ..executor import blocking
+from ...prices.bands import band_totals_sql, bands_from_edges, summarise_bands
 
 router = APIRouter()
 
@@ -25,6 +33,14 @@ MAX_POINTS = 1500  # per region
 THIRTY_DAYS_S = 30 * 86400
 
 
+def _mean_bins(ts: np.ndarray, values: np.ndarray, bin_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Average consecutive runs of bin_size points, stamped at each run's middle point."""
+    starts = np.arange(0, len(values), bin_size)
+    sizes = np.minimum(bin_size, len(values) - starts)
+    means = np.add.reduceat(values, starts) / sizes
+    return ts[starts + sizes // 2], means
+
+
 def _pick_price_table(span_seconds: float) -> tuple[str, str]:
     """Choose prices5 vs prices30 based on the requested window.
 
@@ -67,6 +83,7 @@ def _resolve_regions(region: Optional[str], regions: Optional[str]) -> list[str]
 
 
 @router.get("/prices/spot")
+@blocking
 def spot_price(
     region: Optional[str] = Query(None, min_length=2, max_length=8),
     regions: Optional[str] = Query(None),
@@ -74,8 +91,10 @@ def spot_price(
     to: Optional[datetime] = Query(None),
     resolution: str = Query("auto"),
     smoothing: Optional[str] = Query(None),
-) -> dict:
+    format: str = Query("rows"),
+):
     region_list = _resolve_regions(region, regions)
+    fmt = resolve_format(format)
     smoothing = smoothing.lower().strip() if smoothing else None
     if smoothing not in (None, "loess"):
         raise HTTPException(400, detail={"code": "INVALID_SMOOTHING", "message": f"unknown smoothing: {smoothing}"})
@@ -86,67 +105,67 @@ def spot_price(
         to.replace(tzinfo=timezone.utc) if to else now_utc
     )
 
-    if from_ is None:
-        # "All data" — anchor from the earliest available timestamp. Clients
-        # commonly send only `to=now` for the All chip, so don't require both
-        # to be omitted.
-        conn0 = get_connection()
-        try:
-            min_dt = conn0.execute(
-                "SELECT MIN(settlementdate) FROM prices_30min"
-            ).fetchone()[0]
-        finally:
-            conn0.close()
-        from_utc = nem_naive_to_utc(min_dt) if min_dt else (to_utc - timedelta(hours=24))
-    else:
-        from_utc = from_.astimezone(timezone.utc) if from_.tzinfo else from_.replace(tzinfo=timezone.utc)
-
-    span_seconds = (to_utc - from_utc).total_seconds()
-    src_table, res_label = _pick_price_table(span_seconds)
-
-    from_nem = utc_to_nem_naive(from_utc)
-    to_nem = utc_to_nem_naive(to_utc)
-
-    placeholders = ",".join(["?"] * len(region_list))
-    if src_table == "prices_30min" or src_table == "prices30":
-        # Both "30-min" tables hold a mix of 5-min and 30-min rows for 2022+;
-        # force uniform 30-min cadence so LTTB sees evenly-spaced input.
-        sql = f"""
-            SELECT time_bucket(INTERVAL '30 minutes', settlementdate) AS settlementdate,
-                   regionid,
-                   AVG(rrp) AS rrp
-            FROM {src_table}
-            WHERE regionid IN ({placeholders})
-              AND settlementdate >= ?
-              AND settlementdate <= ?
-            GROUP BY 1, regionid
-            ORDER BY regionid, 1
-        """
-    else:
-        sql = f"""
-            SELECT settlementdate, regionid, rrp
-            FROM {src_table}
-            WHERE regionid IN ({placeholders})
-              AND settlementdate >= ?
-              AND settlementdate <= ?
-            ORDER BY regionid, settlementdate
-        """
-    params = list(region_list) + [from_nem, to_nem]
-
+    # One pooled connection serves both the "All" anchor lookup and the query
     conn = get_connection()
     try:
-        rows = conn.execute(sql, params).fetchall()
+        if from_ is None:
+            # "All data" — anchor from the earliest available timestamp. Clients
+            # commonly send only `to=now` for the All chip, so don't require both
+            # to be omitted.
+            min_dt = conn.execute(
+                "SELECT MIN(settlementdate) FROM prices_30min"
+            ).fetchone()[0]
+            from_utc = nem_naive_to_utc(min_dt) if min_dt else (to_utc - timedelta(hours=24))
+        else:
+            from_utc = from_.astimezone(timezone.utc) if from_.tzinfo else from_.replace(tzinfo=timezone.utc)
+
+        span_seconds = (to_utc - from_utc).total_seconds()
+        src_table, res_label = _pick_price_table(span_seconds)
+
+        from_nem = utc_to_nem_naive(from_utc)
+        to_nem = utc_to_nem_naive(to_utc)
+
+        placeholders = ",".join(["?"] * len(region_list))
+        if src_table == "prices_30min" or src_table == "prices30":
+            # Both "30-min" tables hold a mix of 5-min and 30-min rows for 2022+;
+            # force uniform 30-min cadence so LTTB sees evenly-spaced input.
+            sql = f"""
+                SELECT time_bucket(INTERVAL '30 minutes', settlementdate) AS settlementdate,
+                       regionid,
+                       AVG(rrp) AS rrp
+                FROM {src_table}
+                WHERE regionid IN ({placeholders})
+                  AND settlementdate >= ?
+                  AND settlementdate <= ?
+                GROUP BY 1, regionid
+                ORDER BY regionid, 1
+            """
+        else:
+            sql = f"""
+                SELECT settlementdate, regionid, rrp
+                FROM {src_table}
+                WHERE regionid IN ({placeholders})
+                  AND settlementdate >= ?
+                  AND settlementdate <= ?
+                ORDER BY regionid, settlementdate
+            """
+        params = list(region_list) + [from_nem, to_nem]
+
+        cols = fetch_columns(conn, sql, params)
     finally:
         conn.close()
 
-    # Group by region
-    by_region: dict[str, list[tuple[datetime, float]]] = {r: [] for r in region_list}
-    for ts, regid, rrp in rows:
-        by_region.setdefault(regid, []).append((ts, float(rrp)))
+    # Split the (regionid, settlementdate)-ordered columns into per-region arrays
+    by_region: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    regids = cols["regionid"]
+    if len(regids):
+        starts = np.flatnonzero(np.r_[True, regids[1:] != regids[:-1]])
+        for lo, hi in zip(starts, np.r_[starts[1:], len(regids)]):
+            by_region[regids[lo]] = (cols["settlementdate"][lo:hi],
+                                     cols["rrp"][lo:hi].astype(float))
 
-    source_rows = sum(len(v) for v in by_region.values())
+    source_rows = len(regids)
 
-    data: list[dict] = []
     downsampled = False
     smoothed_meta = False
     # Pick a LOESS bandwidth: 0.05 of the visible series for everything
@@ -154,71 +173,83 @@ def spot_price(
     span_seconds = (to_utc - from_utc).total_seconds()
     loess_frac = 0.08 if span_seconds > 366 * 86400 else 0.05
 
-    for regid in region_list:
-        series = by_region.get(regid, [])
-        if not series:
-            continue
-
-        if smoothing == "loess":
-            # Smoothing path: use mean-binning (not LTTB) so price spikes are
-            # averaged into their bucket rather than preserved as max-triangle
-            # outliers. Then LOESS for trend on top of the bucket means.
-            if len(series) > MAX_POINTS:
-                bin_size = max(1, len(series) // MAX_POINTS)
-                binned: list[tuple[datetime, float]] = []
-                for start in range(0, len(series), bin_size):
-                    chunk = series[start:start + bin_size]
-                    if not chunk:
-                        continue
-                    mid_ts = chunk[len(chunk) // 2][0]
-                    mean_v = sum(s[1] for s in chunk) / len(chunk)
-                    binned.append((mid_ts, mean_v))
-                ts_v_pairs = binned
+    present = [r for r in region_list if r in by_region]
+    series_by_region: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    if smoothing == "loess":
+        # Smoothing path: use mean-binning (not LTTB) so price spikes are
+        # averaged into their bucket rather than preserved as max-triangle
+        # outliers. Then LOESS for trend on top of the bucket means.
+        for regid in present:
+            ts, values = by_region[regid]
+            if len(ts) > MAX_POINTS:
+                ts, values = _mean_bins(ts, values, max(1, len(ts) // MAX_POINTS))
                 downsampled = True
-            else:
-                ts_v_pairs = list(series)
-
-            if len(ts_v_pairs) >= 5:
-                xs = [float(i) for i in range(len(ts_v_pairs))]
-                ys = [v for _, v in ts_v_pairs]
-                ys_smoothed = loess(xs, ys, frac=loess_frac)
-                ts_v_pairs = [(t, sv) for (t, _), sv in zip(ts_v_pairs, ys_smoothed)]
-                smoothed_meta = True
-        else:
-            # Raw path: LTTB preserves spikes for the unsmoothed view.
-            if len(series) > MAX_POINTS:
-                ts_idx = [float(i) for i in range(len(series))]
-                vals = [s[1] for s in series]
-                idx_out, v_out = lttb(ts_idx, vals, MAX_POINTS)
+            series_by_region[regid] = (ts, values)
+
+        # Regions with the same number of points are smoothed in one pass
+        by_length: dict[int, list[str]] = {}
+        for regid, (ts, _) in series_by_region.items():
+            if len(ts) >= 5:
+                by_length.setdefault(len(ts), []).append(regid)
+        for n, same_length in by_length.items():
+            ys = np.stack([series_by_region[r][1] for r in same_length])
+            smoothed = loess_smooth(np.arange(n, dtype=float), ys, frac=loess_frac)
+            for regid, ys_smoothed in zip(same_length, smoothed):
+                series_by_region[regid] = (series_by_region[regid][0], ys_smoothed)
+            smoothed_meta = True
+    else:
+        # Raw path: LTTB preserves spikes for the unsmoothed view. All long
+        # regions are downsampled in one batched pass.
+        long_regions = [r for r in present if len(by_region[r][0]) > MAX_POINTS]
+        keep = dict(zip(long_regions, lttb_many(
+            [by_region[r][1] for r in long_regions], MAX_POINTS)))
+        for regid in present:
+            ts, values = by_region[regid]
+            if regid in keep:
+                ts, values = ts[keep[regid]], values[keep[regid]]
                 downsampled = True
-                ts_v_pairs = [(series[int(ix)][0], v) for ix, v in zip(idx_out, v_out)]
-            else:
-                ts_v_pairs = list(series)
+            series_by_region[regid] = (ts, values)
+
+    meta = {
+        "from": from_utc.isoformat().replace("+00:00", "Z"),
+        "to": to_utc.isoformat().replace("+00:00", "Z"),
+        "resolution": res_label,
+        "regions": region_list,
+        "downsampled": downsampled,
+        "smoothed": smoothed_meta,
+        "source_rows": source_rows,
+        "returned_rows": sum(len(ts) for ts, _ in series_by_region.values()),
+        "as_of": datetime.now(timezone.utc).isoformat(),
+    }
+
+    if fmt == "columnar":
+        meta["format"] = "columnar"
+        return ColumnarJSONResponse({
+            "series": [
+                {"region": regid,
+                 "t": epoch_seconds(series_by_region[regid][0]),
+                 "price": series_by_region[regid][1]}
+                for regid in present
+            ],
+            "meta": meta,
+        })
 
-        for ts, v in ts_v_pairs:
+    data: list[dict] = []
+    for regid in present:
+        ts, values = series_by_region[regid]
+        for t, v in zip(ts.tolist(), values.tolist()):
             data.append({
-                "timestamp": _utc_iso(ts),
+                "timestamp": _utc_iso(t),
                 "region": regid,
                 "price": v,
             })
 
-    return {
-        "data": data,
-        "meta": {
-            "from": from_utc.isoformat().replace("+00:00", "Z"),
-            "to": to_utc.isoformat().replace("+00:00", "Z"),
-            "resolution": res_label,
-            "regions": region_list,
-            "downsampled": downsampled,
-            "smoothed": smoothed_meta,
-            "source_rows": source_rows,
-            "returned_rows": len(data),
-            "as_of": datetime.now(timezone.utc).isoformat(),
-        },
-    }
+    return {"data": data, "meta": meta}
 
 
 @router.get('/prices/time-of-day')
+@blocking
 def time_of_day(
     region: Optional[str] = Query(None, min_length=2, max_length=8),
     regions: Optional[str] = Query(None),
@@ -277,6 +308,7 @@ def time_of_day(
     }
 
 @router.get("/prices/by-fuel")
+@blocking
 def by_fuel(
     region: Optional[str] = Query(None, min_length=2, max_length=8),
     regions: Optional[str] = Query(None),
@@ -418,6 +450,7 @@ def by_fuel(
 
 
 @router.get("/prices/stats")
+@blocking
 def prices_stats(
     region: Optional[str] = Query(None, min_length=2, max_length=8),
     regions: Optional[str] = Query(None),
@@ -515,6 +548,7 @@ def _resolve_bins(bins_q: Optional[str]) -> list[float]:
 
 
 @router.get("/prices/bands")
+@blocking
 def prices_bands(
     region: Optional[str] = Query(None, min_length=2, max_length=8),
     regions: Optional[str] = Query(None),
@@ -544,70 +578,30 @@ def prices_bands(
     span_seconds = (to_utc - from_utc).total_seconds()
     src_table, _ = _pick_price_table(span_seconds)
 
-    # Build a values list for the bins CTE: (idx, lower, upper) per band.
-    bands_values_sql = ", ".join(
-        f"({i + 1}, {lo}, {hi})"
-        for i, (lo, hi) in enumerate(zip(bin_edges, bin_edges[1:]))
-    )
-    placeholders = ",".join(["?"] * len(region_list))
-    sql = f"""
-        WITH bands(idx, lower, upper) AS (
-            VALUES {bands_values_sql}
-        ),
-        prices AS (
-            SELECT regionid, rrp
-            FROM {src_table}
-            WHERE regionid IN ({placeholders})
-              AND settlementdate >= ? AND settlementdate <= ?
-              AND rrp IS NOT NULL
-        ),
-        counted AS (
-            SELECT p.regionid, b.idx, b.lower, b.upper,
-                   COUNT(*) AS cnt,
-                   SUM(p.rrp) AS sum_rrp
-            FROM prices p
-            JOIN bands b ON p.rrp >= b.lower AND p.rrp < b.upper
-            GROUP BY p.regionid, b.idx, b.lower, b.upper
-        ),
-        totals AS (
-            SELECT regionid,
-                   COUNT(*) AS total,
-                   SUM(rrp) AS total_sum_rrp
-            FROM prices GROUP BY regionid
-        )
-        SELECT b.idx,
-               b.lower,
-               b.upper,
-               r.regionid AS regionid,
-               COALESCE(c.cnt, 0) AS cnt,
-               COALESCE(c.cnt::DOUBLE / NULLIF(t.total, 0), 0.0) AS share,
-               COALESCE(c.sum_rrp, 0.0) AS sum_rrp,
-               COALESCE(c.sum_rrp / NULLIF(t.total_sum_rrp, 0), 0.0) AS contribution_share
-        FROM bands b
-        CROSS JOIN (SELECT DISTINCT regionid FROM prices) r
-        LEFT JOIN counted c ON c.regionid = r.regionid AND c.idx = b.idx
-        LEFT JOIN totals t ON t.regionid = r.regionid
-        ORDER BY r.regionid, b.idx
-    """
-    params = list(region_list) + [from_nem, to_nem]
+    # Band assignment and per-(region, band) totals in one grouped scan,
+    # shared with the prices tab's band charts
+    bands = bands_from_edges(bin_edges)
+    sql, params = band_totals_sql(src_table, region_list, bands)
+    params += [from_nem, to_nem]
 
     conn = get_connection()
     try:
-        rows = conn.execute(sql, params).fetchall()
+        totals = pd.DataFrame(fetch_columns(conn, sql, params))
     finally:
         conn.close()
 
+    summary = summarise_bands(totals, bands)
     data = [
         {
-            "region": regid,
-            "lower": float(lo),
-            "upper": float(hi),
-            "count": int(cnt),
-            "share": round(float(share), 6),
-            "sum_rrp": round(float(sum_rrp), 4),
-            "contribution_share": round(float(contrib), 6),
+            "region": row.region,
+            "lower": float(row.lower),
+            "upper": float(row.upper),
+            "count": int(row.count),
+            "share": round(float(row.share), 6),
+            "sum_rrp": round(float(row.sum_rrp), 4),
+            "contribution_share": round(float(row.contribution_share), 6),
         }
-        for _idx, lo, hi, regid, cnt, share, sum_rrp, contrib in rows
+        for row in summary.itertuples(index=False)
     ]
 
     return {
@@ -645,6 +639,7 @@ def _decode_cursor(cursor: str) -> tuple[str, str]:
 
 
 @router.get("/prices/high-events")
+@blocking
 def prices_high_events(
     region: Optional[str] = Query(None, min_length=2, max_length=8),
     regions: Optional[str] = Query(None),
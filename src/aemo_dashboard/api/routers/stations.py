@@ -7,6 +7,9 @@
                          station_time_series_30min when present, falls
                          back to scada30 × duid_info × prices30 join.
   /stations/tod          hour-of-day average station-total dispatch.
+
+/stations/time-series also takes ``format=columnar`` for parallel t / gen_mw /
+price arrays instead of a dict per period (see ..columnar).
 """
 from __future__ import annotations
 
@@ -14,10 +17,13 @@ from datetime import datetime, timedelta, timezone
 from typing import Literal, Optional
 
 import duckdb
+import numpy as np
 from fastapi import APIRouter, HTTPException, Query
 
+from ..columnar import ColumnarJSONResponse, epoch_seconds, fetch_columns, resolve_format
 from ..db import get_connection
-from ..downsample import lttb
+from ..downsample import lttb_many
+from ..executor import blocking
 
 router = APIRouter()
 
@@ -80,7 +86,8 @@ def _resolve_station(conn, station: str) -> Optional[dict]:
 # ----------------------------------------------------------------------
 
 @router.get('/stations')
-async def stations_list(
+@blocking
+def stations_list(
     region: Optional[str] = Query(None),
 ) -> dict:
     region = region.upper() if region else None
@@ -139,12 +146,15 @@ async def stations_list(
 # ----------------------------------------------------------------------
 
 @router.get('/stations/time-series')
-async def stations_time_series(
+@blocking
+def stations_time_series(
     station:     str  = Query(..., min_length=1),
     period_days: int  = Query(30, ge=1, le=365),
     frequency:   TSFreq = Query('30m'),
-) -> dict:
+    format:      str  = Query('rows'),
+):
     """Per-period station total (sum across DUIDs) + averaged price."""
+    fmt = resolve_format(format)
     conn = get_connection()
     try:
         meta = _resolve_station(conn, station)
@@ -156,19 +166,36 @@ async def stations_time_series(
 
         end_excl = datetime.now()
         start = end_excl - timedelta(days=period_days)
-        rows = _query_time_series(conn, station, start, end_excl, frequency, meta)
+        rows = _query_time_series(conn, station, start, end_excl, frequency, meta,
+                                  columnar=(fmt == 'columnar'))
     finally:
         conn.close()
 
+    if fmt == 'columnar':
+        # LTTB cap on the arrays directly
+        src_rows = len(rows['t'])
+        downsampled = src_rows > MAX_POINTS
+        if downsampled:
+            keep = lttb_many([rows['gen_mw']], MAX_POINTS)[0]
+            rows = {k: v[keep] for k, v in rows.items()}
+        series = {
+            # Same instants as the row shape, which stamps naive times as UTC
+            't':      epoch_seconds(rows['t'], utc_offset_s=0),
+            'gen_mw': np.round(rows['gen_mw'].astype(float), 2),
+            'price':  np.round(rows['price'].astype(float), 2),
+        }
+        return ColumnarJSONResponse({
+            'series': [{'station_name': meta['station_name'], **series}],
+            'meta': _ts_meta(meta, frequency, period_days, start, end_excl,
+                             src_rows, len(series['t']), downsampled, fmt),
+        })
+
     # LTTB cap (per series — only one here)
     src_rows = len(rows)
     downsampled = False
     if src_rows > MAX_POINTS:
-        ts_idx = list(range(src_rows))
-        vals   = [r[1] for r in rows]
-        keep_idx, _ = lttb(ts_idx, vals, MAX_POINTS)
-        keep = {int(i) for i in keep_idx}
-        rows = [rows[i] for i in range(src_rows) if i in keep]
+        keep = lttb_many([[r[1] for r in rows]], MAX_POINTS)[0]
+        rows = [rows[i] for i in keep]
         downsampled = True
 
     data = [
@@ -182,33 +209,51 @@ async def stations_time_series(
 
     return {
         'data': data,
-        'meta': {
-            'station_name':  meta['station_name'],
-            'region':        meta['region'],
-            'fuel':          meta['fuel'],
-            'owner':         meta['owner'],
-            'capacity_mw':   meta['capacity_mw'],
-            'duid_count':    meta['duid_count'],
-            'frequency':     frequency,
-            'period_days':   period_days,
-            'from':          _utc_iso(start),
-            'to':            _utc_iso(end_excl),
-            'source_rows':   src_rows,
-            'returned_rows': len(data),
-            'downsampled':   downsampled,
-            'as_of':         _now_iso(),
-        },
+        'meta': _ts_meta(meta, frequency, period_days, start, end_excl,
+                         src_rows, len(data), downsampled, fmt),
+    }
+
+
+def _ts_meta(meta, frequency, period_days, start, end_excl,
+             src_rows, returned_rows, downsampled, fmt) -> dict:
+    out = {
+        'station_name':  meta['station_name'],
+        'region':        meta['region'],
+        'fuel':          meta['fuel'],
+        'owner':         meta['owner'],
+        'capacity_mw':   meta['capacity_mw'],
+        'duid_count':    meta['duid_count'],
+        'frequency':     frequency,
+        'period_days':   period_days,
+        'from':          _utc_iso(start),
+        'to':            _utc_iso(end_excl),
+        'source_rows':   src_rows,
+        'returned_rows': returned_rows,
+        'downsampled':   downsampled,
+        'as_of':         _now_iso(),
     }
+    if fmt == 'columnar':
+        out['format'] = 'columnar'
+    return out
 
 
-def _query_time_series(conn, station, start, end_excl, frequency, meta) -> list:
+def _query_time_series(conn, station, start, end_excl, frequency, meta,
+                       columnar: bool = False):
     """Return list of (t, gen_mw, price). Prefer station_time_series_30min,
     fall back to scada30 × duid_info × prices30 join. For aggregated
     frequencies we must sum across DUIDs *first* (giving station total at
     each 30-min slot), *then* average across slots within the bucket.
+
+    With columnar=True the t / gen_mw / price columns come back as NumPy
+    arrays instead of row tuples.
     """
     bucket = FREQ_BUCKET.get(frequency)
 
+    def run(sql, params):
+        if columnar:
+            return fetch_columns(conn, sql, params)
+        return conn.execute(sql, params).fetchall()
+
     # Preferred: pre-built station table.
     if bucket:
         sql_fast = f'''
@@ -238,7 +283,7 @@ def _query_time_series(conn, station, start, end_excl, frequency, meta) -> list:
             ORDER BY 1
         '''
     try:
-        return conn.execute(sql_fast, [station, start, end_excl]).fetchall()
+        return run(sql_fast, [station, start, end_excl])
     except duckdb.CatalogException:
         pass
 
@@ -275,7 +320,7 @@ def _query_time_series(conn, station, start, end_excl, frequency, meta) -> list:
             ORDER BY 1
         '''
     params: list = [meta['region']] + list(meta['duids']) + [start, end_excl]
-    return conn.execute(sql_fb, params).fetchall()
+    return run(sql_fb, params)
 
 
 # ----------------------------------------------------------------------
@@ -283,7 +328,8 @@ def _query_time_series(conn, station, start, end_excl, frequency, meta) -> list:
 # ----------------------------------------------------------------------
 
 @router.get('/stations/tod')
-async def stations_tod(
+@blocking
+def stations_tod(
     station:     str = Query(..., min_length=1),
     period_days: int = Query(30, ge=1, le=365),
 ) -> dict:
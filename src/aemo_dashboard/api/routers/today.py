@@ -17,6 +17,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
 
 from ..db import get_connection
+from ..executor import blocking
 
 router = APIRouter()
 
@@ -38,6 +39,7 @@ def _utc_iso(dt: datetime) -> str:
 # ----------------------------------------------------------------------
 
 @router.get('/predispatch')
+@blocking
 def predispatch(
     region: str = Query('NSW1'),
 ) -> dict:
@@ -19,6 +19,7 @@ import pandas as pd
 from fastapi import APIRouter, HTTPException, Query
 
 from ..db import get_connection
+from ..executor import blocking
 
 router = APIRouter()
 
@@ -131,7 +132,8 @@ VALID_VREPROD_FUELS = ("VRE", "Solar", "Wind", "Rooftop")
 
 
 @router.get("/trends/vre-production")
-async def vre_production(
+@blocking
+def vre_production(
     region: str = Query("NEM", min_length=2, max_length=8),
     fuel: str = Query("VRE"),
 ) -> dict:
@@ -198,7 +200,8 @@ async def vre_production(
 
 
 @router.get("/trends/vre-by-fuel")
-async def vre_by_fuel(
+@blocking
+def vre_by_fuel(
     region: str = Query("NEM", min_length=2, max_length=8),
 ) -> dict:
     """VRE production by fuel (Rooftop/Solar/Wind), 2018-now, 30-day MA."""
@@ -248,7 +251,8 @@ async def vre_by_fuel(
 
 
 @router.get("/trends/thermal-vs-renewables")
-async def thermal_vs_renewables(
+@blocking
+def thermal_vs_renewables(
     region: str = Query("NEM", min_length=2, max_length=8),
 ) -> dict:
     """Thermal (Coal+Gas) vs Renewable (Wind+Solar+Rooftop+Hydro), 2018-now,
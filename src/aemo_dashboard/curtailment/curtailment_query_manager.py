@@ -13,6 +13,7 @@ Schema:
 import duckdb
 import pandas as pd
 from ..shared.logging_config import get_logger
+from ..shared.sql import Where, execute
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from pathlib import Path
@@ -231,15 +232,9 @@ class CurtailmentQueryManager:
             view = view_map.get(resolution, 'curtailment_30min')
 
             # Build WHERE clause
-            conditions = [
-                f"timestamp >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'",
-                f"timestamp <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'"
-            ]
-
+            where = Where().between('timestamp', start_date, end_date)
             if region and region != 'All':
-                conditions.append(f"region = '{region}'")
-
-            where_clause = " AND ".join(conditions)
+                where.eq('region', region)
 
             # Build SELECT based on fuel filter
             if fuel and fuel != 'All':
@@ -267,7 +262,7 @@ class CurtailmentQueryManager:
             query = f"""
                 SELECT {select_cols}
                 FROM {view}
-                WHERE {where_clause}
+                WHERE {where}
                 ORDER BY timestamp, region
             """
 
@@ -281,7 +276,7 @@ class CurtailmentQueryManager:
 
             # Execute query
             logger.info(f"Querying {resolution} curtailment data from {start_date} to {end_date}")
-            result = self.conn.execute(query).df()
+            result = execute(self.conn, query, where.params).df()
 
             # Cache result
             self.cache[cache_key] = result
@@ -306,6 +301,7 @@ class CurtailmentQueryManager:
             DataFrame with regional curtailment statistics
         """
         try:
+            where = Where().between('timestamp', start_date, end_date)
             query = f"""
                 SELECT
                     region,
@@ -326,13 +322,12 @@ class CurtailmentQueryManager:
                     MAX(wind_curtailment) as max_wind_curtailment_mw,
                     MAX(total_curtailment) as max_total_curtailment_mw
                 FROM curtailment_regional
-                WHERE timestamp >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                  AND timestamp <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+                WHERE {where}
                 GROUP BY region
                 ORDER BY total_curtailment_mwh DESC
             """
 
-            return self.conn.execute(query).df()
+            return execute(self.conn, query, where.params).df()
 
         except Exception as e:
             logger.error(f"Error querying region summary: {e}")
@@ -351,7 +346,9 @@ class CurtailmentQueryManager:
             DataFrame with fuel-type curtailment statistics
         """
         try:
-            region_filter = f"AND region = '{region}'" if region and region != 'All' else ""
+            where = Where().between('timestamp', start_date, end_date)
+            if region and region != 'All':
+                where.eq('region', region)
 
             query = f"""
                 WITH fuel_data AS (
@@ -363,9 +360,7 @@ class CurtailmentQueryManager:
                         (SUM(solar_curtailment) / NULLIF(SUM(solar_uigf), 0)) * 100 as curtailment_rate_pct,
                         MAX(solar_curtailment) as max_curtailment_mw
                     FROM curtailment_regional
-                    WHERE timestamp >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                      AND timestamp <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                      {region_filter}
+                    WHERE {where}
 
                     UNION ALL
 
@@ -377,15 +372,14 @@ class CurtailmentQueryManager:
                         (SUM(wind_curtailment) / NULLIF(SUM(wind_uigf), 0)) * 100 as curtailment_rate_pct,
                         MAX(wind_curtailment) as max_curtailment_mw
                     FROM curtailment_regional
-                    WHERE timestamp >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                      AND timestamp <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                      {region_filter}
+                    WHERE {where}
                 )
                 SELECT * FROM fuel_data
                 ORDER BY curtailment_mwh DESC
             """
 
-            return self.conn.execute(query).df()
+            # The filter appears once per fuel
+            return execute(self.conn, query, where.params * 2).df()
 
         except Exception as e:
             logger.error(f"Error querying fuel summary: {e}")
@@ -415,6 +409,7 @@ class CurtailmentQueryManager:
         try:
             # For curtailment type filtering, we need to join with prices
             # First get raw curtailment data with price info
+            where = Where().between('c.timestamp', start_date, end_date)
             query = f"""
                 SELECT
                     c.timestamp,
@@ -423,12 +418,11 @@ class CurtailmentQueryManager:
                     c.totalcleared,
                     c.curtailment
                 FROM curtailment_duid c
-                WHERE c.timestamp >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                  AND c.timestamp <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+                WHERE {where}
                   AND c.curtailment > 0
             """
 
-            curt_df = self.conn.execute(query).df()
+            curt_df = execute(self.conn, query, where.params).df()
 
             if curt_df.empty:
                 logger.info(f"No curtailment data found for period")
@@ -438,13 +432,13 @@ class CurtailmentQueryManager:
             curt_df['region'] = curt_df['duid'].map(self.duid_to_region)
 
             # Join with prices - need to get prices for the same period
+            prices_where = Where().between('timestamp', start_date, end_date)
             prices_query = f"""
                 SELECT timestamp, region, price
                 FROM prices
-                WHERE timestamp >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                  AND timestamp <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+                WHERE {prices_where}
             """
-            prices_df = self.conn.execute(prices_query).df()
+            prices_df = execute(self.conn, prices_query, prices_where.params).df()
 
             # Merge curtailment with prices
             merged = curt_df.merge(prices_df, on=['timestamp', 'region'], how='left')
@@ -528,6 +522,7 @@ class CurtailmentQueryManager:
         """
         try:
             # Get raw curtailment data
+            where = Where().between('c.timestamp', start_date, end_date)
             query = f"""
                 SELECT
                     c.timestamp,
@@ -536,12 +531,11 @@ class CurtailmentQueryManager:
                     c.totalcleared,
                     c.curtailment
                 FROM curtailment_duid c
-                WHERE c.timestamp >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                  AND c.timestamp <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+                WHERE {where}
                   AND c.curtailment > 0
             """
 
-            curt_df = self.conn.execute(query).df()
+            curt_df = execute(self.conn, query, where.params).df()
 
             if curt_df.empty:
                 return pd.DataFrame()
@@ -557,13 +551,13 @@ class CurtailmentQueryManager:
                 return pd.DataFrame()
 
             # Get prices
+            prices_where = Where().between('timestamp', start_date, end_date)
             prices_query = f"""
                 SELECT timestamp, region, price
                 FROM prices
-                WHERE timestamp >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                  AND timestamp <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+                WHERE {prices_where}
             """
-            prices_df = self.conn.execute(prices_query).df()
+            prices_df = execute(self.conn, prices_query, prices_where.params).df()
 
             # Merge
             merged = curt_df.merge(prices_df, on=['timestamp', 'region'], how='left')
@@ -652,6 +646,7 @@ class CurtailmentQueryManager:
                 time_expr = "date_trunc('day', timestamp)"
                 agg_suffix = "SUM"  # Sum for daily to get MWh
 
+            where = Where().between('timestamp', start_date, end_date).eq('duid', duid)
             if resolution == '5min':
                 query = f"""
                     SELECT
@@ -661,9 +656,7 @@ class CurtailmentQueryManager:
                         totalcleared,
                         curtailment
                     FROM curtailment_duid
-                    WHERE timestamp >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                      AND timestamp <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                      AND duid = '{duid}'
+                    WHERE {where}
                     ORDER BY timestamp
                 """
             else:
@@ -676,14 +669,12 @@ class CurtailmentQueryManager:
                         {agg_suffix}(totalcleared) {divisor} as totalcleared,
                         {agg_suffix}(curtailment) {divisor} as curtailment
                     FROM curtailment_duid
-                    WHERE timestamp >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                      AND timestamp <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                      AND duid = '{duid}'
+                    WHERE {where}
                     GROUP BY 1, 2
                     ORDER BY timestamp
                 """
 
-            result = self.conn.execute(query).df()
+            result = execute(self.conn, query, where.params).df()
             logger.info(f"Queried {len(result)} {resolution} records for {duid}")
             return result
 
@@ -18,6 +18,8 @@ from datetime import datetime, timedelta
 
 import panel as pn
 
+from ..shared.sql import Where, execute
+
 
 DB_PATH = os.getenv(
     "AEMO_DUCKDB_PATH",
@@ -39,6 +41,8 @@ FLEXOKI = {
     "purple": "#5E409D",
 }
 
+NEM_REGIONS = ["NSW1", "QLD1", "VIC1", "SA1", "TAS1"]
+
 FUEL_ORDER = ["Net Imports", "Coal", "Gas", "Hydro", "Wind", "Solar", "Rooftop Solar", "Battery", "Other"]
 FUEL_COLORS = {
     "Net Imports": FLEXOKI["green"],
@@ -66,12 +70,12 @@ FUEL_MAPPING = {
 }
 
 
-def _query(sql, max_retries=3, retry_delay=0.2):
+def _query(sql, params=None, max_retries=3, retry_delay=0.2):
     last_err = None
     for attempt in range(max_retries):
         try:
             con = duckdb.connect(DB_PATH, read_only=True)
-            df = con.execute(sql).df()
+            df = execute(con, sql, params).df()
             con.close()
             return df
         except duckdb.IOException as e:
@@ -129,17 +133,21 @@ def get_evening_data(start_date: str, end_date: str, region: str = "NEM"):
     else:
         region_duids = [duid for duid, reg in duid_to_region.items() if reg == region]
 
+    def evening(column="settlementdate"):
+        """17:00-22:00 intervals in [start_date, end_date)"""
+        return (Where().between(column, start_date, end_date, end_inclusive=False)
+                .add(f"EXTRACT(HOUR FROM {column}) >= 17")
+                .add(f"EXTRACT(HOUR FROM {column}) < 22"))
+
+    where = evening()
     scada_df = _query(f"""
         SELECT
             settlementdate,
             duid,
             CASE WHEN scadavalue > 0 THEN scadavalue ELSE 0 END as generation
         FROM scada30
-        WHERE settlementdate >= '{start_date}'
-        AND settlementdate < '{end_date}'
-        AND EXTRACT(HOUR FROM settlementdate) >= 17
-        AND EXTRACT(HOUR FROM settlementdate) < 22
-    """)
+        WHERE {where}
+    """, where.params)
 
     if region_duids is not None:
         scada_df = scada_df[scada_df["duid"].isin(region_duids)]
@@ -154,23 +162,20 @@ def get_evening_data(start_date: str, end_date: str, region: str = "NEM"):
         if fuel not in fuel_by_time.columns and fuel not in ("Rooftop Solar", "Net Imports"):
             fuel_by_time[fuel] = 0
 
+    where = evening()
     if region == "NEM":
-        rooftop_region_filter = "AND regionid IN ('NSW1','QLD1','VIC1','SA1','TAS1')"
+        where.isin("regionid", NEM_REGIONS)
     else:
-        rooftop_region_filter = f"AND regionid = '{region}'"
+        where.eq("regionid", region)
 
     rooftop_df = _query(f"""
         SELECT
             settlementdate,
             SUM(power) as rooftop_mw
         FROM rooftop30
-        WHERE settlementdate >= '{start_date}'
-        AND settlementdate < '{end_date}'
-        AND EXTRACT(HOUR FROM settlementdate) >= 17
-        AND EXTRACT(HOUR FROM settlementdate) < 22
-        {rooftop_region_filter}
+        WHERE {where}
         GROUP BY settlementdate
-    """)
+    """, where.params)
     rooftop_df = rooftop_df.set_index("settlementdate")
 
     fuel_by_time = fuel_by_time.join(rooftop_df["rooftop_mw"].rename("Rooftop Solar"), how="left")
@@ -179,15 +184,12 @@ def get_evening_data(start_date: str, end_date: str, region: str = "NEM"):
     if region == "NEM":
         fuel_by_time["Net Imports"] = 0.0
     else:
+        where = evening().eq("regionid", region)
         demand_df = _query(f"""
             SELECT settlementdate, demand
             FROM demand30
-            WHERE settlementdate >= '{start_date}'
-            AND settlementdate < '{end_date}'
-            AND EXTRACT(HOUR FROM settlementdate) >= 17
-            AND EXTRACT(HOUR FROM settlementdate) < 22
-            AND regionid = '{region}'
-        """)
+            WHERE {where}
+        """, where.params)
         demand_df = demand_df.set_index("settlementdate")
         fuel_by_time = fuel_by_time.join(demand_df["demand"], how="left")
         fuel_by_time["demand"] = fuel_by_time["demand"].fillna(0)
@@ -196,6 +198,7 @@ def get_evening_data(start_date: str, end_date: str, region: str = "NEM"):
         fuel_by_time.drop(columns=["demand"], inplace=True)
 
     if region == "NEM":
+        where = evening("p.settlementdate").isin("p.regionid", NEM_REGIONS)
         prices_df = _query(f"""
             SELECT
                 p.settlementdate,
@@ -204,28 +207,21 @@ def get_evening_data(start_date: str, end_date: str, region: str = "NEM"):
             JOIN demand30 d
               ON p.settlementdate = d.settlementdate
              AND p.regionid = d.regionid
-            WHERE p.settlementdate >= '{start_date}'
-            AND p.settlementdate < '{end_date}'
-            AND EXTRACT(HOUR FROM p.settlementdate) >= 17
-            AND EXTRACT(HOUR FROM p.settlementdate) < 22
-            AND p.regionid IN ('NSW1','QLD1','VIC1','SA1','TAS1')
+            WHERE {where}
             GROUP BY p.settlementdate
             ORDER BY p.settlementdate
-        """)
+        """, where.params)
         weighted_prices = prices_df.set_index("settlementdate")
     else:
+        where = evening().eq("regionid", region)
         prices_df = _query(f"""
             SELECT
                 settlementdate,
                 rrp AS weighted_price
             FROM prices30
-            WHERE settlementdate >= '{start_date}'
-            AND settlementdate < '{end_date}'
-            AND EXTRACT(HOUR FROM settlementdate) >= 17
-            AND EXTRACT(HOUR FROM settlementdate) < 22
-            AND regionid = '{region}'
+            WHERE {where}
             ORDER BY settlementdate
-        """)
+        """, where.params)
         weighted_prices = prices_df.set_index("settlementdate")
 
     fuel_by_time["time"] = fuel_by_time.index.strftime("%H:%M")
@@ -18,6 +18,7 @@ import plotly.graph_objects as go
 import panel as pn
 
 from ..shared.flexoki_theme import FLEXOKI_PAPER, FLEXOKI_BLACK, FLEXOKI_BASE, FLEXOKI_ACCENT
+from ..shared.precompute import get_precompute_store
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +62,7 @@ def _strip_column(col):
     return col
 
 
-def _load_futures():
+def load_futures():
     """Load futures.csv, strip long column names, return DataFrame indexed by date."""
     path = DATA_DIR / "futures.csv"
     if not path.exists():
@@ -85,7 +86,7 @@ def _parse_contract_columns(columns):
     return mapping
 
 
-def _load_spot_weekly():
+def load_spot_weekly():
     """Load weekly average spot prices from DuckDB, return {region: Series}."""
     result = {}
     try:
@@ -302,7 +303,8 @@ def create_futures_tab():
     """Create the Futures tab content. Returns a pn.Column."""
     logger.info("Creating futures tab...")
 
-    futures_df = _load_futures()
+    store = get_precompute_store()
+    futures_df = store.get('futures.contracts')
     if futures_df.empty:
         return pn.Column(
             pn.pane.Markdown("# Electricity Futures"),
@@ -311,7 +313,7 @@ def create_futures_tab():
         )
 
     contract_map = _parse_contract_columns(futures_df.columns)
-    spot_weekly = _load_spot_weekly()
+    spot_weekly = store.get('futures.spot_weekly')
 
     # Contract choices for single-contract tab
     all_keys = set()
@@ -15,6 +15,8 @@ import plotly.graph_objects as go
 import panel as pn
 from datetime import datetime, timedelta
 
+from ..shared.precompute import get_precompute_store
+
 logger = logging.getLogger(__name__)
 
 # ── Flexoki Light theme ──────────────────────────────────────────
@@ -57,7 +59,7 @@ DB_PATH = os.getenv(
 )
 
 
-def _load_prices():
+def load_prices():
     """Load all STTM ex-post prices from DuckDB and compute average."""
     conn = duckdb.connect(DB_PATH, read_only=True)
     df = conn.execute(
@@ -76,7 +78,7 @@ def _load_prices():
     return df
 
 
-def _load_volumes():
+def load_volumes():
     """Load network allocation (demand) data from DuckDB."""
     conn = duckdb.connect(DB_PATH, read_only=True)
     df = conn.execute(
@@ -446,9 +448,11 @@ def create_sttm_gas_tab():
     """Create the STTM Gas tab panel with Price and Volume sub-tabs."""
     logger.info("Creating STTM Gas tab")
 
+    store = get_precompute_store()
+
     # Load price data
     try:
-        all_prices = _load_prices()
+        all_prices = store.get('gas.sttm_prices')
         date_max = all_prices["gas_date"].max()
         date_min = all_prices["gas_date"].min()
         logger.info("STTM gas: %d rows, %s to %s", len(all_prices), date_min.date(), date_max.date())
@@ -460,7 +464,7 @@ def create_sttm_gas_tab():
 
     # Load volume data
     try:
-        vol_df = _load_volumes()
+        vol_df = store.get('gas.sttm_volumes')
         logger.info("STTM volume: %d rows", len(vol_df))
     except Exception as e:
         logger.warning("Failed to load STTM volume data: %s", e)
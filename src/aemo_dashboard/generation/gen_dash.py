@@ -16,19 +16,23 @@ import pickle
 from pathlib import Path
 import json
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 from ..shared.config import config
 from ..shared.logging_config import setup_logging, get_logger
-from ..analysis.price_analysis_ui import create_price_analysis_tab
-from ..station.station_analysis_ui import create_station_analysis_tab
+# Only the Today tab is built with the page; every other tab module is
+# imported by its _create_*_tab method when the tab is first opened
 from ..nem_dash.nem_dash_tab import create_nem_dash_tab_with_updates
-from ..curtailment import create_curtailment_tab
-from ..gas import create_sttm_gas_tab
 from .generation_query_manager import GenerationQueryManager
+from ..shared.hybrid_query_manager import private_copy
+from .refresh_engine import get_refresh_engine
+from ..shared.smoothing import ewm, loess, moving_average, smooth_groups
+from ..transmission.flows import interconnectors, net_flows, regional_flows
 from ..shared.flexoki_theme import (
     FLEXOKI_PAPER,
     FLEXOKI_BLACK,
@@ -59,6 +63,44 @@ logger.info(f"Panel caching: {'enabled' if ENABLE_PN_CACHE else 'disabled'}")
 # Cache statistics
 _cache_stats = {'hits': 0, 'misses': 0, 'errors': 0}
 
+# One process-wide refresh per collector cycle shared by all sessions
+# (set to false to fall back to a per-session auto_update_loop)
+ENABLE_SHARED_REFRESH = os.getenv('ENABLE_SHARED_REFRESH', 'true').lower() == 'true'
+logger.info(f"Shared refresh engine: {'enabled' if ENABLE_SHARED_REFRESH else 'disabled'}")
+
+# Generation, price, transmission and rooftop datasets for a chart update are
+# queried side by side on this pool (shared by all sessions to bound DuckDB load).
+# Each worker queries through its own cursor (DuckDBDataService.conn).
+SNAPSHOT_WORKERS = int(os.getenv('GEN_SNAPSHOT_WORKERS', '4'))
+_snapshot_pool = None
+
+
+def _get_snapshot_pool():
+    """Lazily create the process-wide pool used to fetch chart data snapshots"""
+    global _snapshot_pool
+    if _snapshot_pool is None:
+        _snapshot_pool = ThreadPoolExecutor(max_workers=SNAPSHOT_WORKERS,
+                                            thread_name_prefix='gen-snapshot')
+    return _snapshot_pool
+
+
+# Opt in to building the tab datasets every session shares
+# (shared/tab_datasets.py) in the background at server start, so the first
+# open of those tabs is a lookup. Off by default: the builds import the tab
+# modules that are otherwise only loaded when a tab is opened.
+PRECOMPUTE_WARM = os.getenv('PRECOMPUTE_WARM', 'false').lower() == 'true'
+
+
+def _warm_precomputed_tabs():
+    """Start building the tab datasets' defaults on the precompute workers"""
+    try:
+        from ..shared.precompute import get_precompute_store
+        from ..shared.tab_datasets import warm_tab_datasets
+
+        warm_tab_datasets(get_precompute_store())
+    except Exception as e:
+        logger.error(f"Error warming precomputed tab data: {e}")
+
 # =============================================================================
 # Cached Plot Creation Functions
 # =============================================================================
@@ -283,6 +325,13 @@ class EnergyDashboard(param.Parameterized):
         self.duid_to_region = {}
         self.last_update = None
         self.update_task = None
+        # Shared refresh engine state (see refresh_engine.py)
+        self._refresh_token = None
+        self._shared_refresh_payload = None
+        # Per update_plot() cycle memo of processed region data (see _cycle_memo)
+        self._cycle_cache = None
+        self.last_cycle_timings = {}
+        self._last_date_range = None
         # Hours will be determined dynamically based on time_range selection
         self._plot_objects = {}  # Cache for plot objects
         
@@ -472,99 +521,114 @@ class EnergyDashboard(param.Parameterized):
     def load_generation_data(self):
         """Load generation data using optimized query manager for long date ranges"""
         try:
+            # Use data fetched by the shared refresh engine when it matches
+            shared = self._get_shared_refresh_data('generation')
+            if shared is not None:
+                self.gen_output_df, self._using_aggregated_data = shared
+                logger.info(f"Using shared refresh generation data: {len(self.gen_output_df):,} records")
+                return
+
             # Calculate time window based on selected time range
             start_time, end_time = self._get_effective_date_range()
-            
-            # Calculate days span to determine loading strategy
-            days_span = (end_time - start_time).total_seconds() / (24 * 3600) if start_time and end_time else 0
-            
-            # For long date ranges, use pre-aggregated data from query manager
-            if days_span > 30:  # Use aggregated data for ranges > 30 days
-                logger.info(f"Using pre-aggregated data for {days_span:.0f} day range")
-                
-                # Query aggregated data by fuel type
-                df = self.query_manager.query_generation_by_fuel(
-                    start_date=start_time,
-                    end_date=end_time,
-                    region='NEM'  # Load all regions, filter later
-                )
-                
-                if df.empty:
-                    logger.warning("No generation data returned from query manager")
-                    self.gen_output_df = pd.DataFrame()
-                    return
-                
-                # Create synthetic structure to match existing code expectations
-                # Add synthetic DUID column (fuel_type + _AGG)
-                df['duid'] = df['fuel_type'] + '_AGG'
-                df['scadavalue'] = df['total_generation_mw']
-                df['fuel'] = df['fuel_type']
-                
-                # For NEM-wide data, set region to 'NEM' (will be filtered later in process_data_for_region)
-                df['region'] = 'NEM'
-                
-                # Set flag to indicate we're using aggregated data
-                self._using_aggregated_data = True
-                
-                logger.info(f"Loaded {len(df):,} pre-aggregated records by fuel type")
-                
-            else:
-                # For short date ranges, use existing raw data approach
-                logger.info(f"Using raw DUID data for {days_span:.0f} day range")
-                from ..shared.adapter_selector import load_generation_data
-                
-                df = load_generation_data(
-                    start_date=start_time,
-                    end_date=end_time,
-                    resolution='auto'
-                )
-                
-                if df.empty:
-                    logger.warning("No generation data returned from adapter")
-                    self.gen_output_df = pd.DataFrame()
-                    return
-                
-                # Check for unknown DUIDs
-                all_duids_in_data = set(df['duid'].unique())
-                known_duids = set(self.duid_to_fuel.keys())
-                unknown_duids = all_duids_in_data - known_duids
-                
-                if unknown_duids:
-                    self.handle_unknown_duids(unknown_duids, df)
-                
-                # Add fuel and region information
-                df['fuel'] = df['duid'].map(self.duid_to_fuel)
-                df['region'] = df['duid'].map(self.duid_to_region)
-                
-                # Log dropped records
-                original_count = len(df)
-                df = df.dropna(subset=['fuel', 'region'])
-                dropped_count = original_count - len(df)
-                
-                if dropped_count > 0:
-                    logger.warning(f"Dropped {dropped_count} records ({dropped_count/original_count*100:.1f}%) due to unknown DUIDs")
-                
-                # Set flag to indicate we're using raw data
-                self._using_aggregated_data = False
-                
-                logger.info(f"Loaded {len(df)} raw generation records")
-            
-            self.gen_output_df = df
-                
+            self.gen_output_df, self._using_aggregated_data = self._query_generation_data(start_time, end_time)
+
         except Exception as e:
             logger.error(f"Error loading generation data: {e}")
             self.gen_output_df = pd.DataFrame()
             self._using_aggregated_data = False
 
+    def _query_generation_data(self, start_time, end_time):
+        """
+        Query generation data for a time window without touching session state.
+
+        Returns:
+            Tuple of (DataFrame, using_aggregated_data flag)
+        """
+        # Calculate days span to determine loading strategy
+        days_span = (end_time - start_time).total_seconds() / (24 * 3600) if start_time and end_time else 0
+
+        # For long date ranges, use pre-aggregated data from query manager
+        if days_span > 30:  # Use aggregated data for ranges > 30 days
+            logger.info(f"Using pre-aggregated data for {days_span:.0f} day range")
+
+            # Query aggregated data by fuel type
+            df = self.query_manager.query_generation_by_fuel(
+                start_date=start_time,
+                end_date=end_time,
+                region='NEM'  # Load all regions, filter later
+            )
+
+            if df.empty:
+                logger.warning("No generation data returned from query manager")
+                return pd.DataFrame(), False
+
+            # Create synthetic structure to match existing code expectations
+            # Add synthetic DUID column (fuel_type + _AGG)
+            df['duid'] = df['fuel_type'] + '_AGG'
+            df['scadavalue'] = df['total_generation_mw']
+            df['fuel'] = df['fuel_type']
+
+            # For NEM-wide data, set region to 'NEM' (will be filtered later in process_data_for_region)
+            df['region'] = 'NEM'
+
+            logger.info(f"Loaded {len(df):,} pre-aggregated records by fuel type")
+            return df, True
+
+        # For short date ranges, sum by region and fuel in DuckDB so only one
+        # row per (interval, region) reaches pandas
+        logger.info(f"Using DuckDB fuel aggregates for {days_span:.0f} day range")
+        from ..shared.adapter_selector import find_unknown_duids, load_generation_by_fuel_region
+
+        df = load_generation_by_fuel_region(
+            start_date=start_time,
+            end_date=end_time,
+            resolution='auto'
+        )
+
+        if df.empty:
+            logger.warning("No generation data returned from adapter")
+            return pd.DataFrame(), False
+
+        # Unknown DUIDs are excluded by the join; report them from a separate
+        # anti-join that returns one row per DUID
+        unknown_df = find_unknown_duids(start_time, end_time, resolution='auto')
+        if not unknown_df.empty:
+            self.handle_unknown_duids(set(unknown_df['duid']), unknown_df)
+
+        logger.info(f"Loaded {len(df)} region/fuel generation rows")
+        return df, False
+
+    @staticmethod
+    def _fuel_pivot(df, region):
+        """
+        Fuel-by-time frame for a region from load_generation_by_fuel_region() output.
+
+        Fuels with no units in the region are dropped; the NEM sums all regions.
+        """
+        if region != 'NEM':
+            df = df[df['region'] == region]
+        pivot_df = df.drop(columns='region').groupby('settlementdate').sum(min_count=1)
+        pivot_df = pivot_df.loc[:, pivot_df.notna().any()]
+        pivot_df.columns.name = 'fuel'
+        return pivot_df.fillna(0)
+
     def load_price_data(self):
         """Load and process price data using enhanced adapter with auto resolution"""
+        # Use data fetched by the shared refresh engine when it matches
+        shared = self._get_shared_refresh_data('prices')
+        if shared is not None:
+            return shared
+
+        # Calculate time window based on selected time range
+        start_time, end_time = self._get_effective_date_range()
+        return self._query_price_data(start_time, end_time, self.region)
+
+    def _query_price_data(self, start_time, end_time, region):
+        """Query and clean price data for a time window and region without touching session state"""
         try:
             # Use the enhanced price adapter with time filtering and auto resolution
             from ..shared.adapter_selector import load_price_data
             
-            # Calculate time window based on selected time range
-            start_time, end_time = self._get_effective_date_range()
-            
             df = load_price_data(
                 start_date=start_time,
                 end_date=end_time,
@@ -598,7 +662,7 @@ class EnergyDashboard(param.Parameterized):
                 df['SETTLEMENTDATE'] = pd.to_datetime(df['SETTLEMENTDATE'])
             
             # Apply time range filtering based on user selection
-            start_datetime, end_datetime = self._get_effective_date_range()
+            start_datetime, end_datetime = start_time, end_time
             if start_datetime is not None:
                 df = df[(df['SETTLEMENTDATE'] >= start_datetime) & (df['SETTLEMENTDATE'] <= end_datetime)]
                 logger.info(f"Price data filtered to {start_datetime.date()} - {end_datetime.date()}")
@@ -611,8 +675,8 @@ class EnergyDashboard(param.Parameterized):
             logger.info(f"Price data shape after time filtering: {df.shape}")
             
             # Filter by region
-            if self.region != 'NEM':
-                df = df[df['REGIONID'] == self.region]
+            if region != 'NEM':
+                df = df[df['REGIONID'] == region]
             else:
                 # For NEM, use NSW1 as representative (or you could average all regions)
                 df = df[df['REGIONID'] == 'NSW1']
@@ -641,7 +705,7 @@ class EnergyDashboard(param.Parameterized):
                 # Reset index to get settlementdate back as column
                 clean_df = clean_df.reset_index()
                 
-                logger.info(f"Loaded {len(clean_df)} price records for {self.time_range}")
+                logger.info(f"Loaded {len(clean_df)} price records for {region}")
                 if not clean_df.empty:
                     logger.info(f"Price range: ${clean_df['RRP'].min():.2f} to ${clean_df['RRP'].max():.2f}")
                     logger.info(f"Time range: {clean_df['settlementdate'].min()} to {clean_df['settlementdate'].max()}")
@@ -661,130 +725,118 @@ class EnergyDashboard(param.Parameterized):
     def load_transmission_data(self):
         """Load and process transmission flow data using enhanced adapter"""
         try:
-            from ..shared.adapter_selector import load_transmission_data
-            
+            # Use data fetched by the shared refresh engine when it matches
+            shared = self._get_shared_refresh_data('transmission')
+            if shared is not None:
+                self.transmission_df = shared
+                return
+
             # Calculate time window based on selected time range
             start_datetime, end_datetime = self._get_effective_date_range()
-            
-            # Load transmission data using enhanced adapter with auto resolution and performance optimization
-            # Check if this is a long date range that needs optimization
-            df = load_transmission_data(
-                start_date=start_datetime,
-                end_date=end_datetime,
-                resolution='auto'
-            )
-            logger.info(f"Loaded transmission data using enhanced adapter: {df.shape}")
-            
-            if df.empty:
-                self.transmission_df = pd.DataFrame()
-                return
-            
-            # Store transmission data
-            self.transmission_df = df
-            logger.info(f"Loaded {len(df)} transmission records using enhanced adapter with auto resolution")
-            logger.info(f"Transmission date range: {df['settlementdate'].min()} to {df['settlementdate'].max()}")
-            logger.info(f"Available interconnectors: {df['interconnectorid'].unique()}")
+            self.transmission_df = self._query_transmission_data(start_datetime, end_datetime)
             
         except Exception as e:
             logger.error(f"Error loading transmission data: {e}")
             self.transmission_df = pd.DataFrame()
 
+    def _query_transmission_data(self, start_datetime, end_datetime):
+        """Query transmission flow data for a time window without touching session state"""
+        from ..shared.adapter_selector import load_transmission_data
+
+        # Load transmission data using enhanced adapter with auto resolution and performance optimization
+        df = load_transmission_data(
+            start_date=start_datetime,
+            end_date=end_datetime,
+            resolution='auto'
+        )
+        logger.info(f"Loaded transmission data using enhanced adapter: {df.shape}")
+
+        if df.empty:
+            return pd.DataFrame()
+
+        logger.info(f"Loaded {len(df)} transmission records using enhanced adapter with auto resolution")
+        logger.info(f"Transmission date range: {df['settlementdate'].min()} to {df['settlementdate'].max()}")
+        logger.info(f"Available interconnectors: {df['interconnectorid'].unique()}")
+        return df
 
     def load_rooftop_solar_data(self):
         """Load and process rooftop solar data using the enhanced rooftop adapter"""
         try:
-            from ..shared.adapter_selector import load_rooftop_data
+            # Use data fetched by the shared refresh engine when it matches
+            shared = self._get_shared_refresh_data('rooftop')
+            if shared is not None:
+                self.rooftop_df = shared
+                return
 
             # Calculate time window based on selected time range
             start_datetime, end_datetime = self._get_effective_date_range()
-
-            # Load data using the enhanced adapter with time filtering
-            df = load_rooftop_data(
-                start_date=start_datetime,
-                end_date=end_datetime
-            )
-            logger.info(f"Loaded rooftop solar data using enhanced adapter: {df.shape}")
-            
-            if df.empty:
-                self.rooftop_df = pd.DataFrame()
-                return
-            
-            logger.info(f"Rooftop solar date range: {df['settlementdate'].min()} to {df['settlementdate'].max()}")
-            
-            # Store rooftop solar data
-            self.rooftop_df = df
-            logger.info(f"Loaded {len(df)} rooftop solar records for {self.time_range}")
-            logger.info(f"Available regions: {[col for col in df.columns if col != 'settlementdate']}")
+            self.rooftop_df = self._query_rooftop_data(start_datetime, end_datetime)
             
         except Exception as e:
             logger.error(f"Error loading rooftop solar data: {e}")
             self.rooftop_df = pd.DataFrame()
 
+    def _query_rooftop_data(self, start_datetime, end_datetime):
+        """Query rooftop solar data for a time window without touching session state"""
+        from ..shared.adapter_selector import load_rooftop_data
+
+        # Load data using the enhanced adapter with time filtering
+        df = load_rooftop_data(
+            start_date=start_datetime,
+            end_date=end_datetime
+        )
+        logger.info(f"Loaded rooftop solar data using enhanced adapter: {df.shape}")
+
+        if df.empty:
+            return pd.DataFrame()
+
+        logger.info(f"Rooftop solar date range: {df['settlementdate'].min()} to {df['settlementdate'].max()}")
+        logger.info(f"Available regions: {[col for col in df.columns if col != 'settlementdate']}")
+        return df
+
+    def _cycle_memo(self, name, compute, *inputs):
+        """
+        Compute a derived dataset once per update_plot() cycle.
+
+        Every chart in a cycle reads the same snapshot, so results are keyed on
+        the region and the identity of the input frames. Callers get copies
+        and may modify them freely. Outside a cycle compute() always runs.
+        """
+        if self._cycle_cache is None:
+            return compute()
+        key = (name, self.region) + tuple(id(frame) for frame in inputs)
+        if key not in self._cycle_cache:
+            self._cycle_cache[key] = compute()
+        result = self._cycle_cache[key]
+        if isinstance(result, tuple):
+            return tuple(part.copy() for part in result)
+        return result.copy()
+
     def calculate_regional_transmission_flows(self):
         """Calculate net transmission flows for the selected region"""
+        return self._cycle_memo('transmission_flows', self._calculate_regional_transmission_flows,
+                                self.transmission_df)
+
+    def _calculate_regional_transmission_flows(self):
         if self.transmission_df is None or self.transmission_df.empty or self.region == 'NEM':
             return pd.DataFrame(), pd.DataFrame()
         
         try:
-            df = self.transmission_df.copy()
-            
-            # Define interconnector mapping for each region
-            interconnector_mapping = {
-                'NSW1': {
-                    'NSW1-QLD1': 'from_nsw',      # Positive = export to QLD
-                    'VIC1-NSW1': 'to_nsw',        # Positive = import from VIC  
-                    'N-Q-MNSP1': 'from_nsw'       # DirectLink: Positive = export to QLD
-                },
-                'QLD1': {
-                    'NSW1-QLD1': 'to_qld',        # Positive = import from NSW
-                    'N-Q-MNSP1': 'to_qld'         # DirectLink: Positive = import from NSW
-                },
-                'VIC1': {
-                    'VIC1-NSW1': 'from_vic',      # Positive = export to NSW
-                    'V-SA': 'from_vic',           # Positive = export to SA
-                    'V-S-MNSP1': 'from_vic',      # Murraylink: Positive = export to SA
-                    'T-V-MNSP1': 'to_vic'         # Basslink: Positive = import from TAS
-                },
-                'SA1': {
-                    'V-SA': 'to_sa',              # Positive = import from VIC
-                    'V-S-MNSP1': 'to_sa'          # Murraylink: Positive = import from VIC
-                },
-                'TAS1': {
-                    'T-V-MNSP1': 'from_tas'       # Basslink: Positive = export to VIC
-                }
-            }
-            
-            region_interconnectors = interconnector_mapping.get(self.region, {})
+            region_interconnectors = interconnectors(self.region)
             if not region_interconnectors:
                 logger.warning(f"No interconnectors defined for region {self.region}")
                 return pd.DataFrame(), pd.DataFrame()
             
-            # Filter transmission data for this region's interconnectors
-            region_transmission = df[df['interconnectorid'].isin(region_interconnectors.keys())].copy()
+            # This region's interconnectors, signed from its perspective
+            # (positive = import, negative = export)
+            region_transmission = regional_flows(self.transmission_df, self.region)
             
             if region_transmission.empty:
                 logger.warning(f"No transmission data found for {self.region}")
                 return pd.DataFrame(), pd.DataFrame()
             
-            # Apply flow direction corrections based on region perspective
-            def correct_flow_direction(row):
-                interconnector = row['interconnectorid']
-                flow_type = region_interconnectors[interconnector]
-                flow = row['meteredmwflow']
-                
-                # Correct sign based on region perspective
-                if flow_type.startswith('to_'):
-                    # This interconnector brings power TO our region (import)
-                    return flow  # Positive = import
-                else:
-                    # This interconnector takes power FROM our region (export)  
-                    return -flow  # Negative = export
-            
-            region_transmission['regional_flow'] = region_transmission.apply(correct_flow_direction, axis=1)
-            
             # Aggregate net flows by time (sum all interconnectors for this region)
-            net_flows = region_transmission.groupby('settlementdate')['regional_flow'].sum().reset_index()
-            net_flows.columns = ['settlementdate', 'net_transmission_mw']
+            net_flows_df = net_flows(region_transmission)
             
             # Create individual line data for the third chart
             # Use pivot_table (not pivot) to handle duplicate timestamp entries
@@ -796,10 +848,10 @@ class EnergyDashboard(param.Parameterized):
             ).fillna(0).reset_index()
             
             logger.info(f"Calculated transmission flows for {self.region}: "
-                       f"{len(net_flows)} time points, "
+                       f"{len(net_flows_df)} time points, "
                        f"{len(region_interconnectors)} interconnectors")
             
-            return net_flows, line_data
+            return net_flows_df, line_data
             
         except Exception as e:
             logger.error(f"Error calculating transmission flows: {e}")
@@ -808,6 +860,9 @@ class EnergyDashboard(param.Parameterized):
     
     def process_data_for_region(self):
         """Process generation data for selected region and add transmission flows"""
+        return self._cycle_memo('region_data', self._process_data_for_region, self.gen_output_df)
+
+    def _process_data_for_region(self):
         if self.gen_output_df is None or self.gen_output_df.empty:
             return pd.DataFrame()
         
@@ -852,15 +907,8 @@ class EnergyDashboard(param.Parameterized):
                 
                 logger.info(f"Using pre-aggregated NEM data: {len(pivot_df)} time periods")
         else:
-            # Using raw DUID data - process as before
-            df = self.gen_output_df.copy()
-            
-            # Filter by region
-            if self.region != 'NEM':
-                df = df[df['region'] == self.region]
-            
-            # Group by time and fuel type
-            df['settlementdate'] = pd.to_datetime(df['settlementdate'])
+            # Region/fuel aggregates from DuckDB - select the region
+            df = self.gen_output_df
             
             # Apply time range filtering
             start_datetime, end_datetime = self._get_effective_date_range()
@@ -868,15 +916,7 @@ class EnergyDashboard(param.Parameterized):
                 df = df[(df['settlementdate'] >= start_datetime) & (df['settlementdate'] <= end_datetime)]
                 logger.info(f"Filtered generation data to {start_datetime.date()} - {end_datetime.date()}: {len(df)} records")
             
-            # Always use 5-minute intervals without resampling
-            result = df.groupby([
-                pd.Grouper(key='settlementdate', freq='5min'),
-                'fuel'
-            ])['scadavalue'].sum().reset_index()
-            
-            # Pivot to get fuel types as columns
-            pivot_df = result.pivot(index='settlementdate', columns='fuel', values='scadavalue')
-            pivot_df = pivot_df.fillna(0)
+            pivot_df = self._fuel_pivot(df, self.region)
         
         # Add transmission flows if available and not NEM region
         if self.region != 'NEM':
@@ -1162,11 +1202,11 @@ class EnergyDashboard(param.Parameterized):
                 ).fillna(0)
 
             else:
-                # Use raw DUID data
-                logger.info(f"Querying PCP raw data for {days_span:.0f} day range")
-                from ..shared.adapter_selector import load_generation_data
+                # Use region/fuel aggregates from DuckDB
+                logger.info(f"Querying PCP fuel aggregates for {days_span:.0f} day range")
+                from ..shared.adapter_selector import load_generation_by_fuel_region
 
-                df = load_generation_data(
+                df = load_generation_by_fuel_region(
                     start_date=pcp_start,
                     end_date=pcp_end,
                     resolution='auto'
@@ -1176,25 +1216,7 @@ class EnergyDashboard(param.Parameterized):
                     logger.warning("No PCP generation data available")
                     return pd.DataFrame()
 
-                # Add fuel and region information
-                df['fuel'] = df['duid'].map(self.duid_to_fuel)
-                df['region'] = df['duid'].map(self.duid_to_region)
-                df = df.dropna(subset=['fuel', 'region'])
-
-                # Filter by region
-                if self.region != 'NEM':
-                    df = df[df['region'] == self.region]
-
-                # Group by time and fuel type
-                df['settlementdate'] = pd.to_datetime(df['settlementdate'])
-                result = df.groupby([
-                    pd.Grouper(key='settlementdate', freq='5min'),
-                    'fuel'
-                ])['scadavalue'].sum().reset_index()
-
-                # Pivot to get fuel types as columns
-                pcp_df = result.pivot(index='settlementdate', columns='fuel', values='scadavalue')
-                pcp_df = pcp_df.fillna(0)
+                pcp_df = self._fuel_pivot(df, self.region)
 
             # Add rooftop solar if available (same logic as process_data_for_region)
             try:
@@ -1442,25 +1464,15 @@ class EnergyDashboard(param.Parameterized):
         if self.gen_output_df is None or self.gen_output_df.empty:
             return pd.DataFrame()
         
-        df = self.gen_output_df.copy()
-        
-        # Filter by region
-        if self.region != 'NEM':
-            df = df[df['region'] == self.region]
-        
-        # Group generation by time and fuel type
-        df['settlementdate'] = pd.to_datetime(df['settlementdate'])
+        df = self.gen_output_df
         
         # Apply time range filtering
         start_datetime, end_datetime = self._get_effective_date_range()
         if start_datetime is not None:
             df = df[(df['settlementdate'] >= start_datetime) & (df['settlementdate'] <= end_datetime)]
         
-        # Always aggregate generation by 5-minute intervals and fuel type
-        generation = df.groupby([
-            pd.Grouper(key='settlementdate', freq='5min'),
-            'fuel'
-        ])['scadavalue'].sum().reset_index()
+        # Generation by interval and fuel type for the region
+        generation = self._fuel_pivot(df, self.region)
         
         # Get capacity data by fuel type for the region
         capacity_df = self.gen_info_df.copy()
@@ -1498,39 +1510,14 @@ class EnergyDashboard(param.Parameterized):
         # Debug: Log capacity data for troubleshooting
         logger.info(f"Fuel capacities for {self.region}: {fuel_capacity.to_dict()}")
         
-        # Calculate utilization for each time period and fuel
-        utilization_data = []
-        for _, row in generation.iterrows():
-            fuel = row['fuel']
-            if fuel in fuel_capacity.index and fuel_capacity[fuel] > 0:
-                generation_mw = row['scadavalue']
-                capacity_mw = fuel_capacity[fuel]
-                utilization = (generation_mw / capacity_mw) * 100
-                
-                # Debug logging for first few calculations
-                if len(utilization_data) < 5:
-                    logger.info(f"Fuel: {fuel}, Generation: {generation_mw:.2f} MW, Capacity: {capacity_mw:.2f} MW, Utilization: {utilization:.2f}%")
-                
-                # Cap at 100% to handle any data anomalies and negative values
-                utilization = max(0, min(utilization, 100))
-                utilization_data.append({
-                    'settlementdate': row['settlementdate'],
-                    'fuel': fuel,
-                    'utilization': utilization
-                })
-        
-        if not utilization_data:
+        # Utilization for each time period and fuel with a known capacity
+        fuel_capacity = fuel_capacity[fuel_capacity > 0]
+        fuels = generation.columns.intersection(fuel_capacity.index)
+        if generation.empty or fuels.empty:
             logger.warning("No utilization data calculated")
             return pd.DataFrame()
         
-        utilization_df = pd.DataFrame(utilization_data)
-        
-        # Debug: Check the raw utilization values
-        logger.info(f"Sample utilization values: {utilization_df['utilization'].head().tolist()}")
-        
-        # Pivot to get fuel types as columns
-        pivot_df = utilization_df.pivot(index='settlementdate', columns='fuel', values='utilization')
-        pivot_df = pivot_df.fillna(0)
+        pivot_df = generation[fuels].div(fuel_capacity[fuels]) * 100
         
         # Additional safety: ensure all values are between 0 and 100
         pivot_df = pivot_df.clip(lower=0, upper=100)
@@ -2391,45 +2378,18 @@ class EnergyDashboard(param.Parameterized):
             if self.transmission_df is None or self.transmission_df.empty:
                 return None
 
-            # Define interconnector mapping for each region
-            interconnector_mapping = {
-                'NSW1': {
-                    'NSW1-QLD1': 'from_nsw',      # Positive = export to QLD
-                    'VIC1-NSW1': 'to_nsw',        # Positive = import from VIC
-                    'N-Q-MNSP1': 'from_nsw'       # DirectLink: Positive = export to QLD
-                },
-                'QLD1': {
-                    'NSW1-QLD1': 'to_qld',        # Positive = import from NSW
-                    'N-Q-MNSP1': 'to_qld'         # DirectLink: Positive = import from NSW
-                },
-                'VIC1': {
-                    'VIC1-NSW1': 'from_vic',      # Positive = export to NSW
-                    'V-SA': 'from_vic',           # Positive = export to SA
-                    'V-S-MNSP1': 'from_vic',      # Murraylink: Positive = export to SA
-                    'T-V-MNSP1': 'to_vic'         # Basslink: Positive = import from TAS
-                },
-                'SA1': {
-                    'V-SA': 'to_sa',              # Positive = import from VIC
-                    'V-S-MNSP1': 'to_sa'          # Murraylink: Positive = import from VIC
-                },
-                'TAS1': {
-                    'T-V-MNSP1': 'from_tas'       # Basslink: Positive = export to VIC
-                }
-            }
-
-            region_interconnectors = interconnector_mapping.get(self.region, {})
+            region_interconnectors = interconnectors(self.region)
             if not region_interconnectors:
                 return None
 
-            # Filter transmission data for this region's interconnectors
-            region_transmission = self.transmission_df[
-                self.transmission_df['interconnectorid'].isin(region_interconnectors.keys())
-            ].copy()
+            # This region's interconnectors with signed flows, the limit for
+            # the current direction and utilisation (vectorised)
+            region_transmission = regional_flows(self.transmission_df, self.region)
 
             # Debug logging
             logger.info(f"=== Transmission Plot Debug for {self.region} ===")
             logger.info(f"Total transmission records: {len(self.transmission_df)}")
-            logger.info(f"Region interconnectors: {list(region_interconnectors.keys())}")
+            logger.info(f"Region interconnectors: {region_interconnectors}")
             logger.info(f"Filtered transmission records: {len(region_transmission)}")
             if not region_transmission.empty:
                 logger.info(f"Date range: {region_transmission['settlementdate'].min()} to {region_transmission['settlementdate'].max()}")
@@ -2445,36 +2405,6 @@ class EnergyDashboard(param.Parameterized):
             if region_transmission.empty:
                 return None
 
-            # Apply flow direction corrections and get limits
-            def process_flow_and_limits(row):
-                interconnector = row['interconnectorid']
-                flow_type = region_interconnectors[interconnector]
-                meteredmwflow = row['meteredmwflow']  # Original AEMO flow
-                import_limit = row.get('importlimit', np.nan)
-                export_limit = row.get('exportlimit', np.nan)
-
-                if flow_type.startswith('to_'):
-                    regional_flow = meteredmwflow
-                else:
-                    regional_flow = -meteredmwflow
-
-                if regional_flow >= 0:
-                    if flow_type.startswith('to_'):
-                        applicable_limit = export_limit if meteredmwflow >= 0 else import_limit
-                    else:
-                        applicable_limit = import_limit if meteredmwflow < 0 else export_limit
-                else:
-                    if flow_type.startswith('to_'):
-                        applicable_limit = -(import_limit if meteredmwflow < 0 else export_limit)
-                    else:
-                        applicable_limit = -(export_limit if meteredmwflow >= 0 else import_limit)
-
-                return regional_flow, applicable_limit
-
-            region_transmission[['regional_flow', 'applicable_limit']] = region_transmission.apply(
-                lambda row: pd.Series(process_flow_and_limits(row)), axis=1
-            )
-
             # Debug processed data
             logger.info(f"=== After Processing ===")
             logger.info(f"Processed data shape: {region_transmission.shape}")
@@ -2496,7 +2426,7 @@ class EnergyDashboard(param.Parameterized):
             fig = go.Figure()
             has_traces = False
 
-            for interconnector in region_interconnectors.keys():
+            for interconnector in region_interconnectors:
                 ic_data = region_transmission[region_transmission['interconnectorid'] == interconnector].copy()
 
                 if ic_data.empty:
@@ -2515,41 +2445,28 @@ class EnergyDashboard(param.Parameterized):
                     avg_limit = ic_data['applicable_limit'].abs().mean()
                     logger.info(f"Interconnector {interconnector}: avg flow={avg_flow:.1f}MW, avg limit={avg_limit:.1f}MW")
 
-                # Build area and hover data
-                area_data = []
-                hover_data = []
-
-                for _, row in ic_data.iterrows():
-                    time = row['settlementdate']
-                    flow = row['regional_flow']
-                    limit = row['dynamic_limit']
-
-                    percent_of_limit = abs(flow / limit) * 100 if limit != 0 else 0
-
-                    if (flow >= 0 and limit >= 0) or (flow < 0 and limit < 0):
-                        area_data.append((time, flow, limit))
-                    else:
-                        area_data.append((time, flow, flow))
-
-                    hover_data.append({
-                        'settlementdate': time,
-                        'flow': flow,
-                        'limit': limit,
-                        'percent': percent_of_limit,
-                        'direction': 'Import' if flow >= 0 else 'Export',
-                        'interconnector': interconnector,
-                    })
-
-                if not area_data:
-                    continue
-
-                area_df = pd.DataFrame(area_data, columns=['settlementdate', 'flow', 'limit'])
-                hover_df = pd.DataFrame(hover_data)
+                # Area between flow and limit where both are on the same side
+                # of zero; elsewhere the area collapses onto the flow line
+                flow = ic_data['regional_flow']
+                limit = ic_data['dynamic_limit']
+                same_side = ((flow >= 0) & (limit >= 0)) | ((flow < 0) & (limit < 0))
+                area_df = pd.DataFrame({
+                    'settlementdate': ic_data['settlementdate'],
+                    'flow': flow,
+                    'limit': limit.where(same_side, flow),
+                })
 
-                hover_df['capacity_status'] = hover_df['percent'].apply(
-                    lambda x: 'At Capacity (>=95%)' if x >= 95 else
-                             'High Utilization (>=80%)' if x >= 80 else
-                             'Normal Operation'
+                hover_df = pd.DataFrame({
+                    'settlementdate': ic_data['settlementdate'],
+                    'flow': flow,
+                    'limit': limit,
+                    'percent': ic_data['utilisation'],
+                    'direction': np.where(flow >= 0, 'Import', 'Export'),
+                })
+                hover_df['capacity_status'] = np.select(
+                    [hover_df['percent'] >= 95, hover_df['percent'] >= 80],
+                    ['At Capacity (>=95%)', 'High Utilization (>=80%)'],
+                    default='Normal Operation',
                 )
 
                 # Filled area: limit boundary (upper/lower) then flow with fill between
@@ -2912,14 +2829,26 @@ class EnergyDashboard(param.Parameterized):
     
     def update_plot(self):
         """Update all plots with fresh data and proper error handling"""
+        owns_snapshot = False
         try:
             logger.info("Starting plot update...")
 
+            # Load the data once for every chart in this cycle unless the shared
+            # refresh engine already pushed a matching payload
+            owns_snapshot = self._begin_update_cycle()
+            timings = {}
+
+            def timed(name, build):
+                started = time.perf_counter()
+                result = build()
+                timings[name] = time.perf_counter() - started
+                return result
+
             # Create new plots
-            new_generation_plot = self.create_plot()  # Returns pn.Column with Plotly + stats
-            new_utilization_plot = self.create_utilization_plot()
-            new_transmission_plot = self.create_transmission_plot()
-            new_tod_plot = self.create_generation_tod_plot()
+            new_generation_plot = timed('generation', self.create_plot)  # Returns pn.Column with Plotly + stats
+            new_utilization_plot = timed('utilization', self.create_utilization_plot)
+            new_transmission_plot = timed('transmission', self.create_transmission_plot)
+            new_tod_plot = timed('time_of_day', self.create_generation_tod_plot)
 
             # Safely update the Plotly generation pane (pn.Column)
             if self.plot_pane is not None:
@@ -2937,9 +2866,13 @@ class EnergyDashboard(param.Parameterized):
 
             # Summary table is now included in plot_pane, keep this for backward compat
             if self.summary_table_pane is not None:
-                new_summary_table = self.create_generation_summary_table()
+                new_summary_table = timed('summary_table', self.create_generation_summary_table)
                 self.summary_table_pane.clear()
                 self.summary_table_pane.append(new_summary_table)
+
+            self.last_cycle_timings.update(timings)
+            logger.info("Chart timings: " + ", ".join(
+                f"{name}={secs:.2f}s" for name, secs in self.last_cycle_timings.items()))
             
             # Update the header with new time
             if self.header_section is not None:
@@ -2958,41 +2891,53 @@ class EnergyDashboard(param.Parameterized):
         except Exception as e:
             logger.error(f"Error updating plots: {e}")
             # Don't crash the application, just log and continue
+        finally:
+            self._cycle_cache = None
+            if owns_snapshot:
+                self._shared_refresh_payload = None
+
+    def _begin_update_cycle(self):
+        """
+        Prepare the data snapshot shared by all charts in one update_plot() cycle.
+
+        Fetches generation, prices, transmission and rooftop for the current
+        refresh key in one concurrent pass (unless a matching shared payload is
+        already set) so the chart builders' loaders never query twice.
+
+        Returns:
+            True if this cycle created the payload and must clear it afterwards
+        """
+        self._cycle_cache = {}
+        self.last_cycle_timings = {}
+        key = self.refresh_key()
+        if self._get_shared_refresh_data('key') is not None:
+            return False
+
+        started = time.perf_counter()
+        try:
+            payload = self.fetch_refresh_payload(key)
+        except Exception as e:
+            # Loaders fall back to querying on their own
+            logger.error(f"Error loading generation tab snapshot: {e}")
+            return False
+        self.last_cycle_timings['snapshot'] = time.perf_counter() - started
+
+        self._shared_refresh_payload = payload
+        self.transmission_df = None
+        self.rooftop_df = None
+        return True
     
     async def auto_update_loop(self):
-        """Automatic update loop every 4.5 minutes with better error handling"""
-        # Track last date range to detect changes
-        last_date_range = None
-        
+        """Automatic update loop every 4.5 minutes with better error handling
+
+        Only used when the shared refresh engine is disabled; otherwise the
+        engine drives refreshes for all sessions (see start_auto_update).
+        """
         while True:
             try:
                 await asyncio.sleep(270)  # 4.5 minutes
                 
-                # FIX for midnight rollover bug: Refresh date ranges for preset time ranges
-                # This ensures the dashboard continues updating after midnight
-                if self.time_range in ['1', '7', '30', '90', '365']:
-                    # Store old date range
-                    old_start_date = self.start_date
-                    old_end_date = self.end_date
-                    old_range = (old_start_date, old_end_date)
-                    
-                    # Update to new date range
-                    self._update_date_range_from_preset()
-                    new_start_date = self.start_date
-                    new_end_date = self.end_date
-                    new_range = (new_start_date, new_end_date)
-                    
-                    # CRITICAL FIX: Check if date RANGE changed (not just dates)
-                    if old_range != new_range and last_date_range is not None:
-                        logger.info(f"Date RANGE changed: {old_range} → {new_range}")
-                        logger.info("Forcing Panel component refresh for display update")
-                        
-                        # Force component recreation to update display
-                        self._force_component_refresh()
-                    elif old_end_date != new_end_date:
-                        logger.info(f"Date rollover detected: updated end_date from {old_end_date} to {new_end_date}")
-                    
-                    last_date_range = new_range
+                self._roll_preset_date_range()
                 
                 # Update plots in both tabs
                 self.update_plot()
@@ -3003,6 +2948,99 @@ class EnergyDashboard(param.Parameterized):
             except Exception as e:
                 logger.error(f"Error in auto-update loop: {e}")
                 await asyncio.sleep(60)  # Wait 1 minute before retrying
+
+    def _roll_preset_date_range(self):
+        """
+        FIX for midnight rollover bug: Refresh date ranges for preset time ranges.
+        This ensures the dashboard continues updating after midnight.
+        """
+        if self.time_range not in ['1', '7', '30', '90', '365']:
+            return
+
+        # Store old date range
+        old_start_date = self.start_date
+        old_end_date = self.end_date
+        old_range = (old_start_date, old_end_date)
+        
+        # Update to new date range
+        self._update_date_range_from_preset()
+        new_start_date = self.start_date
+        new_end_date = self.end_date
+        new_range = (new_start_date, new_end_date)
+        
+        # CRITICAL FIX: Check if date RANGE changed (not just dates)
+        if old_range != new_range and self._last_date_range is not None:
+            logger.info(f"Date RANGE changed: {old_range} → {new_range}")
+            logger.info("Forcing Panel component refresh for display update")
+            
+            # Force component recreation to update display
+            self._force_component_refresh()
+        elif old_end_date != new_end_date:
+            logger.info(f"Date rollover detected: updated end_date from {old_end_date} to {new_end_date}")
+        
+        self._last_date_range = new_range
+
+    def refresh_key(self):
+        """
+        Key identifying the dataset this session displays, used by the shared
+        refresh engine to fetch each (region, date window) once per cycle.
+
+        Preset ranges are rolled forward to today so sessions that opened on
+        different days still share a key after midnight.
+        """
+        start_date, end_date = self._preset_dates(self.time_range)
+        if start_date is None:
+            start_date, end_date = self.start_date, self.end_date
+        return (self.region, self.time_range, start_date, end_date)
+
+    def fetch_refresh_payload(self, key):
+        """
+        Fetch all generation-tab datasets for a refresh key.
+
+        Runs on the shared refresh engine thread, so it only reads reference
+        data from this session and never mutates its state. The four queries
+        are independent and run concurrently on the snapshot pool.
+        """
+        region, time_range, start_date, end_date = key
+        start_time, end_time = self._effective_date_range(time_range, start_date, end_date)
+
+        pool = _get_snapshot_pool()
+        futures = {
+            'generation': pool.submit(self._query_generation_data, start_time, end_time),
+            'prices': pool.submit(self._query_price_data, start_time, end_time, region),
+            'transmission': pool.submit(self._query_transmission_data, start_time, end_time),
+            'rooftop': pool.submit(self._query_rooftop_data, start_time, end_time),
+        }
+        payload = {'key': key}
+        for name, future in futures.items():
+            payload[name] = future.result()
+        return payload
+
+    def apply_refresh_payload(self, payload):
+        """Render a payload pushed by the shared refresh engine"""
+        self._shared_refresh_payload = payload
+        try:
+            self._roll_preset_date_range()
+            self.transmission_df = None
+            self.rooftop_df = None
+            self.update_plot()
+            logger.info("Shared auto-update completed")
+        finally:
+            self._shared_refresh_payload = None
+
+    def _get_shared_refresh_data(self, name):
+        """
+        Return a dataset from the current shared refresh payload if it matches this session.
+
+        Every subscribed session receives the same payload, so DataFrames are
+        handed out as private copies: column assignments, in-place fills and
+        sorts stay in this session.
+        """
+        payload = self._shared_refresh_payload
+        if payload is None or payload['key'] != self.refresh_key():
+            return None
+        data = payload[name]
+        return private_copy(data) if isinstance(data, pd.DataFrame) else data
     
     def _force_component_refresh(self):
         """
@@ -3067,6 +3105,10 @@ class EnergyDashboard(param.Parameterized):
     
     def start_auto_update(self):
         """Start the auto-update task - only when event loop is running"""
+        if ENABLE_SHARED_REFRESH:
+            self._subscribe_shared_refresh()
+            return
+
         try:
             # Cancel existing task if running
             if self.update_task is not None and not self.update_task.done():
@@ -3080,6 +3122,20 @@ class EnergyDashboard(param.Parameterized):
             logger.info(f"Event loop not ready - auto-update will start when served: {e}")
             pass
     
+    def _subscribe_shared_refresh(self):
+        """Register this session with the process-wide refresh engine"""
+        try:
+            engine = get_refresh_engine()
+            if self._refresh_token is not None:
+                engine.unsubscribe(self._refresh_token)
+            self._refresh_token = engine.subscribe(self, document=pn.state.curdoc)
+
+            token = self._refresh_token
+            pn.state.on_session_destroyed(lambda session_context: engine.unsubscribe(token))
+            logger.info("Shared auto-update subscribed")
+        except Exception as e:
+            logger.error(f"Error subscribing to shared refresh engine: {e}")
+
     @param.depends('region', watch=True)
     def on_region_change(self):
         """Called when region parameter changes"""
@@ -3108,30 +3164,44 @@ class EnergyDashboard(param.Parameterized):
     
     def _update_date_range_from_preset(self):
         """Update start_date and end_date based on time_range preset"""
+        start_date, end_date = self._preset_dates(self.time_range)
+        if start_date is None:
+            # Keep current custom dates
+            return
+
+        # Update the date parameters
+        self.start_date = start_date
+        self.end_date = end_date
+
+    @staticmethod
+    def _preset_dates(time_range):
+        """Return (start_date, end_date) for a time_range preset, or (None, None)"""
         end_date = datetime.now().date()
 
-        if self.time_range == '1':
+        if time_range == '1':
             start_date = end_date - timedelta(days=1)
-        elif self.time_range == '7':
+        elif time_range == '7':
             start_date = end_date - timedelta(days=7)
-        elif self.time_range == '30':
+        elif time_range == '30':
             start_date = end_date - timedelta(days=30)
-        elif self.time_range == '90':
+        elif time_range == '90':
             start_date = end_date - timedelta(days=90)
-        elif self.time_range == '365':
+        elif time_range == '365':
             start_date = end_date - timedelta(days=365)
-        elif self.time_range == 'All':
+        elif time_range == 'All':
             start_date = datetime(2020, 1, 1).date()  # Approximate earliest data
         else:
-            # Keep current custom dates
-            return
+            return None, None
 
-        # Update the date parameters
-        self.start_date = start_date
-        self.end_date = end_date
+        return start_date, end_date
     
     def _get_effective_date_range(self):
-        """Get the effective start and end datetime for data filtering
+        """Get the effective start and end datetime for data filtering"""
+        return self._effective_date_range(self.time_range, self.start_date, self.end_date)
+
+    @staticmethod
+    def _effective_date_range(time_range, start_date, end_date):
+        """Get the effective start and end datetime for a time range and dates
         
         IMPORTANT: This method includes a fix for the midnight rollover issue.
         
@@ -3143,7 +3213,7 @@ class EnergyDashboard(param.Parameterized):
         Solution: If the selected end_date is today or in the future, cap the query
         at the current time to prevent querying stale data after date rollover.
         """
-        if self.time_range == 'All':
+        if time_range == 'All':
             # For all data, return full available range for auto resolution selection
             # This allows the enhanced adapters to choose 30-minute data for better performance
             start_datetime = datetime(2020, 2, 1)  # Actual start of historical data in the system
@@ -3151,18 +3221,18 @@ class EnergyDashboard(param.Parameterized):
             return start_datetime, end_datetime
         else:
             # Convert dates to datetime for filtering
-            start_datetime = datetime.combine(self.start_date, datetime.min.time())
+            start_datetime = datetime.combine(start_date, datetime.min.time())
             
             # MIDNIGHT ROLLOVER FIX: Cap end_datetime at current time if end_date is today or future
             now = datetime.now()
-            end_date_midnight = datetime.combine(self.end_date, datetime.max.time())
+            end_date_midnight = datetime.combine(end_date, datetime.max.time())
             
             # Check if the end_date is today or in the future
             if end_date_midnight >= now:
                 # End date is today or future - cap at current time to avoid stale data
                 end_datetime = now
                 logger.info(f"Date range capped at current time: {now.strftime('%Y-%m-%d %H:%M:%S')} "
-                           f"(requested end_date was {self.end_date})")
+                           f"(requested end_date was {end_date})")
             else:
                 # End date is in the past - use the full day as requested
                 end_datetime = end_date_midnight
@@ -3218,8 +3288,6 @@ class EnergyDashboard(param.Parameterized):
         Returns:
             DataFrame with smoothed values in the specified column
         """
-        import numpy as np
-        
         # Create a copy to avoid modifying original
         smoothed_data = data.copy()
         
@@ -3228,132 +3296,70 @@ class EnergyDashboard(param.Parameterized):
             
         # Define groups to smooth
         if group_column and group_column in smoothed_data.columns:
-            groups = smoothed_data[group_column].unique()
+            groups = smoothed_data[group_column].to_numpy()
         else:
-            groups = [None]  # Treat entire dataset as one group
+            groups = np.zeros(len(smoothed_data), dtype=int)  # Treat entire dataset as one group
             
-        for group in groups:
-            if group is not None:
-                mask = smoothed_data[group_column] == group
-            else:
-                mask = np.ones(len(smoothed_data), dtype=bool)
+        try:
+            if smoothing_type == 'Moving Avg (7 periods)':
+                smoother, params = moving_average, {'window': 7, 'center': True}
+            elif smoothing_type == 'Moving Avg (30 periods)':
+                smoother, params = moving_average, {'window': 30, 'center': True}
+            elif smoothing_type == 'Exponential (α=0.3)':
+                smoother, params = ewm, {'alpha': 0.3}
                 
-            group_data = smoothed_data.loc[mask, column_name]
-            
-            try:
-                if smoothing_type == 'Moving Avg (7 periods)':
-                    smoothed_values = group_data.rolling(7, center=True).mean()
-                elif smoothing_type == 'Moving Avg (30 periods)':
-                    smoothed_values = group_data.rolling(30, center=True).mean()
-                elif smoothing_type == 'Exponential (α=0.3)':
-                    smoothed_values = group_data.ewm(alpha=0.3).mean()
-                    
-                elif smoothing_type.startswith('LOESS'):
-                    from statsmodels.nonparametric.smoothers_lowess import lowess
-                    
-                    # Extract parameters from the option string
-                    if '3 hours' in smoothing_type:
-                        frac = 0.01
-                    elif '1 day' in smoothing_type:
-                        frac = 0.02
-                    elif '7 days' in smoothing_type:
-                        frac = 0.05
-                    elif '30 days' in smoothing_type:
-                        frac = 0.1
-                    elif '90 days' in smoothing_type:
-                        frac = 0.15
-                    else:
-                        frac = 0.1  # Default
-                    
-                    # Get valid data points
-                    valid_mask = ~group_data.isna()
-                    if valid_mask.sum() == 0:
-                        continue
-                        
-                    valid_data = group_data[valid_mask].values
-                    valid_indices = np.where(valid_mask)[0]
-                    
-                    # Check if we have enough points
-                    min_points = max(3, int(frac * len(valid_data)) + 1)
-                    if len(valid_data) >= min_points:
-                        # Convert to numeric x values
-                        x = np.arange(len(valid_data))
-                        
-                        # Apply LOESS
-                        smoothed_result = lowess(
-                            valid_data, 
-                            x, 
-                            frac=frac,
-                            it=0,  # No robustness iterations for speed
-                            delta=0.01 * len(valid_data) if len(valid_data) > 100 else 0
-                        )
-                        
-                        # Extract smoothed values
-                        smoothed_vals = smoothed_result[:, 1]
-                        
-                        # Put smoothed values back in the right places
-                        smoothed_values = pd.Series(index=group_data.index, dtype=float)
-                        smoothed_values.iloc[valid_indices] = smoothed_vals
-                    else:
-                        logger.warning(f"Not enough data points for LOESS smoothing")
-                        smoothed_values = group_data
-                        
-                elif smoothing_type.startswith('EWM'):
-                    # Exponentially Weighted Moving Average
-                    
-                    # Extract span from the option string
-                    if '7 days' in smoothing_type:
-                        # For high-frequency data (5-min or 30-min)
-                        if hasattr(data, 'index') and len(data) > 1:
-                            time_diff = (data.index[1] - data.index[0]).total_seconds() / 60
-                            if time_diff <= 10:  # 5-minute data
-                                span = 7 * 24 * 12  # 7 days * 288 periods/day
-                            else:  # 30-minute data
-                                span = 7 * 24 * 2   # 7 days * 48 periods/day
-                        else:
-                            span = 336  # Default to 30-min
-                    elif '14 days' in smoothing_type:
-                        if hasattr(data, 'index') and len(data) > 1:
-                            time_diff = (data.index[1] - data.index[0]).total_seconds() / 60
-                            if time_diff <= 10:  # 5-minute data
-                                span = 14 * 24 * 12
-                            else:  # 30-minute data
-                                span = 14 * 24 * 2
-                        else:
-                            span = 672
-                    elif '30 days' in smoothing_type:
-                        if hasattr(data, 'index') and len(data) > 1:
-                            time_diff = (data.index[1] - data.index[0]).total_seconds() / 60
-                            if time_diff <= 10:  # 5-minute data
-                                span = 30 * 24 * 12
-                            else:  # 30-minute data
-                                span = 30 * 24 * 2
-                        else:
-                            span = 1440
-                    elif '60 days' in smoothing_type:
-                        if hasattr(data, 'index') and len(data) > 1:
-                            time_diff = (data.index[1] - data.index[0]).total_seconds() / 60
-                            if time_diff <= 10:  # 5-minute data
-                                span = 60 * 24 * 12
-                            else:  # 30-minute data
-                                span = 60 * 24 * 2
-                        else:
-                            span = 2880
-                    else:
-                        span = 336  # Default to 7 days
-                    
-                    # Apply EWM
-                    smoothed_values = group_data.ewm(span=span, adjust=False).mean()
+            elif smoothing_type.startswith('LOESS'):
+                # Extract parameters from the option string
+                if '3 hours' in smoothing_type:
+                    frac = 0.01
+                elif '1 day' in smoothing_type:
+                    frac = 0.02
+                elif '7 days' in smoothing_type:
+                    frac = 0.05
+                elif '30 days' in smoothing_type:
+                    frac = 0.1
+                elif '90 days' in smoothing_type:
+                    frac = 0.15
                 else:
-                    # Unknown smoothing type, return original
-                    smoothed_values = group_data
+                    frac = 0.1  # Default
+                
+                # No robustness iterations for speed; long series interpolate
+                # between fits 1% of the series apart. Missing values stay NaN.
+                smoother, params = loess, {
+                    'frac': frac,
+                    'it': 0,
+                    'delta': lambda n: 0.01 * n if n > 100 else 0.0,
+                }
                     
-                # Apply the smoothed values back to the dataframe
-                smoothed_data.loc[mask, column_name] = smoothed_values
+            elif smoothing_type.startswith('EWM'):
+                # Exponentially Weighted Moving Average
                 
-            except Exception as e:
-                logger.error(f"Error applying {smoothing_type} smoothing: {e}")
-                # Keep original values on error
+                # Extract span from the option string
+                days = next((d for d in (7, 14, 30, 60) if f'{d} days' in smoothing_type), None)
+                if days is None:
+                    span = 336  # Default to 7 days
+                elif len(data) > 1:
+                    # For high-frequency data (5-min or 30-min)
+                    time_diff = (data.index[1] - data.index[0]).total_seconds() / 60
+                    periods_per_hour = 12 if time_diff <= 10 else 2
+                    span = days * 24 * periods_per_hour
+                else:
+                    span = days * 24 * 2  # Default to 30-min
+                
+                smoother, params = ewm, {'span': span, 'adjust': False}
+            else:
+                # Unknown smoothing type, return original
+                return smoothed_data
+                
+            # Every group smoothed in one pass; groups of equal length are stacked
+            smoothed_data[column_name] = smooth_groups(
+                smoothed_data[column_name].to_numpy(dtype=float), groups, smoother, **params
+            )
+            
+        except Exception as e:
+            logger.error(f"Error applying {smoothing_type} smoothing: {e}")
+            # Keep original values on error
+            return data.copy()
                 
         return smoothed_data
     
@@ -3767,6 +3773,7 @@ class EnergyDashboard(param.Parameterized):
         """Create price analysis tab"""
         try:
             logger.info("Creating price analysis tab...")
+            from aemo_dashboard.analysis.price_analysis_ui import create_price_analysis_tab
             price_analysis_tab = create_price_analysis_tab()
             logger.info("Price analysis tab created successfully")
             return price_analysis_tab
@@ -3778,6 +3785,7 @@ class EnergyDashboard(param.Parameterized):
         """Create station analysis tab"""
         try:
             logger.info("Creating station analysis tab...")
+            from aemo_dashboard.station.station_analysis_ui import create_station_analysis_tab
             station_analysis_tab = create_station_analysis_tab()
             logger.info("Station analysis tab created successfully")
             return station_analysis_tab
@@ -3806,6 +3814,7 @@ class EnergyDashboard(param.Parameterized):
         """Create curtailment tab"""
         try:
             logger.info("Creating curtailment tab...")
+            from aemo_dashboard.curtailment import create_curtailment_tab
             curtailment_tab = create_curtailment_tab()
             logger.info("Curtailment tab created successfully")
             return curtailment_tab
@@ -4022,6 +4031,9 @@ def main():
     
     # Create the app factory (your existing code)
     app_factory = create_app()
+
+    if PRECOMPUTE_WARM:
+        threading.Thread(target=_warm_precomputed_tabs, name='precompute-warm', daemon=True).start()
     
     # Determine port based on environment variable or default
     port = int(os.getenv('DASHBOARD_PORT', '5008'))
@@ -15,6 +15,8 @@ from ..shared.logging_config import get_logger
 from ..shared.performance_logging import PerformanceLogger, performance_monitor
 from ..shared.hybrid_query_manager import HybridQueryManager
 from ..shared.duckdb_views import view_manager
+from ..shared.resolution_manager import resolution_manager
+from ..shared.sql import Where, execute
 
 logger = get_logger(__name__)
 perf_logger = PerformanceLogger(__name__)
@@ -47,32 +49,37 @@ class GenerationQueryManager:
             start_date: Start of date range
             end_date: End of date range
             region: Region filter ('NEM' for all regions)
-            resolution: 'auto', '5min', or '30min'
+            resolution: 'auto', '5min', '30min' or a rollup level
+                ('hourly', 'daily', 'monthly')
             
         Returns:
             DataFrame with columns: settlementdate, fuel_type, total_generation_mw
         """
         try:
-            # Determine resolution
+            # Determine resolution: the coarsest stored rollup the chart needs
             if resolution == 'auto':
                 days_diff = (end_date - start_date).days
-                if days_diff > 365:
-                    resolution = 'daily'
-                    view_name = 'daily_generation_by_fuel'
-                    logger.info(f"Auto-selected daily aggregation for {days_diff} day range")
-                elif days_diff <= 7:
-                    resolution = '5min'
-                    view_name = 'generation_by_fuel_5min'
-                    logger.info(f"Auto-selected 5min resolution for {days_diff} day range")
-                else:
-                    resolution = '30min'
-                    view_name = 'generation_by_fuel_30min'
-                    logger.info(f"Auto-selected 30min resolution for {days_diff} day range")
+                resolution = resolution_manager.get_budget_resolution(start_date, end_date, 'generation')
+                if resolution == '30min' and days_diff > 365:
+                    # Rollups not built yet: aggregate 30-minute data by day
+                    resolution = 'daily_view'
+                logger.info(f"Auto-selected {resolution} resolution for {days_diff} day range")
+
+            if resolution == 'daily_view':
+                view_name = 'daily_generation_by_fuel'
             else:
+                # generation_by_fuel_{5min,30min} views or _{hourly,daily,monthly} rollups
                 view_name = f'generation_by_fuel_{resolution}'
             
             # Build query based on region and resolution
-            if resolution == 'daily':
+            if resolution == 'daily_view':
+                where = Where().between('date', start_date.date(), end_date.date())
+            else:
+                where = Where().between('settlementdate', start_date, end_date)
+            if region != 'NEM':
+                where.eq('region', region)
+
+            if resolution == 'daily_view':
                 # Daily aggregation has different columns
                 if region == 'NEM':
                     query = f"""
@@ -81,8 +88,7 @@ class GenerationQueryManager:
                             fuel_type,
                             SUM(avg_generation_mw) as total_generation_mw
                         FROM {view_name}
-                        WHERE date >= '{start_date.strftime('%Y-%m-%d')}'
-                        AND date <= '{end_date.strftime('%Y-%m-%d')}'
+                        WHERE {where}
                         GROUP BY date, fuel_type
                         ORDER BY date, fuel_type
                     """
@@ -93,9 +99,7 @@ class GenerationQueryManager:
                             fuel_type,
                             avg_generation_mw as total_generation_mw
                         FROM {view_name}
-                        WHERE date >= '{start_date.strftime('%Y-%m-%d')}'
-                        AND date <= '{end_date.strftime('%Y-%m-%d')}'
-                        AND region = '{region}'
+                        WHERE {where}
                         ORDER BY date, fuel_type
                     """
             elif region == 'NEM':
@@ -108,8 +112,7 @@ class GenerationQueryManager:
                         SUM(total_capacity_mw) as total_capacity_mw,
                         COUNT(DISTINCT region) as region_count
                     FROM {view_name}
-                    WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                    AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+                    WHERE {where}
                     GROUP BY settlementdate, fuel_type
                     ORDER BY settlementdate, fuel_type
                 """
@@ -123,29 +126,22 @@ class GenerationQueryManager:
                         total_capacity_mw,
                         unit_count
                     FROM {view_name}
-                    WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                    AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                    AND region = '{region}'
+                    WHERE {where}
                     ORDER BY settlementdate, fuel_type
                 """
             
             # Create cache key
-            actual_resolution = resolution if resolution != 'auto' else ('daily' if days_diff > 365 else ('5min' if days_diff <= 7 else '30min'))
-            cache_key = f"gen_by_fuel_{region}_{start_date.date()}_{end_date.date()}_{actual_resolution}"
-            
-            # Check cache first
-            cached_result = self.query_manager.cache.get(cache_key)
-            if cached_result is not None:
-                logger.debug(f"Cache hit for {cache_key}")
-                return cached_result
+            cache_key = f"gen_by_fuel_{region}_{start_date.date()}_{end_date.date()}_{resolution}"
             
-            # Query directly without chunking for better performance
-            with perf_logger.timer("query_generation_by_fuel", threshold=0.5):
+            def load() -> pd.DataFrame:
                 # For large aggregated queries, use direct execution instead of chunking
-                result = self.query_manager.conn.execute(query).df()
+                with perf_logger.timer("query_generation_by_fuel", threshold=0.5):
+                    return execute(self.query_manager.conn, query, where.params).df()
             
-            # Cache the result
-            self.query_manager.cache.put(cache_key, result)
+            # Cached until new generation data lands, with concurrent sessions
+            # sharing a single query on a miss
+            cache_key, ttl = self.query_manager.versioned_cache_key(cache_key, end_date, tables=('generation',))
+            result = self.query_manager.cache.get_or_compute(cache_key, load, ttl=ttl)
             
             logger.info(f"Loaded {len(result):,} aggregated records for {region} "
                        f"({start_date.date()} to {end_date.date()})")
@@ -178,6 +174,9 @@ class GenerationQueryManager:
         """
         try:
             view_name = 'capacity_utilization_30min'
+            where = Where().between('settlementdate', start_date, end_date)
+            if region != 'NEM':
+                where.eq('region', region)
             
             if region == 'NEM':
                 # For NEM, calculate weighted average utilization
@@ -187,8 +186,7 @@ class GenerationQueryManager:
                         fuel_type,
                         SUM(total_generation_mw) / NULLIF(SUM(total_capacity_mw), 0) * 100 as utilization_pct
                     FROM {view_name}
-                    WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                    AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+                    WHERE {where}
                     GROUP BY settlementdate, fuel_type
                     ORDER BY settlementdate, fuel_type
                 """
@@ -199,28 +197,19 @@ class GenerationQueryManager:
                         fuel_type,
                         utilization_pct
                     FROM {view_name}
-                    WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                    AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                    AND region = '{region}'
+                    WHERE {where}
                     ORDER BY settlementdate, fuel_type
                 """
             
             cache_key = f"capacity_util_{region}_{start_date.date()}_{end_date.date()}"
             
-            # Check cache first
-            cached_result = self.query_manager.cache.get(cache_key)
-            if cached_result is not None:
-                logger.debug(f"Cache hit for {cache_key}")
-                return cached_result
+            def load() -> pd.DataFrame:
+                with perf_logger.timer("query_capacity_utilization"):
+                    # Direct query for better performance
+                    return execute(self.query_manager.conn, query, where.params).df()
             
-            with perf_logger.timer("query_capacity_utilization"):
-                # Direct query for better performance
-                result = self.query_manager.conn.execute(query).df()
-            
-            # Cache the result
-            self.query_manager.cache.put(cache_key, result)
-            
-            return result
+            cache_key, ttl = self.query_manager.versioned_cache_key(cache_key, end_date, tables=('generation',))
+            return self.query_manager.cache.get_or_compute(cache_key, load, ttl=ttl)
             
         except Exception as e:
             logger.error(f"Error querying capacity utilization: {e}")
@@ -248,17 +237,18 @@ class GenerationQueryManager:
                     GROUP BY d.fuel
                 """
             else:
-                query = f"""
+                query = """
                     SELECT 
                         d.fuel as fuel_type,
                         SUM(d.capacity_mw) as total_capacity_mw
                     FROM duid_mapping d
                     WHERE d.fuel IS NOT NULL
-                    AND d.region = '{region}'
+                    AND d.region = ?
                     GROUP BY d.fuel
                 """
             
-            result = self.query_manager.conn.execute(query).df()
+            params = [] if region == 'NEM' else [region]
+            result = execute(self.query_manager.conn, query, params).df()
             
             # Convert to dictionary
             capacities = {}
@@ -0,0 +1,329 @@
+"""
+Shared Refresh Engine - one data refresh per collector cycle for all sessions
+
+Every browser session owns its own EnergyDashboard. Previously each session ran
+its own auto_update_loop and re-queried generation, prices, transmission and
+rooftop every 270 seconds, so N open sessions meant N identical DuckDB scans per
+cycle.
+
+The engine is a process-wide scheduler. Sessions subscribe, and once per cycle
+the engine groups subscribers by their refresh key (region + date window),
+fetches each distinct key exactly once and fans the payload out to every
+subscriber of that key on its own Bokeh document. Per-cycle metrics record how
+many sessions each fetch served.
+
+Cycle hooks run before the fetches; the process-wide engine uses them to fold
+newly collected intervals into the stored rollups (shared/rollups.py) and to
+start background rebuilds of stale precomputed tab data (shared/precompute.py).
+"""
+
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+from ..shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Matches the collector cycle (4.5 minutes)
+DEFAULT_REFRESH_INTERVAL = 270
+
+# Number of completed cycles kept for get_metrics()
+METRICS_HISTORY = 20
+
+
+class _Subscription:
+    """A single session's registration with the refresh engine"""
+
+    def __init__(self, token: int, subscriber: Any, document: Any = None):
+        # Weak reference so an abandoned session can be garbage collected
+        # even if on_session_destroyed never fires
+        self.token = token
+        self._subscriber_ref = weakref.ref(subscriber)
+        self.document = document
+
+    @property
+    def subscriber(self) -> Optional[Any]:
+        return self._subscriber_ref()
+
+
+class SharedRefreshEngine:
+    """
+    Process-wide refresh scheduler shared by all dashboard sessions.
+
+    Subscribers must provide three methods:
+        refresh_key() -> hashable key identifying the dataset the session shows
+        fetch_refresh_payload(key) -> payload for that key (must not mutate
+            session state, it runs on the engine thread)
+        apply_refresh_payload(payload) -> render the payload in the session
+    """
+
+    def __init__(self, interval: float = DEFAULT_REFRESH_INTERVAL):
+        """
+        Initialize the refresh engine.
+
+        Args:
+            interval: Seconds between refresh cycles
+        """
+        self.interval = interval
+        self._subscriptions: Dict[int, _Subscription] = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cycle_count = 0
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=METRICS_HISTORY)
+        self._cycle_hooks: Dict[str, Callable[[], Any]] = {}
+
+        logger.info(f"SharedRefreshEngine initialized: interval={interval}s")
+
+    def subscribe(self, subscriber: Any, document: Any = None) -> int:
+        """
+        Register a session for shared refreshes.
+
+        Args:
+            subscriber: Object implementing the subscriber methods
+            document: Bokeh document of the session; payloads are applied via
+                its next-tick callback so they run in the session's context
+
+        Returns:
+            Token to pass to unsubscribe()
+        """
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._subscriptions[token] = _Subscription(token, subscriber, document)
+            count = len(self._subscriptions)
+
+        logger.info(f"Session subscribed to shared refresh (token={token}, sessions={count})")
+        self.start()
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        """Remove a session from the refresh engine"""
+        with self._lock:
+            removed = self._subscriptions.pop(token, None)
+            count = len(self._subscriptions)
+
+        if removed is not None:
+            logger.info(f"Session unsubscribed from shared refresh (token={token}, sessions={count})")
+
+    def add_cycle_hook(self, name: str, hook: Callable[[], Any]) -> None:
+        """Run hook() at the start of every cycle, before any fetch (replaces a hook of the same name)"""
+        with self._lock:
+            self._cycle_hooks[name] = hook
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def start(self) -> None:
+        """Start the background refresh thread if it is not already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='shared-refresh-engine', daemon=True
+            )
+            self._thread.start()
+
+        logger.info("Shared refresh engine started")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background refresh thread"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        """Background loop: wait one interval, then run a refresh cycle"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.run_cycle()
+            except Exception as e:
+                logger.error(f"Error in shared refresh cycle: {e}")
+
+    def _live_subscriptions(self) -> List[_Subscription]:
+        """Return live subscriptions, dropping any whose session has gone"""
+        with self._lock:
+            dead = [t for t, s in self._subscriptions.items() if s.subscriber is None]
+            for token in dead:
+                del self._subscriptions[token]
+            return list(self._subscriptions.values())
+
+    def run_cycle(self) -> Dict[str, Any]:
+        """
+        Run one refresh cycle: fetch each distinct key once and fan out.
+
+        Returns:
+            Metrics for the cycle
+        """
+        cycle_start = time.time()
+        self._cycle_count += 1
+
+        with self._lock:
+            hooks = list(self._cycle_hooks.items())
+        hook_seconds = {}
+        for name, hook in hooks:
+            hook_start = time.time()
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"Error in refresh cycle hook {name}: {e}")
+            hook_seconds[name] = round(time.time() - hook_start, 3)
+
+        # Group live subscribers by the dataset they display
+        groups: Dict[Hashable, List[_Subscription]] = {}
+        for sub in self._live_subscriptions():
+            subscriber = sub.subscriber
+            if subscriber is None:
+                continue
+            try:
+                key = subscriber.refresh_key()
+            except Exception as e:
+                logger.error(f"Error computing refresh key (token={sub.token}): {e}")
+                continue
+            groups.setdefault(key, []).append(sub)
+
+        fetch_metrics = []
+        for key, subs in groups.items():
+            fetch_metrics.append(self._refresh_group(key, subs))
+
+        sessions = sum(m['sessions_served'] for m in fetch_metrics)
+        fetches = sum(1 for m in fetch_metrics if m['error'] is None)
+        cycle = {
+            'cycle': self._cycle_count,
+            'started_at': datetime.fromtimestamp(cycle_start).isoformat(timespec='seconds'),
+            'duration_seconds': round(time.time() - cycle_start, 3),
+            'sessions': sessions,
+            'fetches': fetches,
+            'fetches_saved': max(sessions - fetches, 0),
+            'hooks': hook_seconds,
+            'keys': fetch_metrics,
+        }
+        self._history.append(cycle)
+
+        logger.info(
+            f"Shared refresh cycle {cycle['cycle']}: {fetches} fetches served "
+            f"{sessions} sessions in {cycle['duration_seconds']:.2f}s"
+        )
+        return cycle
+
+    def _refresh_group(self, key: Hashable, subs: List[_Subscription]) -> Dict[str, Any]:
+        """Fetch the payload for one key and dispatch it to its subscribers"""
+        fetch_start = time.time()
+        payload = None
+        error = None
+
+        # Any subscriber of the key can perform the fetch; fall back to the
+        # next one if a session disappears mid-cycle
+        for sub in subs:
+            subscriber = sub.subscriber
+            if subscriber is None:
+                continue
+            try:
+                payload = subscriber.fetch_refresh_payload(key)
+                error = None
+                break
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Error fetching shared refresh payload for {key}: {e}")
+
+        fetch_seconds = time.time() - fetch_start
+
+        served = 0
+        if error is None and payload is not None:
+            for sub in subs:
+                if self._dispatch(sub, payload):
+                    served += 1
+
+        return {
+            'key': key,
+            'sessions_served': served,
+            'fetch_seconds': round(fetch_seconds, 3),
+            'error': error,
+        }
+
+    def _dispatch(self, sub: _Subscription, payload: Any) -> bool:
+        """Apply a payload to one subscriber on its own document"""
+        subscriber = sub.subscriber
+        if subscriber is None:
+            return False
+
+        callback = _ApplyCallback(subscriber, payload)
+        try:
+            if sub.document is not None:
+                # add_next_tick_callback is the thread-safe way to touch a
+                # Bokeh document from outside its session
+                sub.document.add_next_tick_callback(callback)
+            else:
+                callback()
+            return True
+        except Exception as e:
+            logger.error(f"Error dispatching shared refresh (token={sub.token}): {e}")
+            return False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get engine metrics, including the most recent cycles"""
+        history = list(self._history)
+        total_sessions = sum(c['sessions'] for c in history)
+        total_fetches = sum(c['fetches'] for c in history)
+        return {
+            'interval_seconds': self.interval,
+            'subscribers': self.subscriber_count,
+            'cycles': self._cycle_count,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'avg_sessions_per_fetch': (total_sessions / total_fetches) if total_fetches else 0.0,
+            'last_cycle': history[-1] if history else None,
+            'recent_cycles': history,
+        }
+
+
+class _ApplyCallback:
+    """Callable handed to Bokeh that applies a payload to one subscriber"""
+
+    def __init__(self, subscriber: Any, payload: Any):
+        self.subscriber = subscriber
+        self.payload = payload
+
+    def __call__(self) -> None:
+        try:
+            self.subscriber.apply_refresh_payload(self.payload)
+        except Exception as e:
+            logger.error(f"Error applying shared refresh payload: {e}")
+
+
+_engine: Optional[SharedRefreshEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_refresh_engine() -> SharedRefreshEngine:
+    """Get the process-wide refresh engine, creating it on first use"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            interval = float(os.getenv('SHARED_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL))
+            _engine = SharedRefreshEngine(interval=interval)
+            _engine.add_cycle_hook('rollups', _refresh_rollups)
+            _engine.add_cycle_hook('precompute', _refresh_precompute)
+        return _engine
+
+
+def _refresh_rollups() -> None:
+    """Fold the latest collector intervals into the hourly/daily/monthly rollups"""
+    from ..shared.rollups import rollup_manager
+    rollup_manager.refresh()
+
+
+def _refresh_precompute() -> None:
+    """Rebuild precomputed tab data whose data version has moved (runs on the store's pool)"""
+    from ..shared.precompute import get_precompute_store
+    get_precompute_store().refresh()
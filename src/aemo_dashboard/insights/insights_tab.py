@@ -13,6 +13,8 @@ from aemo_dashboard.shared.logging_config import get_logger
 from aemo_dashboard.shared.adapter_selector import load_price_data
 from aemo_dashboard.shared.adapter_selector import load_generation_data
 from aemo_dashboard.shared.config import Config
+from aemo_dashboard.shared.data_version import get_data_versions
+from aemo_dashboard.shared.smoothing import loess
 from aemo_dashboard.generation.generation_query_manager import GenerationQueryManager
 
 logger = get_logger(__name__)
@@ -21,13 +23,6 @@ logger = get_logger(__name__)
 FLEXOKI_PAPER = '#FFFCF0'
 FLEXOKI_BORDER = '#B7B5AC'
 
-# Optional LOESS import
-try:
-    from statsmodels.nonparametric.smoothers_lowess import lowess
-    HAS_LOESS = True
-except ImportError:
-    HAS_LOESS = False
-    logger.warning("statsmodels not available, LOESS smoothing disabled")
 
 class InsightsTab:
     """Insights analysis tab with dynamic content and price controls"""
@@ -1515,11 +1510,18 @@ class InsightsTab:
         
         return df
     
+    def _loess_cache_key(self, *parts):
+        """Key for reusing a LOESS result until new price data arrives (None = don't cache)"""
+        try:
+            token = get_data_versions().token(('prices',))
+        except Exception as e:
+            logger.debug(f"Could not read price data version: {e}")
+            return None
+        return None if token is None else ('insights.volatility',) + parts + (token,)
+    
     def _apply_loess_with_bands(self, df: pd.DataFrame, window_days: int) -> pd.DataFrame:
         """Apply LOESS smoothing and calculate volatility bands"""
-        if not HAS_LOESS:
-            logger.warning("LOESS not available, falling back to rolling statistics")
-            return self._calculate_rolling_statistics(df, window_days)
+        region = df['regionid'].iloc[0] if 'regionid' in df.columns and len(df) else None
         
         # Since the data is already 30-minute, we can work with it directly
         # For better performance with 5 years of data, downsample to daily for LOESS
@@ -1545,12 +1547,11 @@ class InsightsTab:
         logger.info(f"Applying LOESS with frac={frac:.4f} on {len(df_daily)} daily points for {window_days}-day smoothing")
         
         # Apply LOESS to price
-        smoothed_price = lowess(
+        smoothed_price = loess(
             df_daily['rrp'].values,
             date_numeric,
             frac=frac,
-            it=0,
-            return_sorted=False
+            cache_key=self._loess_cache_key('price', region),
         )
         
         df_daily['smoothed_price'] = smoothed_price
@@ -1577,12 +1578,11 @@ class InsightsTab:
         }).reset_index()
         
         # Apply LOESS to the rolling std
-        smoothed_std = lowess(
+        smoothed_std = loess(
             df_daily_std['rolling_std'].ffill().bfill().values,
             pd.to_datetime(df_daily_std['settlementdate']).astype(np.int64) / 1e9,
             frac=frac,
-            it=0,
-            return_sorted=False
+            cache_key=self._loess_cache_key('std', region, window_days),
         )
         
         # Interpolate smoothed std back to 30-minute resolution
@@ -1691,12 +1691,8 @@ class InsightsTab:
                 
                 # Apply LOESS smoothing with bands
                 logger.info(f"Applying smoothing for {region} with window={window_days} days")
-                if HAS_LOESS:
-                    region_data = self._apply_loess_with_bands(region_data, window_days)
-                    price_col_to_use = 'smoothed_price'
-                else:
-                    region_data = self._calculate_rolling_statistics(region_data, window_days)
-                    price_col_to_use = 'rolling_mean'
+                region_data = self._apply_loess_with_bands(region_data, window_days)
+                price_col_to_use = 'smoothed_price'
                 
                 # Drop rows with NaN values for clean plotting
                 plot_data = region_data.dropna(subset=[price_col_to_use, 'upper_2std', 'lower_2std'])
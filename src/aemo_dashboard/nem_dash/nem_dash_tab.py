@@ -24,15 +24,9 @@ import pickle
 
 DUCKDB_PATH = os.getenv('AEMO_DUCKDB_PATH')
 
-# Import LOESS for price smoothing
-try:
-    from statsmodels.nonparametric.smoothers_lowess import lowess
-    HAS_LOESS = True
-except ImportError:
-    HAS_LOESS = False
-
 from ..shared.logging_config import get_logger
 from ..shared.config import Config
+from ..shared.smoothing import loess
 from ..shared.flexoki_theme import (
     FLEXOKI_PAPER, FLEXOKI_BLACK, FLEXOKI_BASE, FLEXOKI_ACCENT
 )
@@ -693,21 +687,17 @@ def create_price_chart_matplotlib(prices_df):
     rows_to_take = min(120, len(pivot))
     raw = pivot.tail(rows_to_take)
 
-    # Apply LOESS smoothing if available
+    # LOESS smoothing, all regions in one call (missing intervals stay NaN);
+    # regions with too few prices fall back to EWM
+    values = raw.to_numpy(dtype=float).T
+    try:
+        fitted = loess(values, frac=0.1)
+    except Exception:
+        fitted = None
     smoothed = pd.DataFrame(index=raw.index)
-    for col in raw.columns:
-        y = raw[col].values
-        x = np.arange(len(y))
-        valid_mask = ~np.isnan(y)
-
-        if HAS_LOESS and valid_mask.sum() > 10:
-            try:
-                smoothed_result = lowess(y[valid_mask], x[valid_mask], frac=0.1, it=0, return_sorted=False)
-                smoothed_vals = np.full(len(y), np.nan)
-                smoothed_vals[valid_mask] = smoothed_result
-                smoothed[col] = smoothed_vals
-            except:
-                smoothed[col] = raw[col].ewm(alpha=0.22).mean()
+    for i, col in enumerate(raw.columns):
+        if fitted is not None and np.isfinite(values[i]).sum() > 10:
+            smoothed[col] = fitted[i]
         else:
             smoothed[col] = raw[col].ewm(alpha=0.22).mean()
 
@@ -10,7 +10,6 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple, Any
 from pathlib import Path
 import os
-import time
 
 from aemo_dashboard.shared.logging_config import get_logger
 from aemo_dashboard.shared.smoothing import apply_ewm_smoothing
@@ -21,7 +20,11 @@ from aemo_dashboard.shared.fuel_categories import (
     MAIN_ROOFTOP_REGIONS,
 )
 from aemo_dashboard.generation.generation_query_manager import GenerationQueryManager
-from aemo_dashboard.shared.config import Config
+from aemo_dashboard.shared.config import config
+from aemo_dashboard.shared.data_version import get_data_versions
+from aemo_dashboard.shared.precompute import get_precompute_store
+from aemo_dashboard.shared.tab_datasets import PENETRATION_TABLES
+from aemo_dashboard.shared.smoothing import loess
 from aemo_dashboard.shared.flexoki_theme import (
     FLEXOKI_PAPER,
     FLEXOKI_BLACK,
@@ -31,13 +34,8 @@ from aemo_dashboard.shared.flexoki_theme import (
 
 logger = get_logger(__name__)
 
-# Optional LOESS import
-try:
-    from statsmodels.nonparametric.smoothers_lowess import lowess
-    HAS_LOESS = True
-except ImportError:
-    HAS_LOESS = False
-    logger.warning("statsmodels not available, LOESS smoothing disabled")
+# Separates a cache key from the data version it was computed at
+VERSION_SEP = '|v='
 
 
 def _make_empty_fig(title: str, height: int = 400) -> go.Figure:
@@ -123,15 +121,127 @@ def _apply_flexoki_layout(
     return fig
 
 
+_query_manager: Optional[GenerationQueryManager] = None
+
+
+def _get_query_manager() -> GenerationQueryManager:
+    """Query manager shared by the penetration builders (created on first build)."""
+    global _query_manager
+    if _query_manager is None:
+        _query_manager = GenerationQueryManager()
+    return _query_manager
+
+
+def _load_rooftop_30min(start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    """Load rooftop data at 30-minute resolution."""
+    duckdb_path = os.getenv('AEMO_DUCKDB_PATH')
+    rooftop_file = config.rooftop_solar_file
+
+    if not duckdb_path and (not rooftop_file or not Path(rooftop_file).exists()):
+        logger.warning(f"Rooftop file not found: {rooftop_file}")
+        return pd.DataFrame()
+
+    if duckdb_path:
+        import duckdb as _ddb
+        _conn = _ddb.connect(duckdb_path, read_only=True)
+        df = _conn.execute(
+            "SELECT settlementdate, regionid, power FROM rooftop30 "
+            "WHERE settlementdate >= ? AND settlementdate <= ?",
+            [start_date, end_date]
+        ).df()
+        _conn.close()
+    else:
+        df = pd.read_parquet(rooftop_file)
+    df['settlementdate'] = pd.to_datetime(df['settlementdate'])
+    df = df[(df['settlementdate'] >= start_date) & (df['settlementdate'] <= end_date)]
+
+    if 'regionid' in df.columns:
+        # rooftop30 pre-2026 contained sub-region IDs
+        # (QLDC/QLDN/QLDS/TASN/TASS) alongside the 5 parents — pivoting
+        # then summing across columns for NEM aggregation double-counts
+        # QLD and TAS. Filter to MAIN_ROOFTOP_REGIONS first
+        # (single source of truth shared with rooftop_adapter.py).
+        df = df[df['regionid'].isin(MAIN_ROOFTOP_REGIONS)]
+        df_wide = df.pivot(
+            index='settlementdate',
+            columns='regionid',
+            values='power'
+        ).reset_index()
+        return df_wide
+    else:
+        return df
+
+
+def load_generation_data(years: List[int], months_first: Optional[int], region: str) -> pd.DataFrame:
+    """
+    30-minute generation by fuel plus rooftop for the given years and region.
+
+    months_first limits the first year to its last N months. Builder of the
+    'penetration.generation' precomputed dataset.
+    """
+    query_manager = _get_query_manager()
+    all_data = []
+
+    for i, year in enumerate(years):
+        if i == 0 and months_first is not None:
+            start_date = datetime(year, 12 - months_first + 1, 1)
+        else:
+            start_date = datetime(year, 1, 1)
+        end_date = datetime(year, 12, 31, 23, 59, 59)
+
+        # Get generation data
+        data = query_manager.query_generation_by_fuel(
+            start_date=start_date,
+            end_date=end_date,
+            region=region,
+            resolution='30min'
+        )
+
+        if not data.empty:
+            logger.info(f"Year {year}: Retrieved {len(data)} rows of generation data")
+            all_data.append(data)
+
+        # Load rooftop data
+        try:
+            rooftop_data = _load_rooftop_30min(start_date, end_date)
+
+            if not rooftop_data.empty:
+                # Convert to long format
+                if region == 'NEM':
+                    region_cols = [col for col in rooftop_data.columns if col != 'settlementdate']
+                    rooftop_long = pd.DataFrame({
+                        'settlementdate': rooftop_data['settlementdate'],
+                        'fuel_type': 'Rooftop',
+                        'total_generation_mw': rooftop_data[region_cols].sum(axis=1)
+                    })
+                else:
+                    if region in rooftop_data.columns:
+                        rooftop_long = pd.DataFrame({
+                            'settlementdate': rooftop_data['settlementdate'],
+                            'fuel_type': 'Rooftop',
+                            'total_generation_mw': rooftop_data[region]
+                        })
+                    else:
+                        continue
+
+                logger.info(f"Year {year}: Retrieved {len(rooftop_long)} rows of rooftop data")
+                all_data.append(rooftop_long)
+
+        except Exception as e:
+            logger.warning(f"Could not load rooftop data for year {year}: {e}")
+
+    if not all_data:
+        return pd.DataFrame()
+
+    return pd.concat(all_data, ignore_index=True)
+
+
 class PenetrationTab:
     """Optimized renewable energy penetration analysis tab."""
 
     def __init__(self):
         """Initialize the penetration tab with caching."""
-        self.query_manager = GenerationQueryManager()
-        self.config = Config()
-
-        # Cache for expensive calculations
+        # Cache for this session's figures (data comes from the precompute store)
         self._cache = {}
         self._cache_timestamps = {}
         self.cache_ttl = 300  # 5 minutes
@@ -152,9 +262,7 @@ class PenetrationTab:
         )
 
         # Add smoothing method selector
-        smoothing_options = ['Moving Average']
-        if HAS_LOESS:
-            smoothing_options.append('LOESS (No Lag)')
+        smoothing_options = ['Moving Average', 'LOESS (No Lag)']
         # Add Exponential Weighted Moving Average options
         smoothing_options.extend([
             'EWM (14 days, minimal lag)',
@@ -205,25 +313,35 @@ class PenetrationTab:
             parts.append(f"{k}={v}")
         return "|".join(parts)
 
-    def _get_cached_or_compute(self, cache_key: str, compute_func: callable) -> Any:
-        """Get from cache or compute and cache result."""
-        # Check if cached and still valid
-        if cache_key in self._cache and cache_key in self._cache_timestamps:
+    def _versioned_key(self, cache_key: str, end: Optional[datetime] = None) -> str:
+        """
+        Qualify a cache key with the current generation and rooftop data versions.
+
+        Windows ending before the latest data get a constant token and stay
+        cached; live windows change key when a collector lands new data. If
+        no version is known the key is unchanged and cache_ttl applies.
+        """
+        token = get_data_versions().token(PENETRATION_TABLES, end)
+        return cache_key if token is None else f"{cache_key}{VERSION_SEP}{token}"
+
+    def _cache_get(self, cache_key: str) -> Optional[Any]:
+        """Return a cached value; versioned entries never expire by age."""
+        if cache_key not in self._cache or cache_key not in self._cache_timestamps:
+            return None
+        if VERSION_SEP not in cache_key:
             age = datetime.now() - self._cache_timestamps[cache_key]
-            if age.total_seconds() < self.cache_ttl:
-                logger.debug(f"Cache hit for {cache_key}")
-                return self._cache[cache_key]
-
-        # Compute and cache
-        logger.debug(f"Cache miss for {cache_key}, computing...")
-        start_time = time.time()
-        result = compute_func()
-        compute_time = time.time() - start_time
-        logger.info(f"Computed {cache_key} in {compute_time:.2f}s")
-
-        self._cache[cache_key] = result
+            if age.total_seconds() >= self.cache_ttl:
+                return None
+        return self._cache[cache_key]
+
+    def _cache_put(self, cache_key: str, value: Any) -> None:
+        """Store a value, dropping entries of the same key at older data versions."""
+        base = cache_key.split(VERSION_SEP)[0]
+        for stale in [k for k in self._cache if k != cache_key and k.split(VERSION_SEP)[0] == base]:
+            del self._cache[stale]
+            self._cache_timestamps.pop(stale, None)
+        self._cache[cache_key] = value
         self._cache_timestamps[cache_key] = datetime.now()
-        return result
 
     def _update_charts(self, event=None):
         """Update all charts based on current selections."""
@@ -249,123 +367,15 @@ class PenetrationTab:
         self.vre_by_fuel_pane.object = error_fig
         self.thermal_vs_renewables_pane.object = error_fig
 
-    def _load_rooftop_30min(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
-        """Load rooftop data at 30-minute resolution."""
-        import os
-        duckdb_path = os.getenv('AEMO_DUCKDB_PATH')
-        rooftop_file = self.config.rooftop_solar_file
-
-        if not duckdb_path and (not rooftop_file or not Path(rooftop_file).exists()):
-            logger.warning(f"Rooftop file not found: {rooftop_file}")
-            return pd.DataFrame()
-
-        # Cache key for rooftop data
-        cache_key = self._get_cache_key(
-            'rooftop',
-            start=start_date.isoformat(),
-            end=end_date.isoformat()
-        )
-
-        def load_rooftop():
-            if duckdb_path:
-                import duckdb as _ddb
-                _conn = _ddb.connect(duckdb_path, read_only=True)
-                df = _conn.execute(
-                    "SELECT settlementdate, regionid, power FROM rooftop30 "
-                    "WHERE settlementdate >= ? AND settlementdate <= ?",
-                    [start_date, end_date]
-                ).df()
-                _conn.close()
-            else:
-                df = pd.read_parquet(rooftop_file)
-            df['settlementdate'] = pd.to_datetime(df['settlementdate'])
-            df = df[(df['settlementdate'] >= start_date) & (df['settlementdate'] <= end_date)]
-
-            if 'regionid' in df.columns:
-                # rooftop30 pre-2026 contained sub-region IDs
-                # (QLDC/QLDN/QLDS/TASN/TASS) alongside the 5 parents — pivoting
-                # then summing across columns for NEM aggregation double-counts
-                # QLD and TAS. Filter to MAIN_ROOFTOP_REGIONS first
-                # (single source of truth shared with rooftop_adapter.py).
-                df = df[df['regionid'].isin(MAIN_ROOFTOP_REGIONS)]
-                df_wide = df.pivot(
-                    index='settlementdate',
-                    columns='regionid',
-                    values='power'
-                ).reset_index()
-                return df_wide
-            else:
-                return df
-
-        return self._get_cached_or_compute(cache_key, load_rooftop)
-
     def _get_generation_data(self, years: List[int], months_only_first_year: int = None) -> pd.DataFrame:
-        """Get generation data including rooftop for specified years."""
-        cache_key = self._get_cache_key(
-            'generation',
+        """Get generation data including rooftop for specified years (shared by all sessions)."""
+        return get_precompute_store().get(
+            'penetration.generation',
             years=years,
             months_first=months_only_first_year,
-            region=self.region_select.value
+            region=self.region_select.value,
         )
 
-        def load_generation():
-            all_data = []
-
-            for i, year in enumerate(years):
-                if i == 0 and months_only_first_year is not None:
-                    start_date = datetime(year, 12 - months_only_first_year + 1, 1)
-                else:
-                    start_date = datetime(year, 1, 1)
-                end_date = datetime(year, 12, 31, 23, 59, 59)
-
-                # Get generation data
-                data = self.query_manager.query_generation_by_fuel(
-                    start_date=start_date,
-                    end_date=end_date,
-                    region=self.region_select.value,
-                    resolution='30min'
-                )
-
-                if not data.empty:
-                    logger.info(f"Year {year}: Retrieved {len(data)} rows of generation data")
-                    all_data.append(data)
-
-                # Load rooftop data
-                try:
-                    rooftop_data = self._load_rooftop_30min(start_date, end_date)
-
-                    if not rooftop_data.empty:
-                        # Convert to long format
-                        if self.region_select.value == 'NEM':
-                            region_cols = [col for col in rooftop_data.columns if col != 'settlementdate']
-                            rooftop_long = pd.DataFrame({
-                                'settlementdate': rooftop_data['settlementdate'],
-                                'fuel_type': 'Rooftop',
-                                'total_generation_mw': rooftop_data[region_cols].sum(axis=1)
-                            })
-                        else:
-                            if self.region_select.value in rooftop_data.columns:
-                                rooftop_long = pd.DataFrame({
-                                    'settlementdate': rooftop_data['settlementdate'],
-                                    'fuel_type': 'Rooftop',
-                                    'total_generation_mw': rooftop_data[self.region_select.value]
-                                })
-                            else:
-                                continue
-
-                        logger.info(f"Year {year}: Retrieved {len(rooftop_long)} rows of rooftop data")
-                        all_data.append(rooftop_long)
-
-                except Exception as e:
-                    logger.warning(f"Could not load rooftop data for year {year}: {e}")
-
-            if not all_data:
-                return pd.DataFrame()
-
-            return pd.concat(all_data, ignore_index=True)
-
-        return self._get_cached_or_compute(cache_key, load_generation)
-
     def _apply_smoothing_30day(self, df: pd.DataFrame, value_col: str = 'total_generation_mw') -> pd.DataFrame:
         """Apply 30-day smoothing based on selected method."""
         if self.smoothing_select.value == 'Moving Average':
@@ -390,7 +400,7 @@ class PenetrationTab:
             daily_data['mw_smoothed'] = daily_data['mw_rolling_30d'].fillna(daily_data[value_col])
             return daily_data
 
-        elif self.smoothing_select.value == 'LOESS (No Lag)' and HAS_LOESS:
+        elif self.smoothing_select.value == 'LOESS (No Lag)':
             # First resample to daily averages (not noon values)
             df['settlementdate'] = pd.to_datetime(df['settlementdate'])
             df_daily = df.set_index('settlementdate').resample('D').agg({
@@ -405,13 +415,7 @@ class PenetrationTab:
             # Since each year is shown separately, we want finer detail
             frac = min(0.05, max(0.01, 14 / len(df_daily)))
 
-            smoothed = lowess(
-                df_daily[value_col],
-                date_numeric,
-                frac=frac,
-                it=0,
-                return_sorted=False
-            )
+            smoothed = loess(df_daily[value_col], date_numeric, frac=frac)
 
             df_daily['mw_smoothed'] = smoothed
 
@@ -472,19 +476,18 @@ class PenetrationTab:
     def _create_vre_production_chart(self):
         """Create the VRE production annualised chart."""
         # Cache key for the plot itself
-        plot_cache_key = self._get_cache_key(
+        plot_cache_key = self._versioned_key(self._get_cache_key(
             'plot_vre_production',
             region=self.region_select.value,
             fuel=self.fuel_select.value,
             smoothing=self.smoothing_select.value
-        )
+        ))
 
         # Try to get cached plot
-        if plot_cache_key in self._cache and plot_cache_key in self._cache_timestamps:
-            age = datetime.now() - self._cache_timestamps[plot_cache_key]
-            if age.total_seconds() < self.cache_ttl:
-                logger.info("Using cached VRE production plot")
-                return self._cache[plot_cache_key]
+        cached = self._cache_get(plot_cache_key)
+        if cached is not None:
+            logger.info("Using cached VRE production plot")
+            return cached
 
         # Get current year and two previous years
         current_year = datetime.now().year
@@ -569,26 +572,24 @@ class PenetrationTab:
         )
 
         # Cache the plot
-        self._cache[plot_cache_key] = fig
-        self._cache_timestamps[plot_cache_key] = datetime.now()
+        self._cache_put(plot_cache_key, fig)
 
         return fig
 
     def _create_vre_by_fuel_chart(self):
         """Create the VRE production by fuel type chart."""
         # Cache key for the plot
-        plot_cache_key = self._get_cache_key(
+        plot_cache_key = self._versioned_key(self._get_cache_key(
             'plot_vre_by_fuel',
             region=self.region_select.value,
             smoothing=self.smoothing_select.value
-        )
+        ))
 
         # Try to get cached plot
-        if plot_cache_key in self._cache and plot_cache_key in self._cache_timestamps:
-            age = datetime.now() - self._cache_timestamps[plot_cache_key]
-            if age.total_seconds() < self.cache_ttl:
-                logger.info("Using cached VRE by fuel plot")
-                return self._cache[plot_cache_key]
+        cached = self._cache_get(plot_cache_key)
+        if cached is not None:
+            logger.info("Using cached VRE by fuel plot")
+            return cached
 
         # Get data from 2018 onwards
         start_year = 2018
@@ -635,7 +636,7 @@ class PenetrationTab:
                     ).mean()
                     fuel_df['twh_annualised'] = fuel_df['mw_rolling_30d'] * 24 * 365 / 1_000_000
 
-                elif self.smoothing_select.value == 'LOESS (No Lag)' and HAS_LOESS:
+                elif self.smoothing_select.value == 'LOESS (No Lag)':
                     # Resample to daily first for efficiency
                     daily_fuel = fuel_df.set_index('settlementdate').resample('D')['total_generation_mw'].mean()
 
@@ -643,13 +644,7 @@ class PenetrationTab:
                     # Keep 30-day window for long-term trend analysis (7+ years of data)
                     frac = min(0.05, max(0.01, 30 / len(daily_fuel)))
 
-                    smoothed = lowess(
-                        daily_fuel.values,
-                        date_numeric,
-                        frac=frac,
-                        it=0,
-                        return_sorted=False
-                    )
+                    smoothed = loess(daily_fuel.values, date_numeric, frac=frac)
 
                     # Create dataframe with smoothed values
                     fuel_df = pd.DataFrame({
@@ -710,26 +705,24 @@ class PenetrationTab:
         )
 
         # Cache the plot
-        self._cache[plot_cache_key] = fig
-        self._cache_timestamps[plot_cache_key] = datetime.now()
+        self._cache_put(plot_cache_key, fig)
 
         return fig
 
     def _create_thermal_vs_renewables_chart(self):
         """Create the thermal vs renewables chart with 180-day moving average."""
         # Cache key for the plot
-        plot_cache_key = self._get_cache_key(
+        plot_cache_key = self._versioned_key(self._get_cache_key(
             'plot_thermal_renewables',
             region=self.region_select.value,
             smoothing=self.smoothing_select.value
-        )
+        ))
 
         # Try to get cached plot
-        if plot_cache_key in self._cache and plot_cache_key in self._cache_timestamps:
-            age = datetime.now() - self._cache_timestamps[plot_cache_key]
-            if age.total_seconds() < self.cache_ttl:
-                logger.info("Using cached thermal vs renewables plot")
-                return self._cache[plot_cache_key]
+        cached = self._cache_get(plot_cache_key)
+        if cached is not None:
+            logger.info("Using cached thermal vs renewables plot")
+            return cached
 
         # Get data from 2018 onwards
         start_year = 2018
@@ -747,7 +740,8 @@ class PenetrationTab:
         renewable_fuels = [f for f in RENEWABLE_FUELS if f in ['Wind', 'Solar', 'Rooftop', 'Rooftop Solar', 'Water', 'Hydro']]
         thermal_fuels = [f for f in THERMAL_FUELS if f in ['Coal', 'CCGT', 'OCGT', 'Gas other']]
 
-        # Categorize
+        # Categorize (on a copy: df is shared with other sessions)
+        df = df.copy()
         df['category'] = df['fuel_type'].apply(
             lambda x: 'renewable' if x in renewable_fuels else ('thermal' if x in thermal_fuels else 'other')
         )
@@ -778,7 +772,7 @@ class PenetrationTab:
                 window=window_periods, center=False, min_periods=window_periods//2
             ).mean()
 
-        elif self.smoothing_select.value == 'LOESS (No Lag)' and HAS_LOESS:
+        elif self.smoothing_select.value == 'LOESS (No Lag)':
             # Resample to daily for efficiency
             daily_pivot = pivot_data.resample('D').mean()
 
@@ -786,11 +780,9 @@ class PenetrationTab:
             # Keep 180-day window for long-term transition analysis
             frac = min(0.15, max(0.05, 180 / len(daily_pivot)))
 
-            renewable_smoothed = lowess(
-                daily_pivot['renewable'], date_numeric, frac=frac, it=0, return_sorted=False
-            )
-            thermal_smoothed = lowess(
-                daily_pivot['thermal'], date_numeric, frac=frac, it=0, return_sorted=False
+            # Both series share the daily axis and are smoothed together
+            renewable_smoothed, thermal_smoothed = loess(
+                daily_pivot[['renewable', 'thermal']].to_numpy().T, date_numeric, frac=frac
             )
 
             # Create new dataframe with daily smoothed values
@@ -866,8 +858,7 @@ class PenetrationTab:
         )
 
         # Cache the plot
-        self._cache[plot_cache_key] = fig
-        self._cache_timestamps[plot_cache_key] = datetime.now()
+        self._cache_put(plot_cache_key, fig)
 
         return fig
 
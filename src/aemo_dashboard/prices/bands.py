@@ -0,0 +1,168 @@
+"""
+Price bands - time spent in each price range and its share of the average
+
+A band is a half-open price range [lower, upper); either end may be
+infinite and bands may leave gaps between them. Every price is assigned to
+its band once (a searchsorted over the band lower bounds, or one CASE in
+DuckDB) and counts and sums are aggregated per (region, band) in a single
+grouped pass, instead of masking each region's series once per band.
+
+Used by the prices tab's band charts (prices/price_bands.py, from the
+loaded DataFrame) and by the API's /v1/prices/bands (in DuckDB). Both feed
+their per-band totals to summarise_bands.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+Band = Tuple[float, float]
+
+# Band index of prices outside every band
+OUTSIDE = -1
+
+TOTALS_COLUMNS = ['region', 'band', 'count', 'sum_rrp']
+
+
+def bands_from_edges(edges: Sequence[float]) -> List[Band]:
+    """Contiguous bands [edges[i], edges[i + 1])"""
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def band_index(rrp, bands: Sequence[Band]) -> np.ndarray:
+    """
+    Index into bands of each price (OUTSIDE for NaN and prices in no band).
+
+    Args:
+        rrp: Prices
+        bands: (lower, upper) pairs in ascending, non-overlapping order
+    """
+    rrp = np.asarray(rrp, dtype=float)
+    lower = np.array([lo for lo, _ in bands], dtype=float)
+    upper = np.array([hi for _, hi in bands], dtype=float)
+    if len(bands) <= 16:
+        # A comparison pass per band beats a binary search for a few bands
+        idx = np.full(rrp.shape, -1, dtype=np.intp)
+        for lo in lower:
+            np.add(idx, rrp >= lo, out=idx, casting='unsafe')
+    else:
+        idx = np.searchsorted(lower, rrp, side='right') - 1
+    # Below the first band (-1) clips to band 0 here but stays -1
+    idx[~(rrp < upper.take(idx, mode='clip'))] = OUTSIDE
+    return idx
+
+
+def band_totals(regions, rrp, bands: Sequence[Band]) -> pd.DataFrame:
+    """
+    Count and sum of non-null prices per (region, band).
+
+    Returns:
+        DataFrame with TOTALS_COLUMNS, one row per (region, band) that has
+        prices; band is OUTSIDE for prices in no band
+    """
+    # Factorize before anything else: it stays in the (Arrow) string column
+    codes, names = pd.factorize(regions, sort=True)
+    rrp = np.asarray(rrp, dtype=float)
+    valid = (codes >= 0) & ~np.isnan(rrp)
+    codes, rrp = codes[valid], rrp[valid]
+    if len(rrp) == 0:
+        return pd.DataFrame(columns=TOTALS_COLUMNS)
+
+    width = len(bands) + 1                     # slot 0 holds OUTSIDE
+    cells = codes * width + band_index(rrp, bands) + 1
+    size = len(names) * width
+    counts = np.bincount(cells, minlength=size)
+    sums = np.bincount(cells, weights=rrp, minlength=size)
+
+    present = np.flatnonzero(counts)
+    return pd.DataFrame({
+        'region': np.asarray(names)[present // width],
+        'band': present % width - 1,
+        'count': counts[present],
+        'sum_rrp': sums[present],
+    })
+
+
+def band_totals_sql(table: str, regions: Sequence[str], bands: Sequence[Band]) -> Tuple[str, list]:
+    """
+    DuckDB query for band_totals over table's regionid/rrp columns.
+
+    Returns (sql, params): sql selects TOTALS_COLUMNS for regions and ends
+    with ``settlementdate >= ? AND settlementdate <= ?``, so the caller
+    appends the window to params.
+    """
+    params: list = []
+    whens = []
+    for i, (lo, hi) in enumerate(bands):
+        conditions = []
+        if np.isfinite(lo):
+            conditions.append("rrp >= ?")
+            params.append(float(lo))
+        if np.isfinite(hi):
+            conditions.append("rrp < ?")
+            params.append(float(hi))
+        whens.append(f"WHEN {' AND '.join(conditions) or 'TRUE'} THEN {i}")
+    sql = f"""
+        SELECT regionid AS region,
+               CASE {' '.join(whens)} ELSE {OUTSIDE} END AS band,
+               COUNT(*) AS count,
+               SUM(rrp) AS sum_rrp
+        FROM {table}
+        WHERE regionid IN ({', '.join('?' * len(regions))})
+          AND rrp IS NOT NULL
+          AND settlementdate >= ? AND settlementdate <= ?
+        GROUP BY 1, 2
+    """
+    return sql, params + list(regions)
+
+
+def summarise_bands(totals: pd.DataFrame, bands: Sequence[Band],
+                    regions: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    One row per (region, band) for every band of every region with prices.
+
+    Columns: region, band, lower, upper, count, sum_rrp, share (of the
+    region's prices), average (band mean price, NaN when empty) and
+    contribution_share (band's sum over the region's sum). Prices outside
+    every band count towards the region totals only.
+
+    Args:
+        totals: band_totals (or band_totals_sql) output
+        bands: The bands totals was computed for
+        regions: Row order (default: sorted); regions without prices are left out
+    """
+    region = np.asarray(totals['region'], dtype=object)
+    band = np.asarray(totals['band'], dtype=np.int64)
+    found = set(region)
+    names = sorted(found) if regions is None else [r for r in dict.fromkeys(regions) if r in found]
+    position = {name: i for i, name in enumerate(names)}
+    row = np.array([position.get(r, -1) for r in region], dtype=np.int64)
+    keep = row >= 0
+
+    # (region, band) grid; column 0 collects prices outside every band
+    n_bands = len(bands)
+    counts = np.zeros((len(names), n_bands + 1))
+    sums = np.zeros((len(names), n_bands + 1))
+    np.add.at(counts, (row[keep], band[keep] + 1), np.asarray(totals['count'], dtype=float)[keep])
+    np.add.at(sums, (row[keep], band[keep] + 1), np.asarray(totals['sum_rrp'], dtype=float)[keep])
+    region_count = counts.sum(axis=1, keepdims=True)
+    region_sum = sums.sum(axis=1, keepdims=True)
+    counts, sums = counts[:, 1:], sums[:, 1:]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share = np.where(region_count > 0, counts / region_count, 0.0)
+        average = np.where(counts > 0, sums / counts, np.nan)
+        contribution = np.where(region_sum != 0, sums / region_sum, 0.0)
+
+    return pd.DataFrame({
+        'region': np.repeat(np.array(names, dtype=object), n_bands),
+        'band': np.tile(np.arange(n_bands), len(names)),
+        'lower': np.tile([float(lo) for lo, _ in bands], len(names)),
+        'upper': np.tile([float(hi) for _, hi in bands], len(names)),
+        'count': counts.ravel().astype(np.int64),
+        'sum_rrp': sums.ravel(),
+        'share': share.ravel(),
+        'average': average.ravel(),
+        'contribution_share': contribution.ravel(),
+    })
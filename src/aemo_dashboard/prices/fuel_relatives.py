@@ -2,7 +2,8 @@
 
 Queries DuckDB for daily fuel-weighted prices, applies 90-day LOESS
 smoothing, builds two Plotly charts (absolute prices and price index
-normalised to Flat Load = 100).
+normalised to Flat Load = 100). The smoothed series are kept per region in
+the shared precompute store, so sessions only build the charts.
 """
 
 import logging
@@ -12,6 +13,8 @@ import pandas as pd
 import plotly.graph_objects as go
 
 from ..shared.flexoki_theme import FLEXOKI_PAPER, FLEXOKI_BLACK, FLEXOKI_BASE, FLEXOKI_ACCENT
+from ..shared.smoothing import loess
+from ..shared.sql import Where, execute
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +30,10 @@ FUEL_COLOR_MAP = {
 
 
 def _build_fuel_relatives_query(selected_fuel_region, start_dt, end_dt):
-    """Return the DuckDB SQL query for daily fuel-weighted prices."""
-    return f"""
+    """Return the DuckDB SQL query for daily fuel-weighted prices and its parameters."""
+    generation = Where().between('g.settlementdate', start_dt, end_dt).eq('d.region', selected_fuel_region)
+    prices = Where().between('settlementdate', start_dt, end_dt).eq('regionid', selected_fuel_region)
+    sql = f"""
         WITH daily_generation AS (
             SELECT
                 DATE(g.settlementdate) as date,
@@ -40,9 +45,7 @@ def _build_fuel_relatives_query(selected_fuel_region, start_dt, end_dt):
                 SUM(g.scadavalue) as daily_generation
             FROM generation_30min g
             JOIN duid_mapping d ON g.duid = d.duid
-            WHERE g.settlementdate >= '{start_dt.isoformat()}'
-              AND g.settlementdate <= '{end_dt.isoformat()}'
-              AND d.region = '{selected_fuel_region}'
+            WHERE {generation}
               AND d.fuel IN ('Coal', 'Gas', 'Gas other', 'Wind', 'Solar', 'Water', 'CCGT', 'OCGT', 'Battery Storage')
               AND NOT (d.fuel = 'Battery Storage' AND g.scadavalue < 0)
             GROUP BY DATE(g.settlementdate),
@@ -58,9 +61,7 @@ def _build_fuel_relatives_query(selected_fuel_region, start_dt, end_dt):
                 DATE(settlementdate) as date,
                 rrp
             FROM prices_30min
-            WHERE settlementdate >= '{start_dt.isoformat()}'
-              AND settlementdate <= '{end_dt.isoformat()}'
-              AND regionid = '{selected_fuel_region}'
+            WHERE {prices}
         ),
         fuel_weighted AS (
             SELECT
@@ -76,9 +77,7 @@ def _build_fuel_relatives_query(selected_fuel_region, start_dt, end_dt):
                     ELSE d.fuel
                 END = dg.fuel_type
                 AND g.duid = dg.duid
-            WHERE g.settlementdate >= '{start_dt.isoformat()}'
-              AND g.settlementdate <= '{end_dt.isoformat()}'
-              AND d.region = '{selected_fuel_region}'
+            WHERE {generation}
               AND NOT (d.fuel = 'Battery Storage' AND g.scadavalue < 0)
             GROUP BY dp.date, dg.fuel_type
         ),
@@ -87,9 +86,7 @@ def _build_fuel_relatives_query(selected_fuel_region, start_dt, end_dt):
                 DATE(settlementdate) as date,
                 AVG(rrp) as flat_load_price
             FROM prices_30min
-            WHERE settlementdate >= '{start_dt.isoformat()}'
-              AND settlementdate <= '{end_dt.isoformat()}'
-              AND regionid = '{selected_fuel_region}'
+            WHERE {prices}
             GROUP BY DATE(settlementdate)
         )
         SELECT
@@ -101,6 +98,9 @@ def _build_fuel_relatives_query(selected_fuel_region, start_dt, end_dt):
         FULL OUTER JOIN fuel_weighted fw ON f.date = fw.date
         ORDER BY date, fuel_type
     """
+    # Placeholders in order of appearance: daily_generation, daily_prices,
+    # fuel_weighted, flat_load
+    return sql, generation.params + prices.params + generation.params + prices.params
 
 
 def query_fuel_relatives(duckdb_conn, selected_fuel_region):
@@ -114,9 +114,9 @@ def query_fuel_relatives(duckdb_conn, selected_fuel_region):
     start_dt = pd.to_datetime('2020-01-01')
     end_dt = pd.to_datetime('now')
 
-    query = _build_fuel_relatives_query(selected_fuel_region, start_dt, end_dt)
+    query, params = _build_fuel_relatives_query(selected_fuel_region, start_dt, end_dt)
     logger.info("Executing DuckDB query for fuel relatives...")
-    result_df = duckdb_conn.execute(query).df()
+    result_df = execute(duckdb_conn, query, params).df()
 
     if result_df.empty:
         return pd.DataFrame()
@@ -155,8 +155,6 @@ def apply_loess_smoothing(daily_prices):
     -------
     smoothed_data : DataFrame
     """
-    from statsmodels.nonparametric.smoothers_lowess import lowess
-
     smoothed_data = pd.DataFrame(index=daily_prices.index)
 
     for col in daily_prices.columns:
@@ -190,14 +188,8 @@ def apply_loess_smoothing(daily_prices):
                     frac = min(90.0 / filled_mask.sum(), 0.5)
                     logger.info(f"  Applying LOESS with frac={frac:.3f} for {col}")
 
-                    smoothed = lowess(
-                        filled_values[filled_mask],
-                        x_numeric[filled_mask],
-                        frac=frac, it=0,
-                    )
-
-                    smoothed_values = np.full(len(filled_values), np.nan)
-                    smoothed_values[filled_mask] = smoothed[:, 1]
+                    # Gaps left after filling come back as NaN
+                    smoothed_values = loess(filled_values, x_numeric, frac=frac)
 
                     smoothed_series = pd.Series(smoothed_values, index=daily_prices.index)
                     smoothed_series = smoothed_series.interpolate(
@@ -225,6 +217,20 @@ def apply_loess_smoothing(daily_prices):
     return smoothed_data
 
 
+def load_smoothed_fuel_relatives(region):
+    """Query and LOESS-smooth daily fuel-weighted prices for region (empty if no data).
+
+    Builder of the 'prices.fuel_relatives' precomputed dataset: it queries
+    through the cursor of the thread it runs on.
+    """
+    from data_service.shared_data_duckdb import duckdb_data_service
+
+    daily_prices = query_fuel_relatives(duckdb_data_service.conn, region)
+    if daily_prices.empty:
+        return daily_prices
+    return apply_loess_smoothing(daily_prices)
+
+
 def _apply_fuel_layout(fig, title):
     """Apply standard Flexoki layout to fuel relatives charts."""
     fig.update_layout(
@@ -12,6 +12,7 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 from ..shared.flexoki_theme import FLEXOKI_PAPER, FLEXOKI_BLACK, FLEXOKI_BASE, FLEXOKI_ACCENT
+from .bands import band_totals, summarise_bands
 
 logger = logging.getLogger(__name__)
 
@@ -43,43 +44,33 @@ DEFAULT_DEMANDS = {
 def compute_price_bands(original_price_data, selected_regions):
     """Compute price-band contributions for each region.
 
+    Prices are assigned to bands and totalled for all regions in one pass
+    (see ``prices.bands``, shared with the API's bands endpoint).
+
     Returns
     -------
     band_contributions : list[dict]
     bands_df : DataFrame | None
     """
-    band_contributions = []
-
-    for region in selected_regions:
-        if 'RRP' not in original_price_data.columns:
-            logger.warning("RRP column not found in original_price_data")
-            continue
-
-        region_data = original_price_data[original_price_data['REGIONID'] == region]['RRP']
-        if region_data.empty:
-            continue
-
-        for band_name, low, high in PRICE_BANDS:
-            if low == -float('inf'):
-                band_mask = region_data < high
-            elif high == float('inf'):
-                band_mask = region_data >= low
-            else:
-                band_mask = (region_data >= low) & (region_data < high)
-
-            band_data = region_data[band_mask]
-            if len(band_data) > 0:
-                band_proportion = len(band_data) / len(region_data)
-                band_avg = band_data.mean()
-                contribution = band_proportion * band_avg
-
-                band_contributions.append({
-                    'Region': region,
-                    'Price Band': band_name,
-                    'Contribution': contribution,
-                    'Percentage': band_proportion * 100,
-                    'Band Average': band_avg,
-                })
+    if 'RRP' not in original_price_data.columns:
+        logger.warning("RRP column not found in original_price_data")
+        return [], None
+
+    bands = [(low, high) for _, low, high in PRICE_BANDS]
+    totals = band_totals(original_price_data['REGIONID'], original_price_data['RRP'], bands)
+    summary = summarise_bands(totals, bands, regions=selected_regions)
+    summary = summary[summary['count'] > 0]
+
+    band_contributions = [
+        {
+            'Region': row.region,
+            'Price Band': PRICE_BANDS[row.band][0],
+            'Contribution': row.share * row.average,
+            'Percentage': row.share * 100,
+            'Band Average': row.average,
+        }
+        for row in summary.itertuples(index=False)
+    ]
 
     if not band_contributions:
         return band_contributions, None
@@ -15,6 +15,8 @@ import plotly.graph_objects as go
 
 from ..shared.flexoki_theme import FLEXOKI_PAPER, FLEXOKI_BLACK, FLEXOKI_BASE, FLEXOKI_ACCENT
 from ..shared.config import config
+from ..shared.precompute import get_precompute_store
+from ..shared.smoothing import ewm, loess, moving_average, smooth_groups
 from .fuel_weighted_prices import compute_fuel_weighted_prices, build_combined_stats_table
 from .price_bands import (
     compute_price_bands,
@@ -24,8 +26,6 @@ from .price_bands import (
 )
 from .price_chart import build_price_time_series, build_tod_chart
 from .fuel_relatives import (
-    query_fuel_relatives,
-    apply_loess_smoothing,
     build_fuel_relatives_chart,
     build_price_index_chart,
 )
@@ -645,19 +645,12 @@ def create_prices_tab(dashboard):
                     color=FLEXOKI_ACCENT['green'],
                 )
 
-                import sys
-                from pathlib import Path
-                sys.path.append(str(Path(__file__).parent.parent.parent))
-                from data_service.shared_data_duckdb import duckdb_data_service
+                smoothed = get_precompute_store().get('prices.fuel_relatives', region=region)
 
-                daily_prices = query_fuel_relatives(duckdb_data_service.conn, region)
-
-                if daily_prices.empty:
+                if smoothed.empty:
                     fuel_relatives_plot_pane.object = _placeholder_fig(f'No data available for {region}')
                     return
 
-                smoothed = apply_loess_smoothing(daily_prices)
-
                 fr_chart = build_fuel_relatives_chart(smoothed, region)
                 if fr_chart is not None:
                     fuel_relatives_plot_pane.object = fr_chart
@@ -719,40 +712,15 @@ def _apply_smoothing_to_prices(price_data, smoothing_value, aggregate_value, sel
     """Apply user-selected smoothing to price time-series data.
 
     Reproduces the inline smoothing logic from the original
-    ``load_and_plot_prices`` callback.
+    ``load_and_plot_prices`` callback. All selected regions are smoothed in
+    one pass by ``shared.smoothing.smooth_groups``, except Savitzky-Golay
+    whose window depends on each region's length.
     """
-    for region in selected_regions:
-        region_mask = price_data['REGIONID'] == region
-
-        if smoothing_value == 'Moving Avg (7 periods)':
-            price_data.loc[region_mask, y_col] = (
-                price_data.loc[region_mask, y_col].rolling(7, center=True).mean()
-            )
-        elif smoothing_value == 'Moving Avg (30 periods)':
-            price_data.loc[region_mask, y_col] = (
-                price_data.loc[region_mask, y_col].rolling(30, center=True).mean()
-            )
-        elif smoothing_value == 'Exponential (α=0.3)':
-            price_data.loc[region_mask, y_col] = (
-                price_data.loc[region_mask, y_col].ewm(alpha=0.3).mean()
-            )
-        elif smoothing_value.startswith('EWM'):
-            # Parse EWM options
-            if '7 days' in smoothing_value:
-                span = 7
-            elif '14 days' in smoothing_value:
-                span = 14
-            elif '30 days' in smoothing_value:
-                span = 30
-            elif '60 days' in smoothing_value:
-                span = 60
-            else:
-                span = 14
-            price_data.loc[region_mask, y_col] = (
-                price_data.loc[region_mask, y_col].ewm(span=span).mean()
-            )
-        elif smoothing_value.startswith('Savitzky-Golay'):
-            from scipy.signal import savgol_filter
+    if smoothing_value.startswith('Savitzky-Golay'):
+        from scipy.signal import savgol_filter
+
+        for region in selected_regions:
+            region_mask = price_data['REGIONID'] == region
 
             if '7 days' in smoothing_value:
                 days = 7
@@ -807,41 +775,55 @@ def _apply_smoothing_to_prices(price_data, smoothing_value, aggregate_value, sel
                     logger.warning(f"Not enough points ({len(region_prices)}) for SG window {window_size}")
             except Exception as e:
                 logger.error(f"Savitzky-Golay error: {e}")
+        return price_data
+
+    if smoothing_value == 'Moving Avg (7 periods)':
+        smoother, params = moving_average, {'window': 7, 'center': True}
+    elif smoothing_value == 'Moving Avg (30 periods)':
+        smoother, params = moving_average, {'window': 30, 'center': True}
+    elif smoothing_value == 'Exponential (α=0.3)':
+        smoother, params = ewm, {'alpha': 0.3}
+    elif smoothing_value.startswith('EWM'):
+        # Parse EWM options
+        if '7 days' in smoothing_value:
+            span = 7
+        elif '14 days' in smoothing_value:
+            span = 14
+        elif '30 days' in smoothing_value:
+            span = 30
+        elif '60 days' in smoothing_value:
+            span = 60
+        else:
+            span = 14
+        smoother, params = ewm, {'span': span}
+    elif smoothing_value.startswith('LOESS'):
+        if '3 hours' in smoothing_value:
+            frac = 0.01
+        elif '1 day' in smoothing_value:
+            frac = 0.02
+        elif '7 days' in smoothing_value:
+            frac = 0.05
+        elif '30 days' in smoothing_value:
+            frac = 0.1
+        elif '90 days' in smoothing_value:
+            frac = 0.15
+        else:
+            frac = 0.1
+        smoother, params = loess, {
+            'frac': frac,
+            'it': 0,
+            'delta': lambda n: 0.01 * n if n > 100 else 0.0,
+        }
+    else:
+        return price_data
 
-        elif smoothing_value.startswith('LOESS'):
-            from statsmodels.nonparametric.smoothers_lowess import lowess
-
-            if '3 hours' in smoothing_value:
-                frac = 0.01
-            elif '1 day' in smoothing_value:
-                frac = 0.02
-            elif '7 days' in smoothing_value:
-                frac = 0.05
-            elif '30 days' in smoothing_value:
-                frac = 0.1
-            elif '90 days' in smoothing_value:
-                frac = 0.15
-            else:
-                frac = 0.1
-
-            try:
-                region_data = price_data.loc[region_mask].copy()
-                region_prices = region_data[y_col].values
-                valid_mask = ~np.isnan(region_prices)
-                if valid_mask.sum() == 0:
-                    continue
-                valid_prices = region_prices[valid_mask]
-                min_points = max(3, int(frac * len(valid_prices)) + 1)
-                if len(valid_prices) >= min_points:
-                    x = np.arange(len(valid_prices))
-                    result = lowess(
-                        valid_prices, x, frac=frac, it=0,
-                        delta=0.01 * len(valid_prices) if len(valid_prices) > 100 else 0,
-                    )
-                    smoothed_full = np.full_like(region_prices, np.nan)
-                    smoothed_full[valid_mask] = result[:, 1]
-                    price_data.loc[region_mask, y_col] = smoothed_full
-            except Exception as e:
-                logger.error(f"LOESS error for {region}: {e}")
+    # Rows of unselected regions keep their values
+    regions = price_data['REGIONID'].where(price_data['REGIONID'].isin(selected_regions))
+    try:
+        price_data[y_col] = smooth_groups(
+            price_data[y_col].to_numpy(dtype=float), regions, smoother, **params
+        )
+    except Exception as e:
+        logger.error(f"{smoothing_value} smoothing error: {e}")
 
     return price_data
@@ -10,6 +10,8 @@ from .generation_adapter_duckdb import (
     load_generation_data,
     get_generation_summary,
     get_available_duids,
+    load_generation_by_fuel_region,
+    find_unknown_duids,
     load_gen_data  # Legacy compatibility
 )
 
@@ -54,6 +56,8 @@ __all__ = [
     'load_generation_data',
     'get_generation_summary',
     'get_available_duids',
+    'load_generation_by_fuel_region',
+    'find_unknown_duids',
     'load_gen_data',
     'load_price_data',
     'get_price_summary',
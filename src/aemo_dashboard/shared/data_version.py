@@ -0,0 +1,311 @@
+"""
+Data versions - the latest interval available in each source table
+
+Caches used to expire on a fixed TTL, so a result was either served stale
+after a new dispatch interval landed or thrown away while still valid. A data
+version is the latest settlementdate of a table: it changes exactly when new
+data arrives, so caches key their entries on (query, data version) instead.
+
+Versions come from two places:
+- Collectors publish their latest interval to ``data_versions.json`` in the
+  data directory after every successful cycle (publish_data_version).
+- Otherwise the tracker asks DuckDB for ``MAX(settlementdate)``, which reads
+  parquet/zone-map statistics rather than scanning the table.
+
+A query window that ends before the latest interval of every table it reads
+cannot change through live collection, so its version token starts with
+``'hist'`` and its cache entry lives until evicted. A backfill can still
+rewrite that history without moving the latest interval, so the historical
+token also carries a stamp of each table's history on disk: the storage
+layout, the sealed (all but the newest) partitions and the backfill manifests'
+mtimes. Live windows get a token built from the current versions and are
+recomputed only when one of them moves.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+VERSION_FILENAME = 'data_versions.json'
+
+# Token for windows that end before the latest interval of every table they read
+HISTORICAL = 'hist'
+
+# Seconds a looked-up version is reused before checking again
+POLL_SECONDS = float(os.getenv('DATA_VERSION_POLL_SECONDS', '5'))
+
+# Dashboard DuckDB views holding each collector's data
+DASHBOARD_TABLES = {
+    'generation': 'generation_5min',
+    'prices': 'prices_5min',
+    'transmission': 'transmission_30min',
+    'rooftop': 'rooftop_solar',
+}
+
+# Written by aemo_data_service.shared.backfill next to the partitions it
+# fills, or in .backfill/<stem> for a backfill of a single-file output
+BACKFILL_MANIFEST = '_backfill_manifest.json'
+
+LatestQuery = Callable[[List[str]], Dict[str, Optional[pd.Timestamp]]]
+
+
+def default_version_file() -> Path:
+    """Location of the published versions file (DATA_VERSION_FILE overrides)."""
+    override = os.getenv('DATA_VERSION_FILE')
+    if override:
+        return Path(override)
+    from .config import config
+    return Path(config.data_dir) / VERSION_FILENAME
+
+
+def _read_version_file(path: Path) -> Dict[str, dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def publish_data_version(table: str, latest, version_file: Optional[Path] = None) -> None:
+    """
+    Record the latest interval now available for a table.
+
+    Called by collectors after a successful write. The file is replaced
+    atomically so readers never see a partial document.
+
+    Args:
+        table: Logical table name ('generation', 'prices', ...)
+        latest: Latest settlementdate written
+        version_file: Override the versions file location
+    """
+    if latest is None or pd.isna(latest):
+        return
+    path = Path(version_file) if version_file else default_version_file()
+    versions = _read_version_file(path)
+    versions[table] = {
+        'latest': pd.Timestamp(latest).isoformat(),
+        'published': datetime.now().isoformat(timespec='seconds'),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(versions, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def dashboard_history_files() -> Dict[str, List[Path]]:
+    """Collector outputs behind each logical table's dashboard views."""
+    from .config import config
+
+    return {
+        'generation': [Path(config.scada5_file), Path(config.scada30_file)],
+        'prices': [Path(config.spot_hist_file),
+                   Path(str(config.spot_hist_file).replace('prices5.parquet', 'prices30.parquet'))],
+        'transmission': [Path(config.transmission_output_file),
+                         Path(str(config.transmission_output_file).replace('transmission5.parquet',
+                                                                           'transmission30.parquet'))],
+        'rooftop': [Path(config.rooftop_solar_file)],
+    }
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def history_stamp(output_file) -> str:
+    """
+    Changes when a collector output's history is rewritten.
+
+    Live collection only appends to the file or writes the newest partition
+    (and the write-ahead segment), so neither is part of the stamp. A
+    partitioned backfill rewrites older partitions and a 'file' backfill
+    replaces the file; both save their manifest when done.
+    """
+    path = Path(output_file)
+    partition_dir = path.with_suffix('')
+    partitions = sorted(partition_dir.glob('*.parquet')) if partition_dir.is_dir() else []
+    partitions = [p for p in partitions if not p.name.startswith('_')]
+    if partitions:
+        sealed = partitions[:-1]
+        layout = f"p{len(sealed)}.{max((_mtime_ns(p) for p in sealed), default=0)}"
+    else:
+        layout = 'file'
+    manifests = (partition_dir / BACKFILL_MANIFEST,
+                 path.parent / '.backfill' / path.stem / BACKFILL_MANIFEST)
+    return '.'.join([layout] + [str(_mtime_ns(m)) for m in manifests])
+
+
+def is_historical(token: Optional[str]) -> bool:
+    """True for the token of a window ending before the latest data."""
+    return token is not None and token.split('@')[0] == HISTORICAL
+
+
+def query_dashboard_latest(tables: List[str]) -> Dict[str, Optional[pd.Timestamp]]:
+    """Latest settlementdate per logical table from the dashboard DuckDB views."""
+    from data_service.shared_data_duckdb import duckdb_data_service
+
+    latest = {}
+    for table in tables:
+        view = DASHBOARD_TABLES.get(table, table)
+        try:
+            value = duckdb_data_service.conn.execute(
+                f"SELECT MAX(settlementdate) FROM {view}"
+            ).fetchone()[0]
+            latest[table] = pd.Timestamp(value) if value is not None else None
+        except Exception as e:
+            logger.debug(f"Could not read data version of {view}: {e}")
+            latest[table] = None
+    return latest
+
+
+class DataVersionTracker:
+    """
+    Looks up and briefly caches the latest interval of each table.
+
+    Published versions are preferred; tables missing from the versions file
+    fall back to ``query_latest``. History stamps come from the files in
+    ``history_files`` and are reused for the same poll interval.
+    """
+
+    def __init__(
+        self,
+        version_file: Optional[Path] = None,
+        query_latest: Optional[LatestQuery] = None,
+        poll_seconds: float = POLL_SECONDS,
+        history_files: Optional[Dict[str, List[Path]]] = None
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            version_file: Published versions file (None = not used)
+            query_latest: Fallback returning {table: latest} for a list of tables
+            poll_seconds: How long a looked-up version is reused
+            history_files: Collector outputs per table, stamped into
+                historical tokens (None = plain 'hist')
+        """
+        self.version_file = Path(version_file) if version_file else None
+        self.query_latest = query_latest
+        self.poll_seconds = poll_seconds
+        self.history_files = history_files or {}
+        self._lock = threading.Lock()
+        self._versions: Dict[str, Tuple[float, Optional[pd.Timestamp]]] = {}
+        self._history: Dict[str, Tuple[float, str]] = {}
+        self._published: Dict[str, dict] = {}
+        self._published_mtime: Optional[float] = None
+
+    def _read_published(self) -> Dict[str, dict]:
+        """Re-read the versions file only when it has changed."""
+        if self.version_file is None:
+            return {}
+        try:
+            mtime = self.version_file.stat().st_mtime
+        except OSError:
+            return {}
+        if mtime != self._published_mtime:
+            self._published = _read_version_file(self.version_file)
+            self._published_mtime = mtime
+        return self._published
+
+    def get_many(self, tables: Iterable[str]) -> Dict[str, Optional[pd.Timestamp]]:
+        """Latest interval per table (None when unknown)."""
+        tables = list(tables)
+        now = time.monotonic()
+        with self._lock:
+            result = {}
+            stale = []
+            for table in tables:
+                entry = self._versions.get(table)
+                if entry is not None and now - entry[0] < self.poll_seconds:
+                    result[table] = entry[1]
+                else:
+                    stale.append(table)
+            if not stale:
+                return result
+
+            published = self._read_published()
+            missing = []
+            for table in stale:
+                if table in published:
+                    result[table] = pd.Timestamp(published[table]['latest'])
+                else:
+                    missing.append(table)
+
+            if missing and self.query_latest is not None:
+                result.update(self.query_latest(missing))
+            for table in stale:
+                result.setdefault(table, None)
+                self._versions[table] = (now, result[table])
+            return result
+
+    def get(self, table: str) -> Optional[pd.Timestamp]:
+        return self.get_many([table])[table]
+
+    def history(self, tables: Iterable[str]) -> Optional[str]:
+        """Stamp of the history on disk of tables (None without history_files)."""
+        tables = sorted(t for t in tables if t in self.history_files)
+        if not tables:
+            return None
+        now = time.monotonic()
+        stamps = []
+        with self._lock:
+            for table in tables:
+                entry = self._history.get(table)
+                if entry is None or now - entry[0] >= self.poll_seconds:
+                    stamp = ','.join(history_stamp(f) for f in self.history_files[table])
+                    entry = self._history[table] = (now, stamp)
+                stamps.append(f"{table}={entry[1]}")
+        return hashlib.md5(';'.join(stamps).encode()).hexdigest()[:12]
+
+    def token(self, tables: Iterable[str], end=None) -> Optional[str]:
+        """
+        Version token for a query reading ``tables`` up to ``end``.
+
+        Returns:
+            'hist@<history stamp>' ('hist' without history_files) if the
+            window ends before the latest interval of every table, a token
+            of the current versions otherwise, or None when a version is
+            unknown (callers should fall back to a TTL)
+        """
+        versions = self.get_many(tables)
+        if any(v is None for v in versions.values()):
+            return None
+        if end is not None and pd.Timestamp(end) < min(versions.values()):
+            stamp = self.history(versions)
+            return HISTORICAL if stamp is None else f"{HISTORICAL}@{stamp}"
+        return ','.join(f"{t}={versions[t].isoformat()}" for t in sorted(versions))
+
+    def invalidate(self) -> None:
+        """Forget looked-up versions so the next call checks again."""
+        with self._lock:
+            self._versions.clear()
+            self._history.clear()
+            self._published_mtime = None
+
+
+_tracker: Optional[DataVersionTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_data_versions() -> DataVersionTracker:
+    """Process-wide tracker for the dashboard's DuckDB views."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = DataVersionTracker(default_version_file(), query_dashboard_latest,
+                                          history_files=dashboard_history_files())
+        return _tracker
@@ -8,11 +8,12 @@ and helper functions for view management.
 
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from .logging_config import get_logger
 from .performance_logging import PerformanceLogger, performance_monitor
 from .constants import MINUTES_5_TO_HOURS, MINUTES_30_TO_HOURS
+from .sql import Where
 from data_service.shared_data_duckdb import duckdb_data_service
 
 logger = get_logger(__name__)
@@ -614,7 +615,7 @@ def get_integrated_data_query(
     end_date: datetime,
     resolution: str = '30min',
     columns: Optional[List[str]] = None
-) -> str:
+) -> Tuple[str, List[Any]]:
     """
     Build query for integrated data with optional column selection.
     
@@ -625,7 +626,7 @@ def get_integrated_data_query(
         columns: List of columns to select (None = all)
         
     Returns:
-        SQL query string
+        (SQL query, parameters to bind), for sql.execute
     """
     view_name = f"integrated_data_{resolution}"
     
@@ -634,15 +635,15 @@ def get_integrated_data_query(
     else:
         select_clause = "*"
     
+    where = Where().between('settlementdate', start_date, end_date)
     query = f"""
     SELECT {select_clause}
     FROM {view_name}
-    WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-      AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+    WHERE {where}
     ORDER BY settlementdate
     """
     
-    return query
+    return query, where.params
 
 
 def get_aggregation_query(
@@ -650,7 +651,7 @@ def get_aggregation_query(
     group_by: List[str],
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None
-) -> str:
+) -> Tuple[str, List[Any]]:
     """
     Build query for pre-aggregated data.
     
@@ -661,7 +662,7 @@ def get_aggregation_query(
         end_date: Optional end date filter
         
     Returns:
-        SQL query string
+        (SQL query, parameters to bind), for sql.execute
     """
     # Map to appropriate view
     if aggregation_level == 'hourly' and 'fuel_type' in group_by and 'region' in group_by:
@@ -681,18 +682,18 @@ def get_aggregation_query(
     query = f"SELECT * FROM {view_name}"
     
     # Add date filters if provided
-    filters = []
+    where = Where()
     if start_date:
-        filters.append(f"{date_col} >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'")
+        where.add(f"{date_col} >= ?", start_date)
     if end_date:
-        filters.append(f"{date_col} <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'")
+        where.add(f"{date_col} <= ?", end_date)
     
-    if filters:
-        query += " WHERE " + " AND ".join(filters)
+    if where.clauses:
+        query += f" WHERE {where}"
     
     query += f" ORDER BY {date_col}"
     
-    return query
+    return query, where.params
 
 
 # Example usage and testing
@@ -717,7 +718,7 @@ if __name__ == "__main__":
     end_date = datetime.now()
     start_date = end_date - timedelta(days=1)
     
-    query = get_integrated_data_query(start_date, end_date, '30min', ['settlementdate', 'fuel_type', 'scadavalue'])
+    query, params = get_integrated_data_query(start_date, end_date, '30min', ['settlementdate', 'fuel_type', 'scadavalue'])
     print(f"\nSample query:\n{query[:200]}...")
     
     print("\nDuckDB views initialized successfully!")
\ No newline at end of file
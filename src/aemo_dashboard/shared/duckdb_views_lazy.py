@@ -6,6 +6,7 @@ import os
 import duckdb
 import pandas as pd
 from pathlib import Path
+from data_service.shared_data_duckdb import parquet_source
 from ..shared.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -114,7 +115,7 @@ class LazyDuckDBViews:
                 d.fuel as technology_type_descriptor,
                 d.region as region,
                 d."site name" as station_name
-            FROM read_parquet('{self.file_paths['scada30']}') g
+            FROM {parquet_source(self.file_paths['scada30'])} g
             LEFT JOIN duid_mapping d
             ON UPPER(g.duid) = UPPER(d.duid)
         )
@@ -148,7 +149,7 @@ class LazyDuckDBViews:
                 d.fuel as technology_type_descriptor,
                 d.region as region,
                 d."site name" as station_name
-            FROM read_parquet('{self.file_paths['scada5']}') g
+            FROM {parquet_source(self.file_paths['scada5'])} g
             LEFT JOIN duid_mapping d
             ON UPPER(g.duid) = UPPER(d.duid)
         )
@@ -169,7 +170,7 @@ class LazyDuckDBViews:
         """Create 5-minute prices view"""
         query = f"""
         CREATE OR REPLACE VIEW prices_5min AS
-        SELECT * FROM read_parquet('{self.file_paths['prices5']}')
+        SELECT * FROM {parquet_source(self.file_paths['prices5'])}
         """
         self.conn.execute(query)
     
@@ -177,7 +178,7 @@ class LazyDuckDBViews:
         """Create 30-minute prices view"""
         query = f"""
         CREATE OR REPLACE VIEW prices_30min AS
-        SELECT * FROM read_parquet('{self.file_paths['prices30']}')
+        SELECT * FROM {parquet_source(self.file_paths['prices30'])}
         """
         self.conn.execute(query)
     
@@ -185,7 +186,7 @@ class LazyDuckDBViews:
         """Create 5-minute transmission flows view"""
         query = f"""
         CREATE OR REPLACE VIEW transmission_flows_5min AS
-        SELECT * FROM read_parquet('{self.file_paths['transmission5']}')
+        SELECT * FROM {parquet_source(self.file_paths['transmission5'])}
         """
         self.conn.execute(query)
     
@@ -193,7 +194,7 @@ class LazyDuckDBViews:
         """Create 30-minute transmission flows view"""
         query = f"""
         CREATE OR REPLACE VIEW transmission_flows_30min AS
-        SELECT * FROM read_parquet('{self.file_paths['transmission30']}')
+        SELECT * FROM {parquet_source(self.file_paths['transmission30'])}
         """
         self.conn.execute(query)
     
@@ -201,7 +202,7 @@ class LazyDuckDBViews:
         """Create rooftop solar view"""
         query = f"""
         CREATE OR REPLACE VIEW rooftop_solar_30min AS
-        SELECT * FROM read_parquet('{self.file_paths['rooftop30']}')
+        SELECT * FROM {parquet_source(self.file_paths['rooftop30'])}
         """
         self.conn.execute(query)
     
@@ -17,6 +17,7 @@ from .resolution_manager import resolution_manager
 from .performance_optimizer import PerformanceOptimizer
 from .config import config
 from .performance_logging import PerformanceLogger
+from .sql import Where, execute
 
 # Import DuckDB service
 import sys
@@ -150,18 +151,19 @@ def _query_raw_generation(
     # Build base query
     if region == 'NEM':
         # No region filter - return all data
+        where = Where().between('settlementdate', start_date, end_date)
         query = f"""
             SELECT 
                 settlementdate,
                 duid,
                 scadavalue
             FROM {table}
-            WHERE settlementdate >= '{start_date.isoformat()}'
-              AND settlementdate <= '{end_date.isoformat()}'
+            WHERE {where}
             ORDER BY settlementdate, duid
         """
     else:
         # Need to join with DUID mapping to filter by region
+        where = Where().between('g.settlementdate', start_date, end_date).eq('d.region', region)
         query = f"""
             SELECT 
                 g.settlementdate,
@@ -169,14 +171,12 @@ def _query_raw_generation(
                 g.scadavalue
             FROM {table} g
             JOIN duid_mapping d ON g.duid = d.duid
-            WHERE g.settlementdate >= '{start_date.isoformat()}'
-              AND g.settlementdate <= '{end_date.isoformat()}'
-              AND d.region = '{region}'
+            WHERE {where}
             ORDER BY g.settlementdate, g.duid
         """
     
     # Execute query
-    df = duckdb_data_service.conn.execute(query).df()
+    df = execute(duckdb_data_service.conn, query, where.params).df()
     
     # Ensure consistent data types
     df['settlementdate'] = pd.to_datetime(df['settlementdate'])
@@ -185,6 +185,125 @@ def _query_raw_generation(
     return df
 
 
+def _resolve_resolution(start_date: datetime, end_date: datetime, resolution: str) -> str:
+    """Pick 5min or 30min the same way load_generation_data does for 'auto'."""
+    if resolution != 'auto':
+        return resolution
+    strategy = resolution_manager.get_optimal_resolution_with_fallback(
+        start_date, end_date, 'generation'
+    )
+    return strategy['primary_resolution']
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def load_generation_by_fuel_region(
+    start_date: datetime,
+    end_date: datetime,
+    resolution: str = 'auto'
+) -> pd.DataFrame:
+    """
+    Load generation summed by region and fuel, already pivoted by DuckDB.
+    
+    Replaces fetching DUID-level rows and mapping/grouping them in pandas:
+    the join to the DUID mapping, the SUM and the pivot all run in DuckDB,
+    so only one row per (interval, region) reaches Python. DUIDs missing
+    from the mapping are excluded; see find_unknown_duids().
+    
+    Args:
+        start_date: Start of date range
+        end_date: End of date range
+        resolution: 'auto', '5min' or '30min'
+        
+    Returns:
+        DataFrame with columns settlementdate, region and one column per
+        fuel (NaN where a region has no units of that fuel)
+    """
+    resolution = _resolve_resolution(start_date, end_date, resolution)
+    table = 'generation_5min' if resolution == '5min' else 'generation_30min'
+    mapping = duckdb_data_service._duid_join_table
+    
+    try:
+        with perf_logger.timer("duckdb_generation_fuel_region_query", threshold=0.5):
+            fuels = [row[0] for row in duckdb_data_service.conn.execute(f"""
+                SELECT DISTINCT fuel FROM {mapping}
+                WHERE fuel IS NOT NULL AND region IS NOT NULL
+                ORDER BY fuel
+            """).fetchall()]
+            if not fuels:
+                return pd.DataFrame(columns=['settlementdate', 'region'])
+            
+            # Explicit IN list so DuckDB does not scan the input twice to
+            # discover the pivot columns (PIVOT ... IN takes literals only)
+            fuel_list = ', '.join(_sql_literal(f) for f in fuels)
+            where = Where().between('g.settlementdate', start_date, end_date)
+            df = execute(duckdb_data_service.conn, f"""
+                PIVOT (
+                    SELECT g.settlementdate, d.region, d.fuel, g.scadavalue
+                    FROM {table} g
+                    JOIN (
+                        SELECT duid, ANY_VALUE(fuel) AS fuel, ANY_VALUE(region) AS region
+                        FROM {mapping}
+                        WHERE fuel IS NOT NULL AND region IS NOT NULL
+                        GROUP BY duid
+                    ) d ON g.duid = d.duid
+                    WHERE {where}
+                )
+                ON fuel IN ({fuel_list})
+                USING SUM(scadavalue)
+                GROUP BY settlementdate, region
+                ORDER BY settlementdate, region
+            """, where.params).df()
+    except Exception as e:
+        logger.error(f"Error loading generation by fuel and region via DuckDB: {e}")
+        return pd.DataFrame(columns=['settlementdate', 'region'])
+    
+    df['settlementdate'] = pd.to_datetime(df['settlementdate'])
+    perf_logger.log_data_operation(
+        "Loaded generation by fuel and region via DuckDB",
+        len(df),
+        metadata={"resolution": resolution, "fuels": len(fuels)}
+    )
+    return df
+
+
+def find_unknown_duids(
+    start_date: datetime,
+    end_date: datetime,
+    resolution: str = 'auto'
+) -> pd.DataFrame:
+    """
+    Find DUIDs with generation in a window but no entry in the DUID mapping.
+    
+    Runs as an anti-join in DuckDB and returns only the latest reading of
+    each unknown DUID.
+    
+    Returns:
+        DataFrame with columns duid, settlementdate, scadavalue
+    """
+    resolution = _resolve_resolution(start_date, end_date, resolution)
+    table = 'generation_5min' if resolution == '5min' else 'generation_30min'
+    mapping = duckdb_data_service._duid_join_table
+    
+    where = Where().between('g.settlementdate', start_date, end_date)
+    try:
+        return execute(duckdb_data_service.conn, f"""
+            SELECT g.duid,
+                   MAX(g.settlementdate) AS settlementdate,
+                   ARG_MAX(g.scadavalue, g.settlementdate) AS scadavalue
+            FROM {table} g
+            ANTI JOIN {mapping} d ON g.duid = d.duid
+            WHERE {where}
+            GROUP BY g.duid
+            ORDER BY g.duid
+        """, where.params).df()
+    except Exception as e:
+        logger.error(f"Error checking for unknown DUIDs: {e}")
+        return pd.DataFrame(columns=['duid', 'settlementdate', 'scadavalue'])
+
+
 def _query_generation_by_duids(
     start_date: datetime,
     end_date: datetime,
@@ -197,24 +316,20 @@ def _query_generation_by_duids(
     # Select appropriate table based on resolution
     table = 'generation_5min' if resolution == '5min' else 'generation_30min'
     
-    # Convert DUID list to SQL format
-    duid_list = ','.join([f"'{d}'" for d in duids])
-    
     # Build query
+    where = Where().between('settlementdate', start_date, end_date).isin('duid', duids)
     query = f"""
         SELECT 
             settlementdate,
             duid,
             scadavalue
         FROM {table}
-        WHERE settlementdate >= '{start_date.isoformat()}'
-          AND settlementdate <= '{end_date.isoformat()}'
-          AND duid IN ({duid_list})
+        WHERE {where}
         ORDER BY settlementdate, duid
     """
     
     # Execute query
-    df = duckdb_data_service.conn.execute(query).df()
+    df = execute(duckdb_data_service.conn, query, where.params).df()
     
     # Ensure consistent data types
     df['settlementdate'] = pd.to_datetime(df['settlementdate'])
@@ -252,6 +367,7 @@ def get_generation_summary(
             resolution = resolution_strategy['primary_resolution']
         
         table = 'generation_5min' if resolution == '5min' else 'generation_30min'
+        where = Where().between('settlementdate', start_date, end_date)
         
         # Query summary statistics
         query = f"""
@@ -264,11 +380,10 @@ def get_generation_summary(
                 AVG(scadavalue) as average_generation_mw,
                 MAX(scadavalue) as max_generation_mw
             FROM {table}
-            WHERE settlementdate >= '{start_date.isoformat()}'
-              AND settlementdate <= '{end_date.isoformat()}'
+            WHERE {where}
         """
         
-        result = duckdb_data_service.conn.execute(query).fetchone()
+        result = execute(duckdb_data_service.conn, query, where.params).fetchone()
         
         if result and result[0] > 0:
             return {
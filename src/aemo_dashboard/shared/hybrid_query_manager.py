@@ -6,99 +6,260 @@ efficient querying while maintaining compatibility with existing pandas operatio
 It includes smart caching, progressive loading, and memory management.
 """
 
+import math
 import time
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any, Callable, Tuple, Iterator
 from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
 import threading
 from functools import wraps
 
 from .logging_config import get_logger
 from .performance_logging import PerformanceLogger, performance_monitor
 from .constants import MINUTES_5_TO_HOURS, MINUTES_30_TO_HOURS
+from .data_version import get_data_versions, is_historical
+from .sql import Where, execute
 from data_service.shared_data_duckdb import duckdb_data_service
 
 logger = get_logger(__name__)
 perf_logger = PerformanceLogger(__name__)
 
 
+def _copy_on_write_enabled() -> bool:
+    """True when pandas Copy-on-Write protects shallow copies (always in pandas 3)."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+
+def private_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """A copy of df its holder can modify without touching df (shallow under Copy-on-Write)."""
+    return df.copy(deep=not _copy_on_write_enabled())
+
+
+def _arrow_to_pandas(table: pa.Table) -> pd.DataFrame:
+    """
+    Convert an Arrow table with the dtypes DuckDB's .df() would give.
+
+    DuckDB hands DECIMAL (and HUGEINT, e.g. SUM of an integer column) to
+    Arrow as decimal128, which to_pandas() turns into object columns of
+    Decimals; .df() returns them as float64.
+    """
+    fields = [f.with_type(pa.float64()) if pa.types.is_decimal(f.type) else f for f in table.schema]
+    target = pa.schema(fields, metadata=table.schema.metadata)
+    if not target.equals(table.schema):
+        table = table.cast(target)
+    return table.to_pandas()
+
+
 class SmartCache:
-    """LRU cache with TTL and size limits for query results"""
+    """
+    LRU cache with TTL and size limits for query results.
     
-    def __init__(self, max_size_mb: int = 100, default_ttl: int = 300):
+    By default every get() and put() copies the DataFrame. With
+    ``read_only=True`` the cache takes one private snapshot at put() and hands
+    out shallow views of it: under pandas Copy-on-Write a view is copied only
+    if the caller writes to it; on older pandas the snapshot's NumPy buffers
+    are write-protected, so an in-place write raises instead of corrupting
+    the cache - there, opt in only where callers never modify results.
+    
+    get_or_compute() adds single-flight loading: concurrent misses for one key
+    run the loader once while the other callers wait for its result.
+    """
+    
+    def __init__(self, max_size_mb: int = 100, default_ttl: int = 300, read_only: bool = False):
         """
         Initialize smart cache with size and TTL limits.
         
         Args:
             max_size_mb: Maximum cache size in MB
             default_ttl: Default time-to-live in seconds
+            read_only: Hand out read-only views instead of copies
         """
         self.max_size_bytes = max_size_mb * 1024 * 1024
         self.default_ttl = default_ttl
+        self.read_only = read_only
         self.cache = OrderedDict()
         self.size_tracker = {}
         self.current_size = 0
         self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
         
-        logger.info(f"SmartCache initialized: max_size={max_size_mb}MB, ttl={default_ttl}s")
+        logger.info(f"SmartCache initialized: max_size={max_size_mb}MB, ttl={default_ttl}s, "
+                    f"mode={'read-only views' if read_only else 'copies'}")
     
     def _estimate_dataframe_size(self, df: pd.DataFrame) -> int:
         """Estimate memory usage of a DataFrame in bytes"""
         return df.memory_usage(deep=True).sum()
     
+    def _snapshot(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Private copy of data for storage."""
+        if not self.read_only:
+            return data.copy()
+        if _copy_on_write_enabled():
+            return data.copy(deep=False)
+        if not data.columns.is_unique:
+            return data.copy()
+        
+        # Rebuild from write-protected arrays; extension arrays are copied as-is
+        columns = {}
+        for col in data.columns:
+            series = data[col]
+            if isinstance(series.dtype, np.dtype):
+                values = series.to_numpy(copy=True)
+                values.flags.writeable = False
+                columns[col] = values
+            else:
+                columns[col] = series.array.copy()
+        return pd.DataFrame(columns, index=data.index.copy(), copy=False)
+    
+    def _view(self, data: pd.DataFrame) -> pd.DataFrame:
+        """What callers receive for a stored entry."""
+        return data.copy(deep=not self.read_only)
+    
     def _evict_lru(self, required_space: int) -> None:
         """Evict least recently used items to make space"""
         while self.current_size + required_space > self.max_size_bytes and self.cache:
             # Remove oldest item
-            key, (_, _, size) = self.cache.popitem(last=False)
+            key, (_, _, size, _) = self.cache.popitem(last=False)
             self.current_size -= size
             del self.size_tracker[key]
+            self.evictions += 1
             logger.debug(f"Evicted cache entry: {key}, freed {size/1024/1024:.1f}MB")
     
+    def _lookup(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the stored entry if present and fresh. Caller holds the lock."""
+        if key not in self.cache:
+            return None
+        
+        timestamp, data, size, ttl = self.cache[key]
+        
+        # Check TTL
+        if time.time() - timestamp > ttl:
+            # Expired
+            self.current_size -= size
+            del self.cache[key]
+            del self.size_tracker[key]
+            self.expirations += 1
+            logger.debug(f"Cache entry expired: {key}")
+            return None
+        
+        # Move to end (most recently used)
+        self.cache.move_to_end(key)
+        return data
+    
     def get(self, key: str) -> Optional[pd.DataFrame]:
         """Get item from cache if valid"""
         with self._lock:
-            if key not in self.cache:
+            data = self._lookup(key)
+            if data is None:
+                self.misses += 1
                 return None
-            
-            timestamp, data, size = self.cache[key]
-            
-            # Check TTL
-            if time.time() - timestamp > self.default_ttl:
-                # Expired
-                self.current_size -= size
-                del self.cache[key]
-                del self.size_tracker[key]
-                logger.debug(f"Cache entry expired: {key}")
-                return None
-            
-            # Move to end (most recently used)
-            self.cache.move_to_end(key)
-            return data.copy()  # Return copy to prevent external modifications
+            self.hits += 1
+            return self._view(data)
+    
+    def _store(self, key: str, snapshot: pd.DataFrame, ttl: Optional[float] = None) -> None:
+        """Store an already snapshotted frame. Caller holds the lock."""
+        size = self._estimate_dataframe_size(snapshot)
+        
+        # Check if we need to evict
+        if size > self.max_size_bytes:
+            logger.warning(f"DataFrame too large for cache: {size/1024/1024:.1f}MB")
+            return
+        
+        # Replace any existing entry before making room
+        if key in self.cache:
+            _, _, old_size, _ = self.cache.pop(key)
+            self.current_size -= old_size
+            del self.size_tracker[key]
+        
+        # Evict if necessary
+        self._evict_lru(size)
+        
+        # Store
+        timestamp = time.time()
+        self.cache[key] = (timestamp, snapshot, size, self.default_ttl if ttl is None else ttl)
+        self.size_tracker[key] = size
+        self.current_size += size
+        
+        logger.debug(f"Cached {key}: {size/1024/1024:.1f}MB, total cache: {self.current_size/1024/1024:.1f}MB")
     
-    def put(self, key: str, data: pd.DataFrame, ttl: Optional[int] = None) -> None:
-        """Store item in cache with TTL"""
+    def put(self, key: str, data: pd.DataFrame, ttl: Optional[float] = None) -> None:
+        """Store item in cache with TTL (math.inf = until evicted)"""
+        snapshot = self._snapshot(data)
         with self._lock:
-            # Estimate size
-            size = self._estimate_dataframe_size(data)
-            
-            # Check if we need to evict
-            if size > self.max_size_bytes:
-                logger.warning(f"DataFrame too large for cache: {size/1024/1024:.1f}MB")
-                return
-            
-            # Evict if necessary
-            self._evict_lru(size)
+            self._store(key, snapshot, ttl)
+    
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], pd.DataFrame],
+        ttl: Optional[float] = None,
+        cache_empty: bool = True
+    ) -> pd.DataFrame:
+        """
+        Return the cached entry for key, computing it at most once.
+        
+        If another thread is already computing key, wait for its result
+        instead of running compute() again. An exception raised by compute()
+        is re-raised in every waiting caller.
+        
+        Args:
+            key: Cache key
+            compute: Loader called on a miss
+            ttl: Time-to-live for the new entry (None = default_ttl,
+                math.inf = until evicted)
+            cache_empty: Whether an empty result is stored
             
-            # Store
-            timestamp = time.time()
-            self.cache[key] = (timestamp, data.copy(), size)
-            self.size_tracker[key] = size
-            self.current_size += size
+        Returns:
+            The cached or newly computed DataFrame
+        """
+        with self._lock:
+            data = self._lookup(key)
+            if data is not None:
+                self.hits += 1
+                return self._view(data)
             
-            logger.debug(f"Cached {key}: {size/1024/1024:.1f}MB, total cache: {self.current_size/1024/1024:.1f}MB")
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._in_flight[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            logger.debug(f"Waiting for in-flight load of {key}")
+            return self._view(flight.result())
+        
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            flight.set_exception(e)
+            raise
+        
+        snapshot = self._snapshot(result)
+        with self._lock:
+            if cache_empty or not snapshot.empty:
+                self._store(key, snapshot, ttl)
+            del self._in_flight[key]
+        flight.set_result(snapshot)
+        return self._view(snapshot)
     
     def clear(self) -> None:
         """Clear all cache entries"""
@@ -111,11 +272,20 @@ class SmartCache:
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
             return {
                 'entries': len(self.cache),
                 'size_mb': self.current_size / 1024 / 1024,
                 'max_size_mb': self.max_size_bytes / 1024 / 1024,
-                'utilization': self.current_size / self.max_size_bytes * 100
+                'utilization': self.current_size / self.max_size_bytes * 100,
+                'read_only': self.read_only,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'in_flight': len(self._in_flight),
+                'hit_rate': (self.hits + self.coalesced) / lookups * 100 if lookups else 0
             }
 
 
@@ -130,20 +300,37 @@ class HybridQueryManager:
     - Memory-efficient data loading
     """
     
-    def __init__(self, cache_size_mb: int = 100, cache_ttl: int = 300):
+    def __init__(self, cache_size_mb: int = 100, cache_ttl: int = 300,
+                 read_only_cache: Optional[bool] = None):
         """
         Initialize the hybrid query manager.
         
         Args:
             cache_size_mb: Maximum cache size in MB
             cache_ttl: Default cache TTL in seconds
+            read_only_cache: Return read-only views of cached frames instead of
+                copies. Default: only under pandas Copy-on-Write, where callers
+                can still modify the frames they get; on pandas 2 without it
+                the views would be write-protected, so callers get copies.
         """
-        self.conn = duckdb_data_service.conn
-        self.cache = SmartCache(max_size_mb=cache_size_mb, default_ttl=cache_ttl)
+        if read_only_cache is None:
+            read_only_cache = _copy_on_write_enabled()
+        self._conn = None
+        self.cache = SmartCache(max_size_mb=cache_size_mb, default_ttl=cache_ttl, read_only=read_only_cache)
+        self.versions = get_data_versions()
         self._query_count = 0
-        self._cache_hits = 0
         
         logger.info("HybridQueryManager initialized")
+
+    @property
+    def conn(self):
+        """DuckDB connection for the calling thread (an assigned one, if any)"""
+        conn = getattr(self, '_conn', None)
+        return conn if conn is not None else duckdb_data_service.conn
+
+    @conn.setter
+    def conn(self, value):
+        self._conn = value
     
     def _build_cache_key(self, *args, **kwargs) -> str:
         """Build cache key from query parameters"""
@@ -152,6 +339,32 @@ class HybridQueryManager:
         key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
         return "|".join(key_parts)
     
+    def versioned_cache_key(
+        self,
+        cache_key: str,
+        end_date: datetime,
+        tables: Tuple[str, ...] = ('generation', 'prices')
+    ) -> Tuple[str, Optional[float]]:
+        """
+        Qualify a cache key with the data version of the tables it reads.
+        
+        Args:
+            cache_key: Key built from the query parameters
+            end_date: End of the queried window
+            tables: Data-version tables the query reads
+            
+        Returns:
+            (key, ttl) - a window ending before the latest data cannot change
+            and is cached until evicted; a live window is keyed on the current
+            versions so it is recomputed as soon as new data lands. If no
+            version is known the key is unchanged and the default TTL applies.
+        """
+        token = self.versions.token(tables, end_date)
+        if token is None:
+            return cache_key, None
+        ttl = math.inf if is_historical(token) else None
+        return f"{cache_key}|v={token}", ttl
+    
     @performance_monitor(threshold=1.0)
     def query_integrated_data(
         self,
@@ -159,7 +372,8 @@ class HybridQueryManager:
         end_date: datetime,
         columns: Optional[List[str]] = None,
         resolution: str = '30min',
-        use_cache: bool = True
+        use_cache: bool = True,
+        progress_callback: Optional[Callable[[int], None]] = None
     ) -> pd.DataFrame:
         """
         Query integrated data (generation + price + DUID info) with smart caching.
@@ -170,6 +384,7 @@ class HybridQueryManager:
             columns: Specific columns to return (None = all)
             resolution: Data resolution ('5min' or '30min')
             use_cache: Whether to use cache
+            progress_callback: Called with rows loaded so far while streaming
             
         Returns:
             DataFrame with integrated data
@@ -179,13 +394,18 @@ class HybridQueryManager:
             'integrated_data', start_date, end_date, columns, resolution
         )
         
-        # Check cache
+        # Serve from cache; concurrent misses share one query
         if use_cache:
-            cached_result = self.cache.get(cache_key)
-            if cached_result is not None:
-                self._cache_hits += 1
-                logger.debug(f"Cache hit for integrated data: {start_date} to {end_date}")
-                return cached_result
+            cache_key, ttl = self.versioned_cache_key(cache_key, end_date)
+            return self.cache.get_or_compute(
+                cache_key,
+                lambda: self.query_integrated_data(
+                    start_date, end_date, columns, resolution,
+                    use_cache=False, progress_callback=progress_callback
+                ),
+                ttl=ttl,
+                cache_empty=False
+            )
         
         self._query_count += 1
         
@@ -195,6 +415,8 @@ class HybridQueryManager:
         else:
             select_columns = ", ".join(columns)
         
+        where = Where().between('g.settlementdate', start_date, end_date)
+        
         # Build query based on resolution
         # Revenue = MW × $/MWh × hours
         if resolution == '5min':
@@ -218,8 +440,7 @@ class HybridQueryManager:
                 LEFT JOIN prices_5min p
                     ON g.settlementdate = p.settlementdate
                     AND d.region = p.regionid
-                WHERE g.settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                  AND g.settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+                WHERE {where}
             ) t
             """
         else:
@@ -243,15 +464,14 @@ class HybridQueryManager:
                 LEFT JOIN prices_30min p
                     ON g.settlementdate = p.settlementdate
                     AND d.region = p.regionid
-                WHERE g.settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-                  AND g.settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+                WHERE {where}
             ) t
             """
         
         # Execute query
         with perf_logger.timer("duckdb_integrated_query", threshold=0.5):
             logger.info("===== EXECUTING QUERY: %s" % query[:500])
-            result = self.conn.execute(query).df()
+            result = self._collect(query, progress_callback=progress_callback, params=where.params)
             logger.info("===== SQL query returned %d records =====" % len(result))
         
         # Ensure proper data types
@@ -264,10 +484,6 @@ class HybridQueryManager:
                 if col in result.columns:
                     result[col] = pd.to_numeric(result[col], errors='coerce')
         
-        # Cache result
-        if use_cache and not result.empty:
-            self.cache.put(cache_key, result)
-        
         logger.info(f"Loaded {len(result):,} integrated records for {start_date} to {end_date}")
         
         return result
@@ -313,13 +529,25 @@ class HybridQueryManager:
 
         if use_cache:
 
-            cached_result = self.cache.get(cache_key)
+            cache_key, ttl = self.versioned_cache_key(cache_key, end_date)
+
+            return self.cache.get_or_compute(
+
+                cache_key,
+
+                lambda: self.query_aggregated_data(
 
-            if cached_result is not None:
+                    start_date, end_date, group_by, region_filters, fuel_filters,
 
-                self._cache_hits += 1
+                    resolution=resolution, use_cache=False
 
-                return cached_result
+                ),
+
+                ttl=ttl,
+
+                cache_empty=False
+
+            )
 
 
 
@@ -345,35 +573,15 @@ class HybridQueryManager:
 
 
 
-        sq = chr(39)
-
-        start_str = start_date.strftime("%Y-%m-%d %H:%M:%S")
-
-        end_str = end_date.strftime("%Y-%m-%d %H:%M:%S")
-
-        where_parts = [
-
-            f"g.settlementdate >= {sq}{start_str}{sq}",
-
-            f"g.settlementdate <= {sq}{end_str}{sq}",
-
-        ]
+        where = Where().between("g.settlementdate", start_date, end_date)
 
         if region_filters:
 
-            regions_str = ", ".join(f"{sq}{r}{sq}" for r in region_filters)
-
-            where_parts.append(f"d.region IN ({regions_str})")
+            where.isin("d.region", region_filters)
 
         if fuel_filters:
 
-            fuels_str = ", ".join(f"{sq}{fu}{sq}" for fu in fuel_filters)
-
-            where_parts.append(f"d.fuel IN ({fuels_str})")
-
-
-
-        where_clause = " AND ".join(where_parts)
+            where.isin("d.fuel", fuel_filters)
 
 
 
@@ -413,7 +621,7 @@ class HybridQueryManager:
 
                 AND d.region = p.regionid
 
-            WHERE {where_clause}
+            WHERE {where}
 
             GROUP BY d.fuel, d.region, g.duid
 
@@ -423,9 +631,9 @@ class HybridQueryManager:
 
         with perf_logger.timer("duckdb_aggregated_query", threshold=0.5):
 
-            logger.info(f"Executing aggregated query ({resolution}): {len(where_parts)} filters")
+            logger.info(f"Executing aggregated query ({resolution}): {len(where.clauses)} filters")
 
-            result = self.conn.execute(query).df()
+            result = execute(self.conn, query, where.params).df()
 
             logger.info(f"Aggregated query returned {len(result)} DUID-level rows")
 
@@ -445,20 +653,67 @@ class HybridQueryManager:
 
 
 
-        if use_cache and not result.empty:
-
-            self.cache.put(cache_key, result)
-
-
-
         return result
 
 
+    def query_stream(
+        self,
+        query: str,
+        batch_size: int = 100000,
+        as_arrow: bool = False,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        params: Optional[List[Any]] = None
+    ) -> Iterator[Any]:
+        """
+        Stream query results from a single execution.
+        
+        The query runs once on its own cursor and rows are pulled through
+        DuckDB's Arrow record-batch reader, so memory is bounded by the batch
+        size and batches arrive in the query's own order. The shared
+        connection stays free for other queries while the stream is open.
+        
+        Args:
+            query: SQL query to execute
+            batch_size: Maximum rows per batch
+            as_arrow: Yield pyarrow.RecordBatch instead of DataFrames
+            progress_callback: Called with the total rows streamed so far
+            params: Values for the query's ? placeholders
+            
+        Yields:
+            DataFrame (or RecordBatch) batches
+        """
+        with self._record_batch_reader(query, batch_size, params) as reader:
+            rows_streamed = 0
+            for batch in reader:
+                if batch.num_rows == 0:
+                    continue
+                rows_streamed += batch.num_rows
+                if progress_callback:
+                    progress_callback(rows_streamed)
+                yield batch if as_arrow else _arrow_to_pandas(pa.Table.from_batches([batch]))
+            
+            logger.debug(f"Streamed {rows_streamed:,} rows in batches of {batch_size:,}")
+    
+    @contextmanager
+    def _record_batch_reader(self, query: str, batch_size: int, params: Optional[List[Any]] = None):
+        """Run query once on its own cursor and yield its Arrow record-batch reader."""
+        cursor = self.conn.cursor()
+        try:
+            result = execute(cursor, query, params)
+            # to_arrow_reader() replaced fetch_record_batch() in DuckDB 1.4
+            if hasattr(result, 'to_arrow_reader'):
+                yield result.to_arrow_reader(batch_size)
+            else:
+                yield result.fetch_record_batch(batch_size)
+        finally:
+            cursor.close()
+    
     def query_with_progress(
         self,
         query: str,
         chunk_size: int = 50000,
-        progress_callback: Optional[Callable[[int], None]] = None
+        progress_callback: Optional[Callable[[int], None]] = None,
+        params: Optional[List[Any]] = None
     ) -> pd.DataFrame:
         """
         Execute query with progress updates, loading in chunks.
@@ -467,52 +722,59 @@ class HybridQueryManager:
             query: SQL query to execute
             chunk_size: Number of rows per chunk
             progress_callback: Function to call with progress percentage
+            params: Values for the query's ? placeholders
             
         Returns:
             Complete DataFrame result
         """
-        # First, get total row count
-        count_query = f"SELECT COUNT(*) FROM ({query}) t"
-        total_rows = self.conn.execute(count_query).fetchone()[0]
-        
-        if total_rows == 0:
-            return pd.DataFrame()
+        # A percentage needs the total up front; skip the count when nobody listens
+        total_rows = None
+        if progress_callback:
+            total_rows = execute(self.conn, f"SELECT COUNT(*) FROM ({query}) t", params).fetchone()[0]
+            logger.info(f"Loading {total_rows:,} rows in batches of {chunk_size:,}")
         
-        logger.info(f"Loading {total_rows:,} rows in chunks of {chunk_size:,}")
+        def report(rows_loaded: int) -> None:
+            progress_callback(min(100, int(rows_loaded / max(total_rows, 1) * 100)))
         
-        chunks = []
-        rows_loaded = 0
-        
-        # Load in chunks
-        for offset in range(0, total_rows, chunk_size):
-            chunk_query = f"{query} LIMIT {chunk_size} OFFSET {offset}"
-            
-            with perf_logger.timer("chunk_load", threshold=0.1):
-                chunk = self.conn.execute(chunk_query).df()
-            
-            chunks.append(chunk)
-            rows_loaded += len(chunk)
-            
-            # Report progress
-            if progress_callback:
-                progress = int(rows_loaded / total_rows * 100)
-                progress_callback(progress)
-            
-            # Log progress
-            if rows_loaded % (chunk_size * 10) == 0:
-                logger.info(f"Progress: {rows_loaded:,}/{total_rows:,} rows ({rows_loaded/total_rows*100:.1f}%)")
-        
-        # Combine chunks
-        result = pd.concat(chunks, ignore_index=True)
+        with perf_logger.timer("stream_load", threshold=0.5):
+            result = self._collect(query, chunk_size, report if progress_callback else None, params=params)
         
         logger.info(f"Completed loading {len(result):,} rows")
         
         return result
     
+    def _collect(
+        self,
+        query: str,
+        batch_size: int = 100000,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        params: Optional[List[Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Stream a query's Arrow batches and convert them to pandas once.
+        
+        The reader's schema keeps the columns of an empty result, and the
+        conversion gives the dtypes .df() would.
+        """
+        with self._record_batch_reader(query, batch_size, params) as reader:
+            batches = []
+            rows_loaded = 0
+            for batch in reader:
+                if batch.num_rows == 0:
+                    continue
+                batches.append(batch)
+                rows_loaded += batch.num_rows
+                if progress_callback:
+                    progress_callback(rows_loaded)
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+        return _arrow_to_pandas(table)
+    
     def query_chunks(
         self,
         query: str,
-        chunk_size: int = 100000
+        chunk_size: int = 100000,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        params: Optional[List[Any]] = None
     ) -> Iterator[pd.DataFrame]:
         """
         Stream query results in chunks for memory-efficient processing.
@@ -520,23 +782,14 @@ class HybridQueryManager:
         Args:
             query: SQL query to execute
             chunk_size: Number of rows per chunk
+            progress_callback: Called with the total rows streamed so far
+            params: Values for the query's ? placeholders
             
         Yields:
             DataFrame chunks
         """
-        offset = 0
-        
-        while True:
-            chunk_query = f"{query} LIMIT {chunk_size} OFFSET {offset}"
-            chunk = self.conn.execute(chunk_query).df()
-            
-            if chunk.empty:
-                break
-            
-            yield chunk
-            offset += chunk_size
-            
-            logger.debug(f"Yielded chunk: offset={offset}, size={len(chunk)}")
+        yield from self.query_stream(query, batch_size=chunk_size, progress_callback=progress_callback,
+                                     params=params)
     
     def aggregate_by_group(
         self,
@@ -566,12 +819,19 @@ class HybridQueryManager:
             'aggregate', start_date, end_date, group_by, aggregations, resolution
         )
         
-        # Check cache
+        # Serve from cache; concurrent misses share one query
         if use_cache:
-            cached_result = self.cache.get(cache_key)
-            if cached_result is not None:
-                self._cache_hits += 1
-                return cached_result
+            cache_key, ttl = self.versioned_cache_key(cache_key, end_date)
+            return self.cache.get_or_compute(
+                cache_key,
+                lambda: self.aggregate_by_group(
+                    start_date, end_date, group_by, aggregations, resolution, use_cache=False
+                ),
+                ttl=ttl,
+                cache_empty=False
+            )
+        
+        self._query_count += 1
         
         # Build aggregation expressions
         agg_expressions = []
@@ -589,26 +849,22 @@ class HybridQueryManager:
         
         # Build query - use integrated_data view which has all fields
         table = f"integrated_data_{resolution}"
+        where = Where().between('settlementdate', start_date, end_date)
         query = f"""
         SELECT 
             {', '.join(group_by)},
             {', '.join(agg_expressions)}
         FROM {table}
-        WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-          AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+        WHERE {where}
         GROUP BY {', '.join(group_by)}
         ORDER BY {', '.join(group_by)}
         """
         
         # Execute
         logger.info("===== EXECUTING QUERY: %s" % query[:500])
-        result = self.conn.execute(query).df()
+        result = execute(self.conn, query, where.params).df()
         logger.info("===== SQL query returned %d records =====" % len(result))
         
-        # Cache if not empty
-        if use_cache and not result.empty:
-            self.cache.put(cache_key, result)
-        
         return result
     
     def get_date_ranges(self) -> Dict[str, Dict[str, Any]]:
@@ -619,12 +875,10 @@ class HybridQueryManager:
         """Get query manager statistics"""
         cache_stats = self.cache.get_stats()
         
-        hit_rate = (self._cache_hits / self._query_count * 100) if self._query_count > 0 else 0
-        
         return {
             'query_count': self._query_count,
-            'cache_hits': self._cache_hits,
-            'cache_hit_rate': hit_rate,
+            'cache_hits': cache_stats['hits'] + cache_stats['coalesced'],
+            'cache_hit_rate': cache_stats['hit_rate'],
             'cache_stats': cache_stats
         }
     
@@ -0,0 +1,334 @@
+"""
+Precompute store - tab datasets built once per data version for all sessions
+
+Several tabs show the same data to every visitor: the penetration tab's
+multi-year generation, coal evolution capacity factors, the futures curve,
+STTM gas prices and volumes, and the LOESS-smoothed fuel relatives. Each
+session used to query and smooth these itself when the tab was opened, so
+every open of a tab paid for the full build.
+
+Builders are registered under a name with the data-version tables they read
+(shared/data_version.py), either as a callable or as the ``'module:function'``
+path of one, imported on the first build. The tabs' datasets are registered
+by path in shared/tab_datasets.py when the store is created, so no tab module
+is imported until its tab opens or its dataset is built. The store keeps one
+result per (name, parameters) for the whole process:
+
+- A result is fresh while the version token of its tables is unchanged, or
+  for ``min_interval`` seconds after it was built even if the token has moved
+  (multi-year charts don't need rebuilding every dispatch interval).
+- Datasets without version tables (CSV files, gas tables) expire after
+  ``ttl`` seconds. So do versioned datasets while their version is unknown.
+- A stale result is still returned while a rebuild runs on the store's
+  worker pool, so only the very first request for a dataset waits.
+- Concurrent first requests share one build.
+
+The shared refresh engine calls refresh() once per collector cycle to rebuild
+stale results in the background and drop ones nobody has read for
+``idle_seconds``.
+
+Builds run on the store's worker threads (or the first caller's), so a
+builder takes its DuckDB connection when it runs - duckdb_data_service.conn
+is the running thread's cursor - rather than one captured elsewhere.
+
+Results are shared by every session: callers must copy a DataFrame before
+modifying it, and must not store Plotly figures here (a figure belongs to the
+pane it is shown in).
+"""
+
+import importlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds an unversioned result is served before it is rebuilt
+DEFAULT_TTL = float(os.getenv('PRECOMPUTE_TTL_SECONDS', '3600'))
+
+# Seconds without a read after which refresh() drops a result
+IDLE_SECONDS = float(os.getenv('PRECOMPUTE_IDLE_SECONDS', '21600'))
+
+# Background build threads
+WORKERS = int(os.getenv('PRECOMPUTE_WORKERS', '2'))
+
+Key = Tuple[str, Tuple[Tuple[str, Hashable], ...]]
+
+# A builder, or the 'module:function' path of one
+Builder = Union[Callable[..., Any], str]
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable form of a builder parameter (lists become tuples)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class _Dataset:
+    """A registered builder and its freshness rules"""
+
+    def __init__(self, name: str, builder: Builder, tables: Tuple[str, ...],
+                 ttl: float, min_interval: float):
+        self.name = name
+        self.builder = builder
+        self.tables = tables
+        self.ttl = ttl
+        self.min_interval = min_interval
+
+    def build(self, **params) -> Any:
+        if isinstance(self.builder, str):
+            module, _, function = self.builder.partition(':')
+            self.builder = getattr(importlib.import_module(module), function)
+        return self.builder(**params)
+
+
+class _Entry:
+    """The latest result of one dataset for one set of parameters"""
+
+    def __init__(self, params: Dict[str, Any], now: float):
+        self.params = params
+        self.value: Any = None
+        self.token: Optional[str] = None
+        self.built_at: Optional[float] = None
+        self.used_at = now
+        self.pending: Optional[Future] = None
+
+
+class PrecomputeStore:
+    """
+    Process-wide results of registered dataset builders.
+
+    Usage:
+        store.register('gas.sttm_prices', 'aemo_dashboard.gas.sttm_tab:load_prices')
+        prices = store.get('gas.sttm_prices')
+    """
+
+    def __init__(self, versions=None, workers: int = WORKERS, idle_seconds: float = IDLE_SECONDS):
+        """
+        Initialize the store.
+
+        Args:
+            versions: DataVersionTracker giving version tokens (None = the
+                process-wide tracker, looked up on first use)
+            workers: Threads for background builds
+            idle_seconds: Unread results older than this are dropped by refresh()
+        """
+        self._versions = versions
+        self.workers = workers
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._datasets: Dict[str, _Dataset] = {}
+        self._entries: Dict[Key, _Entry] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stats = {'hits': 0, 'stale': 0, 'misses': 0, 'builds': 0, 'errors': 0,
+                       'build_seconds': 0.0}
+
+    def register(self, name: str, builder: Builder, tables: Iterable[str] = (),
+                 ttl: float = DEFAULT_TTL, min_interval: float = 0.0) -> None:
+        """
+        Register (or replace) the builder of a dataset.
+
+        Args:
+            name: Dataset name, e.g. 'futures.contracts'
+            builder: Called with the parameters given to get(); must not
+                depend on any session's state. A 'module:function' string
+                is imported on the first build
+            tables: Data-version tables the result depends on ('generation',
+                'prices', ...); empty = expire on ttl only
+            ttl: Seconds an unversioned result stays fresh
+            min_interval: Seconds a versioned result stays fresh after a
+                build even if new data has arrived
+        """
+        with self._lock:
+            self._datasets[name] = _Dataset(name, builder, tuple(tables), ttl, min_interval)
+
+    def _dataset(self, name: str) -> _Dataset:
+        with self._lock:
+            dataset = self._datasets.get(name)
+        if dataset is None:
+            raise KeyError(f"No precomputed dataset registered as {name!r}")
+        return dataset
+
+    def _token(self, dataset: _Dataset) -> Optional[str]:
+        """Current version token of the dataset's tables (None = unversioned or unknown)"""
+        if not dataset.tables:
+            return None
+        if self._versions is None:
+            from .data_version import get_data_versions
+            self._versions = get_data_versions()
+        try:
+            return self._versions.token(dataset.tables)
+        except Exception as e:
+            logger.debug(f"Could not read data version for {dataset.name}: {e}")
+            return None
+
+    @staticmethod
+    def _is_fresh(dataset: _Dataset, entry: _Entry, token: Optional[str], now: float) -> bool:
+        if entry.built_at is None:
+            return False
+        age = now - entry.built_at
+        if token is not None and entry.token is not None:
+            return entry.token == token or age < dataset.min_interval
+        return age < dataset.ttl
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix='precompute')
+        return self._pool
+
+    def _schedule(self, dataset: _Dataset, entry: _Entry, token: Optional[str]) -> Future:
+        """Start a background build unless one is running (call with the lock held)"""
+        if entry.pending is None:
+            entry.pending = Future()
+            self._get_pool().submit(self._build, dataset, entry, token, entry.pending)
+        return entry.pending
+
+    def _build(self, dataset: _Dataset, entry: _Entry, token: Optional[str], future: Future) -> None:
+        """Run the builder and publish its result to the entry and the waiting callers"""
+        start = time.perf_counter()
+        try:
+            value = dataset.build(**entry.params)
+        except Exception as e:
+            logger.error(f"Error building precomputed {dataset.name} {entry.params}: {e}")
+            with self._lock:
+                self._stats['errors'] += 1
+                entry.pending = None
+                if entry.built_at is None:
+                    # Nothing to serve; let the next request try again
+                    key = (dataset.name, _freeze(sorted(entry.params.items())))
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+            future.set_exception(e)
+            return
+
+        seconds = time.perf_counter() - start
+        with self._lock:
+            entry.value = value
+            entry.token = token
+            entry.built_at = time.monotonic()
+            entry.pending = None
+            self._stats['builds'] += 1
+            self._stats['build_seconds'] += seconds
+        logger.info(f"Precomputed {dataset.name} {entry.params} in {seconds:.2f}s")
+        future.set_result(value)
+
+    def get(self, name: str, **params) -> Any:
+        """
+        Result of the named dataset for params.
+
+        Fresh results are returned directly. A stale result is returned too
+        while it is rebuilt in the background. Only when there is no result
+        yet does the caller wait, building it itself or joining a build that
+        is already running. Builder errors are raised to the waiting callers.
+        """
+        dataset = self._dataset(name)
+        token = self._token(dataset)
+        key = (name, _freeze(sorted(params.items())))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(params, now)
+            entry.used_at = now
+
+            if entry.built_at is not None:
+                if self._is_fresh(dataset, entry, token, now):
+                    self._stats['hits'] += 1
+                else:
+                    self._stats['stale'] += 1
+                    self._schedule(dataset, entry, token)
+                return entry.value
+
+            self._stats['misses'] += 1
+            future = entry.pending
+            owner = future is None
+            if owner:
+                future = entry.pending = Future()
+
+        if owner:
+            self._build(dataset, entry, token, future)
+        return future.result()
+
+    def warm(self, name: str, **params) -> Future:
+        """Build the dataset in the background unless a fresh result exists"""
+        dataset = self._dataset(name)
+        token = self._token(dataset)
+        key = (name, _freeze(sorted(params.items())))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(params, now)
+            if entry.pending is None and self._is_fresh(dataset, entry, token, now):
+                future = Future()
+                future.set_result(entry.value)
+                return future
+            return self._schedule(dataset, entry, token)
+
+    def refresh(self) -> int:
+        """
+        Rebuild stale results in the background and drop idle ones.
+
+        Called once per collector cycle by the shared refresh engine.
+
+        Returns:
+            Number of rebuilds started
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+            datasets = dict(self._datasets)
+
+        tokens = {name: self._token(dataset) for name, dataset in datasets.items()}
+        now = time.monotonic()
+        started = 0
+        with self._lock:
+            for key, entry in entries:
+                if entry.pending is not None or self._entries.get(key) is not entry:
+                    continue
+                dataset = datasets.get(key[0])
+                if dataset is None or now - entry.used_at > self.idle_seconds:
+                    del self._entries[key]
+                    continue
+                if entry.built_at is not None and not self._is_fresh(dataset, entry, tokens[key[0]], now):
+                    self._schedule(dataset, entry, tokens[key[0]])
+                    started += 1
+        if started:
+            logger.info(f"Precompute refresh: rebuilding {started} stale result(s)")
+        return started
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Forget results of one dataset (or all); builds already running still finish"""
+        with self._lock:
+            for key in [k for k in self._entries if name is None or k[0] == name]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/stale/miss/build counters and the number of results held"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['build_seconds'] = round(stats['build_seconds'], 3)
+        return stats
+
+
+_store: Optional[PrecomputeStore] = None
+_store_lock = threading.Lock()
+
+
+def get_precompute_store() -> PrecomputeStore:
+    """Process-wide precompute store shared by all dashboard sessions"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from .tab_datasets import register_tab_datasets
+            _store = PrecomputeStore()
+            register_tab_datasets(_store)
+        return _store
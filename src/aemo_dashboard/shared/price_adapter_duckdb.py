@@ -16,6 +16,7 @@ from .logging_config import get_logger
 from .resolution_manager import resolution_manager
 from .config import config
 from .performance_logging import PerformanceLogger
+from .sql import Where, execute
 
 # Import DuckDB service
 import sys
@@ -199,11 +200,10 @@ def get_price_summary(
         
         table = 'prices_5min' if resolution == '5min' else 'prices_30min'
         
-        # Build region filter
-        region_filter = ""
+        # Build filter
+        where = Where().between('settlementdate', start_date, end_date)
         if regions:
-            region_list = ','.join([f"'{r}'" for r in regions])
-            region_filter = f"AND regionid IN ({region_list})"
+            where.isin('regionid', regions)
         
         # Query summary statistics by region
         query = f"""
@@ -217,14 +217,12 @@ def get_price_summary(
                 MAX(rrp) as max_price,
                 STDDEV(rrp) as price_volatility
             FROM {table}
-            WHERE settlementdate >= '{start_date.isoformat()}'
-              AND settlementdate <= '{end_date.isoformat()}'
-              {region_filter}
+            WHERE {where}
             GROUP BY regionid
             ORDER BY regionid
         """
         
-        df = duckdb_data_service.conn.execute(query).df()
+        df = execute(duckdb_data_service.conn, query, where.params).df()
         
         # Convert to summary dictionary
         summary = {
@@ -306,6 +304,7 @@ def get_price_statistics(
     """
     try:
         table = 'prices_5min' if resolution == '5min' else 'prices_30min'
+        where = Where().between('settlementdate', start_date, end_date).eq('regionid', region)
         
         query = f"""
             SELECT 
@@ -322,12 +321,10 @@ def get_price_statistics(
                 COUNT(CASE WHEN rrp < 0 THEN 1 END) as negative_count,
                 COUNT(CASE WHEN rrp > 300 THEN 1 END) as high_price_count
             FROM {table}
-            WHERE settlementdate >= '{start_date.isoformat()}'
-              AND settlementdate <= '{end_date.isoformat()}'
-              AND regionid = '{region}'
+            WHERE {where}
         """
         
-        result = duckdb_data_service.conn.execute(query).fetchone()
+        result = execute(duckdb_data_service.conn, query, where.params).fetchone()
         
         if result:
             return {
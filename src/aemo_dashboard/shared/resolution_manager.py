@@ -6,6 +6,9 @@ Intelligently selects between 5-minute and 30-minute data based on:
 - Memory usage estimates  
 - User preferences
 - Data type characteristics
+
+For charts with a point budget it can also step up to the stored hourly,
+daily and monthly rollups (see rollups.py).
 """
 
 import os
@@ -29,6 +32,16 @@ class DataResolutionManager:
         'performance_days': 7,         # Recommend 30-min after 1 week
         'realtime_hours': 24,          # Always use 5-min for last 24h
         'max_records_5min': 1000000,   # Max 5-min records before switching
+        'max_chart_points': int(os.getenv('CHART_POINT_BUDGET', '10000')),  # Points per series
+    }
+
+    # Minutes per interval at each resolution (monthly is an average month)
+    RESOLUTION_MINUTES = {
+        '5min': 5,
+        '30min': 30,
+        'hourly': 60,
+        'daily': 24 * 60,
+        'monthly': 365.25 / 12 * 24 * 60,
     }
     
     # Data type characteristics (bytes per record estimates)
@@ -163,6 +176,66 @@ class DataResolutionManager:
         logger.info(f"Short range ({duration_days:.1f} days) detected, using 5-minute resolution for {data_type}")
         return '5min'
     
+    def get_budget_resolution(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        data_type: str,
+        max_points: Optional[int] = None,
+        user_preference: str = 'auto',
+        available_levels: Optional[Tuple[str, ...]] = None
+    ) -> str:
+        """
+        Select a resolution whose point count fits a chart's budget
+
+        Starts from get_optimal_resolution() and only steps up to a stored
+        rollup when that resolution has more intervals than the budget:
+        the finest rollup that fits is used, or the coarsest one if none do.
+        Multi-year ranges therefore never read 30-minute rows once rollups
+        exist.
+
+        Args:
+            start_date, end_date: Date range
+            data_type: 'generation', 'price', 'transmission', 'rooftop'
+            max_points: Intervals per series the chart can show
+                (defaults to the max_chart_points threshold)
+            user_preference: Passed to get_optimal_resolution()
+            available_levels: Rollup levels built for data_type
+                (defaults to asking the rollup manager; none against an
+                external DuckDB, where rollups are not built)
+
+        Returns:
+            '5min', '30min', 'hourly', 'daily' or 'monthly'
+        """
+        resolution = self.get_optimal_resolution(start_date, end_date, data_type, user_preference)
+        if user_preference != 'auto':
+            return resolution
+
+        if max_points is None:
+            max_points = self.PERFORMANCE_THRESHOLDS['max_chart_points']
+        if self.estimate_points(start_date, end_date, resolution) <= max_points:
+            return resolution
+
+        if available_levels is None:
+            from .rollups import rollup_manager
+            available_levels = rollup_manager.available_levels(data_type)
+        if not available_levels:
+            logger.info(f"No rollups for {data_type}; using {resolution} over the point budget")
+            return resolution
+
+        for level in available_levels:
+            resolution = level
+            if self.estimate_points(start_date, end_date, level) <= max_points:
+                break
+
+        logger.info(f"Point budget {max_points:,} selects {resolution} resolution for {data_type}")
+        return resolution
+
+    def estimate_points(self, start_date: datetime, end_date: datetime, resolution: str) -> int:
+        """Number of intervals of a resolution in a date range"""
+        minutes = (pd.Timestamp(end_date) - pd.Timestamp(start_date)).total_seconds() / 60
+        return int(minutes // self.RESOLUTION_MINUTES[resolution]) + 1
+
     def estimate_memory_usage(
         self,
         start_date: datetime,
@@ -0,0 +1,249 @@
+"""
+Rollups - stored hourly, daily and monthly aggregates of collector data
+
+Multi-year charts used to read 30-minute rows (or views aggregating them) on
+every query, and ``monthly_summary`` is rebuilt from the full history. The
+rollups here are physical DuckDB tables maintained incrementally:
+
+    30min source -> <prefix>_hourly -> <prefix>_daily -> <prefix>_monthly
+
+Each level keeps the average of every value column plus its sum and the
+number of 30-minute rows behind it, so coarser levels are built from the
+level below without going back to the source and averages stay exact.
+
+``rollup_watermarks`` records the latest source interval folded in per
+rollup. A refresh only rebuilds periods from the one containing the
+watermark onwards, so after each collector cycle it touches the last hour,
+day and month rather than the whole history. Data back-filled before the
+watermark needs ``rebuild()``.
+
+Period timestamps are ``date_trunc`` of settlementdate, matching the
+existing daily views. The resolution manager picks a level for a chart's
+point budget from ``available_levels()``.
+
+Refreshes write through a cursor of their own, so their transaction never
+spans another thread's queries. Rollups live only in the dashboard's
+aemo_cache.duckdb: with AEMO_DUCKDB_PATH the collector's database is read
+through per-query read-only connections and nothing builds rollups there, so
+no levels are available and charts stay on 30-minute rows.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from .logging_config import get_logger
+from .performance_logging import PerformanceLogger
+
+logger = get_logger(__name__)
+perf_logger = PerformanceLogger(__name__)
+
+# Stored levels, finest first, with their DuckDB date_trunc unit
+ROLLUP_LEVELS = ('hourly', 'daily', 'monthly')
+_TRUNC_UNITS = {'hourly': 'hour', 'daily': 'day', 'monthly': 'month'}
+
+# Rollups by resolution-manager data type
+ROLLUPS = {
+    'generation': {
+        'source': 'generation_by_fuel_30min',
+        'prefix': 'generation_by_fuel',
+        'keys': ['region', 'fuel_type'],
+        'values': ['total_generation_mw', 'total_capacity_mw', 'unit_count'],
+    },
+    'price': {
+        'source': 'prices_30min',
+        'prefix': 'prices',
+        'keys': ['regionid'],
+        'values': ['rrp'],
+    },
+    'transmission': {
+        'source': 'transmission_30min',
+        'prefix': 'transmission',
+        'keys': ['interconnectorid'],
+        'values': ['meteredmwflow', 'mwflow', 'exportlimit', 'importlimit', 'mwlosses'],
+    },
+}
+
+WATERMARK_TABLE = 'rollup_watermarks'
+
+# Seconds available_levels() trusts its last lookup
+AVAILABILITY_TTL = 60
+
+
+def rollup_table(data_type: str, level: str) -> str:
+    """Table holding a rollup level, e.g. rollup_table('price', 'daily') -> 'prices_daily'"""
+    if level not in ROLLUP_LEVELS:
+        raise ValueError(f"Invalid rollup level: {level}")
+    return f"{ROLLUPS[data_type]['prefix']}_{level}"
+
+
+def _ts_literal(ts) -> str:
+    return f"TIMESTAMP '{pd.Timestamp(ts).strftime('%Y-%m-%d %H:%M:%S')}'"
+
+
+class RollupManager:
+    """Builds and incrementally refreshes the rollup tables"""
+
+    def __init__(self, conn=None):
+        """
+        Args:
+            conn: DuckDB connection to maintain rollups in (defaults to the
+                  dashboard's shared data service connection)
+        """
+        self._conn = conn
+        self._lock = threading.Lock()
+        self._read_only = False
+        self._available: Dict[str, Tuple[str, ...]] = {}
+        self._available_checked = 0.0
+
+    @property
+    def conn(self):
+        if self._conn is not None:
+            return self._conn
+        from data_service.shared_data_duckdb import duckdb_data_service
+        return duckdb_data_service.conn
+
+    def _external(self) -> bool:
+        """True when the dashboard reads an external DuckDB (no rollups there)"""
+        if self._conn is not None:
+            return False
+        from data_service.shared_data_duckdb import duckdb_data_service
+        return duckdb_data_service.uses_external_db
+
+    def watermarks(self) -> Dict[str, pd.Timestamp]:
+        """Latest source interval folded into each rollup"""
+        try:
+            rows = self.conn.execute(f"SELECT rollup, watermark FROM {WATERMARK_TABLE}").fetchall()
+        except Exception:
+            return {}
+        return {name: pd.Timestamp(wm) for name, wm in rows if wm is not None}
+
+    def available_levels(self, data_type: str) -> Tuple[str, ...]:
+        """Rollup levels that have been built for a data type ('generation', 'price', ...)"""
+        if data_type not in ROLLUPS or self._external():
+            return ()
+        if time.time() - self._available_checked > AVAILABILITY_TTL:
+            built = self.watermarks()
+            self._available = {name: ROLLUP_LEVELS for name in built}
+            self._available_checked = time.time()
+        return self._available.get(data_type, ())
+
+    def refresh(self, data_types: Optional[Iterable[str]] = None) -> Dict[str, Optional[pd.Timestamp]]:
+        """
+        Fold source intervals newer than each watermark into the rollups.
+
+        Builds a rollup from scratch the first time. Does nothing against an
+        external DuckDB or a read-only connection.
+
+        Returns:
+            New watermark per refreshed data type (None if unchanged)
+        """
+        if self._read_only or self._external():
+            return {}
+
+        results = {}
+        with self._lock:
+            watermarks = self.watermarks()
+            for data_type in data_types or ROLLUPS:
+                try:
+                    results[data_type] = self._refresh_one(data_type, watermarks.get(data_type))
+                except Exception as e:
+                    if 'read-only' in str(e).lower():
+                        logger.warning(f"DuckDB is read-only, rollups will not be maintained here: {e}")
+                        self._read_only = True
+                        break
+                    logger.error(f"Error refreshing {data_type} rollups: {e}")
+                    results[data_type] = None
+            self._available_checked = 0.0
+        return results
+
+    def rebuild(self, data_type: str) -> Optional[pd.Timestamp]:
+        """Rebuild a rollup from the full source history (e.g. after a backfill)"""
+        if self._external():
+            logger.warning(f"Not rebuilding {data_type} rollups: the dashboard reads an external DuckDB")
+            return None
+        with self._lock:
+            result = self._refresh_one(data_type, None)
+            self._available_checked = 0.0
+        return result
+
+    def _refresh_one(self, data_type: str, watermark: Optional[pd.Timestamp]) -> Optional[pd.Timestamp]:
+        # The transaction gets a cursor of its own rather than the shared
+        # (or this thread's) connection other queries run on
+        conn = self.conn.cursor()
+        try:
+            return self._refresh_in(conn, data_type, watermark)
+        finally:
+            conn.close()
+
+    def _refresh_in(self, conn, data_type: str, watermark: Optional[pd.Timestamp]) -> Optional[pd.Timestamp]:
+        spec = ROLLUPS[data_type]
+        latest = conn.execute(f"SELECT MAX(settlementdate) FROM {spec['source']}").fetchone()[0]
+        if latest is None:
+            return None
+        latest = pd.Timestamp(latest)
+        if watermark is not None and latest <= watermark:
+            return None
+
+        with perf_logger.timer(f"rollup_refresh_{data_type}", threshold=1.0):
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} "
+                    "(rollup VARCHAR PRIMARY KEY, watermark TIMESTAMP, updated_at TIMESTAMP)"
+                )
+                source = spec['source']
+                for level in ROLLUP_LEVELS:
+                    self._refresh_level(conn, spec, level, source, watermark)
+                    source = rollup_table(data_type, level)
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {WATERMARK_TABLE} "
+                    f"VALUES ('{data_type}', {_ts_literal(latest)}, now())"
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        mode = 'built' if watermark is None else f'refreshed from {watermark}'
+        logger.info(f"{data_type} rollups {mode} up to {latest}")
+        return latest
+
+    def _refresh_level(self, conn, spec: dict, level: str, source: str,
+                       watermark: Optional[pd.Timestamp]) -> None:
+        """Recompute the periods of one level from the watermark's period onwards"""
+        unit = _TRUNC_UNITS[level]
+        table = f"{spec['prefix']}_{level}"
+        keys = ', '.join(spec['keys'])
+
+        if source == spec['source']:
+            # From 30-minute rows
+            values = ', '.join(f"AVG({v}) AS {v}, SUM({v}) AS {v}_sum" for v in spec['values'])
+            count = 'COUNT(*)'
+        else:
+            # From the finer rollup, weighting each period by its row count
+            values = ', '.join(f"SUM({v}_sum) / SUM(n) AS {v}, SUM({v}_sum) AS {v}_sum" for v in spec['values'])
+            count = 'SUM(n)'
+
+        select = f"""
+            SELECT date_trunc('{unit}', settlementdate) AS settlementdate, {keys},
+                   {values}, {count} AS n
+            FROM {source}
+            {{where}}
+            GROUP BY ALL
+        """
+
+        if watermark is None:
+            conn.execute(f"CREATE OR REPLACE TABLE {table} AS {select.format(where='')}")
+            return
+
+        since = _ts_literal(watermark)
+        conn.execute(f"DELETE FROM {table} WHERE settlementdate >= date_trunc('{unit}', {since})")
+        where = f"WHERE settlementdate >= date_trunc('{unit}', {since})"
+        conn.execute(f"INSERT INTO {table} BY NAME {select.format(where=where)}")
+
+
+# Shared instance, refreshed by the generation tab's refresh engine each cycle
+rollup_manager = RollupManager()
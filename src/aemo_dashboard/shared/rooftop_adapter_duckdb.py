@@ -22,6 +22,7 @@ from .logging_config import get_logger
 from .performance_logging import PerformanceLogger, performance_monitor
 from .resolution_manager import resolution_manager
 from .fuel_categories import MAIN_ROOFTOP_REGIONS
+from .sql import Where, execute
 
 # Import DuckDB service
 from data_service.shared_data_duckdb import duckdb_data_service
@@ -73,8 +74,7 @@ def load_rooftop_data(
                 logger.warning("No rooftop data range available")
                 return pd.DataFrame()
         
-        # Build region filter list for SQL (only main regions to avoid double-counting)
-        regions_sql = "','".join(MAIN_ROOFTOP_REGIONS)
+        where = Where().between('settlementdate', start_date, end_date)
 
         # Build query for 30-minute data (table is named rooftop_solar)
         if region:
@@ -83,29 +83,24 @@ def load_rooftop_data(
                 logger.warning(f"Region '{region}' is not a main rooftop region. Using main regions only.")
                 logger.warning(f"Main regions are: {MAIN_ROOFTOP_REGIONS}")
 
-            query = f"""
-            SELECT settlementdate, regionid, rooftop_solar_mw
-            FROM rooftop_solar
-            WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-            AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-            AND regionid = '{region}'
-            ORDER BY settlementdate
-            """
+            where.eq('regionid', region)
+            order_by = 'settlementdate'
         else:
             # Multi-region query - ONLY MAIN REGIONS (filter out sub-regions)
-            query = f"""
+            where.isin('regionid', MAIN_ROOFTOP_REGIONS)
+            order_by = 'settlementdate, regionid'
+            logger.info(f"Filtering rooftop data to main regions only: {MAIN_ROOFTOP_REGIONS}")
+
+        query = f"""
             SELECT settlementdate, regionid, rooftop_solar_mw
             FROM rooftop_solar
-            WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-            AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-            AND regionid IN ('{regions_sql}')
-            ORDER BY settlementdate, regionid
+            WHERE {where}
+            ORDER BY {order_by}
             """
-            logger.info(f"Filtering rooftop data to main regions only: {MAIN_ROOFTOP_REGIONS}")
         
         # Execute query
         with perf_logger.timer("duckdb_rooftop_query", threshold=0.5):
-            df_30min = duckdb_data_service.conn.execute(query).df()
+            df_30min = execute(duckdb_data_service.conn, query, where.params).df()
         
         if df_30min.empty:
             logger.warning("No rooftop data found for the specified period")
@@ -211,6 +206,7 @@ def get_rooftop_summary(
                     end_date = date_ranges['rooftop']['end']
         
         # Query for summary statistics
+        where = Where().between('settlementdate', start_date, end_date)
         query = f"""
         SELECT 
             COUNT(*) as record_count,
@@ -221,11 +217,10 @@ def get_rooftop_summary(
             MAX(rooftop_solar_mw) as max_generation,
             SUM(rooftop_solar_mw) / COUNT(DISTINCT settlementdate) as total_avg_generation
         FROM rooftop_solar
-        WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-        AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+        WHERE {where}
         """
         
-        result = duckdb_data_service.conn.execute(query).fetchone()
+        result = execute(duckdb_data_service.conn, query, where.params).fetchone()
         
         if result and result[0] > 0:
             summary = {
@@ -277,14 +272,14 @@ def get_rooftop_at_time(
             rounded_time = (target_time + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
         
         if region:
-            query = f"""
+            query = """
             SELECT rooftop_solar_mw
             FROM rooftop_solar
-            WHERE settlementdate = '{rounded_time.strftime('%Y-%m-%d %H:%M:%S')}'
-            AND regionid = '{region}'
+            WHERE settlementdate = ?
+            AND regionid = ?
             """
             
-            result = duckdb_data_service.conn.execute(query).fetchone()
+            result = execute(duckdb_data_service.conn, query, [rounded_time, region]).fetchone()
             
             if result:
                 return float(result[0])
@@ -292,14 +287,14 @@ def get_rooftop_at_time(
                 logger.warning(f"No rooftop data found for {region} at {rounded_time}")
                 return 0.0
         else:
-            query = f"""
+            query = """
             SELECT regionid, rooftop_solar_mw
             FROM rooftop_solar
-            WHERE settlementdate = '{rounded_time.strftime('%Y-%m-%d %H:%M:%S')}'
+            WHERE settlementdate = ?
             ORDER BY regionid
             """
             
-            df = duckdb_data_service.conn.execute(query).df()
+            df = execute(duckdb_data_service.conn, query, [rounded_time]).df()
             
             if df.empty:
                 logger.warning(f"No rooftop data found at {rounded_time}")
@@ -1,19 +1,49 @@
 """
 Smoothing utilities for time series data in the AEMO dashboard.
+
+The array functions work on one series or on a (k, n) array of k series
+sharing the x axis, and smooth all rows in one NumPy pass:
+
+- ``loess``: local linear regression with tricube weights, giving the same
+  results as ``statsmodels.nonparametric.smoothers_lowess.lowess(...,
+  return_sorted=False)`` (including ``it`` robustness iterations and the
+  ``delta`` interpolation shortcut). Every local fit is solved at once on an
+  (anchors x neighbours) matrix; without robustness iterations the weights
+  depend only on x, so they are computed once for all rows.
+- ``window_loess``: the fixed symmetric-window LOESS used by the mobile API.
+- ``ewm`` / ``moving_average``: pandas semantics on arrays, all rows at once.
+
+``smooth_groups`` applies any of them to a long-format column split by a
+group column (region, fuel type), stacking groups of equal length into one
+call. ``loess`` results can be cached by a caller-supplied key naming the
+series and its data version.
 """
-import pandas as pd
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
 import numpy as np
-from typing import Union, Optional
+import pandas as pd
+
+# Upper bound on elements in one block of local fits (rows x anchors x neighbours)
+_LOESS_BLOCK_ELEMENTS = 1 << 21
+
+# Results kept by loess(cache_key=...)
+CACHE_SIZE = 64
+
+_cache: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {'hits': 0, 'misses': 0}
 
 
 def apply_ewm_smoothing(
-    data: pd.Series, 
+    data: pd.Series,
     span: int = 30,
     min_periods: Optional[int] = None
 ) -> pd.Series:
     """
     Apply Exponential Weighted Moving average smoothing to a time series.
-    
+
     Parameters
     ----------
     data : pd.Series
@@ -22,7 +52,7 @@ def apply_ewm_smoothing(
         Span for the EWM calculation (equivalent to window size)
     min_periods : int, optional
         Minimum number of observations required to have a value
-        
+
     Returns
     -------
     pd.Series
@@ -30,7 +60,7 @@ def apply_ewm_smoothing(
     """
     if min_periods is None:
         min_periods = span // 2
-        
+
     return data.ewm(span=span, min_periods=min_periods, adjust=False).mean()
 
 
@@ -41,7 +71,7 @@ def apply_centered_ma(
 ) -> pd.Series:
     """
     Apply centered moving average smoothing.
-    
+
     Parameters
     ----------
     data : pd.Series
@@ -50,7 +80,7 @@ def apply_centered_ma(
         Window size for the moving average
     min_periods : int, optional
         Minimum number of observations required
-        
+
     Returns
     -------
     pd.Series
@@ -58,5 +88,319 @@ def apply_centered_ma(
     """
     if min_periods is None:
         min_periods = window // 2
-        
-    return data.rolling(window=window, center=True, min_periods=min_periods).mean()
\ No newline at end of file
+
+    return data.rolling(window=window, center=True, min_periods=min_periods).mean()
+
+
+def _delta_anchors(x: np.ndarray, delta: float) -> np.ndarray:
+    """
+    Positions lowess fits exactly; the rest are interpolated.
+
+    Follows statsmodels' update_indices: after a fit at i, points tied with
+    x[i] copy its value and the next fit is at the last point within delta
+    of x[i] (at least the point after the ties).
+    """
+    n = len(x)
+    first = np.flatnonzero(np.r_[True, x[1:] != x[:-1]])
+    if delta <= 0:
+        return first
+    anchors = []
+    i = 0
+    while True:
+        anchors.append(i)
+        last = np.searchsorted(x, x[i], side='right') - 1
+        if last >= n - 1:
+            break
+        k = min(int(np.searchsorted(x, x[i] + delta, side='right')), n - 1)
+        i = max(k - 1, last + 1)
+    return np.asarray(anchors)
+
+
+def _fit_weights(xs: np.ndarray, xa: np.ndarray, resid_weights: Optional[np.ndarray] = None):
+    """
+    Weights p such that sum(p * y) is the local linear fit at xa from the
+    window xs (tricube weights times any residual weights), and whether the
+    window has the two non-zero weights a fit needs.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Tricube weights, multiplied out (float ** is slow on large blocks)
+        w = np.abs(xs - xa[..., None])
+        w /= w.max(axis=-1, keepdims=True)
+        w *= w * w
+        np.subtract(1.0, w, out=w)
+        w *= w * w
+        if resid_weights is not None:
+            w = w * resid_weights
+        ok = np.count_nonzero(w > 1e-12, axis=-1) >= 2
+        w /= w.sum(axis=-1, keepdims=True)
+        mean_x = np.einsum('...k,...k->...', w, xs)
+        dev = xs - mean_x[..., None]
+        var = np.maximum(np.einsum('...k,...k,...k->...', w, dev, dev), 1e-12)
+        dev *= ((xa - mean_x) / var)[..., None]
+        dev += 1.0
+        dev *= w
+    return dev, ok
+
+
+def _local_fits(x: np.ndarray, y: np.ndarray, anchors: np.ndarray, k: int,
+                resid_weights: Optional[np.ndarray]) -> np.ndarray:
+    """Local linear fits at x[anchors] from the k nearest points, for every row of y"""
+    n = len(x)
+    xa = x[anchors]
+    # The window [left, left + k) slides right while x is past its midpoint
+    mids = (x[:n - k] + x[k:]) / 2.0
+    left = np.minimum(np.searchsorted(mids, xa, side='left'), n - k)
+    rows = y.shape[0]
+    out = np.empty((rows, len(anchors)))
+    windows = np.lib.stride_tricks.sliding_window_view(y, k, axis=1)   # (rows, n-k+1, k)
+
+    step = x[1] - x[0] if n > 1 else 0.0
+    if resid_weights is None and step > 0 and np.allclose(np.diff(x), step, rtol=1e-9, atol=0):
+        # Evenly spaced x: the weights depend only on the anchor's offset in
+        # its window, which is the same for every interior point, so those
+        # fits are one matrix-vector product over the window view
+        offset = anchors - left
+        local = np.arange(k) * step
+        unique, inverse = np.unique(offset, return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+        block = max(1, _LOESS_BLOCK_ELEMENTS // k)
+        for start in range(0, len(unique), block):
+            p, ok = _fit_weights(local, local[unique[start:start + block]])
+            for j in range(len(p)):
+                sel = order[bounds[start + j]:bounds[start + j + 1]]
+                if not ok[j]:
+                    out[:, sel] = y[:, anchors[sel]]
+                    continue
+                lefts = left[sel]
+                if lefts[-1] - lefts[0] == len(sel) - 1:
+                    out[:, sel] = windows[:, lefts[0]:lefts[-1] + 1] @ p[j]
+                else:
+                    out[:, sel] = windows[:, lefts] @ p[j]
+        return out
+
+    offsets = np.arange(k)
+    block = max(1, _LOESS_BLOCK_ELEMENTS // (k * max(rows, 1)))
+    for start in range(0, len(anchors), block):
+        sl = slice(start, min(len(anchors), start + block))
+        win = left[sl, None] + offsets                    # (b, k)
+        xs = x[win]
+        if resid_weights is None:
+            p, ok = _fit_weights(xs, xa[sl])
+            fit = np.einsum('bk,rbk->rb', p, windows[:, left[sl]])
+        else:
+            p, ok = _fit_weights(xs, xa[sl], resid_weights[:, win])   # (rows, b, k)
+            fit = (p * windows[:, left[sl]]).sum(axis=-1)
+        out[:, sl] = np.where(ok, fit, y[:, anchors[sl]])
+    return out
+
+
+def _loess_sorted(x: np.ndarray, y: np.ndarray, frac: float, it: int, delta: float) -> np.ndarray:
+    """loess on sorted, finite x and rows of finite y"""
+    n = len(x)
+    k = min(max(int(frac * n + 1e-10), 2), n)
+    anchors = _delta_anchors(x, delta)
+    resid_weights = None
+    for _ in range(it + 1):
+        fitted = _local_fits(x, y, anchors, k, resid_weights)
+        if len(anchors) < n:
+            fitted = np.stack([np.interp(x, x[anchors], row) for row in fitted])
+        if it:
+            resid = np.abs(y - fitted)
+            median = np.median(resid, axis=1, keepdims=True)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                scaled = np.where(median == 0, (resid > 0).astype(float), resid / (6.0 * median))
+            resid_weights = (1.0 - np.minimum(scaled, 1.0) ** 2) ** 2
+    return fitted
+
+
+def loess(y, x=None, frac: float = 2.0 / 3.0, it: int = 0, delta: float = 0.0,
+          cache_key: Optional[Hashable] = None) -> np.ndarray:
+    """
+    LOESS smoothed values of y at its own x positions.
+
+    Equivalent to statsmodels ``lowess(y, x, frac, it, delta,
+    return_sorted=False)``: each point is fitted from the ``frac * n``
+    nearest points, missing values (NaN/inf) are left out of the fits and
+    come back as NaN, and x need not be sorted. Unlike statsmodels, ``it``
+    defaults to 0 (no robustness iterations), as every dashboard chart uses.
+
+    Args:
+        y: One series, or a (k, n) array of series sharing x
+        x: x values (default 0..n-1)
+        frac: Fraction of the points used in each local fit
+        it: Robustness (residual-reweighting) iterations
+        delta: Points within delta of the last fit are interpolated
+            instead of fitted; 0.01 * range(x) is a good choice for long series
+        cache_key: Names the input and its data version; results for the
+            same key and parameters are reused instead of recomputed
+
+    Returns:
+        Array of the same shape as y
+    """
+    if not 0 <= frac <= 1:
+        raise ValueError("LOESS frac must be in the range [0, 1]")
+    ya = np.asarray(y, dtype=float)
+    single = ya.ndim == 1
+    ya = np.atleast_2d(ya)
+    n = ya.shape[1]
+    xa = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    if len(xa) != n:
+        raise ValueError("x and y length mismatch")
+
+    key = None
+    if cache_key is not None:
+        key = (cache_key, ya.shape, frac, it, delta)
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached is not None:
+                _cache.move_to_end(key)
+                _cache_stats['hits'] += 1
+                return cached[0].copy() if single else cached.copy()
+            _cache_stats['misses'] += 1
+
+    order = None
+    if n > 1 and np.any(xa[1:] < xa[:-1]):
+        order = np.argsort(xa, kind='stable')
+        xa, ya = xa[order], ya[:, order]
+
+    out = np.full(ya.shape, np.nan)
+    valid = np.isfinite(ya) & np.isfinite(xa)
+    # Rows missing the same points share their x positions and are fitted together
+    patterns: Dict[bytes, list] = {}
+    for row, mask in enumerate(valid):
+        patterns.setdefault(mask.tobytes(), []).append(row)
+    for rows in patterns.values():
+        mask = valid[rows[0]]
+        if not mask.any():
+            continue
+        out[np.ix_(rows, mask)] = _loess_sorted(xa[mask], ya[np.ix_(rows, mask)], frac, it, delta)
+
+    if order is not None:
+        unsorted = np.empty_like(out)
+        unsorted[:, order] = out
+        out = unsorted
+
+    if key is not None:
+        with _cache_lock:
+            _cache[key] = out.copy()
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return out[0] if single else out
+
+
+def loess_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters and the number of cached loess results"""
+    with _cache_lock:
+        return {'size': len(_cache), **_cache_stats}
+
+
+def clear_loess_cache() -> None:
+    """Forget cached loess results"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def window_loess(x, y, frac: float = 0.05) -> np.ndarray:
+    """
+    Locally-weighted regression smoother (degree-1, tricube weights).
+
+    ``y`` is one series or a (k, n) array of series sharing ``x``; returns
+    smoothed values of the same shape. ``x`` must be monotonic
+    non-decreasing. Each point is fitted on the ``round(frac * n)`` nearest
+    positions (a window centred on it, clamped to the ends).
+    """
+    xa = np.asarray(x, dtype=float)
+    ya = np.asarray(y, dtype=float)
+    single = ya.ndim == 1
+    ya = np.atleast_2d(ya)
+    k, n = ya.shape
+    if n != len(xa):
+        raise ValueError("x and y length mismatch")
+    if n < 3:
+        return ya[0].copy() if single else ya.copy()
+    r = min(max(3, int(round(frac * n))), n)
+
+    # Symmetric window of size r centred on i, clamped to [0, n)
+    centre = np.arange(n)
+    lo = np.maximum(0, centre - r // 2)
+    hi = np.minimum(n, lo + r)
+    lo = np.maximum(0, hi - r)
+
+    out = np.empty((k, n))
+    block = max(1, _LOESS_BLOCK_ELEMENTS // (r * k))
+    offsets = np.arange(r)
+    for start in range(0, n, block):
+        rows = slice(start, min(n, start + block))
+        win = lo[rows, None] + offsets           # (b, r)
+        xs = xa[win]
+        ys = ya[:, win]                          # (k, b, r)
+        xi = xa[rows, None]
+
+        d = np.abs(xs - xi)
+        h = np.maximum(d.max(axis=1, keepdims=True), 1e-12)
+        w = (1.0 - (d / h) ** 3) ** 3
+        sw = w.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            wx = (w * xs).sum(axis=1) / sw
+            wy = (w * ys).sum(axis=2) / sw       # (k, b)
+            dx = xs - wx[:, None]
+            b_num = (w * dx * (ys - wy[..., None])).sum(axis=2)
+            b_den = (w * dx ** 2).sum(axis=1)
+            b = b_num / b_den
+            fitted = np.where(np.abs(b_den) < 1e-12, wy, wy - b * wx + b * xa[rows])
+        out[:, rows] = np.where(sw < 1e-12, ya[:, rows], fitted)
+
+    return out[0] if single else out
+
+
+def _rows_frame(y) -> "tuple[pd.DataFrame, bool]":
+    """One DataFrame column per series, and whether y was a single series"""
+    ya = np.asarray(y, dtype=float)
+    return pd.DataFrame(np.atleast_2d(ya).T), ya.ndim == 1
+
+
+def ewm(y, span: Optional[float] = None, alpha: Optional[float] = None,
+        adjust: bool = True, min_periods: int = 0) -> np.ndarray:
+    """Exponentially weighted mean of a series or of each row of a (k, n) array (pandas semantics)"""
+    frame, single = _rows_frame(y)
+    out = frame.ewm(span=span, alpha=alpha, adjust=adjust, min_periods=min_periods).mean().to_numpy().T
+    return out[0] if single else out
+
+
+def moving_average(y, window: int, center: bool = False,
+                   min_periods: Optional[int] = None) -> np.ndarray:
+    """Rolling mean of a series or of each row of a (k, n) array (pandas semantics)"""
+    frame, single = _rows_frame(y)
+    out = frame.rolling(window, center=center, min_periods=min_periods).mean().to_numpy().T
+    return out[0] if single else out
+
+
+def smooth_groups(values, groups, smoother: Callable[..., np.ndarray],
+                  **params: Union[Any, Callable[[int], Any]]) -> np.ndarray:
+    """
+    Smooth a long-format column separately within each group.
+
+    Each group's values are smoothed in their original order; groups of
+    equal length go to ``smoother`` together as one (k, n) array. A param
+    given as a callable is called with the group length (e.g. a LOESS delta
+    proportional to n). Rows whose group is missing are returned unchanged.
+    """
+    values = np.asarray(values, dtype=float)
+    out = values.copy()
+    codes, _ = pd.factorize(np.asarray(groups), use_na_sentinel=True)
+    order = np.argsort(codes, kind='stable')
+    order = order[codes[order] >= 0]
+    if len(order) == 0:
+        return out
+    counts = np.bincount(codes[order])
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+
+    by_length: Dict[int, list] = {}
+    for group, count in enumerate(counts):
+        by_length.setdefault(int(count), []).append(group)
+    for n, members in by_length.items():
+        idx = np.stack([order[starts[g]:starts[g] + n] for g in members])
+        kwargs = {name: value(n) if callable(value) else value for name, value in params.items()}
+        out[idx] = smoother(values[idx], **kwargs)
+    return out
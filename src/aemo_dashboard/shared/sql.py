@@ -0,0 +1,121 @@
+"""
+Parameterised SQL for the DuckDB adapters
+
+Adapters used to format dates and DUID lists into the SQL text, so every
+refresh produced a statement DuckDB had never seen and had to parse from
+scratch, and a quote in a value broke the query. Here values are bound
+instead and only identifiers (the table or view picked for a resolution, a
+column list) are still chosen in code:
+
+    where = Where().between('settlementdate', start_date, end_date).isin('duid', duids)
+    sql = f"SELECT settlementdate, duid, scadavalue FROM {table} WHERE {where}"
+    df = execute(conn, sql, where.params).df()
+
+The SQL text now only varies with the table and the number of DUIDs, so
+repeated refreshes reuse it. DuckDB's Python API has no prepared-statement
+handle that can be re-executed with new values (``PREPARE``/``EXECUTE``
+cannot take bound parameters), so ``execute`` keeps the *parsed* statement
+for each text in an LRU and DuckDB binds and plans it with the new values.
+Parsed statements do not belong to a connection, so the cache also covers
+the per-query connections opened when ``AEMO_DUCKDB_PATH`` is set.
+
+Datetimes are bound as naive TIMESTAMPs (timezone dropped, as the old
+``strftime`` formatting did) so they compare with the naive NEM-time columns.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import duckdb
+import pandas as pd
+
+# Parsed statements kept for reuse, keyed by SQL text
+STATEMENT_CACHE_SIZE = 256
+
+_statements: "OrderedDict[str, duckdb.Statement]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def placeholders(count: int) -> str:
+    """``?, ?, ?`` for an IN list of ``count`` values"""
+    return ', '.join('?' * count)
+
+
+def bind(value: Any) -> Any:
+    """Convert a parameter to the value DuckDB should see"""
+    if isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+class Where:
+    """AND-ed WHERE conditions with their bound parameters, in order"""
+
+    def __init__(self):
+        self.clauses: List[str] = []
+        self.params: List[Any] = []
+
+    def add(self, clause: str, *params: Any) -> 'Where':
+        """Add a condition with ``?`` placeholders for params"""
+        self.clauses.append(clause)
+        self.params.extend(params)
+        return self
+
+    def between(self, column: str, start: Any, end: Any, end_inclusive: bool = True) -> 'Where':
+        """column >= start AND column <= end (or < end)"""
+        self.add(f"{column} >= ?", start)
+        return self.add(f"{column} {'<=' if end_inclusive else '<'} ?", end)
+
+    def eq(self, column: str, value: Any) -> 'Where':
+        return self.add(f"{column} = ?", value)
+
+    def isin(self, column: str, values: Iterable[Any]) -> 'Where':
+        values = list(values)
+        if not values:
+            return self.add('FALSE')
+        return self.add(f"{column} IN ({placeholders(len(values))})", *values)
+
+    def __str__(self) -> str:
+        return ' AND '.join(self.clauses) if self.clauses else 'TRUE'
+
+
+def statement(sql: str) -> duckdb.Statement:
+    """Parsed statement for sql, parsed once and reused from the LRU"""
+    with _lock:
+        parsed = _statements.get(sql)
+        if parsed is not None:
+            _statements.move_to_end(sql)
+            _stats['hits'] += 1
+            return parsed
+        _stats['misses'] += 1
+
+    parsed = duckdb.extract_statements(sql)
+    if len(parsed) != 1:
+        raise ValueError(f"Expected one SQL statement, got {len(parsed)}")
+    with _lock:
+        _statements[sql] = parsed[0]
+        if len(_statements) > STATEMENT_CACHE_SIZE:
+            _statements.popitem(last=False)
+    return parsed[0]
+
+
+def execute(conn, sql: str, params: Optional[Sequence[Any]] = None):
+    """
+    Run sql on conn with bound parameters.
+
+    conn is anything with DuckDB's ``execute(query, parameters)``: a
+    connection or cursor, or the data service's retrying connection.
+    Returns whatever conn.execute returns (call .df() / .fetchall() on it).
+    """
+    params = [bind(p) for p in params] if params else []
+    return conn.execute(statement(sql), params)
+
+
+def statement_cache_stats() -> Dict[str, int]:
+    with _lock:
+        return {'size': len(_statements), **_stats}
@@ -0,0 +1,73 @@
+"""
+Tab datasets - the precomputed datasets of the lazily imported tabs
+
+A tab's module is imported when the tab is first opened
+(EnergyDashboard._create_*_tab). The datasets those tabs share through the
+precompute store are registered here by the path of their builder, so the
+store knows them without importing any tab: a builder's module is imported
+by its first build.
+
+warm_tab_datasets() starts background builds of what the tabs show first.
+The dashboard only calls it with PRECOMPUTE_WARM=true, as the builds import
+the tab modules the dashboard otherwise loads on demand.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Data-version tables of the penetration tab's generation and caches
+PENETRATION_TABLES = ('generation', 'rooftop')
+
+# name -> (builder path, register() options)
+TAB_DATASETS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    # futures.csv changes weekly, and weekly spot averages only need
+    # rebuilding hourly however often prices arrive
+    'futures.contracts': ('aemo_dashboard.futures.futures_tab:load_futures', {}),
+    'futures.spot_weekly': ('aemo_dashboard.futures.futures_tab:load_spot_weekly',
+                            {'tables': ('prices',), 'min_interval': 3600}),
+    # STTM ex-post data is published once per gas day; refreshed hourly
+    'gas.sttm_prices': ('aemo_dashboard.gas.sttm_tab:load_prices', {}),
+    'gas.sttm_volumes': ('aemo_dashboard.gas.sttm_tab:load_volumes', {}),
+    # Years of daily capacity factors, rebuilt at most hourly
+    'coal.evolution': ('aemo_dashboard.station.coal_analysis:load_evolution_data',
+                       {'tables': ('generation',), 'min_interval': 3600}),
+    # Daily series smoothed over 90 days move little per dispatch interval
+    'prices.fuel_relatives': ('aemo_dashboard.prices.fuel_relatives:load_smoothed_fuel_relatives',
+                              {'tables': ('prices', 'generation'), 'min_interval': 3600}),
+    # Multi-year generation per region, rebuilt at most every 15 minutes
+    'penetration.generation': ('aemo_dashboard.penetration.penetration_tab:load_generation_data',
+                               {'tables': PENETRATION_TABLES, 'min_interval': 900}),
+}
+
+
+def register_tab_datasets(store) -> None:
+    """Register every tab dataset on store (imports no tab module)"""
+    for name, (builder, options) in TAB_DATASETS.items():
+        store.register(name, builder, **options)
+
+
+def penetration_windows(region: str = 'NEM') -> List[Dict[str, Any]]:
+    """'penetration.generation' parameters of the penetration tab's three charts"""
+    current_year = datetime.now().year
+    return [
+        # VRE production: three years plus the last two months of the year before
+        {'years': list(range(current_year - 3, current_year + 1)), 'months_first': 2, 'region': region},
+        # VRE by fuel and thermal vs renewables: 2018 onwards
+        {'years': list(range(2018, current_year + 1)), 'months_first': None, 'region': region},
+    ]
+
+
+def warm_tab_datasets(store) -> None:
+    """Start background builds of the datasets the tabs show when opened"""
+    for name in ('futures.contracts', 'futures.spot_weekly', 'gas.sttm_prices',
+                 'gas.sttm_volumes', 'coal.evolution'):
+        store.warm(name)
+    # Fuel relatives opens on NSW1
+    store.warm('prices.fuel_relatives', region='NSW1')
+    for params in penetration_windows('NEM'):
+        store.warm('penetration.generation', **params)
+    logger.info("Precomputed tab data warming started")
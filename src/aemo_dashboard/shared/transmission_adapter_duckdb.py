@@ -19,6 +19,7 @@ from .config import config
 from .logging_config import get_logger
 from .performance_logging import PerformanceLogger, performance_monitor
 from .resolution_manager import resolution_manager
+from .sql import Where, execute
 
 # Import DuckDB service
 from data_service.shared_data_duckdb import duckdb_data_service
@@ -68,29 +69,23 @@ def load_transmission_data(
         if resolution == 'auto':
             logger.info("Transmission data only available in 30-minute resolution")
         
+        where = Where().between('settlementdate', start_date, end_date)
         if interconnector_id:
-            query = f"""
-            SELECT settlementdate, interconnectorid, meteredmwflow, 
-                   exportlimit, importlimit, mwlosses
-            FROM {table}
-            WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-            AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-            AND interconnectorid = '{interconnector_id}'
-            ORDER BY settlementdate
-            """
+            where.eq('interconnectorid', interconnector_id)
+            order_by = 'settlementdate'
         else:
-            query = f"""
+            order_by = 'settlementdate, interconnectorid'
+        query = f"""
             SELECT settlementdate, interconnectorid, meteredmwflow,
                    exportlimit, importlimit, mwlosses
             FROM {table}
-            WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-            AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-            ORDER BY settlementdate, interconnectorid
+            WHERE {where}
+            ORDER BY {order_by}
             """
         
         # Execute query
         with perf_logger.timer("duckdb_transmission_query", threshold=0.5):
-            df = duckdb_data_service.conn.execute(query).df()
+            df = execute(duckdb_data_service.conn, query, where.params).df()
         
         # Ensure consistent data types
         df['settlementdate'] = pd.to_datetime(df['settlementdate'])
@@ -138,6 +133,7 @@ def get_transmission_summary(
                     end_date = date_ranges['transmission']['end']
         
         # Query for summary statistics
+        where = Where().between('settlementdate', start_date, end_date)
         query = f"""
         SELECT 
             COUNT(*) as record_count,
@@ -147,11 +143,10 @@ def get_transmission_summary(
             AVG(meteredmwflow) as avg_flow,
             MAX(ABS(meteredmwflow)) as max_abs_flow
         FROM transmission_30min
-        WHERE settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-        AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+        WHERE {where}
         """
         
-        result = duckdb_data_service.conn.execute(query).fetchone()
+        result = execute(duckdb_data_service.conn, query, where.params).fetchone()
         
         if result and result[0] > 0:
             summary = {
@@ -227,6 +222,7 @@ def get_flow_statistics(
                     end_date = date_ranges['transmission']['end']
         
         # Query for statistics
+        where = Where().eq('interconnectorid', interconnector_id).between('settlementdate', start_date, end_date)
         query = f"""
         SELECT 
             COUNT(*) as record_count,
@@ -239,12 +235,10 @@ def get_flow_statistics(
             AVG(exportlimit) as avg_export_limit,
             AVG(importlimit) as avg_import_limit
         FROM transmission_30min
-        WHERE interconnectorid = '{interconnector_id}'
-        AND settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-        AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
+        WHERE {where}
         """
         
-        result = duckdb_data_service.conn.execute(query).fetchone()
+        result = execute(duckdb_data_service.conn, query, where.params).fetchone()
         
         if result and result[0] > 0:
             stats = {
@@ -17,10 +17,11 @@ from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from scipy.ndimage import uniform_filter1d
 
 from ..shared.logging_config import get_logger
 from ..shared.config import config
+from ..shared.precompute import get_precompute_store
+from ..shared.sql import Where, execute
 from ..shared.flexoki_theme import (
     FLEXOKI_PAPER, FLEXOKI_BLACK, FLEXOKI_BASE, FLEXOKI_ACCENT
 )
@@ -133,15 +134,15 @@ class CoalAnalysis:
         """
         try:
             # Query SCADA data for coal DUIDs
-            duid_list = ','.join([f"'{d}'" for d in self.coal_duids])
+            # Whole days, as the date strings used to select
+            days = (start_date.date(), end_date.date())
+            where = Where().between('settlementdate', *days, end_inclusive=False).isin('duid', self.coal_duids)
             scada_query = f"""
                 SELECT settlementdate, duid, scadavalue
                 FROM scada
-                WHERE settlementdate >= '{start_date.strftime("%Y-%m-%d")}'
-                  AND settlementdate < '{end_date.strftime("%Y-%m-%d")}'
-                  AND duid IN ({duid_list})
+                WHERE {where}
             """
-            scada_df = self.conn.execute(scada_query).fetchdf()
+            scada_df = execute(self.conn, scada_query, where.params).fetchdf()
 
             if scada_df.empty:
                 logger.warning(f"No SCADA data for period {start_date} to {end_date}")
@@ -152,13 +153,13 @@ class CoalAnalysis:
             scada_df['station'] = scada_df['duid'].map(self.duid_to_station)
 
             # Query prices
+            window = Where().between('settlementdate', *days, end_inclusive=False)
             prices_query = f"""
                 SELECT settlementdate, region, price
                 FROM prices
-                WHERE settlementdate >= '{start_date.strftime("%Y-%m-%d")}'
-                  AND settlementdate < '{end_date.strftime("%Y-%m-%d")}'
+                WHERE {window}
             """
-            prices_df = self.conn.execute(prices_query).fetchdf()
+            prices_df = execute(self.conn, prices_query, window.params).fetchdf()
 
             # Merge SCADA with prices
             merged = scada_df.merge(prices_df, on=['settlementdate', 'region'], how='left')
@@ -243,7 +244,7 @@ class CoalAnalysis:
                 logger.warning(f"No DUIDs found for stations: {stations}")
                 return pd.DataFrame()
 
-            duid_list = ','.join([f"'{d}'" for d in station_duids])
+            where = Where().isin('duid', station_duids)
 
             # Query daily aggregated SCADA data
             query = f"""
@@ -253,11 +254,11 @@ class CoalAnalysis:
                     SUM(scadavalue) * {self.interval_hours} as generation_mwh,
                     COUNT(*) as intervals
                 FROM scada
-                WHERE duid IN ({duid_list})
+                WHERE {where}
                 GROUP BY DATE_TRUNC('day', settlementdate), duid
                 ORDER BY date
             """
-            df = self.conn.execute(query).fetchdf()
+            df = execute(self.conn, query, where.params).fetchdf()
 
             if df.empty:
                 return pd.DataFrame()
@@ -312,7 +313,8 @@ class CoalAnalysis:
             if not station_duids:
                 return pd.DataFrame()
 
-            duid_list = ','.join([f"'{d}'" for d in station_duids])
+            where = Where().isin('duid', station_duids).between(
+                'settlementdate', start_date.date(), end_date.date(), end_inclusive=False)
 
             # Query hourly aggregated data
             query = f"""
@@ -321,13 +323,11 @@ class CoalAnalysis:
                     duid,
                     AVG(scadavalue) as avg_mw
                 FROM scada
-                WHERE duid IN ({duid_list})
-                  AND settlementdate >= '{start_date.strftime("%Y-%m-%d")}'
-                  AND settlementdate < '{end_date.strftime("%Y-%m-%d")}'
+                WHERE {where}
                 GROUP BY EXTRACT(HOUR FROM settlementdate), duid
                 ORDER BY hour
             """
-            df = self.conn.execute(query).fetchdf()
+            df = execute(self.conn, query, where.params).fetchdf()
 
             if df.empty:
                 return pd.DataFrame()
@@ -578,33 +578,16 @@ class CoalEvolutionUI:
     }
 
     def __init__(self):
-        self.engine = CoalAnalysis()
         self.daily_cf_data = None
         self.hourly_latest = None
         self.hourly_historical = None
 
     def _load_data(self):
-        """Load all data for evolution analysis (always refresh)"""
-        self.daily_cf_data = None
-        self.hourly_latest = None
-        self.hourly_historical = None
-
-        # Get daily capacity factor for all time
-        self.daily_cf_data = self.engine.get_daily_capacity_factor(EVOLUTION_STATIONS)
-
-        # Get hourly patterns for latest 12 months
-        now = datetime.now()
-        latest_start = now - timedelta(days=365)
-        self.hourly_latest = self.engine.get_hourly_pattern(
-            EVOLUTION_STATIONS, latest_start, now
-        )
-
-        # Get hourly patterns for 5 years ago (12 month period)
-        historical_end = now - timedelta(days=5*365)
-        historical_start = historical_end - timedelta(days=365)
-        self.hourly_historical = self.engine.get_hourly_pattern(
-            EVOLUTION_STATIONS, historical_start, historical_end
-        )
+        """Load all data for evolution analysis from the shared precompute store"""
+        data = get_precompute_store().get('coal.evolution')
+        self.daily_cf_data = data['daily_cf']
+        self.hourly_latest = data['hourly_latest']
+        self.hourly_historical = data['hourly_historical']
 
     def _get_station_color(self, station_name: str) -> str:
         """Get color for a station, handling partial name matches"""
@@ -647,6 +630,8 @@ class CoalEvolutionUI:
                 # Apply additional smoothing using uniform filter
                 valid_data = station_data.dropna(subset=['ma_90'])
                 if len(valid_data) > 30:
+                    # scipy.ndimage is slow to import; only this chart needs it
+                    from scipy.ndimage import uniform_filter1d
                     smoothed = uniform_filter1d(valid_data['ma_90'].values, size=30)
 
                     color = self._get_station_color(station)
@@ -869,8 +854,35 @@ class CoalEvolutionUI:
             return pn.pane.Markdown(f"Error creating coal evolution analysis: {e}")
 
 
+def load_evolution_data() -> Dict[str, pd.DataFrame]:
+    """Daily capacity factors and hourly patterns (latest and 5 years ago) of EVOLUTION_STATIONS"""
+    engine = CoalAnalysis()
+
+    # Get daily capacity factor for all time
+    daily_cf = engine.get_daily_capacity_factor(EVOLUTION_STATIONS)
+
+    # Get hourly patterns for latest 12 months
+    now = datetime.now()
+    latest_start = now - timedelta(days=365)
+    hourly_latest = engine.get_hourly_pattern(EVOLUTION_STATIONS, latest_start, now)
+
+    # Get hourly patterns for 5 years ago (12 month period)
+    historical_end = now - timedelta(days=5*365)
+    historical_start = historical_end - timedelta(days=365)
+    hourly_historical = engine.get_hourly_pattern(
+        EVOLUTION_STATIONS, historical_start, historical_end
+    )
+    engine.conn.close()
+
+    return {
+        'daily_cf': daily_cf,
+        'hourly_latest': hourly_latest,
+        'hourly_historical': hourly_historical,
+    }
+
+
 def create_coal_evolution_tab():
-    """Factory function to create coal evolution tab content — refreshes on each view"""
+    """Factory function to create coal evolution tab content — rebuilt on each view from shared data"""
     def _build():
         try:
             ui = CoalEvolutionUI()
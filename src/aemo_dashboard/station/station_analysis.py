@@ -15,6 +15,7 @@ from ..shared.config import config
 from ..shared.logging_config import get_logger
 from ..shared.hybrid_query_manager import HybridQueryManager
 from ..shared.duckdb_views import view_manager
+from ..shared.sql import Where
 
 logger = get_logger(__name__)
 
@@ -123,7 +124,7 @@ class StationAnalysisMotor:
                 interval_hours = 0.5  # 30 minutes
             
             # Build query for specific DUIDs
-            placeholders = ','.join(['?' for _ in duids])
+            where = Where().isin('duid', duids).between('settlementdate', start_date, end_date)
             query = f"""
             SELECT 
                 settlementdate,
@@ -137,34 +138,11 @@ class StationAnalysisMotor:
                 fuel_type,
                 capacity_mw
             FROM {view_name}
-            WHERE duid IN ({placeholders})
-            AND settlementdate >= ?
-            AND settlementdate <= ?
+            WHERE {where}
             ORDER BY settlementdate
             """
             
-            # Execute query - need to format it with actual values since DuckDB doesn't support ? parameters in Python API
-            formatted_duids = ','.join([f"'{d}'" for d in duids])
-            formatted_query = f"""
-            SELECT 
-                settlementdate,
-                duid,
-                scadavalue,
-                price,
-                {revenue_col} as revenue,
-                station_name,
-                owner,
-                region,
-                fuel_type,
-                capacity_mw
-            FROM {view_name}
-            WHERE duid IN ({formatted_duids})
-            AND settlementdate >= '{start_date.strftime('%Y-%m-%d %H:%M:%S')}'
-            AND settlementdate <= '{end_date.strftime('%Y-%m-%d %H:%M:%S')}'
-            ORDER BY settlementdate
-            """
-            
-            filtered_data = self.query_manager.query_with_progress(formatted_query)
+            filtered_data = self.query_manager.query_with_progress(query, params=where.params)
             
             if len(filtered_data) == 0:
                 logger.warning(f"No data found for {filter_description}")
@@ -3,8 +3,15 @@ Station Search Engine - Fuzzy search functionality for stations and DUIDs.
 
 This module provides approximate search capabilities to help users find stations
 by name or DUID with auto-suggestions and fuzzy matching.
+
+Each index (DUIDs, stations) gets a prebuilt _NgramIndex: an n-gram inverted
+index narrows every keystroke to the entries sharing a bigram/trigram with the
+query before any fuzzy scoring, sorted field values answer prefix suggestions
+with a bisect, and recent queries are kept in a small LRU.
 """
 
+import bisect
+from collections import OrderedDict, defaultdict
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from fuzzywuzzy import fuzz, process
@@ -12,6 +19,65 @@ from ..shared.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Queries shorter than this are matched on bigrams, longer ones on trigrams
+TRIGRAM_MIN_QUERY = 6
+# Scored result lists kept per index for repeated / retyped queries
+RESULT_CACHE_SIZE = 256
+
+
+def _ngrams(text: str, n: int) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class _NgramIndex:
+    """Candidate filter, prefix lookup and result LRU over one list of search entries"""
+
+    def __init__(self, entries: List[Dict], fields: Tuple[str, ...], prefix_fields: Tuple[str, ...] = ()):
+        self.entries = entries
+        # Lower-cased values per field, aligned with entries
+        self.values = {field: [str(entry.get(field) or '').lower() for entry in entries] for field in fields}
+        self.postings = {2: defaultdict(set), 3: defaultdict(set)}
+        for column in self.values.values():
+            for i, value in enumerate(column):
+                for n, postings in self.postings.items():
+                    for gram in _ngrams(value, n):
+                        postings[gram].add(i)
+        self.prefixes = {
+            field: sorted((value, i) for i, value in enumerate(self.values[field]))
+            for field in prefix_fields
+        }
+        self.results = OrderedDict()
+
+    def candidates(self, query: str) -> List[int]:
+        """Positions of entries sharing at least one n-gram with the query, in index order"""
+        n = 2 if len(query) < TRIGRAM_MIN_QUERY else 3
+        postings = self.postings[n]
+        matched = set()
+        for gram in _ngrams(query, n):
+            matched.update(postings.get(gram, ()))
+        return sorted(matched)
+
+    def prefix_matches(self, query: str) -> List[int]:
+        """Positions of entries with any prefix field starting with query, in index order"""
+        matched = set()
+        for ordered in self.prefixes.values():
+            i = bisect.bisect_left(ordered, (query,))
+            while i < len(ordered) and ordered[i][0].startswith(query):
+                matched.add(ordered[i][1])
+                i += 1
+        return sorted(matched)
+
+    def cached(self, key):
+        hits = self.results.get(key)
+        if hits is not None:
+            self.results.move_to_end(key)
+        return hits
+
+    def store(self, key, hits) -> None:
+        self.results[key] = hits
+        if len(self.results) > RESULT_CACHE_SIZE:
+            self.results.popitem(last=False)
+
 class StationSearchEngine:
     """Fuzzy search engine for stations and DUIDs with aggregation support"""
     
@@ -26,6 +92,38 @@ class StationSearchEngine:
         self.search_index = self._build_search_index()
         self.station_index = self._build_station_index()  # New: Station-level aggregation
         logger.info(f"Search engine initialized with {len(self.search_index)} DUIDs and {len(self.station_index)} stations")
+
+    # The n-gram indexes are built lazily and dropped whenever a caller
+    # replaces search_index / station_index (e.g. filtering to active DUIDs)
+
+    @property
+    def search_index(self) -> List[Dict]:
+        return self._search_index
+
+    @search_index.setter
+    def search_index(self, entries: List[Dict]):
+        self._search_index = entries
+        self._duid_ngrams = None
+
+    @property
+    def station_index(self) -> List[Dict]:
+        return self._station_index
+
+    @station_index.setter
+    def station_index(self, entries: List[Dict]):
+        self._station_index = entries
+        self._station_ngrams = None
+
+    def _ngram_index(self, mode: str) -> _NgramIndex:
+        """Prebuilt n-gram index for the DUID or station list"""
+        if mode == 'station':
+            if self._station_ngrams is None:
+                self._station_ngrams = _NgramIndex(self._station_index, ('station_name', 'searchable_text'))
+            return self._station_ngrams
+        if self._duid_ngrams is None:
+            self._duid_ngrams = _NgramIndex(self._search_index, ('duid', 'station_name', 'searchable_text'),
+                                            prefix_fields=('duid', 'station_name'))
+        return self._duid_ngrams
     
     def _build_search_index(self) -> List[Dict]:
         """
@@ -197,42 +295,71 @@ class StationSearchEngine:
             return []
         
         query = query.lower().strip()
-        results = []
-        
-        # Choose which index to search based on mode
-        search_data = self.station_index if mode == 'station' else self.search_index
-        
-        for entry in search_data:
+        index = self._ngram_index(mode)
+        key = (query, mode, min_score)
+        hits = index.cached(key)
+        if hits is None:
+            hits = self._score_candidates(index, query, min_score, mode)
+            index.store(key, hits)
+
+        return [dict(index.entries[i], score=score) for i, score in hits[:limit]]
+
+    def _score_candidates(self, index: _NgramIndex, query: str, min_score: int, mode: str) -> List[Tuple[int, int]]:
+        """
+        Score the n-gram candidates for a query.
+
+        Field values repeated across entries (e.g. the station name shared by
+        every unit) are scored once per query, and an entry stops being
+        scored once a field reaches 100.
+
+        Returns:
+            (entry position, score) pairs with score >= min_score, best first
+        """
+        scores = {}
+
+        def score(value):
+            result = scores.get(value)
+            if result is None:
+                result = scores[value] = fuzz.partial_ratio(query, value)
+            return result
+
+        def best_of(*values):
+            best = 0
+            for value in values:
+                best = max(best, score(value))
+                if best == 100:
+                    break
+            return best
+
+        names = index.values['station_name']
+        texts = index.values['searchable_text']
+        duids = index.values.get('duid')
+        query_upper = query.upper()
+        hits = []
+        for i in index.candidates(query):
             # Calculate fuzzy match scores for different fields
             if mode == 'station':
                 # For station mode, no DUID matching - focus on station name
-                name_score = fuzz.partial_ratio(query, entry['station_name'].lower())
-                text_score = fuzz.partial_ratio(query, entry['searchable_text'])
-                best_score = max(name_score, text_score)
-                
+                best_score = best_of(names[i], texts[i])
+
                 # Boost exact station name matches
-                if query.lower() in entry['station_name'].lower():
+                if query in names[i]:
                     best_score = min(100, best_score + 20)
             else:
                 # For DUID mode, include DUID scoring
-                duid_score = fuzz.partial_ratio(query, entry['duid'].lower())
-                name_score = fuzz.partial_ratio(query, entry['station_name'].lower())
-                text_score = fuzz.partial_ratio(query, entry['searchable_text'])
-                best_score = max(duid_score, name_score, text_score)
-                
+                best_score = best_of(duids[i], names[i], texts[i])
+
                 # Boost exact DUID matches
-                if query.upper() == entry['duid'].upper():
+                if query_upper == duids[i].upper():
                     best_score = 100
-            
+
             if best_score >= min_score:
-                result = entry.copy()
-                result['score'] = best_score
-                results.append(result)
-        
-        # Sort by score (descending) and limit results
-        results.sort(key=lambda x: x['score'], reverse=True)
-        return results[:limit]
-    
+                hits.append((i, best_score))
+
+        # Sort by score (descending); ties keep index order
+        hits.sort(key=lambda hit: hit[1], reverse=True)
+        return hits
+
     def get_suggestions(self, partial_query: str, limit: int = 5) -> List[str]:
         """
         Get auto-complete suggestions for partial queries.
@@ -247,15 +374,11 @@ class StationSearchEngine:
         if not partial_query or len(partial_query.strip()) < 1:
             return []
         
-        suggestions = []
         query = partial_query.lower().strip()
-        
-        for entry in self.search_index:
-            # Check if any field starts with the query
-            if (entry['duid'].lower().startswith(query) or 
-                entry['station_name'].lower().startswith(query)):
-                suggestions.append(entry['display_name'])
-        
+        # DUIDs or station names starting with the query, via the sorted prefix lists
+        suggestions = [self.search_index[i]['display_name']
+                       for i in self._ngram_index('duid').prefix_matches(query)]
+
         # Remove duplicates and limit
         suggestions = list(dict.fromkeys(suggestions))  # Preserves order while removing duplicates
         return suggestions[:limit]
@@ -374,6 +374,40 @@ class TransmissionHistoricalBackfill:
             logger.error("No historical transmission data was successfully downloaded")
             return False
 
+    def backfill_from_archives(self, source_dir, start_date=None, end_date=None, workers=2):
+        """
+        Backfill from DispatchIS archive zips already on disk.
+
+        Uses the shared backfill engine: archives are parsed in parallel and
+        merged in the layout the transmission collector writes
+        (COLLECTOR_STORAGE_MODE), either its partition directory or the single
+        file, and a manifest lets an interrupted run resume.
+        """
+        from aemo_data_service.shared.backfill import (
+            BackfillEngine, LocalArchiveSource, interconnector_job, working_root
+        )
+        from aemo_data_service.shared.config import config as collector_config
+        from aemo_data_service.shared.partitioned_storage import partition_dir_for
+
+        storage = collector_config.storage_mode
+        root = partition_dir_for if storage == 'partitioned' else working_root
+        job = interconnector_job(root(self.transmission_output_file))
+        try:
+            engine = BackfillEngine(
+                job,
+                LocalArchiveSource(Path(source_dir)),
+                workers=workers,
+                legacy_file=self.transmission_output_file,
+                storage=storage
+            )
+        except ValueError as e:
+            logger.error(str(e))
+            return False
+        summary = engine.run(start=start_date, end=end_date)
+        logger.info(f"Backfilled {summary['archives']} archives from {source_dir}, "
+                    f"{summary['rows_added']} new records")
+        return not summary['failed']
+
 
 def main():
     """Main function for historical transmission data backfill"""
@@ -382,6 +416,8 @@ def main():
     parser.add_argument('--end-date', type=str, help='End date (YYYY-MM-DD)')
     parser.add_argument('--max-days', type=int, help='Maximum number of days to process')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be downloaded without downloading')
+    parser.add_argument('--source-dir', type=str, help='Backfill from DispatchIS archive zips in this directory')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes when using --source-dir')
     
     args = parser.parse_args()
     
@@ -394,7 +430,18 @@ def main():
     start_date = pd.to_datetime(args.start_date) if args.start_date else None
     end_date = pd.to_datetime(args.end_date) if args.end_date else None
     
-    if args.dry_run:
+    if args.source_dir:
+        success = backfill.backfill_from_archives(
+            args.source_dir,
+            start_date=start_date,
+            end_date=end_date,
+            workers=args.workers
+        )
+        if success:
+            logger.info("Historical transmission data backfill completed successfully")
+        else:
+            logger.error("Historical transmission data backfill failed")
+    elif args.dry_run:
         # Just show what would be downloaded
         if start_date is None or end_date is None:
             gen_start, gen_end = backfill.get_generation_data_timeframe()
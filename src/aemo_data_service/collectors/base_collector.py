@@ -5,15 +5,23 @@ Abstract base class for all data collectors.
 """
 
 import asyncio
+import os
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from typing import Optional, Dict, Any, List
 import logging
 
+from aemo_dashboard.shared.data_version import publish_data_version
+
 from ..shared.config import config
+from ..shared.http_client import get_http_client
 from ..shared.logging_config import get_logger
+from ..shared.partitioned_storage import PartitionedParquetStore, anti_join, partition_dir_for
 
 logger = get_logger(__name__)
 
@@ -28,8 +36,36 @@ class BaseCollector(ABC):
     - Error handling and retries
     - Data validation
     - Status reporting
+    
+    With COLLECTOR_STORAGE_MODE=partitioned, new rows are appended to a
+    PartitionedParquetStore instead of rewriting the whole output file, and
+    only the current partition is held in memory.
+    
+    With COLLECTOR_TAIL_HOURS > 0, self.data holds only that many hours before
+    the latest interval, plus a watermark of the latest interval per key. New
+    rows at or before their key's watermark are already stored and dropped;
+    the rest are checked against the tail and streamed onto the end of the
+    output file, so memory no longer grows with the history on disk.
     """
     
+    # Column used to assign rows to partitions
+    time_column = 'settlementdate'
+    
+    # Columns identifying a unique row in partitioned storage (None = all columns)
+    key_columns: Optional[List[str]] = None
+    
+    # Table name published to the data-version file after each successful
+    # cycle, so dashboard caches know new data has landed (None = not published)
+    data_version_key: Optional[str] = None
+    
+    # Rows per row group when appending to the output file; small trailing
+    # row groups are merged on each rewrite so their count stays bounded
+    file_row_group_size = 500_000
+    
+    # Seconds one run_once() may take before the service abandons it
+    # (None = config.collector_timeout_seconds)
+    timeout_seconds: Optional[float] = None
+    
     def __init__(self, name: str, output_file: Path, update_interval_minutes: int = None):
         """
         Initialize the base collector.
@@ -45,22 +81,165 @@ class BaseCollector(ABC):
         self.last_update = None
         self.error_count = 0
         self.max_retries = 3
+        self.timeout_budget = self.timeout_seconds or config.collector_timeout_seconds
+        
+        # Per-cycle download metrics, reported by get_status()
+        self._cycle_bytes = 0
+        self._cycle_requests = 0
+        self.metrics = {
+            'cycles': 0,
+            'timeouts': 0,
+            'last_duration_seconds': None,
+            'avg_duration_seconds': None,
+            'max_duration_seconds': None,
+            'last_bytes': 0,
+            'last_requests': 0,
+            'total_bytes': 0,
+            'total_requests': 0,
+        }
         
         # Ensure output directory exists
         self.output_file.parent.mkdir(parents=True, exist_ok=True)
         
+        # Partitioned append-only storage (None = legacy single file)
+        self.store = self._create_store() if config.storage_mode == 'partitioned' else None
+        
+        # Bounded in-memory state (None = hold the full history)
+        tail_hours = config.collector_tail_hours
+        self.tail_window = timedelta(hours=tail_hours) if tail_hours > 0 else None
+        self.watermark: Optional[pd.Series] = None
+        
         # Initialize data
         self.data = self.load_existing_data()
+        self._update_watermark(self.data)
         
         logger.info(f"Initialized {self.name} collector")
         logger.info(f"Output file: {self.output_file}")
         logger.info(f"Update interval: {self.update_interval/60:.1f} minutes")
     
+    def _create_store(self) -> PartitionedParquetStore:
+        """Open the partitioned store, migrating the legacy file on first use."""
+        store = PartitionedParquetStore(
+            partition_dir_for(self.output_file),
+            time_column=self.time_column,
+            key_columns=self.key_columns,
+            partition=config.partition_granularity,
+            wal_max_rows=config.wal_max_rows,
+            wal_max_segments=config.wal_max_segments
+        )
+        
+        if store.is_empty() and self.output_file.exists():
+            logger.info(f"{self.name}: Migrating {self.output_file} to partitioned storage")
+            store.import_file(self.output_file)
+        
+        logger.info(f"{self.name}: Using partitioned storage at {store.root}")
+        return store
+    
+    def to_storage_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert in-memory data to the flat layout written to partitions."""
+        return df
+    
+    def from_storage_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert rows read from partitions back to the in-memory layout."""
+        return df
+    
+    def _times(self, df: pd.DataFrame) -> pd.Series:
+        """Timestamps of df, whether time_column is a column or the index."""
+        if df.index.name == self.time_column:
+            return pd.Series(df.index, index=df.index)
+        return df[self.time_column]
+    
+    def _trim_to_tail(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows older than the tail window before the latest interval."""
+        if self.tail_window is None or df.empty:
+            return df
+        times = self._times(df)
+        return df[(times >= times.max() - self.tail_window).to_numpy()]
+    
+    def _watermark_columns(self) -> List[str]:
+        return [c for c in (self.key_columns or []) if c != self.time_column]
+    
+    def _update_watermark(self, df: pd.DataFrame) -> None:
+        """Record the latest interval seen per key (or overall for keyless data)."""
+        if df is None or df.empty:
+            return
+        frame = self.to_storage_frame(df)
+        cols = self._watermark_columns()
+        if cols:
+            latest = frame.groupby(cols)[self.time_column].max()
+        else:
+            latest = pd.Series({self.time_column: frame[self.time_column].max()})
+        
+        if self.watermark is not None and not self.watermark.empty:
+            combined = pd.concat([self.watermark, latest])
+            latest = combined.groupby(level=list(range(combined.index.nlevels))).max()
+        self.watermark = latest
+    
+    def _drop_stored(self, flat: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows (in storage layout) at or before their key's watermark."""
+        if self.watermark is None or self.watermark.empty or flat.empty:
+            return flat
+        cols = self._watermark_columns()
+        if cols:
+            keys = pd.MultiIndex.from_frame(flat[cols]) if len(cols) > 1 else pd.Index(flat[cols[0]])
+            latest = self.watermark.reindex(keys).to_numpy()
+        else:
+            latest = self.watermark.iloc[0]
+        # Keys without a watermark compare against NaT and are kept
+        stored = (flat[self.time_column] <= latest).to_numpy()
+        return flat[~stored]
+    
+    def _read_output_file(self) -> pd.DataFrame:
+        """Read the output file, or only its tail when memory is bounded."""
+        if self.tail_window is None:
+            return pd.read_parquet(self.output_file)
+        
+        _, latest = self._file_time_range()
+        if latest is None:
+            return pd.read_parquet(self.output_file)
+        cutoff = pd.Timestamp(latest) - self.tail_window
+        return pd.read_parquet(self.output_file, filters=[(self.time_column, '>=', cutoff)])
+    
+    def _file_time_range(self):
+        """Min/max of time_column from parquet row group statistics."""
+        metadata = pq.read_metadata(self.output_file)
+        schema = metadata.schema.to_arrow_schema()
+        if self.time_column not in schema.names:
+            return None, None
+        col = schema.get_field_index(self.time_column)
+        
+        mins, maxs = [], []
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(col).statistics
+            if stats is None or not stats.has_min_max:
+                return None, None
+            mins.append(stats.min)
+            maxs.append(stats.max)
+        if not maxs:
+            return None, None
+        return min(mins), max(maxs)
+    
+    def _load_from_store(self) -> pd.DataFrame:
+        """Load only the current partition; older partitions stay on disk."""
+        try:
+            df = self.store.read_latest_partition()
+            if not df.empty:
+                df = self._trim_to_tail(self.sort_data(self.from_storage_frame(df)))
+                logger.info(f"{self.name}: Loaded {len(df)} records from latest partition")
+                return df
+        except Exception as e:
+            logger.error(f"{self.name}: Error loading partitioned data: {e}")
+        
+        return self.create_empty_dataframe()
+    
     def load_existing_data(self) -> pd.DataFrame:
         """Load existing data from parquet file or create empty DataFrame."""
+        if self.store is not None:
+            return self._load_from_store()
+        
         if self.output_file.exists():
             try:
-                df = pd.read_parquet(self.output_file)
+                df = self._read_output_file()
                 logger.info(f"{self.name}: Loaded {len(df)} existing records")
                 return df
             except Exception as e:
@@ -142,6 +321,12 @@ class BaseCollector(ABC):
                 logger.warning(f"{self.name}: Data validation failed")
                 return False
             
+            if self.store is not None:
+                return self._append_to_store(new_df)
+            
+            if self.tail_window is not None and self.output_file.exists():
+                return self._append_to_file(new_df)
+            
             # If existing data is empty, just use the new data
             if self.data.empty:
                 self.data = new_df.copy()
@@ -156,6 +341,8 @@ class BaseCollector(ABC):
                 # Sort and save
                 self.data = self.sort_data(self.data)
                 self.save_data()
+                self._update_watermark(new_df)
+                self.data = self._trim_to_tail(self.data)
                 
                 logger.info(f"{self.name}: Added {added_count} new records")
                 logger.info(f"{self.name}: Total records: {len(self.data):,}")
@@ -168,6 +355,102 @@ class BaseCollector(ABC):
             logger.error(f"{self.name}: Error adding new data: {e}")
             return False
     
+    def _append_to_store(self, new_df: pd.DataFrame) -> bool:
+        """Append new rows to partitioned storage and refresh the in-memory tail."""
+        added_count = self.store.append(self.to_storage_frame(new_df))
+        if added_count == 0:
+            logger.info(f"{self.name}: No new records to add")
+            return False
+        
+        if self.data.empty:
+            data = new_df.copy()
+        else:
+            data = self.merge_data(self.data, new_df)
+        data = self.sort_data(data)
+        
+        # Keep only the newest partition in memory so it does not grow forever
+        times = self._times(data)
+        current = self.store.partition_key(times.max())
+        keys = self.store.partition_keys(times).to_numpy()
+        self.data = self._trim_to_tail(data[keys == current])
+        self._update_watermark(new_df)
+        
+        logger.info(f"{self.name}: Appended {added_count} new records")
+        logger.info(f"{self.name}: Records in memory: {len(self.data):,}")
+        return True
+    
+    def _append_to_file(self, new_df: pd.DataFrame) -> bool:
+        """Merge new rows against the in-memory tail and append them to the file."""
+        tail = self.data
+        merged = self.sort_data(self.merge_data(tail, new_df) if not tail.empty else new_df.copy())
+        
+        flat_merged = self.to_storage_frame(merged)
+        key_cols = self.key_columns or list(flat_merged.columns)
+        added = anti_join(flat_merged, self.to_storage_frame(tail), key_cols) if not tail.empty else flat_merged
+        added = self._drop_stored(added)
+        
+        if added.empty:
+            logger.info(f"{self.name}: No new records to add")
+            return False
+        
+        if not self.append_rows_to_file(added):
+            return False
+        
+        self._update_watermark(merged)
+        self.data = self._trim_to_tail(merged)
+        
+        logger.info(f"{self.name}: Added {len(added)} new records")
+        logger.info(f"{self.name}: Records in memory: {len(self.data):,}")
+        return True
+    
+    def append_rows_to_file(self, rows: pd.DataFrame) -> bool:
+        """
+        Append rows (in storage layout) to the output parquet file.
+        
+        Parquet files cannot be appended in place, so existing row groups are
+        copied one at a time into a new file followed by the new rows. Full
+        row groups are copied as they are; smaller ones (earlier appends) are
+        merged with the new rows into groups of file_row_group_size, so the
+        row group count does not grow with every cycle. Memory is bounded by
+        about two row groups rather than the whole file.
+        """
+        tmp_path = self.output_file.with_name(self.output_file.name + '.tmp')
+        size = self.file_row_group_size
+        try:
+            source = pq.ParquetFile(self.output_file)
+            schema = source.schema_arrow
+            new_table = pa.Table.from_pandas(rows, preserve_index=False)
+            new_table = new_table.select(schema.names).cast(schema)
+            
+            with pq.ParquetWriter(tmp_path, schema, compression='snappy') as writer:
+                pending, pending_rows = [], 0
+                for i in range(source.num_row_groups):
+                    if not pending and source.metadata.row_group(i).num_rows >= size:
+                        writer.write_table(source.read_row_group(i))
+                        continue
+                    group = source.read_row_group(i)
+                    pending.append(group)
+                    pending_rows += group.num_rows
+                    if pending_rows >= size:
+                        merged = pa.concat_tables(pending)
+                        full = pending_rows - pending_rows % size
+                        writer.write_table(merged.slice(0, full), row_group_size=size)
+                        pending, pending_rows = [merged.slice(full)], pending_rows - full
+                pending.append(new_table)
+                writer.write_table(pa.concat_tables(pending), row_group_size=size)
+            
+            os.replace(tmp_path, self.output_file)
+            
+            file_size = self.output_file.stat().st_size / (1024*1024)
+            logger.info(f"{self.name}: Appended {len(rows)} rows to {self.output_file} ({file_size:.2f}MB)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"{self.name}: Error appending to {self.output_file}: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return False
+    
     def merge_data(self, existing: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
         """
         Merge new data with existing data.
@@ -203,32 +486,131 @@ class BaseCollector(ABC):
     
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the collector."""
+        if self.store is not None:
+            return self._get_store_status()
+        
+        file_size = 0
+        total_records = 0
+        first = latest = None
         if self.output_file.exists():
             file_size = self.output_file.stat().st_size / (1024*1024)
-        else:
-            file_size = 0
+            # Counts and range come from parquet metadata, not the in-memory tail
+            try:
+                total_records = pq.read_metadata(self.output_file).num_rows
+                first, latest = self._file_time_range()
+            except Exception as e:
+                logger.warning(f"{self.name}: Could not read parquet metadata: {e}")
         
         status = {
             'name': self.name,
             'last_update': self.last_update,
             'error_count': self.error_count,
-            'total_records': len(self.data) if not self.data.empty else 0,
+            'total_records': total_records,
+            'records_in_memory': len(self.data),
             'file_size_mb': round(file_size, 2),
-            'output_file': str(self.output_file)
+            'output_file': str(self.output_file),
+            'timeout_seconds': self.timeout_budget,
+            'metrics': dict(self.metrics)
         }
         
-        # Add data range if available
-        if not self.data.empty and hasattr(self.data, 'settlementdate'):
+        if first is not None and latest is not None:
+            status['date_range'] = {
+                'start': pd.Timestamp(first).isoformat(),
+                'end': pd.Timestamp(latest).isoformat()
+            }
+        
+        if self.watermark is not None and not self.watermark.empty:
+            status['watermark'] = {
+                'latest': pd.Timestamp(self.watermark.max()).isoformat(),
+                'keys': len(self.watermark)
+            }
+        
+        return status
+    
+    def _get_store_status(self) -> Dict[str, Any]:
+        """Status for partitioned storage, read from parquet metadata."""
+        stats = self.store.get_stats()
+        status = {
+            'name': self.name,
+            'last_update': self.last_update,
+            'error_count': self.error_count,
+            'total_records': stats['total_records'],
+            'records_in_memory': len(self.data),
+            'file_size_mb': stats['size_mb'],
+            'output_file': str(self.store.root),
+            'timeout_seconds': self.timeout_budget,
+            'metrics': dict(self.metrics),
+            'storage': stats
+        }
+        
+        if not self.data.empty:
             try:
+                times = self._times(self.data)
                 status['date_range'] = {
-                    'start': self.data['settlementdate'].min().isoformat(),
-                    'end': self.data['settlementdate'].max().isoformat()
+                    'start': stats['first_partition'] or times.min().isoformat(),
+                    'end': times.max().isoformat()
                 }
-            except:
+            except Exception:
                 pass
         
         return status
     
+    async def http_get(self, url: str, timeout: float = 30):
+        """
+        GET a URL through the shared HTTP client, counting bytes for metrics.
+        
+        Returns:
+            requests.Response (call raise_for_status() as needed)
+        """
+        response = await get_http_client().get(url, timeout=timeout)
+        size = len(response.content)
+        self._cycle_bytes += size
+        self._cycle_requests += 1
+        self.metrics['total_bytes'] += size
+        self.metrics['total_requests'] += 1
+        return response
+    
+    async def run_with_budget(self) -> bool:
+        """
+        Run one collection cycle within this collector's timeout budget.
+        
+        A slow download is cancelled at its next await, so it cannot hold up
+        the rest of the service's cycle. Writes happen after the last await in
+        run_once(), so a cancelled cycle never leaves a partial save.
+        """
+        start = time.monotonic()
+        self._cycle_bytes = 0
+        self._cycle_requests = 0
+        try:
+            return await asyncio.wait_for(self.run_once(), timeout=self.timeout_budget)
+        except asyncio.TimeoutError:
+            self.error_count += 1
+            self.metrics['timeouts'] += 1
+            logger.warning(f"{self.name}: Collection cycle exceeded {self.timeout_budget:.0f}s budget")
+            return False
+        finally:
+            self._record_cycle(time.monotonic() - start)
+    
+    def _record_cycle(self, duration: float) -> None:
+        metrics = self.metrics
+        cycles = metrics['cycles'] + 1
+        previous_avg = metrics['avg_duration_seconds'] or 0.0
+        metrics['cycles'] = cycles
+        metrics['last_duration_seconds'] = round(duration, 3)
+        metrics['avg_duration_seconds'] = round(previous_avg + (duration - previous_avg) / cycles, 3)
+        metrics['max_duration_seconds'] = round(max(metrics['max_duration_seconds'] or 0.0, duration), 3)
+        metrics['last_bytes'] = self._cycle_bytes
+        metrics['last_requests'] = self._cycle_requests
+    
+    def publish_data_version(self) -> None:
+        """Publish the latest collected interval for data-version-aware caches."""
+        if self.data_version_key is None or self.watermark is None or self.watermark.empty:
+            return
+        try:
+            publish_data_version(self.data_version_key, self.watermark.max(), config.data_version_file)
+        except Exception as e:
+            logger.warning(f"{self.name}: Could not publish data version: {e}")
+    
     async def run_once(self) -> bool:
         """
         Run a single collection cycle.
@@ -257,6 +639,7 @@ class BaseCollector(ABC):
             if success:
                 self.last_update = datetime.now()
                 self.error_count = 0
+                self.publish_data_version()
                 logger.info(f"{self.name}: Collection cycle completed successfully")
                 return True
             else:
@@ -8,8 +8,6 @@ import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 import re
-import zipfile
-from io import BytesIO
 from pathlib import Path
 from typing import Optional, List
 import asyncio
@@ -17,6 +15,7 @@ import asyncio
 from .base_collector import BaseCollector
 from ..shared.config import config
 from ..shared.logging_config import get_logger
+from ..shared.mms_parser import DISPATCH_UNIT_SCADA, read_mms_zip
 
 logger = get_logger(__name__)
 
@@ -29,6 +28,9 @@ class GenerationCollector(BaseCollector):
     for all registered units in the National Electricity Market.
     """
     
+    key_columns = ['settlementdate', 'duid']
+    data_version_key = 'generation'
+    
     def __init__(self):
         """Initialize the generation collector."""
         super().__init__(
@@ -86,17 +88,8 @@ class GenerationCollector(BaseCollector):
     async def _get_latest_file_url(self) -> Optional[str]:
         """Get the URL of the most recent SCADA file."""
         try:
-            # Use proper headers to avoid 403 errors
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, 
-                lambda: requests.get(self.base_url, headers=headers, timeout=30)
-            )
+            # Shared pooled client, limited per host
+            response = await self.http_get(self.base_url, timeout=30)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -137,22 +130,13 @@ class GenerationCollector(BaseCollector):
         """Download and parse SCADA ZIP file with retry logic."""
         for attempt in range(3):
             try:
-                # Use proper headers to avoid 403 errors
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                
                 # Add small delay to avoid rate limiting
                 if attempt > 0:
                     await asyncio.sleep(2 * attempt)
                     logger.info(f"Retry attempt {attempt + 1} for {file_url}")
                 
-                # Download in thread pool
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: requests.get(file_url, headers=headers, timeout=60)
-                )
+                # Shared pooled client, limited per host
+                response = await self.http_get(file_url, timeout=60)
                 response.raise_for_status()
                 
                 # If successful, break the retry loop
@@ -170,55 +154,20 @@ class GenerationCollector(BaseCollector):
                 return None
         
         try:
-            # Extract ZIP file
-            with zipfile.ZipFile(BytesIO(response.content)) as zip_file:
-                # Get the first CSV file in the ZIP
-                csv_files = [name for name in zip_file.namelist() if name.endswith('.CSV')]
-                
-                if not csv_files:
-                    logger.error("No CSV files found in ZIP archive")
-                    return None
-                
-                csv_filename = csv_files[0]
-                logger.info(f"Extracting and parsing: {csv_filename}")
-                
-                # Read CSV content from ZIP
-                with zip_file.open(csv_filename) as csv_file:
-                    csv_content = csv_file.read().decode('utf-8')
-            
-            # Parse CSV content
-            lines = csv_content.strip().split('\n')
-            
-            # Find data lines (start with 'D')
-            data_rows = []
-            for line in lines:
-                if line.startswith('D,DISPATCH,UNIT_SCADA'):
-                    # Split CSV line and extract required fields
-                    fields = line.split(',')
-                    if len(fields) >= 7:  # Ensure we have all required fields
-                        settlementdate = fields[4].strip('"')
-                        duid = fields[5].strip('"')
-                        scadavalue = fields[6].strip('"')
-                        
-                        try:
-                            scadavalue = float(scadavalue)
-                        except ValueError:
-                            continue  # Skip invalid numeric values
-                        
-                        data_rows.append({
-                            'settlementdate': settlementdate,
-                            'duid': duid,
-                            'scadavalue': scadavalue
-                        })
+            # Stream the UNIT_SCADA table straight out of the zip
+            tables = read_mms_zip(response.content, [DISPATCH_UNIT_SCADA], lowercase=True)
+            df = tables[DISPATCH_UNIT_SCADA]
             
-            if data_rows:
-                df = pd.DataFrame(data_rows)
-                df['settlementdate'] = pd.to_datetime(df['settlementdate'])
-                logger.info(f"Parsed {len(df)} records")
-                return df
-            else:
+            if df.empty:
                 logger.warning("No valid data rows found in file")
                 return None
+            
+            df = df[['settlementdate', 'duid', 'scadavalue']].copy()
+            df['scadavalue'] = pd.to_numeric(df['scadavalue'], errors='coerce')
+            df = df.dropna(subset=['scadavalue']).reset_index(drop=True)
+            
+            logger.info(f"Parsed {len(df)} records")
+            return df
                 
         except Exception as e:
             logger.error(f"Error downloading/parsing file {file_url}: {e}")
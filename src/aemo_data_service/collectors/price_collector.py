@@ -7,11 +7,6 @@ Collects regional spot prices from NEMWEB every 5 minutes.
 import pandas as pd
 import requests
 import re
-import zipfile
-import tempfile
-import os
-from io import StringIO
-import csv
 from pathlib import Path
 from typing import Optional, List
 import asyncio
@@ -19,6 +14,7 @@ import asyncio
 from .base_collector import BaseCollector
 from ..shared.config import config
 from ..shared.logging_config import get_logger
+from ..shared.mms_parser import DREGION, read_mms_zip
 
 logger = get_logger(__name__)
 
@@ -31,6 +27,13 @@ class PriceCollector(BaseCollector):
     for all regions in the National Electricity Market.
     """
     
+    time_column = 'SETTLEMENTDATE'
+    key_columns = ['SETTLEMENTDATE', 'REGIONID']
+    data_version_key = 'prices'
+    
+    # One small file per cycle; fail fast rather than wait on a stalled socket
+    timeout_seconds = 60
+    
     def __init__(self):
         """Initialize the price collector."""
         super().__init__(
@@ -68,7 +71,7 @@ class PriceCollector(BaseCollector):
                 logger.warning("Failed to download latest dispatch file")
                 return None
             
-            csv_content, filename = result
+            zip_content, filename = result
             
             # Skip if we've already processed this file
             if filename == self.last_processed_file:
@@ -76,7 +79,7 @@ class PriceCollector(BaseCollector):
                 return None
             
             # Parse the data
-            new_data = self._parse_dispatch_data(csv_content)
+            new_data = self._parse_dispatch_data(zip_content)
             
             if new_data is not None and not new_data.empty:
                 self.last_processed_file = filename
@@ -91,20 +94,11 @@ class PriceCollector(BaseCollector):
     async def _get_latest_dispatch_file(self):
         """
         Download the latest dispatch file from AEMO website.
-        Returns the CSV content as a string and filename, or None if failed.
+        Returns the zip content as bytes and filename, or None if failed.
         """
         try:
-            # Use proper headers to avoid 403 errors
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: requests.get(self.aemo_url, headers=headers, timeout=30)
-            )
+            # Shared pooled client, limited per host
+            response = await self.http_get(self.aemo_url, timeout=30)
             response.raise_for_status()
             
             # Look for PUBLIC_DISPATCH files
@@ -128,10 +122,7 @@ class PriceCollector(BaseCollector):
                         await asyncio.sleep(2 * attempt)
                         logger.info(f"Retry attempt {attempt + 1} for price file {latest_file}")
                     
-                    zip_response = await loop.run_in_executor(
-                        None,
-                        lambda: requests.get(file_url, headers=headers, timeout=60)
-                    )
+                    zip_response = await self.http_get(file_url, timeout=60)
                     zip_response.raise_for_status()
                     break
                     
@@ -142,83 +133,30 @@ class PriceCollector(BaseCollector):
                     else:
                         raise
             
-            # Create a temporary file for the zip
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_zip_file:
-                temp_zip_path = temp_zip_file.name
-                temp_zip_file.write(zip_response.content)
-                temp_zip_file.flush()
-                
-                try:
-                    # Extract the CSV from the zip file
-                    with zipfile.ZipFile(temp_zip_path, 'r') as zip_file:
-                        # Find the CSV file inside
-                        csv_name = latest_file.replace('.zip', '.CSV')
-                        if csv_name not in zip_file.namelist():
-                            # Try without _LEGACY suffix
-                            csv_name = latest_file.replace('_LEGACY.zip', '.CSV')
-                        
-                        if csv_name in zip_file.namelist():
-                            csv_content = zip_file.read(csv_name).decode('utf-8')
-                            return csv_content, latest_file
-                        else:
-                            logger.error(f"CSV file not found in zip. Available files: {zip_file.namelist()}")
-                            return None, None
-                            
-                finally:
-                    # Clean up temporary file
-                    try:
-                        os.unlink(temp_zip_path)
-                    except OSError as e:
-                        logger.warning(f"Could not delete temporary file {temp_zip_path}: {e}")
-                        
+            return zip_response.content, latest_file
+            
         except Exception as e:
             logger.error(f"Error downloading dispatch file: {e}")
             return None, None
     
-    def _parse_dispatch_data(self, csv_content: str) -> Optional[pd.DataFrame]:
+    def _parse_dispatch_data(self, zip_content: bytes) -> Optional[pd.DataFrame]:
         """
-        Parse AEMO dispatch CSV data and extract regional price information.
+        Parse the DREGION table of an AEMO dispatch zip into regional prices.
         Returns DataFrame with SETTLEMENTDATE as index and columns: REGIONID, RRP
         """
         try:
-            lines = csv_content.strip().split('\n')
-            price_records = []
-            
-            for line in lines:
-                if not line.strip():
-                    continue
-                
-                # Split the line by commas, handling quoted fields properly
-                reader = csv.reader(StringIO(line))
-                try:
-                    fields = next(reader)
-                except:
-                    continue
-                
-                # Look for DREGION data rows
-                if len(fields) >= 9 and fields[0] == 'D' and fields[1] == 'DREGION':
-                    try:
-                        # Field positions: 0=D, 1=DREGION, 2=empty, 3=3, 4=settlement_date, 
-                        # 5=runno, 6=regionid, 7=intervention, 8=rrp
-                        settlement_date = pd.to_datetime(fields[4])
-                        region = fields[6]
-                        rrp = float(fields[8])
-                        
-                        price_records.append({
-                            'SETTLEMENTDATE': settlement_date,
-                            'REGIONID': region,
-                            'RRP': rrp
-                        })
-                    except (ValueError, TypeError, IndexError) as e:
-                        logger.debug(f"Error parsing price row: {e}")
-                        continue
+            tables = read_mms_zip(zip_content, [DREGION])
+            dregion = tables[DREGION]
             
-            if not price_records:
+            if dregion.empty:
                 logger.warning("No valid price records extracted")
                 return pd.DataFrame()
             
-            # Convert to DataFrame and set SETTLEMENTDATE as index
-            temp_df = pd.DataFrame(price_records)
+            temp_df = dregion[['SETTLEMENTDATE', 'REGIONID', 'RRP']].copy()
+            temp_df['RRP'] = pd.to_numeric(temp_df['RRP'], errors='coerce')
+            temp_df = temp_df.dropna(subset=['SETTLEMENTDATE', 'RRP'])
+            
+            # Set SETTLEMENTDATE as index
             result_df = temp_df.set_index('SETTLEMENTDATE')
             
             settlement_time = result_df.index[0]
@@ -285,11 +223,22 @@ class PriceCollector(BaseCollector):
         """Sort price data by settlement date index."""
         return df.sort_index()
     
+    def to_storage_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Partitions store SETTLEMENTDATE as a column."""
+        return df.reset_index()
+    
+    def from_storage_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Restore the SETTLEMENTDATE index used in memory."""
+        return df.set_index('SETTLEMENTDATE')
+    
     def load_existing_data(self) -> pd.DataFrame:
         """Load existing price data, handling the index structure correctly."""
+        if self.store is not None:
+            return self._load_from_store()
+        
         if self.output_file.exists():
             try:
-                df = pd.read_parquet(self.output_file)
+                df = self._read_output_file()
                 
                 # Ensure SETTLEMENTDATE is the index
                 if df.index.name != 'SETTLEMENTDATE':
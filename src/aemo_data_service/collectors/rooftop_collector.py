@@ -8,8 +8,6 @@ import pandas as pd
 import numpy as np
 import requests
 from bs4 import BeautifulSoup
-import zipfile
-from io import BytesIO
 from pathlib import Path
 from typing import Optional, List
 import asyncio
@@ -18,6 +16,7 @@ from datetime import datetime, timedelta
 from .base_collector import BaseCollector
 from ..shared.config import config
 from ..shared.logging_config import get_logger
+from ..shared.mms_parser import ROOFTOP_ACTUAL, read_mms_zip
 
 logger = get_logger(__name__)
 
@@ -30,6 +29,12 @@ class RooftopCollector(BaseCollector):
     rooftop solar generation data and converts to 5-minute intervals using weighted averaging.
     """
     
+    key_columns = ['settlementdate']
+    data_version_key = 'rooftop'
+    
+    # Downloads several half-hourly zips per cycle
+    timeout_seconds = 180
+    
     def __init__(self):
         """Initialize the rooftop collector."""
         super().__init__(
@@ -113,17 +118,8 @@ class RooftopCollector(BaseCollector):
     async def _get_latest_rooftop_files(self) -> List[str]:
         """Get list of recent rooftop PV files from NEMWEB."""
         try:
-            # Use proper headers to avoid 403 errors
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: requests.get(self.base_url, headers=headers, timeout=30)
-            )
+            # Shared pooled client, limited per host
+            response = await self.http_get(self.base_url, timeout=30)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -161,22 +157,13 @@ class RooftopCollector(BaseCollector):
         
         for attempt in range(3):
             try:
-                # Use proper headers to avoid 403 errors
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                
                 # Add small delay to avoid rate limiting
                 if attempt > 0:
                     await asyncio.sleep(2 * attempt)
                     logger.info(f"Retry attempt {attempt + 1} for rooftop file {filename}")
                 
-                # Download in thread pool
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: requests.get(file_url, headers=headers, timeout=30)
-                )
+                # Shared pooled client, limited per host
+                response = await self.http_get(file_url, timeout=30)
                 response.raise_for_status()
                 
                 return response.content
@@ -197,52 +184,19 @@ class RooftopCollector(BaseCollector):
     def _parse_rooftop_zip(self, zip_content: bytes) -> pd.DataFrame:
         """Parse rooftop PV ZIP content into 30-minute DataFrame."""
         try:
-            # Extract ZIP file
-            with zipfile.ZipFile(BytesIO(zip_content)) as zip_file:
-                # Look for CSV files
-                csv_files = [name for name in zip_file.namelist() if name.lower().endswith('.csv')]
-                
-                if not csv_files:
-                    logger.error("No CSV files found in rooftop ZIP")
-                    return pd.DataFrame()
-                
-                csv_filename = csv_files[0]
-                
-                # Read CSV content
-                with zip_file.open(csv_filename) as csv_file:
-                    csv_content = csv_file.read().decode('utf-8')
-            
-            # Parse CSV lines
-            lines = csv_content.strip().split('\n')
-            data_rows = []
-            
-            for line in lines:
-                if line.startswith('D,ROOFTOP,ACTUAL'):
-                    fields = line.split(',')
-                    if len(fields) >= 8:
-                        # Extract fields: interval_datetime, regionid, powermw
-                        interval_datetime = fields[4].strip('"')
-                        regionid = fields[5].strip('"')
-                        powermw = fields[6].strip('"')
-                        
-                        try:
-                            powermw = float(powermw) if powermw else 0.0
-                        except ValueError:
-                            continue
-                        
-                        data_rows.append({
-                            'settlementdate': interval_datetime,
-                            'regionid': regionid,
-                            'powermw': powermw
-                        })
+            # Stream the ROOFTOP ACTUAL table straight out of the zip
+            tables = read_mms_zip(zip_content, [ROOFTOP_ACTUAL])
+            actual = tables[ROOFTOP_ACTUAL]
             
-            if not data_rows:
+            if actual.empty:
                 logger.warning("No valid rooftop data rows found")
                 return pd.DataFrame()
             
-            # Create DataFrame and pivot
-            df = pd.DataFrame(data_rows)
-            df['settlementdate'] = pd.to_datetime(df['settlementdate'])
+            df = pd.DataFrame({
+                'settlementdate': actual['INTERVAL_DATETIME'],
+                'regionid': actual['REGIONID'],
+                'powermw': pd.to_numeric(actual['POWER'], errors='coerce').fillna(0.0)
+            })
             
             # Pivot to get regions as columns
             pivot_df = df.pivot_table(
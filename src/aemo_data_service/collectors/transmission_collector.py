@@ -8,8 +8,6 @@ import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 import re
-import zipfile
-from io import BytesIO
 from pathlib import Path
 from typing import Optional, List, Dict
 import asyncio
@@ -17,6 +15,7 @@ import asyncio
 from .base_collector import BaseCollector
 from ..shared.config import config
 from ..shared.logging_config import get_logger
+from ..shared.mms_parser import DISPATCH_INTERCONNECTORRES, read_mms_zip
 
 logger = get_logger(__name__)
 
@@ -29,6 +28,9 @@ class TransmissionCollector(BaseCollector):
     transmission flow data between NEM regions.
     """
     
+    key_columns = ['settlementdate', 'interconnectorid']
+    data_version_key = 'transmission'
+    
     def __init__(self):
         """Initialize the transmission collector."""
         super().__init__(
@@ -110,17 +112,8 @@ class TransmissionCollector(BaseCollector):
     async def _get_latest_file_url(self) -> Optional[str]:
         """Get the URL of the most recent DISPATCHIS file."""
         try:
-            # Use proper headers to avoid 403 errors
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: requests.get(self.base_url, headers=headers, timeout=30)
-            )
+            # Shared pooled client, limited per host
+            response = await self.http_get(self.base_url, timeout=30)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -161,22 +154,13 @@ class TransmissionCollector(BaseCollector):
         """Download and parse DISPATCHIS ZIP file with retry logic."""
         for attempt in range(3):
             try:
-                # Use proper headers to avoid 403 errors
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                
                 # Add small delay to avoid rate limiting
                 if attempt > 0:
                     await asyncio.sleep(2 * attempt)
                     logger.info(f"Retry attempt {attempt + 1} for {file_url}")
                 
-                # Download in thread pool
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: requests.get(file_url, headers=headers, timeout=60)
-                )
+                # Shared pooled client, limited per host
+                response = await self.http_get(file_url, timeout=60)
                 response.raise_for_status()
                 
                 # If successful, break the retry loop
@@ -194,69 +178,23 @@ class TransmissionCollector(BaseCollector):
                 return None
         
         try:
+            # Stream the INTERCONNECTORRES table straight out of the zip
+            tables = read_mms_zip(response.content, [DISPATCH_INTERCONNECTORRES], lowercase=True)
+            df = tables[DISPATCH_INTERCONNECTORRES]
             
-            # Extract ZIP file
-            with zipfile.ZipFile(BytesIO(response.content)) as zip_file:
-                # Get the first CSV file in the ZIP
-                csv_files = [name for name in zip_file.namelist() if name.endswith('.CSV')]
-                
-                if not csv_files:
-                    logger.error("No CSV files found in ZIP archive")
-                    return None
-                
-                csv_filename = csv_files[0]
-                logger.info(f"Extracting and parsing: {csv_filename}")
-                
-                # Read CSV content from ZIP
-                with zip_file.open(csv_filename) as csv_file:
-                    csv_content = csv_file.read().decode('utf-8')
+            if df.empty:
+                logger.warning("No valid transmission flow data rows found")
+                return None
             
-            # Parse CSV content
-            lines = csv_content.strip().split('\n')
+            columns = ['settlementdate', 'interconnectorid', 'meteredmwflow',
+                       'mwflow', 'exportlimit', 'importlimit', 'mwlosses']
+            df = df.reindex(columns=columns)
+            for col in columns[2:]:
+                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0)
             
-            # Find data lines (start with 'D,DISPATCH,INTERCONNECTORRES')
-            data_rows = []
-            for line in lines:
-                if line.startswith('D,DISPATCH,INTERCONNECTORRES'):
-                    # Split CSV line and extract required fields
-                    fields = line.split(',')
-                    if len(fields) >= 17:  # Ensure we have all required fields
-                        settlementdate = fields[4].strip('"')
-                        interconnectorid = fields[6].strip('"')
-                        meteredmwflow = fields[9].strip('"')
-                        mwflow = fields[10].strip('"')
-                        mwlosses = fields[11].strip('"')
-                        exportlimit = fields[15].strip('"') if len(fields) > 15 else '0'
-                        importlimit = fields[16].strip('"') if len(fields) > 16 else '0'
-                        
-                        try:
-                            meteredmwflow = float(meteredmwflow) if meteredmwflow else 0.0
-                            mwflow = float(mwflow) if mwflow else 0.0
-                            exportlimit = float(exportlimit) if exportlimit else 0.0
-                            importlimit = float(importlimit) if importlimit else 0.0
-                            mwlosses = float(mwlosses) if mwlosses else 0.0
-                        except ValueError:
-                            continue  # Skip invalid numeric values
-                        
-                        data_rows.append({
-                            'settlementdate': settlementdate,
-                            'interconnectorid': interconnectorid,
-                            'meteredmwflow': meteredmwflow,
-                            'mwflow': mwflow,
-                            'exportlimit': exportlimit,
-                            'importlimit': importlimit,
-                            'mwlosses': mwlosses
-                        })
+            logger.info(f"Parsed {len(df)} transmission flow records")
+            return df
             
-            if data_rows:
-                df = pd.DataFrame(data_rows)
-                df['settlementdate'] = pd.to_datetime(df['settlementdate'])
-                logger.info(f"Parsed {len(df)} transmission flow records")
-                return df
-            else:
-                logger.warning("No valid transmission flow data rows found")
-                return None
-                
         except Exception as e:
             logger.error(f"Error downloading/parsing file {file_url}: {e}")
             return None
@@ -13,6 +13,7 @@ import json
 from pathlib import Path
 
 from .shared.config import config
+from .shared.http_client import close_http_client, get_http_client
 from .shared.logging_config import configure_service_logging, get_logger
 from .collectors.generation_collector import GenerationCollector
 from .collectors.price_collector import PriceCollector
@@ -131,6 +132,8 @@ class AEMODataService:
             except (asyncio.TimeoutError, asyncio.CancelledError):
                 logger.info("Collection task stopped")
         
+        close_http_client()
+        
         self.is_running = False
         logger.info("Data service stopped")
     
@@ -182,25 +185,23 @@ class AEMODataService:
         """
         Run a single collection cycle for all collectors.
         Returns dict mapping collector names to success status.
+        
+        Collectors run concurrently on the shared HTTP client, each within its
+        own timeout budget, so a slow download only fails its own collector.
         """
-        # Run all collectors concurrently
-        tasks = []
-        for name, collector in self.collectors.items():
-            task = asyncio.create_task(
-                collector.run_once(),
-                name=f"cycle_{name}"
-            )
-            tasks.append((name, task))
+        names = list(self.collectors)
+        outcomes = await asyncio.gather(
+            *(self.collectors[name].run_with_budget() for name in names),
+            return_exceptions=True
+        )
         
-        # Wait for all to complete
         results = {}
-        for name, task in tasks:
-            try:
-                success = await task
-                results[name] = success
-            except Exception as e:
-                logger.error(f"Error in {name} collector: {e}")
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Error in {name} collector: {outcome}")
                 results[name] = False
+            else:
+                results[name] = outcome
         
         return results
     
@@ -238,7 +239,8 @@ class AEMODataService:
                 'update_interval_minutes': self.update_interval / 60,
                 'collection_task_running': self.collection_task and not self.collection_task.done() if self.collection_task else False
             },
-            'collectors': {}
+            'collectors': {},
+            'http': get_http_client().get_stats()
         }
         
         # Get status from each collector
@@ -272,6 +274,11 @@ class AEMODataService:
             summary += f"    File size: {collector_status['file_size_mb']} MB\n"
             summary += f"    Errors: {collector_status['error_count']}\n"
             
+            metrics = collector_status.get('metrics', {})
+            if metrics.get('last_duration_seconds') is not None:
+                summary += (f"    Last cycle: {metrics['last_duration_seconds']:.1f}s, "
+                            f"{metrics['last_bytes'] / 1024:.0f} KB in {metrics['last_requests']} requests\n")
+            
             if collector_status.get('date_range'):
                 summary += f"    Date range: {collector_status['date_range']['start']} to {collector_status['date_range']['end']}\n"
         
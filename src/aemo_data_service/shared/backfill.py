@@ -0,0 +1,816 @@
+#!/usr/bin/env python3
+"""
+Parallel, resumable backfill of MMS tables from NEMWEB archive zips.
+
+The archive layouts differ (a monthly MMSDM zip holds one nested zip per
+table, a daily DispatchIS archive holds 288 nested five-minute zips), but the
+work is always the same: find the CSV members, pull one MMS table out of
+them, clean it and merge it into the history. This module does that once for
+every backfill script:
+
+* Archives come from an ``ArchiveSource``: a local directory of zips (usable
+  offline and in tests) or a list of URLs streamed to disk.
+* Each archive is parsed by a worker process. Workers stream CSV members
+  through ``iter_mms_tables`` and write each piece straight to per-partition
+  shard files, so memory is bounded by the parser chunk size rather than the
+  archive size.
+* The parent process is the only writer to the ``PartitionedParquetStore``.
+  It merges an archive's shards into the partitions they touch and then
+  records the archive in a JSON manifest. An interrupted run skips archives
+  already in the manifest; merges deduplicate on the key columns, so an
+  archive that was half-merged when the run stopped is simply merged again.
+* An optional rollup (e.g. scada5 -> scada30 means) is recomputed for every
+  touched partition, also in the worker pool.
+
+The history is written in the layout its collector uses (see
+``COLLECTOR_STORAGE_MODE``), because readers prefer a partition directory
+over the single file whenever the directory exists. With 'partitioned'
+storage the engine merges into the collector's partition directory. With
+'file' storage it stages partitions in a working directory the dashboard
+never reads, then folds them (and any rows the collector appended in the
+meantime) back into the single file.
+"""
+
+import io
+import json
+import os
+import re
+import shutil
+import zipfile
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import requests
+
+from .http_client import DEFAULT_HEADERS
+from .logging_config import get_logger
+from .mms_parser import (
+    DEFAULT_CHUNK_SIZE,
+    DISPATCH_INTERCONNECTORRES,
+    DISPATCH_UNIT_SCADA,
+    TableKey,
+    iter_mms_tables,
+)
+from .partitioned_storage import PartitionedParquetStore, anti_join, partition_dir_for
+
+logger = get_logger(__name__)
+
+# Nested zips larger than this are spilled to a temp file rather than held in memory
+NESTED_ZIP_SPILL_BYTES = 64 * 1024 * 1024
+
+MANIFEST_FILENAME = '_backfill_manifest.json'
+
+STORAGE_LAYOUTS = ('file', 'partitioned')
+
+# Rows per row group when a 'file' layout backfill rewrites the single file
+FILE_ROW_GROUP_SIZE = 500_000
+
+
+# ----------------------------------------------------------------------
+# Jobs
+# ----------------------------------------------------------------------
+
+class Rollup(NamedTuple):
+    """Coarser table derived from the backfilled one (e.g. scada30 from scada5)."""
+    root: Path
+    freq: str = '30min'
+    value_columns: Tuple[str, ...] = ('scadavalue',)
+    # 'right' labels a window by its end, as AEMO trading intervals are:
+    # 00:30 is the mean of 00:05..00:30
+    label: str = 'right'
+    # Single-file history of the rollup table, imported before the first write
+    legacy_file: Optional[Path] = None
+
+
+class BackfillJob:
+    """
+    What to extract from the archives and where to put it.
+
+    Jobs are pickled to the worker processes, so ``transform`` must be a
+    module-level function.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        table: TableKey,
+        columns: List[str],
+        key_columns: List[str],
+        output_root: Path,
+        time_column: str = 'settlementdate',
+        member_pattern: Optional[str] = None,
+        column_types: Optional[Dict[str, pa.DataType]] = None,
+        transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        partition: str = 'day',
+        rollup: Optional[Rollup] = None,
+    ):
+        """
+        Args:
+            name: Job name, used in logs and the manifest
+            table: MMS (report, subreport) to extract
+            columns: MMS column names to keep (stored lower-cased)
+            key_columns: Lower-case columns identifying a unique row
+            output_root: Partition directory to merge into
+            time_column: Lower-case timestamp column used for partitioning
+            member_pattern: Regex a zip member (or an enclosing nested zip)
+                must match to be read; default reads every CSV
+            column_types: Arrow types by MMS column name, keeping shard
+                schemas identical across pieces
+            transform: Optional cleaning step applied to each piece
+            partition: 'day' or 'month'
+            rollup: Optional derived table recomputed for touched partitions
+        """
+        self.name = name
+        self.table = table
+        self.columns = [c.upper() for c in columns]
+        self.key_columns = key_columns
+        self.output_root = Path(output_root)
+        self.time_column = time_column
+        self.member_pattern = member_pattern
+        self.column_types = column_types
+        self.transform = transform
+        self.partition = partition
+        self.rollup = rollup
+
+    def open_store(self) -> PartitionedParquetStore:
+        return PartitionedParquetStore(
+            self.output_root,
+            time_column=self.time_column,
+            key_columns=self.key_columns,
+            partition=self.partition,
+        )
+
+    def open_rollup_store(self) -> Optional[PartitionedParquetStore]:
+        if self.rollup is None:
+            return None
+        return PartitionedParquetStore(
+            self.rollup.root,
+            time_column=self.time_column,
+            key_columns=self.key_columns,
+            partition=self.partition,
+        )
+
+
+def clean_scada(df: pd.DataFrame) -> pd.DataFrame:
+    """Strip DUIDs and drop rows without a SCADA value."""
+    df['duid'] = df['duid'].str.strip()
+    df['scadavalue'] = pd.to_numeric(df['scadavalue'], errors='coerce')
+    return df.dropna()
+
+
+def clean_interconnector(df: pd.DataFrame) -> pd.DataFrame:
+    """Blank flows and limits are zero, matching the live collector."""
+    value_columns = [c for c in df.columns if c not in ('settlementdate', 'interconnectorid')]
+    df[value_columns] = df[value_columns].fillna(0)
+    return df
+
+
+def scada_job(output_root: Path, rollup_root: Optional[Path] = None, partition: str = 'day',
+              rollup_legacy_file: Optional[Path] = None) -> BackfillJob:
+    """DISPATCH_UNIT_SCADA from MMSDM monthly archives, optionally with 30-minute means."""
+    return BackfillJob(
+        name='scada',
+        table=DISPATCH_UNIT_SCADA,
+        columns=['SETTLEMENTDATE', 'DUID', 'SCADAVALUE'],
+        key_columns=['settlementdate', 'duid'],
+        output_root=output_root,
+        member_pattern=r'DISPATCH_UNIT_SCADA',
+        column_types={'DUID': pa.string(), 'SCADAVALUE': pa.float64()},
+        transform=clean_scada,
+        partition=partition,
+        rollup=Rollup(root=Path(rollup_root), legacy_file=rollup_legacy_file) if rollup_root else None,
+    )
+
+
+def interconnector_job(output_root: Path, partition: str = 'day') -> BackfillJob:
+    """DISPATCH INTERCONNECTORRES from DispatchIS archives."""
+    flow_columns = ['METEREDMWFLOW', 'MWFLOW', 'MWLOSSES', 'EXPORTLIMIT', 'IMPORTLIMIT']
+    return BackfillJob(
+        name='transmission',
+        table=DISPATCH_INTERCONNECTORRES,
+        columns=['SETTLEMENTDATE', 'INTERCONNECTORID'] + flow_columns,
+        key_columns=['settlementdate', 'interconnectorid'],
+        output_root=output_root,
+        column_types={'INTERCONNECTORID': pa.string(), **{c: pa.float64() for c in flow_columns}},
+        transform=clean_interconnector,
+        partition=partition,
+    )
+
+
+# ----------------------------------------------------------------------
+# Sources
+# ----------------------------------------------------------------------
+
+class Archive(NamedTuple):
+    name: str
+    location: str
+
+
+class ArchiveSource(ABC):
+    """Lists archives and makes each available as a local file."""
+
+    @abstractmethod
+    def list_archives(self) -> List[Archive]:
+        """Archives to backfill, in processing order."""
+
+    @abstractmethod
+    def fetch(self, archive: Archive) -> Path:
+        """Return a local path for the archive, downloading it if needed."""
+
+    def release(self, archive: Archive, path: Path) -> None:
+        """Called once an archive has been merged; may delete downloads."""
+
+
+class LocalArchiveSource(ArchiveSource):
+    """Zip files already on disk, e.g. MMSDM archives downloaded in advance."""
+
+    def __init__(self, directory: Path, pattern: str = '*.zip', names: Optional[List[str]] = None):
+        """
+        Args:
+            directory: Directory holding the archives
+            pattern: Glob selecting archive files
+            names: Optional file names to restrict the run to
+        """
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.names = set(names) if names is not None else None
+
+    def list_archives(self) -> List[Archive]:
+        paths = sorted(self.directory.glob(self.pattern))
+        if self.names is not None:
+            paths = [p for p in paths if p.name in self.names]
+        return [Archive(p.name, str(p)) for p in paths]
+
+    def fetch(self, archive: Archive) -> Path:
+        return Path(archive.location)
+
+
+class HTTPArchiveSource(ArchiveSource):
+    """Archives downloaded from NEMWEB, streamed to disk rather than memory."""
+
+    def __init__(self, urls: List[str], download_dir: Path, keep_downloads: bool = False,
+                 timeout: float = 60):
+        self.urls = urls
+        self.download_dir = Path(download_dir)
+        self.keep_downloads = keep_downloads
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+
+    def list_archives(self) -> List[Archive]:
+        return [Archive(url.rstrip('/').rsplit('/', 1)[-1], url) for url in self.urls]
+
+    def fetch(self, archive: Archive) -> Path:
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        path = self.download_dir / archive.name
+        if path.exists():
+            return path
+
+        logger.info(f"Downloading {archive.location}")
+        part_path = path.with_name(path.name + '.part')
+        with self.session.get(archive.location, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            with open(part_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+        os.replace(part_path, path)
+        logger.info(f"Downloaded {archive.name} ({path.stat().st_size / (1024 * 1024):.0f} MB)")
+        return path
+
+    def release(self, archive: Archive, path: Path) -> None:
+        if not self.keep_downloads and path.exists():
+            path.unlink()
+
+
+# ----------------------------------------------------------------------
+# Manifest
+# ----------------------------------------------------------------------
+
+class BackfillManifest:
+    """
+    JSON record of merged archives, so an interrupted backfill can resume.
+
+    Written atomically after every archive. ``pending_rollup`` holds
+    partitions whose rollup has not been recomputed yet.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.data: Dict[str, Any] = {'completed': {}, 'pending_rollup': []}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.data.update(json.load(f))
+
+    @property
+    def completed(self) -> Dict[str, Dict[str, Any]]:
+        return self.data['completed']
+
+    def is_done(self, archive_name: str) -> bool:
+        return archive_name in self.completed
+
+    def mark_done(self, archive_name: str, rows: int, partitions: List[str]) -> None:
+        self.completed[archive_name] = {
+            'rows': rows,
+            'partitions': partitions,
+            'finished': datetime.now().isoformat(timespec='seconds'),
+        }
+        pending = set(self.data['pending_rollup']) | set(partitions)
+        self.data['pending_rollup'] = sorted(pending)
+        self.save()
+
+    def clear_rollup(self, partitions: List[str]) -> None:
+        self.data['pending_rollup'] = sorted(set(self.data['pending_rollup']) - set(partitions))
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+# ----------------------------------------------------------------------
+# Worker-side functions (run in the process pool)
+# ----------------------------------------------------------------------
+
+def _iter_csv_members(zf: zipfile.ZipFile, pattern: Optional[re.Pattern],
+                      matched: bool, spill_dir: Path) -> Iterator[Tuple[str, Any]]:
+    """Yield (name, open stream) for CSV members, descending into nested zips."""
+    for info in zf.infolist():
+        name = info.filename
+        selected = matched or pattern is None or bool(pattern.search(name))
+        lower = name.lower()
+
+        if lower.endswith('.zip'):
+            # Nested zips need a seekable file; small ones stay in memory
+            if info.file_size <= NESTED_ZIP_SPILL_BYTES:
+                with zf.open(info) as member:
+                    nested = io.BytesIO(member.read())
+            else:
+                spill_path = spill_dir / f"nested_{os.getpid()}_{Path(name).name}"
+                with zf.open(info) as member, open(spill_path, 'wb') as out:
+                    shutil.copyfileobj(member, out, length=DEFAULT_CHUNK_SIZE)
+                nested = open(spill_path, 'rb')
+            try:
+                with zipfile.ZipFile(nested) as inner:
+                    yield from _iter_csv_members(inner, pattern, selected, spill_dir)
+            finally:
+                nested.close()
+                if not isinstance(nested, io.BytesIO):
+                    Path(nested.name).unlink()
+
+        elif lower.endswith('.csv') and selected:
+            with zf.open(info) as member:
+                yield name, member
+
+
+def _prepare_piece(job: BackfillJob, piece: pa.Table,
+                   start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> pd.DataFrame:
+    missing = [c for c in job.columns if c not in piece.column_names]
+    if missing:
+        logger.warning(f"{job.name}: piece missing columns {missing}, skipped")
+        return pd.DataFrame()
+
+    df = piece.select(job.columns).to_pandas()
+    df.columns = [c.lower() for c in df.columns]
+    if start is not None:
+        df = df[df[job.time_column] >= start]
+    if end is not None:
+        df = df[df[job.time_column] <= end]
+    if job.transform is not None and not df.empty:
+        df = job.transform(df)
+    return df
+
+
+def process_archive(job: BackfillJob, archive_path: str, staging_dir: str,
+                    start: Optional[str] = None, end: Optional[str] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Parse one archive into per-partition shard files.
+
+    Each parsed piece is appended to the shard of every partition it
+    touches, so at most one piece is held in memory.
+
+    Returns:
+        Dict with the archive path, rows parsed and {partition: shard path}
+    """
+    staging = Path(staging_dir)
+    if staging.exists():
+        shutil.rmtree(staging)  # left over from an interrupted run
+    staging.mkdir(parents=True)
+
+    store = job.open_store()
+    pattern = re.compile(job.member_pattern, re.IGNORECASE) if job.member_pattern else None
+    start_ts = pd.Timestamp(start) if start else None
+    end_ts = pd.Timestamp(end) if end else None
+
+    writers: Dict[str, pq.ParquetWriter] = {}
+    shards: Dict[str, str] = {}
+    rows = 0
+    members = 0
+
+    try:
+        with zipfile.ZipFile(archive_path) as zf:
+            for _name, stream in _iter_csv_members(zf, pattern, False, staging):
+                members += 1
+                for _key, piece in iter_mms_tables(stream, [job.table], chunk_size, job.column_types):
+                    df = _prepare_piece(job, piece, start_ts, end_ts)
+                    if df.empty:
+                        continue
+                    keys = store.partition_keys(df[job.time_column]).to_numpy()
+                    for key in pd.unique(keys):
+                        table = pa.Table.from_pandas(df[keys == key], preserve_index=False)
+                        if key not in writers:
+                            shards[key] = str(staging / f"{key}.parquet")
+                            writers[key] = pq.ParquetWriter(shards[key], table.schema)
+                        writers[key].write_table(table.cast(writers[key].schema))
+                    rows += len(df)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    logger.info(f"{job.name}: Parsed {rows:,} rows from {members} CSV members of "
+                f"{Path(archive_path).name}")
+    return {'archive_path': archive_path, 'rows': rows, 'shards': shards}
+
+
+def rollup_partition(job: BackfillJob, key: str) -> int:
+    """
+    Recompute one partition of the job's rollup table from the base table.
+
+    With right-labelled windows the first window of a partition includes the
+    tail of the previous one, so that tail is read too. Existing rollup rows
+    for windows not recomputed here are kept.
+
+    Returns:
+        Rows in the rewritten rollup partition
+    """
+    rollup = job.rollup
+    base = job.open_store()
+    target = job.open_rollup_store()
+    time_col = job.time_column
+    group_cols = [c for c in job.key_columns if c != time_col]
+
+    df = base.read_partition(key, include_wal=False)
+    if df.empty:
+        return 0
+
+    if rollup.label == 'right':
+        window_start = pd.Timestamp(df[time_col].min()).ceil(rollup.freq) - pd.Timedelta(rollup.freq)
+        previous = sorted(p for p in base.partition_files() if p.stem < key)
+        if previous:
+            tail = pd.read_parquet(previous[-1], filters=[(time_col, '>', window_start)])
+            df = pd.concat([tail, df], ignore_index=True)
+        windows = df[time_col].dt.ceil(rollup.freq)
+    else:
+        windows = df[time_col].dt.floor(rollup.freq)
+
+    df = df.assign(**{time_col: windows})
+    aggregated = (df.groupby([time_col] + group_cols, sort=False)[list(rollup.value_columns)]
+                  .mean()
+                  .reset_index())
+    aggregated = aggregated[target.partition_keys(aggregated[time_col]).to_numpy() == key]
+
+    existing = target.read_partition(key, include_wal=False)
+    if not existing.empty:
+        kept = anti_join(existing, aggregated, job.key_columns)
+        aggregated = pd.concat([kept, aggregated], ignore_index=True)
+
+    aggregated = aggregated.sort_values(job.key_columns).reset_index(drop=True)
+    target.write_partition(key, aggregated)
+    return len(aggregated)
+
+
+# ----------------------------------------------------------------------
+# Single-file layout
+# ----------------------------------------------------------------------
+
+def working_root(output_file: Path) -> Path:
+    """Staging partition directory for a 'file' layout backfill of output_file.
+
+    Kept apart from ``partition_dir_for(output_file)``, which readers would
+    prefer over the file itself.
+    """
+    output_file = Path(output_file)
+    return output_file.parent / '.backfill' / output_file.stem
+
+
+def _file_max_time(path: Path, time_column: str) -> Optional[str]:
+    """Latest time_column value in a parquet file (ISO string), None if empty."""
+    table = pq.read_table(path, columns=[time_column])
+    if table.num_rows == 0:
+        return None
+    return pd.Timestamp(pc.max(table.column(time_column)).as_py()).isoformat()
+
+
+def _conform(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Select and cast table's columns to schema, filling missing ones with nulls."""
+    columns = [
+        table.column(field.name).cast(field.type) if field.name in table.column_names
+        else pa.nulls(table.num_rows, field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def write_store_to_file(store: PartitionedParquetStore, path: Path,
+                        schema: Optional[pa.Schema] = None) -> int:
+    """
+    Write every row of the store, in partition order, to one parquet file.
+
+    Reads one partition at a time and writes row groups of about
+    FILE_ROW_GROUP_SIZE rows.
+
+    Returns:
+        Rows written
+    """
+    writer = None
+    pending: List[pa.Table] = []
+    pending_rows = written = 0
+    try:
+        for part in store.partition_files():
+            table = pq.read_table(part)
+            if schema is None:
+                schema = table.schema
+            pending.append(_conform(table, schema))
+            pending_rows += table.num_rows
+            if pending_rows >= FILE_ROW_GROUP_SIZE:
+                writer = writer or pq.ParquetWriter(path, schema, compression='snappy')
+                writer.write_table(pa.concat_tables(pending), row_group_size=FILE_ROW_GROUP_SIZE)
+                written += pending_rows
+                pending, pending_rows = [], 0
+        if pending or writer is None:
+            writer = writer or pq.ParquetWriter(path, schema or pa.schema([]), compression='snappy')
+            if pending:
+                writer.write_table(pa.concat_tables(pending), row_group_size=FILE_ROW_GROUP_SIZE)
+            written += pending_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+
+class BackfillEngine:
+    """
+    Runs a BackfillJob over every archive of a source.
+
+    Parsing runs in a process pool while the parent downloads the next
+    archives and merges finished ones; at most ``max_in_flight`` archives
+    are fetched but not yet merged, which bounds temporary disk use.
+
+    With ``storage='file'`` the job's output roots are staging directories
+    (see working_root): the single file is imported into them, and once
+    every archive is merged the staged partitions are written back over the
+    file and removed.
+    """
+
+    def __init__(
+        self,
+        job: BackfillJob,
+        source: ArchiveSource,
+        workers: int = 2,
+        manifest_path: Optional[Path] = None,
+        staging_dir: Optional[Path] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_in_flight: Optional[int] = None,
+        legacy_file: Optional[Path] = None,
+        storage: str = 'partitioned',
+    ):
+        """
+        Args:
+            job: What to extract and where to write it
+            source: Where the archives come from
+            workers: Worker processes (0 = run everything in this process)
+            manifest_path: Resume manifest (default: inside the output directory)
+            staging_dir: Shard directory (default: a temp dir beside the output)
+            chunk_size: MMS parser chunk size in bytes
+            max_in_flight: Archives fetched but not yet merged (default 2 x workers)
+            legacy_file: Single-file history to import before the first run, so
+                readers that prefer the partition directory still see it
+            storage: Layout the collector writes, 'partitioned' or 'file'; with
+                'file', legacy_file (and the rollup's legacy_file) are the files
+                written back to
+
+        Raises:
+            ValueError: If the storage layout is unknown, or 'file' storage
+                would leave a partition directory that shadows the file
+        """
+        if storage not in STORAGE_LAYOUTS:
+            raise ValueError(f"Unknown storage layout {storage!r}, expected one of {STORAGE_LAYOUTS}")
+        self.job = job
+        self.source = source
+        self.workers = workers
+        self.manifest = BackfillManifest(manifest_path or job.output_root / MANIFEST_FILENAME)
+        self.staging_dir = Path(staging_dir) if staging_dir else job.output_root.parent / f".{job.output_root.name}_staging"
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight or max(2 * workers, 1)
+        self.store = job.open_store()
+        self.storage = storage
+
+        # (store, single file) pairs: imported before the run and, for 'file'
+        # storage, written back after it
+        self.targets: List[Tuple[PartitionedParquetStore, Path]] = []
+        if legacy_file is not None:
+            self.targets.append((self.store, Path(legacy_file)))
+        if job.rollup is not None and job.rollup.legacy_file is not None:
+            self.targets.append((job.open_rollup_store(), Path(job.rollup.legacy_file)))
+        if storage == 'file':
+            self._check_file_layout()
+
+        for store, path in self.targets:
+            if store.is_empty() and path.exists():
+                logger.info(f"{job.name}: Importing {path} into {store.root}")
+                store.import_file(path)
+                if storage == 'file':
+                    # Rows the collector appends after this are merged at write-back
+                    self.manifest.data.setdefault('imported', {})[str(path)] = \
+                        _file_max_time(path, job.time_column)
+                    self.manifest.save()
+
+    def _check_file_layout(self) -> None:
+        """Refuse a 'file' backfill whose output readers would not see."""
+        if not self.targets or self.targets[0][0] is not self.store:
+            raise ValueError(f"{self.job.name}: 'file' storage needs legacy_file to write back to")
+        if self.job.rollup is not None and len(self.targets) < 2:
+            raise ValueError(f"{self.job.name}: 'file' storage needs the rollup's legacy_file")
+        for store, path in self.targets:
+            shadow = partition_dir_for(path)
+            if store.root == shadow:
+                raise ValueError(f"{self.job.name}: {store.root} is where readers look for "
+                                 f"partitions of {path.name}; stage elsewhere (working_root)")
+            if shadow.is_dir() and any(shadow.glob('*.parquet')):
+                raise ValueError(
+                    f"{self.job.name}: {shadow} holds partitions, so readers ignore {path.name}. "
+                    f"Set COLLECTOR_STORAGE_MODE=partitioned to keep that layout, or fold the "
+                    f"directory back into the file before backfilling it"
+                )
+
+    def _write_back(self, store: PartitionedParquetStore, path: Path, attempts: int = 3) -> None:
+        """
+        Replace path with the staged store, then empty the store.
+
+        Rows the collector appended to path since the import are merged in
+        first. If path changes again while the new file is being written,
+        the merge and write are repeated.
+        """
+        imported = self.manifest.data.get('imported', {})
+        since = imported.get(str(path))
+        time_col = self.job.time_column
+        tmp_path = path.with_name(path.name + '.tmp')
+
+        for _ in range(attempts):
+            before = path.stat() if path.exists() else None
+            schema = None
+            if before is not None:
+                dataset = ds.dataset(path)
+                schema = dataset.schema
+                where = None
+                if since is not None:
+                    where = ds.field(time_col) > pa.scalar(pd.Timestamp(since), type=schema.field(time_col).type)
+                appended = 0
+                for batch in dataset.to_batches(filter=where):
+                    appended += store.merge(batch.to_pandas())
+                if appended:
+                    logger.info(f"{self.job.name}: Merged {appended:,} rows appended to {path.name} "
+                                f"during the backfill")
+
+            rows = write_store_to_file(store, tmp_path, schema)
+            after = path.stat() if path.exists() else None
+            if (before is None) == (after is None) and (
+                    before is None or (before.st_mtime_ns, before.st_size) == (after.st_mtime_ns, after.st_size)):
+                os.replace(tmp_path, path)
+                break
+            logger.info(f"{self.job.name}: {path.name} changed during write-back, retrying")
+        else:
+            tmp_path.unlink(missing_ok=True)
+            raise RuntimeError(f"{self.job.name}: {path} kept changing; staged rows left in {store.root}")
+
+        for part in store.partition_files() + store.wal_segments():
+            part.unlink()
+        imported.pop(str(path), None)
+        self.manifest.save()
+        logger.info(f"{self.job.name}: Wrote {rows:,} rows back to {path}")
+
+    def _merge_result(self, archive: Archive, path: Path, result: Dict[str, Any]) -> int:
+        added = 0
+        for key, shard in sorted(result['shards'].items()):
+            added += self.store.merge(pd.read_parquet(shard))
+        self.manifest.mark_done(archive.name, result['rows'], sorted(result['shards']))
+        shutil.rmtree(self.staging_dir / Path(archive.name).stem, ignore_errors=True)
+        self.source.release(archive, path)
+        logger.info(f"{self.job.name}: Merged {archive.name}: {result['rows']:,} rows parsed, "
+                    f"{added:,} new across {len(result['shards'])} partitions")
+        return added
+
+    def _submit(self, pool: Optional[ProcessPoolExecutor], archive: Archive, path: Path,
+                start: Optional[str], end: Optional[str]) -> Future:
+        args = (self.job, str(path), str(self.staging_dir / Path(archive.name).stem),
+                start, end, self.chunk_size)
+        if pool is None:
+            future: Future = Future()
+            try:
+                future.set_result(process_archive(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return pool.submit(process_archive, *args)
+
+    def run(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Backfill every archive not already in the manifest.
+
+        Args:
+            start: Optional first timestamp to keep
+            end: Optional last timestamp to keep
+
+        Returns:
+            Summary with archives processed, skipped and failed, and rows added
+        """
+        archives = self.source.list_archives()
+        todo = [a for a in archives if not self.manifest.is_done(a.name)]
+        skipped = len(archives) - len(todo)
+        if skipped:
+            logger.info(f"{self.job.name}: Skipping {skipped} archives already backfilled")
+        logger.info(f"{self.job.name}: Backfilling {len(todo)} archives with {self.workers} workers")
+
+        start_s = pd.Timestamp(start).isoformat() if start is not None else None
+        end_s = pd.Timestamp(end).isoformat() if end is not None else None
+        summary = {'archives': len(todo), 'skipped': skipped, 'failed': [], 'rows_added': 0}
+
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 0 else None
+        pending: Dict[Future, Tuple[Archive, Path]] = {}
+
+        def drain(block: bool) -> None:
+            if not pending:
+                return
+            done, _ = wait(list(pending), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                archive, path = pending.pop(future)
+                try:
+                    summary['rows_added'] += self._merge_result(archive, path, future.result())
+                except Exception as e:
+                    logger.error(f"{self.job.name}: Failed to backfill {archive.name}: {e}")
+                    summary['failed'].append(archive.name)
+
+        try:
+            for archive in todo:
+                while len(pending) >= self.max_in_flight:
+                    drain(block=True)
+                try:
+                    path = self.source.fetch(archive)
+                except Exception as e:
+                    logger.error(f"{self.job.name}: Could not fetch {archive.name}: {e}")
+                    summary['failed'].append(archive.name)
+                    continue
+                pending[self._submit(pool, archive, path, start_s, end_s)] = (archive, path)
+                drain(block=False)
+
+            while pending:
+                drain(block=True)
+
+            if self.job.rollup is not None:
+                self._run_rollups(pool)
+
+            if self.storage == 'file' and not summary['failed']:
+                for store, path in self.targets:
+                    self._write_back(store, path)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+        logger.info(f"{self.job.name}: Backfill complete: {summary['rows_added']:,} rows added, "
+                    f"{len(summary['failed'])} archives failed")
+        return summary
+
+    def _run_rollups(self, pool: Optional[ProcessPoolExecutor]) -> None:
+        """Recompute rollups for touched partitions and the partition after each."""
+        touched: Set[str] = set(self.manifest.data['pending_rollup'])
+        if not touched:
+            return
+        keys = [p.stem for p in self.store.partition_files()]
+        for i, key in enumerate(keys[:-1]):
+            if key in touched:
+                touched.add(keys[i + 1])
+
+        logger.info(f"{self.job.name}: Rolling up {len(touched)} partitions")
+        ordered = sorted(touched)
+        if pool is None:
+            for key in ordered:
+                rollup_partition(self.job, key)
+        else:
+            list(pool.map(rollup_partition, [self.job] * len(ordered), ordered))
+        self.manifest.clear_rollup(ordered)
@@ -4,8 +4,11 @@ Configuration adapter for AEMO Data Service
 Uses the existing dashboard configuration system.
 """
 
+import os
+
 # Import from the existing dashboard configuration
 from aemo_dashboard.shared.config import config as dashboard_config
+from aemo_dashboard.shared.data_version import default_version_file
 
 # Create a simple wrapper that provides the interface expected by collectors
 class DataServiceConfig:
@@ -50,6 +53,38 @@ class DataServiceConfig:
     def aemo_scada_url(self):
         return "http://nemweb.com.au/Reports/CURRENT/Dispatch_SCADA/"
     
+    @property
+    def storage_mode(self):
+        """'file' rewrites one parquet per collector, 'partitioned' appends to day/month files."""
+        return os.getenv('COLLECTOR_STORAGE_MODE', 'file').lower()
+    
+    @property
+    def partition_granularity(self):
+        return os.getenv('COLLECTOR_PARTITION', 'day').lower()
+    
+    @property
+    def wal_max_rows(self):
+        return int(os.getenv('COLLECTOR_WAL_MAX_ROWS', '50000'))
+    
+    @property
+    def wal_max_segments(self):
+        return int(os.getenv('COLLECTOR_WAL_MAX_SEGMENTS', '24'))
+    
+    @property
+    def collector_tail_hours(self):
+        """Hours of recent data collectors keep in memory (0 = full history)."""
+        return float(os.getenv('COLLECTOR_TAIL_HOURS', '0'))
+    
+    @property
+    def collector_timeout_seconds(self):
+        """Default time budget for one collector's run_once() per cycle."""
+        return float(os.getenv('COLLECTOR_TIMEOUT_SECONDS', '120'))
+    
+    @property
+    def data_version_file(self):
+        """JSON file where collectors publish the latest interval of each table."""
+        return default_version_file()
+    
     @property
     def log_level(self):
         return 'INFO'
@@ -63,6 +98,12 @@ class DataServiceConfig:
         summary = "AEMO Data Service Configuration:\n"
         summary += f"  Update interval: {self.update_interval_minutes} minutes\n"
         summary += f"  Log file: {self.log_file}\n"
+        summary += f"  Storage mode: {self.storage_mode}"
+        if self.storage_mode == 'partitioned':
+            summary += f" ({self.partition_granularity})"
+        summary += "\n"
+        if self.collector_tail_hours > 0:
+            summary += f"  In-memory tail: {self.collector_tail_hours:g} hours\n"
         summary += "  Data files:\n"
         summary += f"    Generation: {self.gen_output_file}\n"
         summary += f"    Prices: {self.spot_hist_file}\n"
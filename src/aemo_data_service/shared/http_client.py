@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for AEMO Data Service collectors.
+
+All collectors download from NEMWEB in the same cycle. Rather than each one
+calling requests.get() through the default executor (a fresh connection per
+request, and an executor shared with everything else in the process), they
+share one pooled requests.Session driven from a dedicated thread pool, with a
+per-host limit on concurrent requests so four collectors running at once
+cannot flood nemweb.com.au.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Browser user agent; NEMWEB returns 403 to the default python-requests agent
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+MAX_CONNECTIONS = int(os.getenv('AEMO_HTTP_MAX_CONNECTIONS', '16'))
+MAX_PER_HOST = int(os.getenv('AEMO_HTTP_MAX_PER_HOST', '4'))
+
+
+class AsyncHTTPClient:
+    """
+    Pooled HTTP client with an asyncio interface.
+
+    Requests run on a private thread pool sized to the connection pool, and
+    an asyncio.Semaphore per host caps how many are in flight to one server.
+    """
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS, max_per_host: int = MAX_PER_HOST):
+        """
+        Initialize the client.
+
+        Args:
+            max_connections: Size of the connection pool and worker pool
+            max_per_host: Maximum concurrent requests to any one host
+        """
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix='aemo-http')
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.request_count = 0
+        self.bytes_downloaded = 0
+
+        logger.info(f"HTTP client initialized: {max_connections} connections, {max_per_host} per host")
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; start afresh if the loop changed
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._host_limits = {}
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
+
+    async def get(self, url: str, timeout: float = 30, **kwargs: Any) -> requests.Response:
+        """
+        GET a URL without blocking the event loop.
+
+        Args:
+            url: URL to fetch
+            timeout: Socket timeout in seconds
+            **kwargs: Passed through to requests.Session.get
+
+        Returns:
+            The requests.Response (not raised for status)
+        """
+        loop = asyncio.get_running_loop()
+        async with self._host_limit(url):
+            response = await loop.run_in_executor(
+                self._executor,
+                partial(self.session.get, url, timeout=timeout, **kwargs)
+            )
+
+        self.request_count += 1
+        self.bytes_downloaded += len(response.content)
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection pool settings and lifetime totals."""
+        return {
+            'max_connections': self.max_connections,
+            'max_per_host': self.max_per_host,
+            'requests': self.request_count,
+            'bytes_downloaded': self.bytes_downloaded,
+            'hosts': sorted(self._host_limits),
+        }
+
+    def close(self) -> None:
+        """Close pooled connections and the worker pool."""
+        self.session.close()
+        self._executor.shutdown(wait=False)
+
+
+_client: Optional[AsyncHTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> AsyncHTTPClient:
+    """Get the process-wide HTTP client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = AsyncHTTPClient()
+        return _client
+
+
+def close_http_client() -> None:
+    """Close the process-wide HTTP client if one was created."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for AEMO MMS-format CSV files.
+
+NEMWEB reports (DISPATCHIS, Dispatch_SCADA, ROOFTOP_PV, MMSDM archives) share
+one layout: a file holds several tables, each introduced by an ``I`` header row
+and followed by its ``D`` data rows, with ``C`` comment rows at the start and
+end::
+
+    I,DISPATCH,PRICE,5,SETTLEMENTDATE,RUNNO,REGIONID,...
+    D,DISPATCH,PRICE,5,"2025/08/20 18:10:00",1,NSW1,...
+
+Tables are selected by ``(report, subreport)``, e.g. ``('DISPATCH', 'PRICE')``
+or ``('DREGION', '')``. Only the header rows are examined in Python; the data
+rows of each selected table are handed to pyarrow's CSV reader as one block,
+so columns come back typed (timestamps, floats, strings) without splitting
+lines in Python. Input is read in chunks, and zip members are decompressed as
+a stream, so large MMSDM files never need to fit in memory or on disk.
+"""
+
+import io
+import re
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TableKey = Tuple[str, str]
+
+# Common tables used by the collectors
+DISPATCH_PRICE: TableKey = ('DISPATCH', 'PRICE')
+DISPATCH_REGIONSUM: TableKey = ('DISPATCH', 'REGIONSUM')
+DISPATCH_INTERCONNECTORRES: TableKey = ('DISPATCH', 'INTERCONNECTORRES')
+DISPATCH_UNIT_SCADA: TableKey = ('DISPATCH', 'UNIT_SCADA')
+DREGION: TableKey = ('DREGION', '')
+ROOFTOP_ACTUAL: TableKey = ('ROOFTOP', 'ACTUAL')
+
+MMS_TIMESTAMP_FORMAT = '%Y/%m/%d %H:%M:%S'
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Leading record type, report, subreport and version columns on every row
+_PREFIX_COLUMNS = ['_record_type', '_report', '_subreport', '_version']
+
+_COMMENT_RE = re.compile(rb'^C,[^\n]*(?:\n|$)', re.MULTILINE)
+
+
+def _skip_row(row) -> str:
+    """Skip malformed rows (wrong field count) rather than failing the block."""
+    return 'skip'
+
+
+def _find_headers(buffer: bytes) -> Iterator[Tuple[int, int, TableKey, List[str]]]:
+    """
+    Yield (line_start, line_end, key, columns) for each I row in buffer.
+
+    Uses bytes.find rather than a multiline regex; header rows are rare, so
+    data rows are only ever scanned by the C-level search.
+    """
+    start = 0 if buffer.startswith(b'I,') else buffer.find(b'\nI,')
+    while start >= 0:
+        if buffer[start] == ord('\n'):
+            start += 1
+        end = buffer.find(b'\n', start)
+        if end < 0:
+            end = len(buffer)
+        fields = buffer[start:end].rstrip(b'\r').decode().split(',')
+        key = (fields[1].upper(), fields[2].upper())
+        yield start, end, key, [c.strip() for c in fields[4:]]
+        start = buffer.find(b'\nI,', end)
+
+
+class _TableState:
+    """Header of the table currently being read"""
+
+    def __init__(self, key: TableKey, columns: List[str], selected: bool):
+        self.key = key
+        self.columns = columns
+        self.selected = selected
+
+
+def _parse_block(block: bytes, columns: List[str],
+                 column_types: Optional[Dict[str, pa.DataType]] = None) -> Optional[pa.Table]:
+    """Parse the D rows of one table into an Arrow table."""
+    if block.startswith(b'C,') or b'\nC,' in block:
+        block = _COMMENT_RE.sub(b'', block)
+    if not block.strip():
+        return None
+
+    # Small blocks (one dispatch interval) parse faster without the thread pool
+    read_options = pacsv.ReadOptions(
+        column_names=_PREFIX_COLUMNS + columns,
+        use_threads=len(block) > 1024 * 1024,
+    )
+    parse_options = pacsv.ParseOptions(invalid_row_handler=_skip_row)
+    convert_options = pacsv.ConvertOptions(
+        include_columns=columns,
+        column_types=column_types or {},
+        timestamp_parsers=[MMS_TIMESTAMP_FORMAT],
+    )
+    table = pacsv.read_csv(
+        io.BytesIO(block),
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options,
+    )
+
+    # Match the nanosecond timestamps the existing parquet files use
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type) and field.type.unit != 'ns':
+            table = table.set_column(i, field.name, table.column(i).cast(pa.timestamp('ns')))
+    return table
+
+
+def iter_mms_tables(
+    stream: BinaryIO,
+    tables: Iterable[TableKey],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    column_types: Optional[Dict[str, pa.DataType]] = None,
+) -> Iterator[Tuple[TableKey, pa.Table]]:
+    """
+    Stream Arrow tables for the selected MMS tables out of a binary stream.
+
+    A table spanning several chunks is yielded as several pieces.
+
+    Args:
+        stream: Binary file-like object (open file, zip member, BytesIO)
+        tables: (report, subreport) pairs to extract
+        chunk_size: Bytes read per chunk
+        column_types: Optional Arrow types by column name, overriding inference
+
+    Yields:
+        ((report, subreport), pyarrow.Table) pieces in file order
+    """
+    wanted = {(r.upper(), s.upper()) for r, s in tables}
+    state: Optional[_TableState] = None
+    leftover = b''
+
+    while True:
+        chunk = stream.read(chunk_size)
+        at_eof = not chunk
+        buffer = leftover + chunk
+
+        if not at_eof:
+            # Only process complete lines; carry the partial last line over
+            cut = buffer.rfind(b'\n')
+            if cut < 0:
+                leftover = buffer
+                continue
+            buffer, leftover = buffer[:cut + 1], buffer[cut + 1:]
+        else:
+            leftover = b''
+
+        pos = 0
+        for line_start, line_end, key, columns in _find_headers(buffer):
+            if state is not None and state.selected:
+                piece = _parse_block(buffer[pos:line_start], state.columns, column_types)
+                if piece is not None and piece.num_rows:
+                    yield state.key, piece
+
+            state = _TableState(key, columns, key in wanted)
+            pos = line_end + 1
+
+        if state is not None and state.selected:
+            piece = _parse_block(buffer[pos:], state.columns, column_types)
+            if piece is not None and piece.num_rows:
+                yield state.key, piece
+
+        if at_eof:
+            break
+
+
+def _to_frames(
+    pieces: Iterable[Tuple[TableKey, pa.Table]],
+    tables: List[TableKey],
+    lowercase: bool,
+) -> Dict[TableKey, pd.DataFrame]:
+    """Concatenate streamed pieces into one DataFrame per requested table."""
+    collected: Dict[TableKey, List[pa.Table]] = {key: [] for key in tables}
+    for key, piece in pieces:
+        collected.setdefault(key, []).append(piece)
+
+    result = {}
+    for key, parts in collected.items():
+        if not parts:
+            df = pd.DataFrame()
+        elif len(parts) == 1:
+            df = parts[0].to_pandas()
+        else:
+            # Pieces may infer different types (int vs float); let pandas upcast
+            df = pd.concat([p.to_pandas() for p in parts], ignore_index=True)
+        if lowercase:
+            df.columns = [c.lower() for c in df.columns]
+        result[key] = df
+    return result
+
+
+def _normalise_tables(tables: Iterable[TableKey]) -> List[TableKey]:
+    return [(r.upper(), s.upper()) for r, s in tables]
+
+
+def read_mms_csv(
+    source: Union[bytes, str, Path, BinaryIO],
+    tables: Iterable[TableKey],
+    lowercase: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    column_types: Optional[Dict[str, pa.DataType]] = None,
+) -> Dict[TableKey, pd.DataFrame]:
+    """
+    Read selected tables from an MMS CSV.
+
+    Args:
+        source: CSV content as bytes, a path, or a binary stream
+        tables: (report, subreport) pairs to extract
+        lowercase: Lower-case the column names
+        chunk_size: Bytes read per chunk
+        column_types: Optional Arrow types by column name
+
+    Returns:
+        Dict of DataFrames keyed by (report, subreport); tables not present
+        in the file map to an empty DataFrame
+    """
+    tables = _normalise_tables(tables)
+
+    if isinstance(source, bytes):
+        stream = io.BytesIO(source)
+    elif isinstance(source, (str, Path)):
+        stream = open(source, 'rb')
+    else:
+        stream = source
+
+    try:
+        pieces = iter_mms_tables(stream, tables, chunk_size, column_types)
+        return _to_frames(pieces, tables, lowercase)
+    finally:
+        if isinstance(source, (str, Path)):
+            stream.close()
+
+
+def read_mms_zip(
+    source: Union[bytes, str, Path, BinaryIO],
+    tables: Iterable[TableKey],
+    lowercase: bool = False,
+    member_pattern: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    column_types: Optional[Dict[str, pa.DataType]] = None,
+) -> Dict[TableKey, pd.DataFrame]:
+    """
+    Read selected tables from every CSV member of a zip, without extracting it.
+
+    Args:
+        source: Zip content as bytes, a path, or a binary stream
+        tables: (report, subreport) pairs to extract
+        lowercase: Lower-case the column names
+        member_pattern: Regex a member name must match (default: any .csv)
+        chunk_size: Bytes decompressed per chunk
+        column_types: Optional Arrow types by column name
+
+    Returns:
+        Dict of DataFrames keyed by (report, subreport), combined across members
+    """
+    tables = _normalise_tables(tables)
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    pattern = re.compile(member_pattern) if member_pattern else None
+
+    def pieces():
+        with zipfile.ZipFile(source) as zf:
+            for name in zf.namelist():
+                if not name.lower().endswith('.csv'):
+                    continue
+                if pattern is not None and not pattern.search(name):
+                    continue
+                with zf.open(name) as member:
+                    yield from iter_mms_tables(member, tables, chunk_size, column_types)
+
+    return _to_frames(pieces(), tables, lowercase)
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Partitioned append-only parquet storage for AEMO Data Service collectors.
+
+Instead of rewriting one ever-growing parquet file every cycle, data is stored
+as one parquet file per day or month plus small write-ahead segments:
+
+    scada5/
+        2025-08-19.parquet      <- closed partitions, written by compaction
+        2025-08-20.parquet
+        _wal-000041.parquet     <- recent intervals not yet compacted,
+        _wal-000042.parquet        one segment per append
+
+New intervals are deduplicated only against the partition they belong to and
+written to a new write-ahead segment, so an append only writes its own rows.
+When the segments hold more than a row limit, or the partition period rolls
+over, they are folded into their partition files; too many segments are
+consolidated into one. Every file matches ``<dir>/*.parquet`` so readers can
+use a single glob ``read_parquet`` and see both compacted and uncompacted rows.
+
+Compaction and consolidation replace several files at once. The new files are
+staged first and a journal records the commit; old files are removed before
+the staged ones are promoted, so a glob reader may briefly miss the moved rows
+but never counts them twice. A journal left by a crash is finished when the
+store is next opened.
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Write-ahead segments: _wal-<seq>.parquet (and the single _wal.parquet
+# written before segments, still read until it is compacted)
+WAL_GLOB = '_wal*.parquet'
+WAL_SEGMENT = re.compile(r'_wal-(\d+)\.parquet$')
+JOURNAL_FILENAME = '_compaction.json'
+# Staged files end outside the glob until their commit promotes them
+STAGED_SUFFIX = '.staged'
+
+PARTITION_FORMATS = {
+    'day': '%Y-%m-%d',
+    'month': '%Y-%m',
+}
+
+
+def anti_join(new: pd.DataFrame, existing: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Return rows of ``new`` whose ``columns`` key is not present in ``existing``."""
+    if existing.empty or new.empty:
+        return new
+    existing_keys = pd.MultiIndex.from_frame(existing[columns])
+    new_keys = pd.MultiIndex.from_frame(new[columns])
+    return new[~new_keys.isin(existing_keys)]
+
+
+def partition_dir_for(output_file: Path) -> Path:
+    """Directory holding the partitions for a legacy single-file output path."""
+    output_file = Path(output_file)
+    return output_file.with_suffix('')
+
+
+class PartitionedParquetStore:
+    """
+    Append-only parquet store partitioned by day or month.
+
+    Rows are identified by ``key_columns`` (all columns when None); a row whose
+    key already exists in its partition is never written again.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        time_column: str = 'settlementdate',
+        key_columns: Optional[List[str]] = None,
+        partition: str = 'day',
+        wal_max_rows: int = 50_000,
+        wal_max_segments: int = 24,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the partition files
+            time_column: Timestamp column used to assign partitions
+            key_columns: Columns identifying a unique row (None = all columns)
+            partition: 'day' or 'month'
+            wal_max_rows: Compact the write-ahead segments beyond this many rows
+            wal_max_segments: Consolidate the write-ahead segments beyond this many files
+        """
+        if partition not in PARTITION_FORMATS:
+            raise ValueError(f"Unknown partition granularity: {partition}")
+
+        self.root = Path(root)
+        self.time_column = time_column
+        self.key_columns = key_columns
+        self.partition = partition
+        self.wal_max_rows = wal_max_rows
+        self.wal_max_segments = wal_max_segments
+        self._format = PARTITION_FORMATS[partition]
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._recover()
+
+    def wal_segments(self) -> List[Path]:
+        """Write-ahead segment files, oldest first."""
+        def order(path: Path):
+            match = WAL_SEGMENT.match(path.name)
+            return int(match.group(1)) if match else -1
+        return sorted(self.root.glob(WAL_GLOB), key=order)
+
+    def _next_segment_path(self) -> Path:
+        numbers = [int(m.group(1)) for m in (WAL_SEGMENT.match(p.name) for p in self.wal_segments()) if m]
+        return self.root / f"_wal-{max(numbers, default=0) + 1:06d}.parquet"
+
+    @property
+    def glob_pattern(self) -> str:
+        """Glob matching every file in the store, for DuckDB read_parquet."""
+        return str(self.root / '*.parquet')
+
+    def partition_key(self, timestamp: Any) -> str:
+        """Return the partition key ('2025-08-20' or '2025-08') for a timestamp."""
+        return pd.Timestamp(timestamp).strftime(self._format)
+
+    def partition_keys(self, times: Any) -> pd.Series:
+        """Vectorised partition_key() for a column or index of timestamps."""
+        return pd.Series(pd.to_datetime(times)).dt.strftime(self._format)
+
+    def partition_path(self, key: str) -> Path:
+        return self.root / f"{key}.parquet"
+
+    def partition_files(self) -> List[Path]:
+        """Return compacted partition files in chronological order."""
+        return sorted(p for p in self.root.glob('*.parquet') if not p.name.startswith('_'))
+
+    def is_empty(self) -> bool:
+        return not self.wal_segments() and not self.partition_files()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _read_file(self, path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        if not path.exists():
+            return pd.DataFrame()
+        return pd.read_parquet(path, columns=columns)
+
+    def read_wal(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        frames = [self._read_file(p, columns) for p in self.wal_segments()]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def read_partition(self, key: str, include_wal: bool = True) -> pd.DataFrame:
+        """Read one partition, including its uncompacted rows."""
+        frames = [self._read_file(self.partition_path(key))]
+        if include_wal:
+            wal = self.read_wal()
+            if not wal.empty:
+                frames.append(wal[self._partition_keys(wal) == key])
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def read_latest_partition(self) -> pd.DataFrame:
+        """Read the most recent partition (compacted rows plus write-ahead rows)."""
+        keys = [p.stem for p in self.partition_files()]
+        wal = self.read_wal(columns=[self.time_column])
+        if not wal.empty:
+            keys.extend(self._partition_keys(wal).unique())
+        if not keys:
+            return pd.DataFrame()
+        return self.read_partition(max(keys))
+
+    def read_all(self) -> pd.DataFrame:
+        """Read the whole store. Intended for tools and tests, not the hot path."""
+        frames = [self._read_file(p) for p in self.partition_files()]
+        frames.append(self.read_wal())
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _partition_keys(self, df: pd.DataFrame) -> pd.Series:
+        return self.partition_keys(df[self.time_column])
+
+    def _dedupe_columns(self, df: pd.DataFrame) -> List[str]:
+        return list(self.key_columns) if self.key_columns else list(df.columns)
+
+    def _anti_join(self, new: pd.DataFrame, existing: pd.DataFrame) -> pd.DataFrame:
+        """Return rows of ``new`` whose key is not present in ``existing``."""
+        return anti_join(new, existing, self._dedupe_columns(new))
+
+    @staticmethod
+    def _write_atomic(df: pd.DataFrame, path: Path) -> None:
+        """Write a parquet file so readers never see a partial file."""
+        # Temp name does not end in .parquet so it never matches the glob
+        tmp_path = path.with_name(path.name + '.tmp')
+        df.to_parquet(tmp_path, compression='snappy', index=False)
+        os.replace(tmp_path, path)
+
+    def append(self, new_df: pd.DataFrame) -> int:
+        """
+        Append new rows, deduplicating only against their own partitions.
+
+        Args:
+            new_df: Rows to add; must contain ``time_column``
+
+        Returns:
+            Number of rows actually added
+        """
+        if new_df is None or new_df.empty:
+            return 0
+
+        new_df = new_df.drop_duplicates(subset=self._dedupe_columns(new_df)).reset_index(drop=True)
+        key_cols = self._dedupe_columns(new_df)
+        wal = self.read_wal(columns=list(dict.fromkeys([self.time_column, *key_cols])))
+
+        new_keys = self._partition_keys(new_df)
+        wal_keys = self._partition_keys(wal) if not wal.empty else pd.Series(dtype=str)
+
+        fresh = []
+        for key in sorted(new_keys.unique()):
+            rows = new_df[new_keys == key]
+            existing = self._read_file(self.partition_path(key), columns=key_cols)
+            rows = self._anti_join(rows, existing)
+            if not wal.empty:
+                rows = self._anti_join(rows, wal[wal_keys == key])
+            if not rows.empty:
+                fresh.append(rows)
+
+        if not fresh:
+            return 0
+
+        added = pd.concat(fresh, ignore_index=True)
+        self._write_atomic(added, self._next_segment_path())
+        pending = len(wal) + len(added)
+        pending_keys = set(new_keys.unique()) | set(wal_keys.unique())
+
+        logger.info(f"{self.root.name}: Appended {len(added)} rows to write-ahead segment "
+                    f"({pending} uncompacted)")
+
+        # Compact once the segments are large or span more than one partition
+        if pending >= self.wal_max_rows or len(pending_keys) > 1:
+            self.compact(keep_latest=pending < self.wal_max_rows)
+        elif len(self.wal_segments()) > self.wal_max_segments:
+            self.consolidate_wal()
+
+        return len(added)
+
+    def compact(self, keep_latest: bool = False) -> int:
+        """
+        Fold write-ahead rows into their partition files.
+
+        Args:
+            keep_latest: Leave rows of the newest partition in the segment, so a
+                rollover only rewrites the partition that just closed
+
+        Returns:
+            Number of rows moved into partition files
+        """
+        segments = self.wal_segments()
+        wal = self.read_wal()
+        if wal.empty:
+            self._commit(remove=segments, write={})
+            return 0
+
+        keys = self._partition_keys(wal)
+        latest = keys.max()
+        moved = 0
+        write: Dict[Path, pd.DataFrame] = {}
+
+        for key in sorted(keys.unique()):
+            if keep_latest and key == latest:
+                continue
+            rows = wal[keys == key]
+            merged = self._merged_partition(key, rows)
+            if merged is not None:
+                write[self.partition_path(key)] = merged
+            moved += len(rows)
+
+        if keep_latest:
+            write[self._next_segment_path()] = wal[keys == latest].reset_index(drop=True)
+        self._commit(remove=segments, write=write)
+
+        logger.info(f"{self.root.name}: Compacted {moved} rows into partitions")
+        return moved
+
+    def consolidate_wal(self) -> None:
+        """Rewrite the write-ahead segments as one, bounding the file count."""
+        segments = self.wal_segments()
+        if len(segments) > 1:
+            self._commit(remove=segments, write={self._next_segment_path(): self.read_wal()})
+
+    def _commit(self, remove: List[Path], write: Dict[Path, pd.DataFrame]) -> None:
+        """
+        Replace files so no row is visible in two of them at once.
+
+        The new files are staged outside the glob and a journal naming the
+        removals and promotions is written atomically; that is the commit.
+        Applying it removes the old files before promoting the staged ones.
+        """
+        for path, df in write.items():
+            self._write_atomic(df, path.with_name(path.name + STAGED_SUFFIX))
+        journal = {'remove': [p.name for p in remove], 'promote': [p.name for p in write]}
+        journal_path = self.root / JOURNAL_FILENAME
+        tmp_path = journal_path.with_name(journal_path.name + '.tmp')
+        tmp_path.write_text(json.dumps(journal))
+        os.replace(tmp_path, journal_path)
+        self._apply(journal)
+
+    def _apply(self, journal: Dict[str, List[str]]) -> None:
+        """Carry out a committed journal; safe to repeat."""
+        for name in journal['remove']:
+            (self.root / name).unlink(missing_ok=True)
+        for name in journal['promote']:
+            staged = self.root / (name + STAGED_SUFFIX)
+            if staged.exists():
+                os.replace(staged, self.root / name)
+        (self.root / JOURNAL_FILENAME).unlink(missing_ok=True)
+
+    def _recover(self) -> None:
+        """Finish a compaction interrupted after its commit."""
+        journal_path = self.root / JOURNAL_FILENAME
+        if journal_path.exists():
+            logger.warning(f"{self.root.name}: Finishing interrupted compaction")
+            self._apply(json.loads(journal_path.read_text()))
+
+    def _merged_partition(self, key: str, rows: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """One partition with rows merged in (None when they add nothing)."""
+        existing = self._read_file(self.partition_path(key))
+        if not existing.empty:
+            rows = self._anti_join(rows, existing)
+            if rows.empty:
+                return None
+            merged = pd.concat([existing, rows], ignore_index=True)
+        else:
+            merged = rows
+        return merged.sort_values(self.time_column, kind='stable').reset_index(drop=True)
+
+    def _merge_into_partition(self, key: str, rows: pd.DataFrame) -> None:
+        """Merge rows into one partition file, deduplicating against it."""
+        merged = self._merged_partition(key, rows)
+        if merged is not None:
+            self._write_atomic(merged, self.partition_path(key))
+
+    def merge(self, new_df: pd.DataFrame) -> int:
+        """
+        Merge rows straight into their partition files, bypassing the segment.
+
+        Intended for bulk historical loads (backfills), where rows span many
+        closed partitions and would only be compacted out of the segment again.
+
+        Returns:
+            Number of rows actually added
+        """
+        if new_df is None or new_df.empty:
+            return 0
+
+        new_df = new_df.drop_duplicates(subset=self._dedupe_columns(new_df))
+        keys = self._partition_keys(new_df)
+        added = 0
+        for key in sorted(keys.unique()):
+            rows = new_df[keys == key]
+            before = self._row_count(self.partition_path(key))
+            self._merge_into_partition(key, rows)
+            added += self._row_count(self.partition_path(key)) - before
+        return added
+
+    def write_partition(self, key: str, df: pd.DataFrame) -> None:
+        """Replace one partition file outright (for derived tables such as rollups)."""
+        self._write_atomic(df.reset_index(drop=True), self.partition_path(key))
+
+    @staticmethod
+    def _row_count(path: Path) -> int:
+        return pq.read_metadata(path).num_rows if path.exists() else 0
+
+    def import_file(self, source_file: Path, batch_size: int = 1_000_000) -> int:
+        """
+        Split a legacy single parquet file into partitions.
+
+        Reads the file in record batches so memory is bounded by the largest
+        partition rather than the whole file.
+
+        Returns:
+            Number of rows imported
+        """
+        source_file = Path(source_file)
+        parquet_file = pq.ParquetFile(source_file)
+        pending: Dict[str, List[pd.DataFrame]] = {}
+        imported = 0
+
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            df = batch.to_pandas()
+            if self.time_column not in df.columns and df.index.name == self.time_column:
+                df = df.reset_index()
+            keys = self._partition_keys(df)
+            batch_keys = set(keys.unique())
+
+            # Source files are time ordered, so partitions not present in this
+            # batch are complete and can be flushed
+            for key in [k for k in pending if k not in batch_keys]:
+                self._merge_into_partition(key, pd.concat(pending.pop(key), ignore_index=True))
+
+            for key in batch_keys:
+                pending.setdefault(key, []).append(df[keys == key])
+            imported += len(df)
+
+        for key, frames in pending.items():
+            self._merge_into_partition(key, pd.concat(frames, ignore_index=True))
+
+        logger.info(f"{self.root.name}: Imported {imported:,} rows from {source_file}")
+        return imported
+
+    # ------------------------------------------------------------------
+    # Metadata
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """File count, row count and size read from parquet metadata only."""
+        segments = self.wal_segments()
+        files = self.partition_files() + segments
+
+        total_rows = 0
+        total_bytes = 0
+        for path in files:
+            try:
+                total_rows += pq.read_metadata(path).num_rows
+                total_bytes += path.stat().st_size
+            except Exception as e:
+                logger.warning(f"Could not read metadata for {path}: {e}")
+
+        partitions = [p.stem for p in self.partition_files()]
+        return {
+            'partitions': len(partitions),
+            'first_partition': partitions[0] if partitions else None,
+            'last_partition': partitions[-1] if partitions else None,
+            'wal_rows': sum(self._row_count(p) for p in segments),
+            'total_records': total_rows,
+            'size_mb': round(total_bytes / (1024 * 1024), 2),
+            'last_modified': datetime.fromtimestamp(
+                max(p.stat().st_mtime for p in files)
+            ).isoformat() if files else None,
+        }
@@ -8,9 +8,15 @@ When AEMO_DUCKDB_PATH is set, queries use the external DuckDB database
 with per-request read-only connections and retry on lock conflict. This
 allows the collector to write to the same file without blocking dashboard
 reads.
+
+Otherwise one connection to aemo_cache.duckdb owns the views and each thread
+queries through its own cursor of it: a DuckDB connection must not be used
+from two threads at once, and session threads, the refresh engine and the
+snapshot/precompute pools all query concurrently.
 """
 
 import os
+import threading
 import time
 
 import duckdb
@@ -26,11 +32,29 @@ from aemo_dashboard.shared.config import config
 from aemo_dashboard.shared.logging_config import get_logger
 from aemo_dashboard.shared.performance_logging import PerformanceLogger
 from aemo_dashboard.shared.constants import MINUTES_5_TO_HOURS, MINUTES_30_TO_HOURS
+from aemo_dashboard.shared.data_version import get_data_versions
+from aemo_dashboard.shared.rollups import ROLLUP_LEVELS, rollup_table
+from aemo_dashboard.shared.sql import Where, execute
 
 logger = get_logger(__name__)
 perf_logger = PerformanceLogger(__name__)
 
 
+def parquet_source(path) -> str:
+    """Return the DuckDB ``read_parquet`` expression for a collector output.
+
+    Collectors in partitioned storage mode write ``<name>/*.parquet`` (one file
+    per day or month plus a write-ahead segment) next to the legacy
+    ``<name>.parquet`` file. When that directory holds data it is read through a
+    glob, otherwise the single file is used.
+    """
+    path = Path(path)
+    partition_dir = path.with_suffix('')
+    if partition_dir.is_dir() and any(partition_dir.glob('*.parquet')):
+        return f"read_parquet('{partition_dir / '*.parquet'}', union_by_name=true)"
+    return f"read_parquet('{path}')"
+
+
 class _RetryQueryResult:
     """Wraps a DuckDB query result, closing the connection after data extraction."""
 
@@ -71,16 +95,22 @@ class _RetryConnection:
         self._max_retries = max_retries
         self._retry_delay = retry_delay
 
-    def execute(self, query):
+    def open(self, query, parameters=None):
+        """Run query on a fresh read-only connection, retrying on lock conflict.
+
+        Returns (connection, result); the caller closes the connection.
+        """
         last_error = None
         for attempt in range(self._max_retries):
+            conn = None
             try:
                 conn = duckdb.connect(self._db_path, read_only=True)
                 conn.execute("SET memory_limit='2GB'")
                 conn.execute("SET threads=4")
-                result = conn.execute(query)
-                return _RetryQueryResult(conn, result)
+                return conn, conn.execute(query, parameters)
             except duckdb.IOException as e:
+                if conn is not None:
+                    conn.close()
                 last_error = e
                 if attempt < self._max_retries - 1:
                     delay = self._retry_delay * (attempt + 1)
@@ -89,6 +119,37 @@ class _RetryConnection:
                     time.sleep(delay)
         raise last_error
 
+    def execute(self, query, parameters=None):
+        return _RetryQueryResult(*self.open(query, parameters))
+
+    def cursor(self):
+        """A _RetryCursor: one connection held until it is closed, for streamed results."""
+        return _RetryCursor(self)
+
+
+class _RetryCursor:
+    """One read-only connection of a _RetryConnection, opened on first execute().
+
+    Streamed results (Arrow record-batch readers) read from the connection
+    after execute() returns, so it stays open until close() rather than
+    closing with the first fetch like _RetryQueryResult.
+    """
+
+    def __init__(self, retry_conn):
+        self._retry_conn = retry_conn
+        self._conn = None
+
+    def execute(self, query, parameters=None):
+        if self._conn is None:
+            self._conn, result = self._retry_conn.open(query, parameters)
+            return result
+        return self._conn.execute(query, parameters)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
 
 class DuckDBDataService:
     """
@@ -110,6 +171,8 @@ class DuckDBDataService:
             cls._instance._initialized = False
             cls._instance._conn = None
             cls._instance._external_db_path = os.getenv('AEMO_DUCKDB_PATH')
+            cls._instance._init_lock = threading.RLock()
+            cls._instance._local = threading.local()
         return cls._instance
 
     @property
@@ -118,11 +181,29 @@ class DuckDBDataService:
 
         When using external DuckDB (AEMO_DUCKDB_PATH set), returns a
         _RetryConnection that opens fresh read-only connections per query.
-        Otherwise returns the persistent connection to aemo_cache.duckdb.
+        Otherwise returns the calling thread's cursor of the persistent
+        connection to aemo_cache.duckdb, so concurrent threads never share
+        a connection object.
         """
         if self._conn is None:
-            self._initialize_connection()
-        return self._conn
+            with self._init_lock:
+                if self._conn is None:
+                    self._initialize_connection()
+        root = self._conn
+        if isinstance(root, _RetryConnection):
+            return root
+        local = self._local
+        # A cursor belongs to the root it was made from; close() and a
+        # re-initialisation replace the root
+        if getattr(local, 'root', None) is not root:
+            local.cursor = root.cursor()
+            local.root = root
+        return local.cursor
+
+    @property
+    def uses_external_db(self) -> bool:
+        """True when queries read the collector's DuckDB (AEMO_DUCKDB_PATH)."""
+        return bool(self._external_db_path)
 
     @property
     def _duid_join_table(self):
@@ -182,6 +263,9 @@ class DuckDBDataService:
             # Check if views already exist (persistent DB)
             if self._views_exist():
                 logger.info("Using existing views from persistent DB")
+                # Re-point parquet views (cheap) in case a collector switched
+                # between single-file and partitioned storage
+                self._register_data_views()
                 # Still need DUID mapping in memory for quick access
                 self._load_duid_mapping_from_db()
             else:
@@ -231,13 +315,13 @@ class DuckDBDataService:
         gen_30_path = str(config.scada30_file)
         
         self._conn.execute(f"""
-            CREATE VIEW generation_30min AS
-            SELECT * FROM read_parquet('{gen_30_path}')
+            CREATE OR REPLACE VIEW generation_30min AS
+            SELECT * FROM {parquet_source(gen_30_path)}
         """)
 
         self._conn.execute(f"""
-            CREATE VIEW generation_5min AS
-            SELECT * FROM read_parquet('{gen_5_path}')
+            CREATE OR REPLACE VIEW generation_5min AS
+            SELECT * FROM {parquet_source(gen_5_path)}
         """)
 
         # Price data
@@ -245,41 +329,41 @@ class DuckDBDataService:
         price_5_path = str(config.spot_hist_file)
 
         self._conn.execute(f"""
-            CREATE VIEW prices_30min AS
+            CREATE OR REPLACE VIEW prices_30min AS
             SELECT
                 settlementdate,
                 regionid,
                 rrp
-            FROM read_parquet('{price_30_path}')
+            FROM {parquet_source(price_30_path)}
         """)
 
         self._conn.execute(f"""
-            CREATE VIEW prices_5min AS
+            CREATE OR REPLACE VIEW prices_5min AS
             SELECT
                 settlementdate,
                 regionid,
                 rrp
-            FROM read_parquet('{price_5_path}')
+            FROM {parquet_source(price_5_path)}
         """)
 
         # Transmission data
         trans_30_path = str(config.transmission_output_file).replace('transmission5.parquet', 'transmission30.parquet')
 
         self._conn.execute(f"""
-            CREATE VIEW transmission_30min AS
-            SELECT * FROM read_parquet('{trans_30_path}')
+            CREATE OR REPLACE VIEW transmission_30min AS
+            SELECT * FROM {parquet_source(trans_30_path)}
         """)
         
         # Rooftop solar - rename 'power' column to 'rooftop_solar_mw' for consistency
         # Note: DuckDB may not see all columns due to parquet format compatibility
         # Only select columns that DuckDB can reliably read
         self._conn.execute(f"""
-            CREATE VIEW rooftop_solar AS
+            CREATE OR REPLACE VIEW rooftop_solar AS
             SELECT
                 settlementdate,
                 regionid,
                 power AS rooftop_solar_mw
-            FROM read_parquet('{config.rooftop_solar_file}')
+            FROM {parquet_source(config.rooftop_solar_file)}
         """)
         
         logger.info("All parquet files registered as views")
@@ -380,7 +464,6 @@ class DuckDBDataService:
             return sorted(self.duid_mapping['Fuel'].dropna().unique().tolist())
         return []
     
-    @lru_cache(maxsize=128)
     def get_generation_by_fuel(
         self,
         start_date: datetime,
@@ -391,14 +474,30 @@ class DuckDBDataService:
         """
         Get generation data aggregated by fuel type.
         
-        This executes a SQL query on the parquet files directly.
+        This executes a SQL query on the parquet files directly. Results are
+        cached per generation data version, so a window still receiving data
+        is re-queried once a new interval lands while closed windows stay
+        cached.
         """
+        version = get_data_versions().token(('generation',), end_date)
+        return self._get_generation_by_fuel(start_date, end_date, regions, resolution, version)
+    
+    @lru_cache(maxsize=128)
+    def _get_generation_by_fuel(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        regions: Optional[Tuple[str]],
+        resolution: str,
+        data_version: Optional[str]
+    ) -> pd.DataFrame:
+        """Cached body of get_generation_by_fuel, keyed on the data version."""
         with perf_logger.timer("duckdb_generation_query", threshold=0.5):
             # Build the base query
             if resolution == '5min' and (end_date - start_date).days < 7:
                 table = 'generation_5min'
                 # Need to join with DUID mapping for 5min data
-                base_query = """
+                base_query = f"""
                     SELECT 
                         g.settlementdate,
                         COALESCE(d.Fuel, 'Unknown') as fuel_type,
@@ -417,20 +516,13 @@ class DuckDBDataService:
                 """
             
             # Add WHERE clause
-            where_conditions = [
-                f"settlementdate >= '{start_date.isoformat()}'",
-                f"settlementdate <= '{end_date.isoformat()}'"
-            ]
+            where = Where().between('settlementdate', start_date, end_date)
             
             if regions:
                 # For 5min data, need to join to get region
-                region_list = ','.join([f"'{r}'" for r in regions])
-                if table == 'generation_5min':
-                    where_conditions.append(f"d.Region IN ({region_list})")
-                else:
-                    where_conditions.append(f"region IN ({region_list})")
+                where.isin('d.Region' if table == 'generation_5min' else 'region', regions)
             
-            where_clause = " WHERE " + " AND ".join(where_conditions)
+            where_clause = f" WHERE {where}"
             
             # Add GROUP BY based on resolution
             if resolution == 'hourly':
@@ -471,7 +563,7 @@ class DuckDBDataService:
                 query = f"{base_query}{where_clause} {group_by} ORDER BY settlementdate, fuel_type"
             
             # Execute query
-            result = self.conn.execute(query).df()
+            result = execute(self.conn, query, where.params).df()
             
             logger.debug(f"Generation query returned {len(result)} rows")
             return result
@@ -483,30 +575,32 @@ class DuckDBDataService:
         regions: Optional[List[str]] = None,
         resolution: str = '30min'
     ) -> pd.DataFrame:
-        """Get price data by region"""
+        """Get price data by region (resolution may also be a rollup level)"""
         with perf_logger.timer("duckdb_price_query", threshold=0.5):
             # Select appropriate table
-            table = 'prices_5min' if resolution == '5min' and (end_date - start_date).days < 7 else 'prices_30min'
+            if resolution in ROLLUP_LEVELS:
+                table = rollup_table('price', resolution)
+            elif resolution == '5min' and (end_date - start_date).days < 7:
+                table = 'prices_5min'
+            else:
+                table = 'prices_30min'
             
             # Build query
+            where = Where().between('settlementdate', start_date, end_date)
+            if regions:
+                where.isin('regionid', regions)
             query = f"""
                 SELECT 
                     settlementdate,
                     regionid,
                     rrp
                 FROM {table}
-                WHERE settlementdate >= '{start_date.isoformat()}'
-                  AND settlementdate <= '{end_date.isoformat()}'
+                WHERE {where}
+                ORDER BY settlementdate, regionid
             """
             
-            if regions:
-                region_list = ','.join([f"'{r}'" for r in regions])
-                query += f" AND regionid IN ({region_list})"
-            
-            query += " ORDER BY settlementdate, regionid"
-            
             # Execute query
-            result = self.conn.execute(query).df()
+            result = execute(self.conn, query, where.params).df()
             
             logger.debug(f"Price query returned {len(result)} rows")
             return result
@@ -573,6 +667,7 @@ class DuckDBDataService:
 
             # Build the revenue query with correct time factor
             # Revenue = MW × $/MWh × hours
+            where = Where().between('g.settlementdate', start_date, end_date)
             query = f"""
                 SELECT
                     {', '.join(select_fields)},
@@ -584,14 +679,13 @@ class DuckDBDataService:
                 JOIN {price_table} p
                   ON g.settlementdate = p.settlementdate
                   AND {region_col} = p.regionid
-                WHERE g.settlementdate >= '{start_date.isoformat()}'
-                  AND g.settlementdate <= '{end_date.isoformat()}'
+                WHERE {where}
                 GROUP BY {', '.join(sql_group_by)}
                 ORDER BY revenue DESC
             """
 
             # Execute query
-            result = self.conn.execute(query).df()
+            result = execute(self.conn, query, where.params).df()
 
             logger.debug(f"Revenue query ({resolution}) returned {len(result)} rows")
             return result
@@ -620,6 +714,7 @@ class DuckDBDataService:
             time_factor = MINUTES_5_TO_HOURS
             gen_table = 'generation_5min'
             price_table = 'prices_5min'
+            where = Where().eq('d."Site Name"', station_name).between('g.settlementdate', start_date, end_date)
             # For 5min, need to join with duid_mapping
             query = f"""
                 SELECT
@@ -635,15 +730,14 @@ class DuckDBDataService:
                 JOIN {price_table} p
                   ON g.settlementdate = p.settlementdate
                   AND d.Region = p.regionid
-                WHERE d."Site Name" = '{station_name}'
-                  AND g.settlementdate >= '{start_date.isoformat()}'
-                  AND g.settlementdate <= '{end_date.isoformat()}'
+                WHERE {where}
                 ORDER BY g.settlementdate
             """
         else:
             time_factor = MINUTES_30_TO_HOURS
             gen_table = 'generation_enriched_30min'
             price_table = 'prices_30min'
+            where = Where().eq('g.station_name', station_name).between('g.settlementdate', start_date, end_date)
             query = f"""
                 SELECT
                     g.settlementdate,
@@ -657,52 +751,58 @@ class DuckDBDataService:
                 JOIN {price_table} p
                   ON g.settlementdate = p.settlementdate
                   AND g.region = p.regionid
-                WHERE g.station_name = '{station_name}'
-                  AND g.settlementdate >= '{start_date.isoformat()}'
-                  AND g.settlementdate <= '{end_date.isoformat()}'
+                WHERE {where}
                 ORDER BY g.settlementdate
             """
 
-        return self.conn.execute(query).df()
+        return execute(self.conn, query, where.params).df()
     
     def get_transmission_flows(
         self,
         start_date: datetime,
         end_date: datetime,
-        interconnector_id: Optional[str] = None
+        interconnector_id: Optional[str] = None,
+        resolution: str = '30min'
     ) -> pd.DataFrame:
-        """Get transmission flow data"""
+        """Get transmission flow data (resolution '30min' or a rollup level)"""
+        if resolution in ROLLUP_LEVELS:
+            columns = 'settlementdate, interconnectorid, meteredmwflow, mwflow, exportlimit, importlimit, mwlosses'
+            table = rollup_table('transmission', resolution)
+        else:
+            columns = '*'
+            table = 'transmission_30min'
+
+        where = Where().between('settlementdate', start_date, end_date)
+        if interconnector_id:
+            where.eq('interconnectorid', interconnector_id)
         query = f"""
-            SELECT *
-            FROM transmission_30min
-            WHERE settlementdate >= '{start_date.isoformat()}'
-              AND settlementdate <= '{end_date.isoformat()}'
+            SELECT {columns}
+            FROM {table}
+            WHERE {where}
+            ORDER BY settlementdate
         """
         
-        if interconnector_id:
-            query += f" AND interconnectorid = '{interconnector_id}'"
-        
-        query += " ORDER BY settlementdate"
-        
-        return self.conn.execute(query).df()
+        return execute(self.conn, query, where.params).df()
     
     def close(self):
-        """Close DuckDB connection"""
-        if self._conn is not None and not isinstance(self._conn, _RetryConnection):
-            self._conn.close()
-        self._conn = None
+        """Close DuckDB connection (and with it every thread's cursor)"""
+        with self._init_lock:
+            if self._conn is not None and not isinstance(self._conn, _RetryConnection):
+                self._conn.close()
+            self._conn = None
 
     def refresh_views(self):
         """Force recreation of all views (useful after data updates)"""
         if self._external_db_path:
             logger.info("External DB mode — views are managed in the DuckDB file")
             return
-        if self._conn is not None:
-            logger.info("Refreshing all views...")
-            self._register_data_views()
-            self._load_duid_mapping()
-            self._create_helper_views()
-            logger.info("Views refreshed")
+        with self._init_lock:
+            if self._conn is not None:
+                logger.info("Refreshing all views...")
+                self._register_data_views()
+                self._load_duid_mapping()
+                self._create_helper_views()
+                logger.info("Views refreshed")
 
 
 # Lazy singleton - instance created but connection deferred
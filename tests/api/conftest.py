@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+import tempfile
 from pathlib import Path
 
 import pytest
@@ -15,6 +16,8 @@ if _DUCKDB.exists():
     os.environ['AEMO_DUCKDB_PATH'] = str(_DUCKDB)
 # PASA reads parquet files from AEMO_DATA_PATH (one dir, not a single file).
 os.environ['AEMO_DATA_PATH'] = str(_FIXTURES)
+# Fresh response-cache store per run so nothing leaks between sessions.
+os.environ['AEMO_API_CACHE_DIR'] = tempfile.mkdtemp(prefix='aemo-api-cache-')
 
 
 @pytest.fixture(scope='session')
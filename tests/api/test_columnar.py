@@ -0,0 +1,81 @@
+"""Tests for the opt-in columnar response format (?format=columnar)."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from aemo_dashboard.api import columnar
+
+
+def _epoch(iso: str) -> int:
+    return int(datetime.fromisoformat(iso.replace('Z', '+00:00')).astimezone(timezone.utc).timestamp())
+
+
+def _get_both(client, auth_headers, url):
+    rows = client.get(url, headers=auth_headers)
+    cols = client.get(f'{url}&format=columnar', headers=auth_headers)
+    assert rows.status_code == 200 and cols.status_code == 200
+    return rows.json(), cols.json()
+
+
+@pytest.mark.parametrize('query', [
+    'regions=NSW1,QLD1,VIC1&to=2026-05-01T00:00:00Z',
+    'regions=NSW1,SA1&to=2026-05-01T00:00:00Z&smoothing=loess',
+])
+def test_spot_columnar_matches_rows(client, auth_headers, query):
+    rows, cols = _get_both(client, auth_headers, f'/v1/prices/spot?{query}')
+
+    assert cols['meta']['format'] == 'columnar'
+    assert cols['meta']['returned_rows'] == rows['meta']['returned_rows']
+    flattened = [
+        (t, s['region'], p)
+        for s in cols['series'] for t, p in zip(s['t'], s['price'])
+    ]
+    assert flattened == [(_epoch(p['timestamp']), p['region'], p['price']) for p in rows['data']]
+
+
+@pytest.mark.parametrize('query', [
+    'region=NSW1&from=2026-04-28T00:00:00Z&to=2026-04-29T00:00:00Z',
+    'regions=NSW1,QLD1,VIC1,SA1,TAS1&from=2026-04-20T00:00:00Z&to=2026-04-29T00:00:00Z',
+])
+def test_mix_columnar_matches_rows(client, auth_headers, query):
+    rows, cols = _get_both(client, auth_headers, f'/v1/generation/mix?{query}')
+
+    assert cols['meta']['fuels'] == rows['meta']['fuels']
+    assert [s['fuel'] for s in cols['series']] == rows['meta']['fuels']
+    for s in cols['series']:
+        expected = [(_epoch(p['timestamp']), p['mw']) for p in rows['data'] if p['fuel'] == s['fuel']]
+        assert list(zip(s['t'], s['mw'])) == pytest.approx(expected)
+
+
+def test_station_time_series_columnar_matches_rows(client, auth_headers):
+    rows, cols = _get_both(client, auth_headers,
+                           '/v1/stations/time-series?station=Tailem%20Bend&period_days=365')
+
+    series = cols['series'][0]
+    assert series['station_name'] == rows['meta']['station_name']
+    assert series['t'] == [_epoch(p['t']) for p in rows['data']]
+    assert series['gen_mw'] == [p['gen_mw'] for p in rows['data']]
+    assert series['price'] == [p['price'] for p in rows['data']]
+
+
+def test_unknown_format_returns_400(client, auth_headers):
+    resp = client.get('/v1/prices/spot?region=NSW1&format=xml', headers=auth_headers)
+    assert resp.status_code == 400
+    assert resp.json()['detail']['code'] == 'INVALID_FORMAT'
+
+
+def test_epoch_seconds_converts_from_nem_time():
+    ts = np.array(['2026-04-28T10:00:00'], dtype='datetime64[us]')
+    assert columnar.epoch_seconds(ts).tolist() == [_epoch('2026-04-28T00:00:00Z')]
+
+
+def test_dumps_without_orjson_writes_nan_as_null(monkeypatch):
+    payload = {'t': np.array([1, 2]), 'v': np.array([1.5, np.nan]), 'n': np.float64(2.0)}
+    expected = b'{"t":[1,2],"v":[1.5,null],"n":2.0}'
+    assert columnar.dumps(payload) == expected
+
+    monkeypatch.setattr(columnar, 'orjson', None)
+    assert columnar.dumps(payload) == expected
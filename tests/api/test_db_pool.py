@@ -0,0 +1,111 @@
+"""Tests for the per-worker DuckDB connection pool and GET /v1/meta."""
+from __future__ import annotations
+
+import os
+import threading
+
+import duckdb
+import pytest
+
+from aemo_dashboard.api.db import ConnectionPool
+
+
+def _make_db(path, value: int) -> None:
+    conn = duckdb.connect(str(path))
+    conn.execute(f"CREATE TABLE t AS SELECT {value} AS v")
+    conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / 'snapshot.duckdb'
+    _make_db(path, 1)
+    monkeypatch.setenv('AEMO_DUCKDB_PATH', str(path))
+    return path
+
+
+def _publish(db_path, value: int) -> None:
+    """Replace the file the way the collector publishes a snapshot."""
+    staged = db_path.with_name('staged.duckdb')
+    _make_db(staged, value)
+    os.replace(staged, db_path)
+
+
+def test_cursors_are_reused(db_path):
+    pool = ConnectionPool(size=2)
+    for _ in range(3):
+        conn = pool.acquire()
+        assert conn.execute('SELECT v FROM t').fetchone()[0] == 1
+        conn.close()
+
+    stats = pool.stats()
+    assert stats['checkouts'] == 3
+    assert stats['cursors_opened'] == 1
+    assert stats['in_use'] == 0 and stats['idle'] == 1
+    pool.close()
+
+
+def test_new_snapshot_recycles_pool(db_path):
+    pool = ConnectionPool(size=2)
+    in_flight = pool.acquire()
+    assert in_flight.execute('SELECT v FROM t').fetchone()[0] == 1
+
+    _publish(db_path, 2)
+    conn = pool.acquire()
+
+    assert conn.execute('SELECT v FROM t').fetchone()[0] == 2
+    # A request already running keeps its snapshot until it returns the cursor
+    assert in_flight.execute('SELECT v FROM t').fetchone()[0] == 1
+    in_flight.close()
+    conn.close()
+    assert pool.stats()['recycles'] == 1
+    assert pool.stats()['idle'] == 1
+    pool.close()
+
+
+def test_exhausted_pool_waits_then_times_out(db_path):
+    pool = ConnectionPool(size=1, wait_s=0.05)
+    held = pool.acquire()
+
+    with pytest.raises(RuntimeError, match='exhausted'):
+        pool.acquire()
+
+    threading.Timer(0.01, held.close).start()
+    pool.wait_s = 5
+    pool.acquire().close()
+
+    stats = pool.stats()
+    assert stats['waits'] == 2
+    assert stats['timeouts'] == 1
+    assert stats['wait_ms_max'] > 0
+    pool.close()
+
+
+def test_closed_connection_cannot_be_used(db_path):
+    pool = ConnectionPool(size=1)
+    conn = pool.acquire()
+    conn.close()
+    conn.close()  # idempotent
+
+    with pytest.raises(duckdb.ConnectionException):
+        conn.execute('SELECT 1')
+    assert pool.stats()['in_use'] == 0
+    pool.close()
+
+
+def test_missing_file_raises(tmp_path, monkeypatch):
+    monkeypatch.setenv('AEMO_DUCKDB_PATH', str(tmp_path / 'missing.duckdb'))
+    with pytest.raises(RuntimeError, match='not found'):
+        ConnectionPool().acquire()
+
+
+def test_meta_reports_pool_stats(client, auth_headers):
+    client.get('/v1/meta/freshness', headers=auth_headers)
+    resp = client.get('/v1/meta', headers=auth_headers)
+    assert resp.status_code == 200
+    pool = resp.json()['data']['db_pool']
+    for key in ('size', 'in_use', 'idle', 'waiting', 'checkouts', 'waits',
+                'wait_ms_total', 'wait_ms_max', 'timeouts', 'recycles'):
+        assert key in pool, f'missing db_pool.{key}'
+    assert pool['checkouts'] >= 1
+    assert pool['in_use'] == 0
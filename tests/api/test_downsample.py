@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import math
 
+import numpy as np
 import pytest
 
 from aemo_dashboard.api.downsample import lttb
@@ -99,3 +100,101 @@ def test_loess_monotonic_input_produces_monotonic_output():
     out = loess([float(i) for i in range(50)], [float(i) for i in range(50)], 0.2)
     for prev, cur in zip(out, out[1:]):
         assert cur >= prev - 1e-6
+
+
+# --- Equivalence with the original pure-Python implementations -------------
+
+def _reference_lttb(timestamps, values, target):
+    """The per-point loop api/downsample.py used before vectorisation."""
+    n = len(timestamps)
+    bucket_size = (n - 2) / (target - 2)
+    out_t, out_v = [timestamps[0]], [values[0]]
+    a_t, a_v = float(timestamps[0]), float(values[0])
+    for i in range(target - 2):
+        next_lo = int((i + 1) * bucket_size) + 1
+        next_hi = min(int((i + 2) * bucket_size) + 1, n)
+        if next_lo >= next_hi:
+            next_lo = next_hi - 1
+        avg_t = sum(float(timestamps[k]) for k in range(next_lo, next_hi)) / (next_hi - next_lo)
+        avg_v = sum(float(values[k]) for k in range(next_lo, next_hi)) / (next_hi - next_lo)
+        cur_lo = int(i * bucket_size) + 1
+        cur_hi = min(int((i + 1) * bucket_size) + 1, n - 1)
+        max_area, chosen = -1.0, cur_lo
+        for k in range(cur_lo, cur_hi):
+            area = abs((a_t - avg_t) * (float(values[k]) - a_v)
+                       - (a_t - float(timestamps[k])) * (avg_v - a_v))
+            if area > max_area:
+                max_area, chosen = area, k
+        out_t.append(float(timestamps[chosen]))
+        out_v.append(float(values[chosen]))
+        a_t, a_v = float(timestamps[chosen]), float(values[chosen])
+    out_t.append(float(timestamps[-1]))
+    out_v.append(float(values[-1]))
+    return out_t, out_v
+
+
+def _reference_loess(x, y, frac):
+    n = len(x)
+    r = min(max(3, int(round(frac * n))), n)
+    xa, ya = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    out = []
+    for i in range(n):
+        lo = max(0, i - r // 2)
+        hi = min(n, lo + r)
+        lo = max(0, hi - r)
+        xs, ys = xa[lo:hi], ya[lo:hi]
+        d = np.abs(xs - xa[i])
+        w = (1.0 - (d / max(d.max(), 1e-12)) ** 3) ** 3
+        sw = w.sum()
+        wx, wy = (w * xs).sum() / sw, (w * ys).sum() / sw
+        b_den = (w * (xs - wx) ** 2).sum()
+        if abs(b_den) < 1e-12:
+            out.append(wy)
+        else:
+            b = (w * (xs - wx) * (ys - wy)).sum() / b_den
+            out.append(wy - b * wx + b * xa[i])
+    return out
+
+
+def _series(kind, n):
+    rng = np.random.default_rng(n)
+    if kind == 'noise':
+        return rng.normal(size=n).tolist()
+    if kind == 'walk':
+        return (100 + np.cumsum(rng.normal(0, 5, n))).tolist()
+    return [float(i % 31) for i in range(n)]
+
+
+@pytest.mark.parametrize('kind', ['noise', 'walk', 'sawtooth'])
+@pytest.mark.parametrize('n,target', [(10, 4), (1000, 50), (8640, 1500), (60000, 1500)])
+def test_lttb_matches_reference(kind, n, target):
+    t = [1.7e9 + 300.0 * i for i in range(n)]
+    v = _series(kind, n)
+    assert lttb(t, v, target) == _reference_lttb(t, v, target)
+
+
+def test_lttb_many_matches_single_series():
+    from aemo_dashboard.api.downsample import lttb_many
+    series = [_series('walk', 5000), _series('noise', 5000), _series('walk', 3000)]
+    keep = lttb_many(series, 200)
+    for values, idx in zip(series, keep):
+        t = [float(i) for i in range(len(values))]
+        assert [float(i) for i in idx] == _reference_lttb(t, values, 200)[0]
+
+
+@pytest.mark.parametrize('n,frac', [(3, 0.5), (200, 0.05), (1500, 0.08), (3000, 1.0)])
+def test_loess_matches_reference(n, frac):
+    x = [float(i) for i in range(n)]
+    y = _series('walk', n)
+    from aemo_dashboard.api.downsample import loess
+    assert loess(x, y, frac) == pytest.approx(_reference_loess(x, y, frac), rel=1e-9, abs=1e-9)
+
+
+def test_loess_smooth_batches_series():
+    from aemo_dashboard.api.downsample import loess_smooth
+    x = np.arange(400, dtype=float)
+    ys = np.array([_series('walk', 400), _series('noise', 400)])
+    out = loess_smooth(x, ys, 0.05)
+    assert out.shape == ys.shape
+    for row, y in zip(out, ys):
+        np.testing.assert_allclose(row, loess_smooth(x, y, 0.05))
@@ -0,0 +1,123 @@
+"""Incremental demand records behind /v1/gauges/today.
+
+DemandRecords must always agree with the full-history scans it replaced,
+while folding in only settlement periods newer than its watermark.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import duckdb
+import pytest
+
+from aemo_dashboard.api.routers.gauges import DemandRecords
+
+REGIONS = ("NSW1", "QLD1", "VIC1", "SA1", "TAS1")
+START = datetime(2026, 1, 1)
+
+
+def _insert(conn, table: str, periods: range, value) -> None:
+    rows = [(START + timedelta(minutes=30 * i), r, value(i, r)) for i in periods for r in REGIONS]
+    conn.executemany(f"INSERT INTO {table} VALUES (?, ?, ?)", rows)
+
+
+def _full_scan(conn, hour: int) -> tuple:
+    totals = """
+        SELECT d.settlementdate,
+               SUM(d.demand) + COALESCE(SUM(r.power), 0) AS period_total
+        FROM demand30 d
+        LEFT JOIN rooftop30 r
+          ON d.settlementdate = r.settlementdate AND d.regionid = r.regionid
+        GROUP BY d.settlementdate
+    """
+    hour_rec = conn.execute(
+        f"SELECT MAX(period_total) FROM ({totals}) WHERE EXTRACT(HOUR FROM settlementdate) = ?",
+        [hour],
+    ).fetchone()[0]
+    hi, lo = conn.execute(f"SELECT MAX(period_total), MIN(period_total) FROM ({totals})").fetchone()
+    return hour_rec, hi, lo
+
+
+@pytest.fixture
+def conn():
+    c = duckdb.connect(":memory:")
+    c.execute("CREATE TABLE demand30 (settlementdate TIMESTAMP, regionid VARCHAR, demand DOUBLE)")
+    c.execute("CREATE TABLE rooftop30 (settlementdate TIMESTAMP, regionid VARCHAR, power DOUBLE)")
+    _insert(c, "demand30", range(96), lambda i, r: 1000 + (i * 37) % 500)
+    _insert(c, "rooftop30", range(96), lambda i, r: (i * 11) % 300)
+    yield c
+    c.close()
+
+
+def test_records_match_full_scan(conn):
+    records = DemandRecords().refresh(conn)
+
+    for hour in (0, 7, 18):
+        hour_rec, hi, lo = _full_scan(conn, hour)
+        assert records.hour_record(hour) == pytest.approx(hour_rec)
+    assert records.alltime_max == pytest.approx(hi)
+    assert records.alltime_min == pytest.approx(lo)
+    assert records.watermark == START + timedelta(minutes=30 * 95)
+
+
+def test_new_periods_fold_in_and_late_rooftop_is_picked_up(conn):
+    records = DemandRecords().refresh(conn)
+    watermark = records.watermark
+
+    # New demand lands before its rooftop: the period stays open
+    _insert(conn, "demand30", range(96, 98), lambda i, r: 5000)
+    records.refresh(conn)
+    assert records.watermark == watermark
+    assert records.alltime_max == pytest.approx(5000 * len(REGIONS))
+
+    _insert(conn, "rooftop30", range(96, 98), lambda i, r: 100)
+    records.refresh(conn)
+    assert records.watermark > watermark
+    assert records.alltime_max == pytest.approx(_full_scan(conn, 0)[1])
+
+
+def test_records_persist_across_instances(conn, tmp_path):
+    path = tmp_path / "records.json"
+    first = DemandRecords(path).refresh(conn)
+
+    second = DemandRecords(path)
+    second._load()
+    assert second.watermark == first.watermark
+
+    second.refresh(conn)
+    assert second.alltime_max == pytest.approx(first.alltime_max)
+    assert second.hour_record(12) == pytest.approx(first.hour_record(12))
+
+
+def test_rewritten_history_rebuilds_the_records(conn, tmp_path):
+    path = tmp_path / "records.json"
+    records = DemandRecords(path).refresh(conn)
+    peak = records.alltime_max
+
+    # A backfill lowers every closed period under the watermark
+    conn.execute("UPDATE demand30 SET demand = demand - 100")
+    expected = _full_scan(conn, 12)
+
+    records.refresh(conn)
+    assert records.alltime_max == pytest.approx(expected[1]) != pytest.approx(peak)
+    assert records.hour_record(12) == pytest.approx(expected[0])
+
+    # A restarted worker must not trust the file saved before the backfill
+    conn.execute("UPDATE rooftop30 SET power = power + 50")
+    restarted = DemandRecords(path).refresh(conn)
+    assert restarted.alltime_max == pytest.approx(_full_scan(conn, 0)[1])
+    assert restarted.alltime_min == pytest.approx(_full_scan(conn, 0)[2])
+
+
+def test_data_version_tracks_every_table_the_payload_reads():
+    import inspect
+    import re
+
+    from aemo_dashboard.api.routers import gauges
+
+    source = "".join(inspect.getsource(f) for f in
+                     (gauges._period_stats, gauges._load_demand, gauges._load_renewable, gauges._load_battery))
+    ctes = set(re.findall(r"(\w+) AS \(", source))
+    read = set(re.findall(r"FROM (\w+)", source)) - ctes - {"settlementdate"}
+
+    assert read == {table for table, _ in gauges._VERSION_SOURCES}
@@ -0,0 +1,125 @@
+"""Tests for the /v1 response cache (window snapping, ETag/304, gzip store)."""
+from __future__ import annotations
+
+import gzip
+import os
+import shutil
+from datetime import datetime, timezone
+
+from aemo_dashboard.api import cache
+
+NOW = datetime(2026, 4, 29, 12, 7, 31, tzinfo=timezone.utc)
+
+
+def test_windows_seconds_apart_normalise_to_the_same_key():
+    a = cache.normalise_query([('to', '2026-04-29T00:04:03Z'), ('regions', 'NSW1,QLD1')], NOW)
+    b = cache.normalise_query([('regions', 'NSW1,QLD1'), ('to', '2026-04-29T00:01:47Z')], NOW)
+
+    assert a == b == ([('regions', 'NSW1,QLD1'), ('to', '2026-04-29T00:02:30Z')], None)
+
+
+def test_canonical_window_selects_the_requested_rows():
+    params, _ = cache.normalise_query(
+        [('from', '2025-01-01T00:17:00'), ('to', '2026-04-29T10:45:00+10:00')], NOW)
+
+    # Bounds on a 5-minute boundary are kept; the others move within their
+    # slot, past no row, whichever comparison the router uses
+    assert params == [('from', '2025-01-01T00:17:30'), ('to', '2026-04-29T10:45:00+10:00')]
+    rows = [datetime(2025, 1, 1, 0, m) for m in range(0, 30, 5)]
+    for requested in (datetime(2025, 1, 1, 0, 16), datetime(2025, 1, 1, 0, 19, 59)):
+        canonical = cache._canonical(requested)
+        assert [r for r in rows if r >= requested] == [r for r in rows if r >= canonical]
+        assert [r for r in rows if r < requested] == [r for r in rows if r < canonical]
+    on_boundary = datetime(2025, 1, 1, 0, 15)
+    assert cache._canonical(on_boundary) == on_boundary
+
+
+def test_open_ended_window_is_keyed_on_current_slot():
+    _, slot = cache.normalise_query([('region', 'NSW1')], NOW)
+    _, same_slot = cache.normalise_query([('region', 'NSW1')], NOW.replace(minute=9))
+
+    assert slot == same_slot == str(int(NOW.timestamp()) // cache.FIVE_MIN_S)
+    assert cache.normalise_query([('to', 'yesterday')], NOW) is None
+
+
+SPOT = '/v1/prices/spot?regions=NSW1,QLD1,VIC1&from=2026-04-28T00:00:00Z&to=2026-04-29T00:0{}:00Z'
+
+
+def test_second_request_in_same_window_is_a_hit(client, auth_headers):
+    first = client.get(SPOT.format(1), headers=auth_headers)
+    second = client.get(SPOT.format(3), headers=auth_headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers['x-cache'] == 'MISS'
+    assert second.headers['x-cache'] == 'HIT'
+    assert second.content == first.content
+    assert second.headers['etag'] == first.headers['etag']
+    assert second.headers['content-encoding'] == 'gzip'
+
+
+def test_matching_etag_returns_304(client, auth_headers):
+    etag = client.get(SPOT.format(2), headers=auth_headers).headers['etag']
+
+    resp = client.get(SPOT.format(4), headers={**auth_headers, 'If-None-Match': etag})
+
+    assert resp.status_code == 304
+    assert resp.content == b''
+    assert resp.headers['etag'] == etag
+
+
+def test_client_without_gzip_gets_plain_body(client, auth_headers):
+    url = SPOT.format(0) + '&smoothing=loess'
+    gzipped = client.get(url, headers=auth_headers)
+    plain = client.get(url, headers={**auth_headers, 'Accept-Encoding': 'identity'})
+
+    assert 'content-encoding' not in plain.headers
+    assert plain.content == gzipped.content
+
+
+def test_new_snapshot_misses(client, auth_headers, monkeypatch):
+    url = SPOT.format(0) + '&resolution=auto'
+    client.get(url, headers=auth_headers)
+    monkeypatch.setattr(cache, 'snapshot_version', lambda: 'published-later')
+
+    assert client.get(url, headers=auth_headers).headers['x-cache'] == 'MISS'
+
+
+def test_entries_are_stored_gzipped(client, auth_headers):
+    url = SPOT.format(0) + '&format=columnar'
+    body = client.get(url, headers=auth_headers).content
+    entries = [p.read_bytes().partition(b'\n')[2] for p in cache.CACHE_DIR.glob('*.entry')]
+
+    assert any(gzip.decompress(e) == body for e in entries if e[:2] == b'\x1f\x8b')
+
+
+def test_meta_is_not_cached(client, auth_headers):
+    resp = client.get('/v1/meta', headers=auth_headers)
+    assert 'x-cache' not in resp.headers
+    assert resp.json()['data']['response_cache']['hits'] >= 1
+
+
+def test_spot_rows_stay_inside_the_requested_window(client, auth_headers):
+    url = '/v1/prices/spot?regions=NSW1&from=2026-04-28T03:{}Z&to=2026-04-29T00:00:00Z'
+    on_boundary = client.get(url.format('50:00'), headers=auth_headers).json()['data']
+    inside = client.get(url.format('52:10'), headers=auth_headers).json()['data']
+
+    # Snapping 03:52 down to 03:50 used to return the 03:50 row as well
+    assert on_boundary[0]['timestamp'] == '2026-04-28T03:50:00Z'
+    assert inside[0]['timestamp'] == '2026-04-28T03:55:00Z'
+    assert inside == on_boundary[1:]
+
+
+def test_file_backed_routes_miss_when_their_files_change(client, auth_headers, tmp_path, monkeypatch):
+    shutil.copy(os.path.join(os.environ['AEMO_DATA_PATH'], 'futures.csv'), tmp_path / 'futures.csv')
+    monkeypatch.setenv('AEMO_DATA_PATH', str(tmp_path))
+    url = '/v1/futures/contracts?region=NSW1'
+
+    assert client.get(url, headers=auth_headers).headers['x-cache'] == 'MISS'
+    assert client.get(url, headers=auth_headers).headers['x-cache'] == 'HIT'
+    with open(tmp_path / 'futures.csv', 'a') as f:
+        f.write('\n')
+    assert client.get(url, headers=auth_headers).headers['x-cache'] == 'MISS'
+
+
+def test_notices_are_not_cached():
+    assert '/v1/notices'.startswith(cache.UNCACHED_PREFIXES)
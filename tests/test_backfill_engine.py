@@ -0,0 +1,246 @@
+"""
+Tests for the parallel, resumable MMS backfill engine.
+
+Builds small MMSDM-style archives (an outer zip holding a nested
+DISPATCH_UNIT_SCADA zip) in a temp directory and backfills them offline
+through LocalArchiveSource. The layout tests then append live rows with a
+collector and read the history back the way the dashboard does.
+"""
+import io
+import zipfile
+from typing import List, Optional
+
+import duckdb
+import pandas as pd
+import pytest
+
+from aemo_data_service.collectors.base_collector import BaseCollector
+from aemo_data_service.shared.backfill import (
+    Archive,
+    ArchiveSource,
+    BackfillEngine,
+    BackfillManifest,
+    LocalArchiveSource,
+    interconnector_job,
+    scada_job,
+    working_root,
+)
+from aemo_data_service.shared.partitioned_storage import PartitionedParquetStore, partition_dir_for
+from data_service.shared_data_duckdb import parquet_source
+
+DUIDS = ['BW01', 'ER01']
+
+
+def scada_csv(times, offset=0.0) -> bytes:
+    lines = ['C,NEMP.WORLD,DVD_DISPATCH_UNIT_SCADA,AEMO,PUBLIC,2021/01/05,00:00:00',
+             'I,DISPATCH,UNIT_SCADA,1,SETTLEMENTDATE,DUID,SCADAVALUE,LASTCHANGED']
+    for i, ts in enumerate(times):
+        for j, duid in enumerate(DUIDS):
+            value = offset + i * 10 + j
+            lines.append(f'D,DISPATCH,UNIT_SCADA,1,"{ts:%Y/%m/%d %H:%M:%S}",{duid} ,{value},'
+                         f'"{ts:%Y/%m/%d %H:%M:%S}"')
+    lines.append('C,"END OF REPORT",99')
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def write_mmsdm_archive(path, times, offset=0.0):
+    """Outer zip -> nested DISPATCH_UNIT_SCADA zip -> CSV, plus an unrelated table."""
+    nested = io.BytesIO()
+    with zipfile.ZipFile(nested, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('PUBLIC_DVD_DISPATCH_UNIT_SCADA_202012010000.CSV', scada_csv(times, offset))
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('MMSDM/DATA/PUBLIC_DVD_DISPATCH_UNIT_SCADA_202012010000.zip', nested.getvalue())
+        zf.writestr('MMSDM/DATA/PUBLIC_DVD_DISPATCHPRICE_202012010000.CSV', scada_csv(times[:1], 1000))
+
+
+@pytest.fixture
+def archives(tmp_path):
+    source_dir = tmp_path / 'archives'
+    source_dir.mkdir()
+    # 2020-12-31 22:05 .. 2021-01-01 02:00, split across two archives
+    times = pd.date_range('2020-12-31 22:05', '2021-01-01 02:00', freq='5min')
+    write_mmsdm_archive(source_dir / 'MMSDM_2020_12.zip', times[:24])
+    write_mmsdm_archive(source_dir / 'MMSDM_2021_01.zip', times[24:], offset=240)
+    return source_dir, times
+
+
+def test_parallel_backfill_writes_partitions_and_rollup(tmp_path, archives):
+    source_dir, times = archives
+    job = scada_job(tmp_path / 'scada5', rollup_root=tmp_path / 'scada30')
+
+    summary = BackfillEngine(job, LocalArchiveSource(source_dir), workers=2).run()
+
+    assert summary['failed'] == []
+    assert summary['rows_added'] == len(times) * len(DUIDS)
+
+    scada5 = PartitionedParquetStore(tmp_path / 'scada5')
+    assert [p.stem for p in scada5.partition_files()] == ['2020-12-31', '2021-01-01']
+    df = scada5.read_all()
+    assert len(df) == len(times) * len(DUIDS)
+    assert set(df['duid']) == set(DUIDS)  # trailing spaces stripped
+    assert 'lastchanged' not in df.columns
+
+    scada30 = PartitionedParquetStore(tmp_path / 'scada30').read_all().set_index(['settlementdate', 'duid'])
+    # 00:00 is the mean of 23:35..00:00, which spans both day partitions
+    window = (df['settlementdate'] > '2020-12-31 23:30') & (df['settlementdate'] <= '2021-01-01 00:00')
+    expected = df[window & (df['duid'] == 'BW01')]['scadavalue'].mean()
+    assert scada30.loc[(pd.Timestamp('2021-01-01 00:00'), 'BW01'), 'scadavalue'] == pytest.approx(expected)
+    assert len(scada30) == 8 * len(DUIDS)
+
+
+def test_interrupted_run_resumes_from_manifest(tmp_path, archives):
+    source_dir, times = archives
+    good = source_dir / 'MMSDM_2021_01.zip'
+    content = good.read_bytes()
+    good.write_bytes(b'not a zip')  # simulates a truncated download
+
+    job = scada_job(tmp_path / 'scada5')
+    first = BackfillEngine(job, LocalArchiveSource(source_dir), workers=0).run()
+    assert first['failed'] == ['MMSDM_2021_01.zip']
+
+    manifest = BackfillManifest(tmp_path / 'scada5' / '_backfill_manifest.json')
+    assert list(manifest.completed) == ['MMSDM_2020_12.zip']
+
+    good.write_bytes(content)
+    second = BackfillEngine(job, LocalArchiveSource(source_dir), workers=0).run()
+
+    assert second['skipped'] == 1
+    assert second['archives'] == 1
+    assert second['rows_added'] == (len(times) - 24) * len(DUIDS)
+    assert len(PartitionedParquetStore(tmp_path / 'scada5').read_all()) == len(times) * len(DUIDS)
+
+
+def test_rerun_is_idempotent_and_date_filtered(tmp_path, archives):
+    source_dir, _ = archives
+    job = scada_job(tmp_path / 'scada5')
+    engine = BackfillEngine(job, LocalArchiveSource(source_dir), workers=0,
+                            manifest_path=tmp_path / 'manifest.json')
+
+    summary = engine.run(start=pd.Timestamp('2021-01-01'), end=pd.Timestamp('2021-01-01 00:55'))
+    assert summary['rows_added'] == 12 * len(DUIDS)
+
+    # A fresh manifest re-reads every archive, but nothing is duplicated
+    again = BackfillEngine(job, LocalArchiveSource(source_dir), workers=0,
+                           manifest_path=tmp_path / 'other.json').run(
+        start=pd.Timestamp('2021-01-01'), end=pd.Timestamp('2021-01-01 00:55'))
+    assert again['rows_added'] == 0
+
+
+def test_legacy_file_imported_before_backfill(tmp_path, archives):
+    source_dir, times = archives
+    legacy = tmp_path / 'transmission5.parquet'
+    pd.DataFrame({
+        'settlementdate': [pd.Timestamp('2020-12-30 10:00')],
+        'interconnectorid': ['NSW1-QLD1'],
+        'meteredmwflow': [100.0],
+    }).to_parquet(legacy)
+
+    job = interconnector_job(tmp_path / 'transmission5')
+    BackfillEngine(job, LocalArchiveSource(source_dir), workers=0, legacy_file=legacy).run()
+
+    store = PartitionedParquetStore(tmp_path / 'transmission5')
+    assert [p.stem for p in store.partition_files()] == ['2020-12-30']
+
+
+def test_incomplete_source_fails_when_created():
+    class ListOnly(ArchiveSource):
+        def list_archives(self) -> List[Archive]:
+            return []
+
+    with pytest.raises(TypeError):
+        ListOnly()
+
+
+class ScadaCollector(BaseCollector):
+    """Live collector writing the same table as the backfill"""
+
+    key_columns = ['settlementdate', 'duid']
+
+    def __init__(self, output_file):
+        super().__init__(name="Test SCADA", output_file=output_file, update_interval_minutes=5)
+
+    def create_empty_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=['settlementdate', 'duid', 'scadavalue'])
+
+    def get_required_columns(self) -> List[str]:
+        return ['settlementdate', 'duid', 'scadavalue']
+
+    async def fetch_latest_data(self) -> Optional[pd.DataFrame]:
+        return None
+
+    def is_new_data(self, new_df: pd.DataFrame) -> bool:
+        return True
+
+    def sort_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.sort_values(['settlementdate', 'duid']).reset_index(drop=True)
+
+
+def scada_rows(start, periods):
+    times = pd.date_range(start, periods=periods, freq='5min')
+    return pd.DataFrame({
+        'settlementdate': times.repeat(len(DUIDS)),
+        'duid': DUIDS * periods,
+        'scadavalue': 1.0,
+    })
+
+
+def dashboard_rows(output_file):
+    """Rows the dashboard sees for a collector output (shared_data_duckdb's view source)"""
+    return duckdb.connect().execute(
+        f"SELECT settlementdate, duid FROM {parquet_source(output_file)} ORDER BY 1, 2").df()
+
+
+@pytest.fixture
+def history(tmp_path):
+    path = tmp_path / 'scada5.parquet'
+    scada_rows('2020-12-30 00:05', 12).to_parquet(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('storage', ['file', 'partitioned'])
+def test_backfill_then_live_append_stay_visible(tmp_path, archives, history, monkeypatch, storage):
+    source_dir, times = archives
+    monkeypatch.setenv('COLLECTOR_STORAGE_MODE', storage)
+    monkeypatch.setenv('COLLECTOR_TAIL_HOURS', '1')
+    root = working_root(history) if storage == 'file' else partition_dir_for(history)
+
+    summary = BackfillEngine(scada_job(root), LocalArchiveSource(source_dir), workers=0,
+                             legacy_file=history, storage=storage).run()
+    assert summary['failed'] == []
+
+    collector = ScadaCollector(history)
+    assert collector.add_new_data(scada_rows('2021-01-01 02:05', 3))
+
+    seen = dashboard_rows(history)
+    assert len(seen) == (12 + len(times) + 3) * len(DUIDS)
+    assert not seen.duplicated().any()
+    assert seen['settlementdate'].max() == pd.Timestamp('2021-01-01 02:15')
+    if storage == 'file':
+        # Nothing left for readers to prefer over the file
+        assert not partition_dir_for(history).exists()
+        assert not any(root.glob('*.parquet'))
+
+
+def test_file_backfill_keeps_rows_appended_during_the_run(tmp_path, archives, history):
+    source_dir, times = archives
+    engine = BackfillEngine(scada_job(working_root(history)), LocalArchiveSource(source_dir),
+                            workers=0, legacy_file=history, storage='file')
+    # The collector appends after the import, before the write-back
+    pd.concat([pd.read_parquet(history), scada_rows('2021-01-02 00:00', 2)]).to_parquet(history, index=False)
+
+    engine.run()
+
+    assert len(pd.read_parquet(history)) == (12 + len(times) + 2) * len(DUIDS)
+
+
+def test_file_backfill_refuses_when_partitions_shadow_the_file(tmp_path, archives, history):
+    source_dir, _ = archives
+    scada_rows('2020-12-29 00:05', 1).to_parquet(tmp_path / 'other.parquet', index=False)
+    PartitionedParquetStore(partition_dir_for(history)).import_file(tmp_path / 'other.parquet')
+
+    with pytest.raises(ValueError, match='COLLECTOR_STORAGE_MODE'):
+        BackfillEngine(scada_job(working_root(history)), LocalArchiveSource(source_dir),
+                       legacy_file=history, storage='file')
+    with pytest.raises(ValueError):
+        BackfillEngine(scada_job(partition_dir_for(history)), LocalArchiveSource(source_dir),
+                       legacy_file=history, storage='file')
@@ -0,0 +1,121 @@
+"""
+Tests for concurrent collector cycles.
+
+Checks that collectors run at the same time, that a collector exceeding its
+timeout budget fails alone without holding up the others, and that latency
+and bytes-downloaded metrics reach the service status.
+"""
+import asyncio
+import time
+from typing import List, Optional
+
+import pandas as pd
+import pytest
+
+from aemo_data_service.collectors import base_collector
+from aemo_data_service.collectors.base_collector import BaseCollector
+from aemo_data_service.service import AEMODataService
+
+
+class FakeResponse:
+    def __init__(self, size):
+        self.content = b'x' * size
+
+
+class FakeHTTPClient:
+    """Stands in for the shared client; each GET sleeps then returns size bytes"""
+
+    def __init__(self, delay=0.05, size=1024):
+        self.delay = delay
+        self.size = size
+
+    async def get(self, url, timeout=30):
+        await asyncio.sleep(self.delay)
+        return FakeResponse(self.size)
+
+    def get_stats(self):
+        return {'requests': 0}
+
+
+class SleepyCollector(BaseCollector):
+    """Collector whose fetch makes `requests` downloads and sleeps `delay` seconds"""
+
+    def __init__(self, name, output_file, delay=0.0, requests=1, timeout=5):
+        self.timeout_seconds = timeout
+        self.delay = delay
+        self.requests = requests
+        super().__init__(name=name, output_file=output_file, update_interval_minutes=5)
+
+    def create_empty_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=['settlementdate', 'value'])
+
+    def get_required_columns(self) -> List[str]:
+        return ['settlementdate', 'value']
+
+    async def fetch_latest_data(self) -> Optional[pd.DataFrame]:
+        for _ in range(self.requests):
+            await self.http_get(f"http://nemweb.test/{self.name}")
+        await asyncio.sleep(self.delay)
+        return pd.DataFrame({'settlementdate': [pd.Timestamp('2025-08-20 10:00')], 'value': [1.0]})
+
+    def is_new_data(self, new_df: pd.DataFrame) -> bool:
+        return True
+
+    def sort_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.sort_values('settlementdate').reset_index(drop=True)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setenv('COLLECTOR_STORAGE_MODE', 'file')
+    monkeypatch.setenv('COLLECTOR_TAIL_HOURS', '0')
+    client = FakeHTTPClient()
+    monkeypatch.setattr(base_collector, 'get_http_client', lambda: client)
+    monkeypatch.setattr('aemo_data_service.service.get_http_client', lambda: client)
+
+    # Skip real collector construction and signal handlers
+    svc = AEMODataService.__new__(AEMODataService)
+    svc.is_running = False
+    svc.start_time = None
+    svc.collection_task = None
+    svc.cycle_count = 0
+    svc.last_cycle_time = None
+    svc.update_interval = 270
+    svc.collectors = {
+        'prices': SleepyCollector('prices', tmp_path / 'prices.parquet', delay=0.2),
+        'generation': SleepyCollector('generation', tmp_path / 'gen.parquet', delay=0.2, requests=3),
+        'rooftop': SleepyCollector('rooftop', tmp_path / 'rooftop.parquet', delay=10, timeout=0.5),
+    }
+    return svc
+
+
+def test_collectors_run_concurrently_and_slow_one_times_out(service):
+    start = time.monotonic()
+    results = asyncio.run(service._run_collection_cycle())
+    elapsed = time.monotonic() - start
+
+    assert results == {'prices': True, 'generation': True, 'rooftop': False}
+    # Bounded by the rooftop budget, not the sum of the collectors
+    assert elapsed < 1.5
+
+    rooftop = service.collectors['rooftop']
+    assert rooftop.metrics['timeouts'] == 1
+    assert rooftop.error_count == 1
+    assert service.collectors['prices'].output_file.exists()
+    assert not rooftop.output_file.exists()
+
+
+def test_status_reports_latency_and_bytes(service):
+    asyncio.run(service._run_collection_cycle())
+
+    status = service.get_status()
+    gen = status['collectors']['generation']
+
+    assert gen['timeout_seconds'] == 5
+    assert gen['metrics']['cycles'] == 1
+    assert gen['metrics']['last_requests'] == 3
+    assert gen['metrics']['last_bytes'] == 3 * 1024
+    assert gen['metrics']['total_bytes'] == 3 * 1024
+    assert gen['metrics']['last_duration_seconds'] >= 0.2
+    assert status['collectors']['rooftop']['metrics']['last_duration_seconds'] < 1.0
+    assert 'http' in status
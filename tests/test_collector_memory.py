@@ -0,0 +1,146 @@
+"""
+Tests for bounded in-memory collector state (COLLECTOR_TAIL_HOURS).
+
+Checks that a collector only loads the tail of its output file, that new
+rows are still appended to the full file on disk (once, and without growing
+the row group count per append), and that status counts come from parquet
+metadata rather than the in-memory tail.
+"""
+from typing import List, Optional
+
+import pandas as pd
+import pytest
+
+from aemo_data_service.collectors.base_collector import BaseCollector
+
+
+class ScadaCollector(BaseCollector):
+    """Minimal collector with the generation collector's schema"""
+
+    key_columns = ['settlementdate', 'duid']
+
+    def __init__(self, output_file):
+        super().__init__(name="Test SCADA", output_file=output_file, update_interval_minutes=5)
+
+    def create_empty_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=['settlementdate', 'duid', 'scadavalue'])
+
+    def get_required_columns(self) -> List[str]:
+        return ['settlementdate', 'duid', 'scadavalue']
+
+    async def fetch_latest_data(self) -> Optional[pd.DataFrame]:
+        return None
+
+    def is_new_data(self, new_df: pd.DataFrame) -> bool:
+        return self.data.empty or new_df['settlementdate'].max() > self.data['settlementdate'].max()
+
+    def merge_data(self, existing: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        newer = new[new['settlementdate'] > existing['settlementdate'].max()]
+        return pd.concat([existing, newer], ignore_index=True)
+
+    def sort_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.sort_values(['settlementdate', 'duid']).reset_index(drop=True)
+
+
+def scada_rows(start, periods, duids=('BW01', 'ER01')):
+    times = pd.date_range(start, periods=periods, freq='5min')
+    return pd.DataFrame([
+        {'settlementdate': t, 'duid': duid, 'scadavalue': float(i)}
+        for i, t in enumerate(times)
+        for duid in duids
+    ])
+
+
+@pytest.fixture
+def output_file(tmp_path, monkeypatch):
+    monkeypatch.setenv('COLLECTOR_STORAGE_MODE', 'file')
+    monkeypatch.setenv('COLLECTOR_TAIL_HOURS', '1')
+    path = tmp_path / 'scada5.parquet'
+    # Two days of history, 576 intervals x 2 DUIDs
+    scada_rows('2025-08-19 00:00', 576).to_parquet(path, index=False)
+    return path
+
+
+def test_only_tail_loaded(output_file):
+    collector = ScadaCollector(output_file)
+
+    times = collector.data['settlementdate']
+    assert times.max() == pd.Timestamp('2025-08-20 23:55')
+    assert times.min() == pd.Timestamp('2025-08-20 22:55')
+    assert len(collector.data) == 13 * 2
+    assert collector.watermark.to_dict() == {
+        'BW01': pd.Timestamp('2025-08-20 23:55'),
+        'ER01': pd.Timestamp('2025-08-20 23:55'),
+    }
+
+
+def test_new_rows_appended_to_full_file(output_file):
+    collector = ScadaCollector(output_file)
+
+    # Overlaps the last interval on disk plus two new ones
+    assert collector.add_new_data(scada_rows('2025-08-20 23:55', 3))
+
+    on_disk = pd.read_parquet(output_file)
+    assert len(on_disk) == 576 * 2 + 4
+    assert not on_disk.duplicated(['settlementdate', 'duid']).any()
+    assert collector.data['settlementdate'].max() == pd.Timestamp('2025-08-21 00:05')
+    assert collector.data['settlementdate'].min() == pd.Timestamp('2025-08-20 23:05')
+
+    # Same fetch again adds nothing
+    assert not collector.add_new_data(scada_rows('2025-08-20 23:55', 3))
+    assert len(pd.read_parquet(output_file)) == 576 * 2 + 4
+
+
+def test_status_reads_parquet_metadata(output_file):
+    collector = ScadaCollector(output_file)
+    collector.add_new_data(scada_rows('2025-08-21 00:00', 1))
+
+    status = collector.get_status()
+
+    assert status['total_records'] == 576 * 2 + 2
+    assert status['records_in_memory'] == len(collector.data)
+    assert status['date_range']['start'] == '2025-08-19T00:00:00'
+    assert status['date_range']['end'] == '2025-08-21T00:00:00'
+    assert status['watermark'] == {'latest': '2025-08-21T00:00:00', 'keys': 2}
+
+
+def test_full_history_kept_without_tail(output_file, monkeypatch):
+    monkeypatch.setenv('COLLECTOR_TAIL_HOURS', '0')
+    collector = ScadaCollector(output_file)
+
+    assert len(collector.data) == 576 * 2
+    assert collector.add_new_data(scada_rows('2025-08-21 00:00', 1))
+    assert len(collector.data) == 576 * 2 + 2
+
+
+def test_rows_older_than_tail_not_appended_again(output_file, monkeypatch):
+    # The default merge keeps every row it has not seen in the tail
+    monkeypatch.setattr(ScadaCollector, 'merge_data', BaseCollector.merge_data)
+    collector = ScadaCollector(output_file)
+    # A re-fetch reaching back past the in-memory tail, plus one new interval
+    refetch = scada_rows('2025-08-20 12:00', 145)
+
+    assert collector.add_new_data(refetch)
+
+    on_disk = pd.read_parquet(output_file)
+    assert len(on_disk) == 576 * 2 + 2
+    assert not on_disk.duplicated(['settlementdate', 'duid']).any()
+
+
+def test_appends_merge_small_row_groups(output_file, monkeypatch):
+    import pyarrow.parquet as pq
+
+    monkeypatch.setattr(ScadaCollector, 'file_row_group_size', 100)
+    collector = ScadaCollector(output_file)
+    for i in range(60):
+        start = pd.Timestamp('2025-08-21 00:00') + pd.Timedelta(minutes=5 * i)
+        assert collector.add_new_data(scada_rows(start, 1))
+
+    metadata = pq.read_metadata(output_file)
+    assert metadata.num_rows == 576 * 2 + 60 * 2
+    # The original group, then the 120 appended rows as 100 + 20 rather
+    # than one group per append
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [1152, 100, 20]
+    on_disk = pd.read_parquet(output_file)
+    assert on_disk['settlementdate'].is_monotonic_increasing
+    assert not on_disk.duplicated(['settlementdate', 'duid']).any()
@@ -0,0 +1,179 @@
+"""
+Tests for data-version tracking and version-keyed query caching.
+"""
+import math
+import os
+
+import pandas as pd
+import pytest
+
+from aemo_dashboard.shared.data_version import (
+    BACKFILL_MANIFEST,
+    HISTORICAL,
+    DataVersionTracker,
+    is_historical,
+    publish_data_version,
+)
+from aemo_dashboard.shared.hybrid_query_manager import HybridQueryManager, SmartCache
+
+
+class FakeLatest:
+    """Stands in for the DuckDB MAX(settlementdate) lookup."""
+
+    def __init__(self, **latest):
+        self.latest = {k: pd.Timestamp(v) for k, v in latest.items()}
+        self.calls = 0
+
+    def __call__(self, tables):
+        self.calls += 1
+        return {t: self.latest.get(t) for t in tables}
+
+
+def test_published_versions_take_precedence(tmp_path):
+    version_file = tmp_path / 'data_versions.json'
+    publish_data_version('generation', pd.Timestamp('2025-08-20 18:10'), version_file)
+    publish_data_version('prices', pd.Timestamp('2025-08-20 18:05'), version_file)
+    query = FakeLatest(generation='2025-01-01', rooftop='2025-08-20 18:00')
+
+    tracker = DataVersionTracker(version_file, query, poll_seconds=0)
+
+    assert tracker.get('generation') == pd.Timestamp('2025-08-20 18:10')
+    assert tracker.get('prices') == pd.Timestamp('2025-08-20 18:05')
+    # Unpublished tables fall back to the query
+    assert tracker.get('rooftop') == pd.Timestamp('2025-08-20 18:00')
+
+
+def test_token_marks_closed_windows_historical(tmp_path):
+    query = FakeLatest(generation='2025-08-20 18:10', prices='2025-08-20 18:05')
+    tracker = DataVersionTracker(query_latest=query, poll_seconds=60)
+
+    assert tracker.token(['generation', 'prices'], pd.Timestamp('2025-08-19')) == HISTORICAL
+    live = tracker.token(['generation', 'prices'], pd.Timestamp('2025-08-20 18:30'))
+    assert live != HISTORICAL
+
+    # A new interval changes the live token once the poll interval is over
+    query.latest['generation'] = pd.Timestamp('2025-08-20 18:15')
+    assert tracker.token(['generation', 'prices'], pd.Timestamp('2025-08-20 18:30')) == live
+    tracker.invalidate()
+    assert tracker.token(['generation', 'prices'], pd.Timestamp('2025-08-20 18:30')) != live
+
+
+def test_versions_are_reused_within_poll_interval():
+    query = FakeLatest(generation='2025-08-20 18:10')
+    tracker = DataVersionTracker(query_latest=query, poll_seconds=60)
+
+    for _ in range(5):
+        tracker.get('generation')
+
+    assert query.calls == 1
+
+
+def test_unknown_version_has_no_token():
+    tracker = DataVersionTracker(query_latest=FakeLatest(), poll_seconds=0)
+
+    assert tracker.token(['generation'], pd.Timestamp('2025-08-20')) is None
+
+
+def touch(path, when):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'x')
+    os.utime(path, ns=(when, when))
+
+
+@pytest.mark.parametrize('layout', ['file', 'partitioned'])
+def test_historical_token_changes_with_backfilled_history(tmp_path, layout):
+    output = tmp_path / 'scada5.parquet'
+    touch(output, 1)
+    if layout == 'partitioned':
+        for day in ('2025-08-18', '2025-08-19', '2025-08-20'):
+            touch(output.with_suffix('') / f'{day}.parquet', 1)
+    tracker = DataVersionTracker(query_latest=FakeLatest(generation='2025-08-20 18:10'),
+                                 poll_seconds=0, history_files={'generation': [output]})
+    hist = pd.Timestamp('2025-08-19')
+
+    first = tracker.token(['generation'], hist)
+    assert is_historical(first) and first != HISTORICAL
+
+    # Live appends: the file, or the newest partition and its WAL
+    touch(output, 2)
+    if layout == 'partitioned':
+        touch(output.with_suffix('') / '2025-08-20.parquet', 2)
+        touch(output.with_suffix('') / '_wal.parquet', 2)
+    assert tracker.token(['generation'], hist) == first
+
+    # A backfill saves its manifest when done
+    if layout == 'partitioned':
+        touch(output.with_suffix('') / '2025-08-18.parquet', 3)
+        assert tracker.token(['generation'], hist) != first
+        manifest = output.with_suffix('') / BACKFILL_MANIFEST
+    else:
+        manifest = tmp_path / '.backfill' / 'scada5' / BACKFILL_MANIFEST
+    before = tracker.token(['generation'], hist)
+    touch(manifest, 4)
+    assert tracker.token(['generation'], hist) != before
+
+
+@pytest.fixture
+def manager():
+    m = HybridQueryManager.__new__(HybridQueryManager)
+    m.cache = SmartCache(max_size_mb=10, default_ttl=300)
+    m.versions = DataVersionTracker(
+        query_latest=FakeLatest(generation='2025-08-20 18:10', prices='2025-08-20 18:10'),
+        poll_seconds=0,
+    )
+    return m
+
+
+def test_versioned_key_for_historical_and_live_windows(manager, tmp_path):
+    hist_key, hist_ttl = manager.versioned_cache_key('q', pd.Timestamp('2025-08-01'))
+    live_key, live_ttl = manager.versioned_cache_key('q', pd.Timestamp('2025-08-21'))
+
+    assert hist_key == f'q|v={HISTORICAL}'
+    assert hist_ttl == math.inf
+    manager.versions.history_files = {'generation': [tmp_path / 'scada5.parquet']}
+    stamped_key, stamped_ttl = manager.versioned_cache_key('q', pd.Timestamp('2025-08-01'))
+    assert stamped_key.startswith(f'q|v={HISTORICAL}@')
+    assert stamped_ttl == math.inf
+    manager.versions.history_files = {}
+    assert live_key != hist_key
+    assert live_ttl is None
+
+    manager.versions.query_latest.latest['generation'] = pd.Timestamp('2025-08-20 18:15')
+    assert manager.versioned_cache_key('q', pd.Timestamp('2025-08-21'))[0] != live_key
+    assert manager.versioned_cache_key('q', pd.Timestamp('2025-08-01'))[0] == hist_key
+
+
+def test_entry_without_expiry_outlives_default_ttl(monkeypatch):
+    cache = SmartCache(max_size_mb=10, default_ttl=300)
+    frame = pd.DataFrame({'value': [1.0, 2.0]})
+    cache.put('hist', frame, ttl=math.inf)
+    cache.put('live', frame)
+
+    import aemo_dashboard.shared.hybrid_query_manager as hqm
+    later = hqm.time.time() + 3600
+    monkeypatch.setattr(hqm.time, 'time', lambda: later)
+
+    assert cache.get('hist') is not None
+    assert cache.get('live') is None
+
+
+def test_group_aggregates_follow_price_updates(manager):
+    import duckdb
+
+    manager.conn = duckdb.connect(':memory:')
+    manager.conn.execute("""
+        CREATE VIEW integrated_data_30min AS
+        SELECT TIMESTAMP '2025-08-20 18:00' AS settlementdate, 'Coal' AS fuel_type,
+               100.0 AS scadavalue, 50.0 AS rrp
+    """)
+    manager._query_count = 0
+    args = (pd.Timestamp('2025-08-20'), pd.Timestamp('2025-08-21'), ['fuel_type'], {'rrp': 'AVG'})
+
+    manager.aggregate_by_group(*args)
+    manager.aggregate_by_group(*args)
+    assert manager._query_count == 1
+
+    # The integrated view joins prices, so a price update recomputes it
+    manager.versions.query_latest.latest['prices'] = pd.Timestamp('2025-08-20 18:15')
+    manager.aggregate_by_group(*args)
+    assert manager._query_count == 2
@@ -0,0 +1,130 @@
+"""
+Tests for the per-cycle data snapshot shared by the generation-tab charts.
+
+Every chart builder in one update_plot() call must read the same datasets,
+fetched once, and the processed region frame must be computed once.
+"""
+from collections import Counter
+
+import pandas as pd
+import param
+import pytest
+
+from aemo_dashboard.generation.gen_dash import EnergyDashboard
+
+TIMES = pd.date_range('2025-08-20', periods=3, freq='5min')
+
+
+@pytest.fixture
+def dashboard():
+    # Skip EnergyDashboard.__init__, which loads DUID mappings and data files
+    d = EnergyDashboard.__new__(EnergyDashboard)
+    param.Parameterized.__init__(d, region='NSW1')
+    d.gen_output_df = None
+    d.transmission_df = None
+    d.rooftop_df = None
+    d._using_aggregated_data = False
+    d._shared_refresh_payload = None
+    d._cycle_cache = None
+    d.last_cycle_timings = {}
+    for pane in ('plot_pane', 'utilization_pane', 'transmission_pane',
+                 'generation_tod_pane', 'summary_table_pane', 'header_section'):
+        setattr(d, pane, None)
+
+    d.calls = Counter()
+
+    def query(name, result):
+        def run(*args):
+            d.calls[name] += 1
+            return result
+        return run
+
+    generation = pd.DataFrame({'settlementdate': TIMES, 'region': 'NSW1', 'Coal': 1.0})
+    d._query_generation_data = query('generation', (generation, False))
+    d._query_price_data = query('prices', pd.DataFrame({'settlementdate': TIMES, 'RRP': 50.0}))
+    d._query_transmission_data = query('transmission', pd.DataFrame({'settlementdate': TIMES}))
+    d._query_rooftop_data = query('rooftop', pd.DataFrame({'settlementdate': TIMES}))
+
+    def process():
+        d.calls['process'] += 1
+        d.load_transmission_data()
+        d.load_rooftop_solar_data()
+        return EnergyDashboard._fuel_pivot(d.gen_output_df, d.region)
+    d._process_data_for_region = process
+
+    def chart():
+        # Mirrors what the real chart builders load
+        d.load_generation_data()
+        data = d.process_data_for_region()
+        data['Coal'] = 0.0  # callers may modify their copy
+        d.load_price_data()
+        return data
+    d.create_plot = d.create_utilization_plot = chart
+    d.create_transmission_plot = d.create_generation_tod_plot = chart
+    return d
+
+
+def test_update_plot_fetches_each_dataset_once(dashboard):
+    dashboard.update_plot()
+
+    assert dashboard.calls == Counter(generation=1, prices=1, transmission=1,
+                                      rooftop=1, process=1)
+    assert {'snapshot', 'generation', 'utilization', 'transmission',
+            'time_of_day'} <= set(dashboard.last_cycle_timings)
+    # The snapshot and memo only live for the cycle
+    assert dashboard._shared_refresh_payload is None
+    assert dashboard._cycle_cache is None
+
+
+def test_cycle_memo_returns_independent_copies(dashboard):
+    dashboard.load_generation_data()
+    dashboard._cycle_cache = {}
+
+    first = dashboard.process_data_for_region()
+    first['Coal'] = 0.0
+
+    assert (dashboard.process_data_for_region()['Coal'] == 1.0).all()
+    assert dashboard.calls['process'] == 1
+
+
+def test_engine_payload_is_reused_and_kept(dashboard):
+    payload = dashboard.fetch_refresh_payload(dashboard.refresh_key())
+    dashboard.calls.clear()
+    dashboard._shared_refresh_payload = payload
+
+    dashboard.update_plot()
+
+    assert dashboard.calls == Counter(process=1)
+    # apply_refresh_payload() owns and clears an engine payload
+    assert dashboard._shared_refresh_payload is payload
+
+
+def test_snapshot_threads_query_through_their_own_cursors(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    import duckdb
+
+    from data_service.shared_data_duckdb import duckdb_data_service
+
+    root = duckdb.connect(':memory:')
+    root.execute("CREATE TABLE readings AS SELECT range AS id FROM range(20000)")
+    monkeypatch.setattr(duckdb_data_service, '_conn', root)
+    monkeypatch.setattr(duckdb_data_service, '_local', threading.local())
+
+    def fetch(n):
+        conn = duckdb_data_service.conn
+        assert conn is duckdb_data_service.conn
+        df = conn.execute("SELECT id FROM readings WHERE id < ? ORDER BY id", [n]).df()
+        return (threading.get_ident(), id(conn)), df['id'].tolist()
+
+    sizes = [100 + i * 37 for i in range(64)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(fetch, sizes))
+
+    assert [rows for _, rows in results] == [list(range(n)) for n in sizes]
+    # One cursor per thread, never shared between threads
+    cursors = dict(key for key, _ in results)
+    assert len(set(key for key, _ in results)) == len(cursors)
+    assert len(set(cursors.values())) == len(cursors)
+    root.close()
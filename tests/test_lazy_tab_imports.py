@@ -0,0 +1,59 @@
+"""
+Tab modules other than Today must not be imported with the dashboard.
+
+Each is imported by its EnergyDashboard._create_*_tab method when the tab is
+first opened. Runs in a fresh interpreter so modules imported by other tests
+don't count.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / 'src'
+
+LAZY_MODULES = [
+    'aemo_dashboard.analysis.price_analysis_ui',
+    'aemo_dashboard.station.station_analysis_ui',
+    'aemo_dashboard.curtailment',
+    'aemo_dashboard.gas',
+    'aemo_dashboard.prices.prices_tab',
+    'aemo_dashboard.penetration',
+    'aemo_dashboard.insights',
+    'aemo_dashboard.futures',
+    'aemo_dashboard.evening_peak',
+    'scipy.ndimage',
+]
+
+
+def test_dashboard_import_leaves_tab_modules_unloaded():
+    script = (
+        "import json, sys\n"
+        "import aemo_dashboard.generation.gen_dash\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    proc = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                          env=env, timeout=300)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert json.loads(proc.stdout.strip().splitlines()[-1]) == []
+
+
+def test_precompute_store_and_warming_default_leave_tab_modules_unloaded():
+    script = (
+        "import json, sys\n"
+        "from aemo_dashboard.generation import gen_dash\n"
+        "from aemo_dashboard.shared.precompute import get_precompute_store\n"
+        "from aemo_dashboard.shared.tab_datasets import TAB_DATASETS\n"
+        "store = get_precompute_store()\n"
+        "assert all(store._dataset(name) for name in TAB_DATASETS)\n"
+        "assert not gen_dash.PRECOMPUTE_WARM\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))\n"
+    )
+    env = {k: v for k, v in os.environ.items() if k != 'PRECOMPUTE_WARM'}
+    env['PYTHONPATH'] = str(SRC)
+    proc = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                          env=env, timeout=300)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert json.loads(proc.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,109 @@
+"""
+Tests for the streaming MMS CSV parser.
+
+Uses the bundled PUBLIC_DISPATCHIS sample plus small synthetic files covering
+the legacy DREGION layout, chunk boundaries and comment rows.
+"""
+import io
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from aemo_data_service.shared.mms_parser import (
+    DISPATCH_INTERCONNECTORRES,
+    DISPATCH_PRICE,
+    DREGION,
+    iter_mms_tables,
+    read_mms_csv,
+    read_mms_zip,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_CSV = next(REPO_ROOT.glob('PUBLIC_DISPATCHIS_*.CSV'), None)
+SAMPLE_ZIP = REPO_ROOT / 'dispatchis_sample.zip'
+
+CONSTRAINT = ('DISPATCH', 'CONSTRAINT')
+
+LEGACY_DISPATCH = b"""C,NEMP.WORLD,DISPATCH,AEMO,PUBLIC,2025/08/20,18:05:13
+I,DREGION,,3,SETTLEMENTDATE,RUNNO,REGIONID,INTERVENTION,RRP,EEP
+D,DREGION,,3,"2025/08/20 18:10:00",1,NSW1,0,242.65,0
+D,DREGION,,3,"2025/08/20 18:10:00",1,VIC1,0,220.27,0
+I,DUNIT,,3,SETTLEMENTDATE,RUNNO,DUID,INTERVENTION,TOTALCLEARED
+D,DUNIT,,3,"2025/08/20 18:10:00",1,BW01,0,600
+C,"END OF REPORT",6
+"""
+
+needs_sample = pytest.mark.skipif(SAMPLE_CSV is None, reason="PUBLIC_DISPATCHIS sample not present")
+
+
+@needs_sample
+def test_selected_tables_are_typed():
+    tables = read_mms_csv(SAMPLE_CSV, [DISPATCH_PRICE, DISPATCH_INTERCONNECTORRES])
+
+    prices = tables[DISPATCH_PRICE]
+    assert len(prices) == 5
+    assert set(prices['REGIONID']) == {'NSW1', 'QLD1', 'SA1', 'TAS1', 'VIC1'}
+    assert prices['SETTLEMENTDATE'].dtype == 'datetime64[ns]'
+    assert prices['SETTLEMENTDATE'].iloc[0] == pd.Timestamp('2025-08-20 18:10:00')
+    assert prices['RRP'].dtype == 'float64'
+
+    flows = tables[DISPATCH_INTERCONNECTORRES]
+    assert len(flows) == 6
+    assert {'METEREDMWFLOW', 'EXPORTLIMIT', 'IMPORTLIMIT'} <= set(flows.columns)
+
+
+@needs_sample
+def test_small_chunks_match_single_read():
+    whole = read_mms_csv(SAMPLE_CSV, [CONSTRAINT])[CONSTRAINT]
+    chunked = read_mms_csv(SAMPLE_CSV, [CONSTRAINT], chunk_size=4096)[CONSTRAINT]
+
+    assert len(whole) == 862
+    pd.testing.assert_frame_equal(whole, chunked, check_dtype=False)
+
+
+@needs_sample
+def test_zip_matches_csv():
+    if not SAMPLE_ZIP.exists():
+        pytest.skip("dispatchis_sample.zip not present")
+    from_csv = read_mms_csv(SAMPLE_CSV, [DISPATCH_PRICE])[DISPATCH_PRICE]
+    from_zip = read_mms_zip(SAMPLE_ZIP.read_bytes(), [DISPATCH_PRICE])[DISPATCH_PRICE]
+
+    pd.testing.assert_frame_equal(from_csv, from_zip)
+
+
+def test_empty_subreport_and_comment_rows():
+    tables = read_mms_csv(LEGACY_DISPATCH, [DREGION], lowercase=True)
+
+    dregion = tables[DREGION]
+    assert list(dregion['regionid']) == ['NSW1', 'VIC1']
+    assert list(dregion['rrp']) == [242.65, 220.27]
+    assert 'eep' in dregion.columns
+
+
+def test_missing_table_returns_empty_frame():
+    tables = read_mms_csv(LEGACY_DISPATCH, [('DISPATCH', 'UNIT_SCADA')])
+
+    assert tables[('DISPATCH', 'UNIT_SCADA')].empty
+
+
+def test_iter_yields_pieces_across_chunks():
+    pieces = list(iter_mms_tables(io.BytesIO(LEGACY_DISPATCH), [DREGION], chunk_size=64))
+
+    assert all(key == DREGION for key, _ in pieces)
+    assert sum(piece.num_rows for _, piece in pieces) == 2
+
+
+def test_zip_members_filtered_and_combined():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr('PUBLIC_DISPATCH_1.CSV', LEGACY_DISPATCH)
+        zf.writestr('PUBLIC_DISPATCH_2.CSV', LEGACY_DISPATCH)
+        zf.writestr('README.txt', b'not a csv')
+
+    both = read_mms_zip(buffer.getvalue(), [DREGION])[DREGION]
+    one = read_mms_zip(buffer.getvalue(), [DREGION], member_pattern=r'_1\.CSV$')[DREGION]
+
+    assert len(both) == 4
+    assert len(one) == 2
@@ -0,0 +1,205 @@
+"""
+Tests for partitioned append-only collector storage.
+
+Checks that appends only dedupe against their own partition, that the
+write-ahead segment is compacted when the day rolls over, that DuckDB sees
+every row through one glob, and that legacy single files migrate cleanly.
+"""
+import json
+import os
+
+import duckdb
+import pandas as pd
+import pytest
+
+from aemo_data_service.shared import partitioned_storage
+from aemo_data_service.shared.partitioned_storage import (
+    JOURNAL_FILENAME,
+    PartitionedParquetStore,
+    partition_dir_for,
+)
+from data_service.shared_data_duckdb import parquet_source
+
+
+def scada_rows(start, periods, duids=('BW01', 'ER01')):
+    """Five-minute SCADA rows for a few DUIDs"""
+    times = pd.date_range(start, periods=periods, freq='5min')
+    return pd.DataFrame([
+        {'settlementdate': t, 'duid': duid, 'scadavalue': float(i)}
+        for i, t in enumerate(times)
+        for duid in duids
+    ])
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PartitionedParquetStore(
+        tmp_path / 'scada5',
+        key_columns=['settlementdate', 'duid'],
+        partition='day',
+    )
+
+
+def test_append_skips_rows_already_in_partition(store):
+    first = scada_rows('2025-08-20 10:00', 3)
+    assert store.append(first) == 6
+
+    # Overlapping fetch: two known intervals plus one new one
+    second = scada_rows('2025-08-20 10:05', 3)
+    assert store.append(second) == 2
+
+    data = store.read_all()
+    assert len(data) == 8
+    assert not data.duplicated(['settlementdate', 'duid']).any()
+
+
+def test_rollover_compacts_closed_partition(store):
+    store.append(scada_rows('2025-08-20 23:50', 2))
+    assert store.partition_files() == []
+
+    store.append(scada_rows('2025-08-21 00:00', 2))
+
+    assert [p.name for p in store.partition_files()] == ['2025-08-20.parquet']
+    # Newest partition stays in the write-ahead segment
+    wal = store.read_wal()
+    assert set(store.partition_keys(wal['settlementdate'])) == {'2025-08-21'}
+    assert len(store.read_latest_partition()) == 4
+
+
+def test_wal_compacts_at_row_limit(tmp_path):
+    store = PartitionedParquetStore(
+        tmp_path / 'scada5', key_columns=['settlementdate', 'duid'], wal_max_rows=10
+    )
+    store.append(scada_rows('2025-08-20 10:00', 6))
+
+    assert store.wal_segments() == []
+    assert len(store.read_partition('2025-08-20', include_wal=False)) == 12
+
+
+def test_duckdb_glob_sees_compacted_and_pending_rows(store, tmp_path):
+    output_file = tmp_path / 'scada5.parquet'
+    assert partition_dir_for(output_file) == store.root
+
+    store.append(scada_rows('2025-08-20 23:50', 2))
+    store.append(scada_rows('2025-08-21 00:00', 2))
+
+    source = parquet_source(output_file)
+    assert '*.parquet' in source
+    count = duckdb.connect().execute(f"SELECT COUNT(*) FROM {source}").fetchone()[0]
+    assert count == 8
+
+
+def test_parquet_source_falls_back_to_single_file(tmp_path):
+    output_file = tmp_path / 'prices5.parquet'
+    assert parquet_source(output_file) == f"read_parquet('{output_file}')"
+
+
+def test_import_file_splits_legacy_file(store, tmp_path):
+    legacy = tmp_path / 'legacy.parquet'
+    scada_rows('2025-08-19 23:00', 30).to_parquet(legacy, index=False)
+
+    imported = store.import_file(legacy, batch_size=7)
+
+    assert imported == 60
+    assert [p.stem for p in store.partition_files()] == ['2025-08-19', '2025-08-20']
+    assert len(store.read_all()) == 60
+
+
+def test_get_stats_reads_metadata(store):
+    store.append(scada_rows('2025-08-20 23:50', 2))
+    store.append(scada_rows('2025-08-21 00:00', 3))
+
+    stats = store.get_stats()
+
+    assert stats['partitions'] == 1
+    assert stats['first_partition'] == '2025-08-20'
+    assert stats['wal_rows'] == 6
+    assert stats['total_records'] == 10
+    assert stats['last_modified'] is not None
+    assert len(store.wal_segments()) == 1
+
+
+def test_appends_write_only_their_rows_to_new_segments(store, monkeypatch):
+    written = []
+    write = PartitionedParquetStore._write_atomic
+    monkeypatch.setattr(PartitionedParquetStore, '_write_atomic',
+                        staticmethod(lambda df, path: (written.append(len(df)), write(df, path))))
+
+    for i in range(5):
+        store.append(scada_rows(pd.Timestamp('2025-08-20 10:00') + pd.Timedelta(minutes=5 * i), 1))
+
+    assert written == [2] * 5
+    assert [p.name for p in store.wal_segments()] == [f'_wal-00000{i}.parquet' for i in range(1, 6)]
+    assert len(store.read_wal()) == 10
+
+
+def test_segments_consolidate_past_the_file_limit(tmp_path):
+    store = PartitionedParquetStore(tmp_path / 'scada5', key_columns=['settlementdate', 'duid'],
+                                    wal_max_segments=3)
+    for i in range(4):
+        store.append(scada_rows(pd.Timestamp('2025-08-20 10:00') + pd.Timedelta(minutes=5 * i), 1))
+
+    assert [p.name for p in store.wal_segments()] == ['_wal-000005.parquet']
+    assert len(store.read_all()) == 8
+
+
+def test_legacy_wal_file_is_read_and_compacted(store):
+    scada_rows('2025-08-20 23:50', 2).to_parquet(store.root / '_wal.parquet', index=False)
+
+    # 23:55 is already in the old file; 00:00 rolls the day over
+    assert store.append(scada_rows('2025-08-20 23:55', 2)) == 2
+
+    assert not (store.root / '_wal.parquet').exists()
+    assert len(store.read_partition('2025-08-20', include_wal=False)) == 4
+    assert len(store.read_all()) == 6
+
+
+def glob_count(store):
+    try:
+        return duckdb.connect().execute(
+            f"SELECT COUNT(*) FROM read_parquet('{store.glob_pattern}', union_by_name=true)").fetchone()[0]
+    except duckdb.IOException:
+        # Between removing the segments and promoting the first partition
+        return 0
+
+
+def test_compaction_never_shows_rows_twice(store, monkeypatch):
+    store.append(scada_rows('2025-08-20 23:45', 3))
+    counts = []
+    replace = os.replace
+    unlink = partitioned_storage.Path.unlink
+
+    # Count what a glob reader sees after every file operation of the compaction
+    def watch_replace(src, dst):
+        replace(src, dst)
+        counts.append(glob_count(store))
+
+    def watch_unlink(path, missing_ok=False):
+        unlink(path, missing_ok=missing_ok)
+        counts.append(glob_count(store))
+
+    monkeypatch.setattr(partitioned_storage.os, 'replace', watch_replace)
+    monkeypatch.setattr(partitioned_storage.Path, 'unlink', watch_unlink)
+    store.append(scada_rows('2025-08-21 00:00', 1))
+
+    assert counts and max(counts) <= 8
+    assert counts[-1] == 8
+
+
+def test_interrupted_compaction_finishes_on_open(store, monkeypatch):
+    store.append(scada_rows('2025-08-20 23:45', 3))
+
+    def crash(journal):
+        raise RuntimeError('killed after commit')
+
+    monkeypatch.setattr(store, '_apply', crash)
+    with pytest.raises(RuntimeError):
+        store.append(scada_rows('2025-08-21 00:00', 1))
+    assert json.loads((store.root / JOURNAL_FILENAME).read_text())['promote']
+
+    reopened = PartitionedParquetStore(store.root, key_columns=['settlementdate', 'duid'])
+    assert not (reopened.root / JOURNAL_FILENAME).exists()
+    assert [p.name for p in reopened.partition_files()] == ['2025-08-20.parquet']
+    data = reopened.read_all()
+    assert len(data) == 8
+    assert not data.duplicated(['settlementdate', 'duid']).any()
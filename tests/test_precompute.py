@@ -0,0 +1,207 @@
+"""
+Tests for the process-wide precompute store (aemo_dashboard.shared.precompute).
+"""
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from aemo_dashboard.shared.data_version import DataVersionTracker
+from aemo_dashboard.shared.precompute import PrecomputeStore
+
+
+class FakeLatest:
+    """Stands in for the DuckDB MAX(settlementdate) lookup."""
+
+    def __init__(self, **latest):
+        self.latest = {k: pd.Timestamp(v) for k, v in latest.items()}
+
+    def __call__(self, tables):
+        return {t: self.latest.get(t) for t in tables}
+
+
+class CountingBuilder:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, **params):
+        self.calls.append(params)
+        self.release.wait(5)
+        time.sleep(self.delay)
+        return {'build': len(self.calls), **params}
+
+
+@pytest.fixture
+def latest():
+    return FakeLatest(generation='2025-08-20 18:10', prices='2025-08-20 18:05')
+
+
+@pytest.fixture
+def store(latest):
+    return PrecomputeStore(DataVersionTracker(query_latest=latest, poll_seconds=0))
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_built_once_per_parameters_and_version(store):
+    builder = CountingBuilder()
+    store.register('gen', builder, tables=('generation',))
+
+    first = store.get('gen', region='NSW1', years=[2024, 2025])
+    assert store.get('gen', region='NSW1', years=[2024, 2025]) is first
+    store.get('gen', region='VIC1', years=[2024, 2025])
+
+    assert builder.calls == [{'region': 'NSW1', 'years': [2024, 2025]},
+                             {'region': 'VIC1', 'years': [2024, 2025]}]
+    assert store.stats()['hits'] == 1
+    assert store.stats()['entries'] == 2
+
+
+def test_new_version_serves_stale_while_rebuilding(store, latest):
+    builder = CountingBuilder()
+    store.register('gen', builder, tables=('generation',))
+    first = store.get('gen')
+
+    latest.latest['generation'] = pd.Timestamp('2025-08-20 18:15')
+    builder.release.clear()
+    assert store.get('gen') is first
+    wait_for(lambda: len(builder.calls) == 2)
+    builder.release.set()
+
+    wait_for(lambda: store.get('gen')['build'] == 2)
+    assert len(builder.calls) == 2
+    assert store.stats()['stale'] >= 1
+
+
+def test_min_interval_keeps_result_across_versions(store, latest):
+    builder = CountingBuilder()
+    store.register('fuel', builder, tables=('prices',), min_interval=3600)
+    store.get('fuel', region='SA1')
+
+    latest.latest['prices'] = pd.Timestamp('2025-08-20 18:10')
+    assert store.get('fuel', region='SA1')['build'] == 1
+    assert store.refresh() == 0
+    assert len(builder.calls) == 1
+
+
+def test_unversioned_results_expire_on_ttl(store):
+    builder = CountingBuilder()
+    store.register('futures', builder, ttl=3600)
+    store.get('futures')
+    store.get('futures')
+    assert len(builder.calls) == 1
+
+    store.register('futures', builder, ttl=0)
+    store.get('futures')
+    wait_for(lambda: store.get('futures')['build'] == 2)
+
+
+def test_concurrent_first_requests_share_one_build(store):
+    builder = CountingBuilder(delay=0.2)
+    store.register('coal', builder, tables=('generation',))
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get('coal'))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(builder.calls) == 1
+    assert len(results) == 5 and all(r is results[0] for r in results)
+
+
+def test_builder_errors_reach_callers_and_are_retried(store):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError('database locked')
+        return 'ok'
+
+    store.register('gas', flaky)
+    with pytest.raises(RuntimeError, match='database locked'):
+        store.get('gas')
+    assert store.get('gas') == 'ok'
+    assert store.stats()['errors'] == 1
+
+
+def test_refresh_rebuilds_stale_and_drops_idle(store, latest):
+    builder = CountingBuilder()
+    store.register('gen', builder, tables=('generation',))
+    store.get('gen', region='NSW1')
+
+    latest.latest['generation'] = pd.Timestamp('2025-08-20 18:15')
+    assert store.refresh() == 1
+    wait_for(lambda: store.get('gen', region='NSW1')['build'] == 2)
+
+    store.idle_seconds = 0
+    time.sleep(0.01)
+    store.refresh()
+    assert store.stats()['entries'] == 0
+
+
+def test_warm_builds_in_background(store):
+    builder = CountingBuilder()
+    store.register('futures', builder)
+
+    assert store.warm('futures').result(5)['build'] == 1
+    assert store.get('futures')['build'] == 1
+    assert store.warm('futures').result(5)['build'] == 1
+    assert len(builder.calls) == 1
+
+
+def test_unknown_dataset():
+    with pytest.raises(KeyError):
+        PrecomputeStore().get('missing')
+
+
+def test_builder_path_imported_on_first_build(store, tmp_path, monkeypatch):
+    import sys
+
+    (tmp_path / 'lazy_tab_builder.py').write_text("def build(region):\n    return {'region': region}\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'lazy_tab_builder', raising=False)
+    store.register('lazy', 'lazy_tab_builder:build', tables=('prices',))
+
+    assert 'lazy_tab_builder' not in sys.modules
+    assert store.get('lazy', region='SA1') == {'region': 'SA1'}
+    assert 'lazy_tab_builder' in sys.modules
+
+
+def test_tab_datasets_build_on_worker_cursors(store, monkeypatch):
+    import duckdb
+
+    from aemo_dashboard.prices import fuel_relatives
+    from aemo_dashboard.shared.tab_datasets import TAB_DATASETS, register_tab_datasets
+    from data_service.shared_data_duckdb import duckdb_data_service
+
+    root = duckdb.connect(':memory:')
+    monkeypatch.setattr(duckdb_data_service, '_conn', root)
+    monkeypatch.setattr(duckdb_data_service, '_local', threading.local())
+    seen = []
+
+    def query(conn, region):
+        seen.append((conn, threading.current_thread().name))
+        return pd.DataFrame()
+
+    monkeypatch.setattr(fuel_relatives, 'query_fuel_relatives', query)
+    register_tab_datasets(store)
+    assert store._datasets.keys() == TAB_DATASETS.keys()
+
+    store.warm('prices.fuel_relatives', region='NSW1').result(5)
+
+    (conn, thread), = seen
+    assert thread.startswith('precompute')
+    assert conn is not duckdb_data_service.conn
+    root.close()
@@ -0,0 +1,133 @@
+"""
+Tests for the grouped price-band totals (aemo_dashboard.prices.bands).
+
+The prices tab's previous per-region, per-band mask loop is reproduced here
+and compared against the one-pass NumPy totals, and the DuckDB query against
+both.
+"""
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from aemo_dashboard.prices.bands import (
+    OUTSIDE, band_index, band_totals, band_totals_sql, bands_from_edges, summarise_bands,
+)
+from aemo_dashboard.prices.price_bands import PRICE_BANDS, compute_price_bands
+
+TAB_BANDS = [(low, high) for _, low, high in PRICE_BANDS]
+API_EDGES = [-1000.0, 0.0, 25.0, 50.0, 100.0, 200.0, 300.0, 500.0, 1000.0, 5000.0, 17500.0]
+
+
+def legacy_price_bands(df, regions):
+    """compute_price_bands' loop before the grouped totals"""
+    rows = []
+    for region in regions:
+        prices = df[df['REGIONID'] == region]['RRP']
+        if prices.empty:
+            continue
+        for name, low, high in PRICE_BANDS:
+            if low == -float('inf'):
+                mask = prices < high
+            elif high == float('inf'):
+                mask = prices >= low
+            else:
+                mask = (prices >= low) & (prices < high)
+            band = prices[mask]
+            if len(band) > 0:
+                rows.append({'Region': region, 'Price Band': name,
+                             'Contribution': len(band) / len(prices) * band.mean(),
+                             'Percentage': len(band) / len(prices) * 100,
+                             'Band Average': band.mean()})
+    return rows
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    n = 20000
+    rrp = rng.normal(90, 200, n)
+    # Band edges, the gap between $300 and $301 and the market limits
+    rrp[:8] = [-1000.0, 0.0, 300.0, 300.5, 301.0, 1000.0, 17500.0, -1100.0]
+    return pd.DataFrame({
+        'SETTLEMENTDATE': pd.date_range('2025-01-01', periods=n, freq='5min'),
+        'REGIONID': rng.choice(['NSW1', 'QLD1', 'SA1', 'TAS1', 'VIC1'], n),
+        'RRP': rrp,
+    })
+
+
+def test_band_index_edges_gaps_and_nan():
+    rrp = np.array([-5.0, 0.0, 299.99, 300.0, 300.5, 301.0, 999.0, 1000.0, 1e6, np.nan])
+    np.testing.assert_array_equal(band_index(rrp, TAB_BANDS),
+                                  [0, 1, 1, OUTSIDE, OUTSIDE, 2, 2, 3, 3, OUTSIDE])
+    edges = bands_from_edges([0.0, 50.0, 100.0])
+    np.testing.assert_array_equal(band_index([-1.0, 0.0, 50.0, 99.9, 100.0], edges),
+                                  [OUTSIDE, 0, 1, 1, OUTSIDE])
+
+
+def test_band_index_many_bands_matches_searchsorted():
+    edges = np.linspace(-1000, 17500, 40)
+    rrp = np.random.default_rng(1).normal(0, 3000, 5000)
+    expected = np.where((rrp >= edges[0]) & (rrp < edges[-1]),
+                        np.searchsorted(edges, rrp, side='right') - 1, OUTSIDE)
+    np.testing.assert_array_equal(band_index(rrp, bands_from_edges(edges)), expected)
+
+
+def test_compute_price_bands_matches_legacy_loop(prices):
+    regions = ['SA1', 'NSW1', 'VIC1']
+    contributions, bands_df = compute_price_bands(prices, regions)
+    expected = legacy_price_bands(prices, regions)
+
+    assert [(r['Region'], r['Price Band']) for r in contributions] == \
+        [(r['Region'], r['Price Band']) for r in expected]
+    for got, want in zip(contributions, expected):
+        for key in ('Contribution', 'Percentage', 'Band Average'):
+            assert got[key] == pytest.approx(want[key], rel=1e-12)
+    assert set(bands_df['Region']) == set(regions)
+
+
+def test_compute_price_bands_without_data(prices):
+    assert compute_price_bands(prices, ['XX1']) == ([], None)
+    assert compute_price_bands(prices.drop(columns='RRP'), ['NSW1']) == ([], None)
+
+
+def test_summary_grid_and_prices_outside_every_band(prices):
+    bands = bands_from_edges(API_EDGES)
+    summary = summarise_bands(band_totals(prices['REGIONID'], prices['RRP'], bands), bands)
+
+    assert len(summary) == 5 * len(bands)
+    # -1100 and 17500 (bands are half-open) fall outside every band: they
+    # count towards their region's total only
+    assert summary['count'].sum() == len(prices) - 2
+    by_region = summary.groupby('region')[['share']].sum()
+    assert (by_region['share'] <= 1.0 + 1e-12).all()
+    assert summary.loc[summary['count'] == 0, 'sum_rrp'].eq(0).all()
+
+
+def test_sql_totals_match_numpy(prices):
+    bands = bands_from_edges(API_EDGES)
+    regions = ['NSW1', 'SA1', 'TAS1']
+    con = duckdb.connect()
+    con.register('prices_df', prices.rename(columns=str.lower))
+    sql, params = band_totals_sql('prices_df', regions, bands)
+    params += [prices['SETTLEMENTDATE'].min(), prices['SETTLEMENTDATE'].max()]
+    from_sql = summarise_bands(con.execute(sql, params).fetchdf(), bands)
+
+    selected = prices[prices['REGIONID'].isin(regions)]
+    from_numpy = summarise_bands(band_totals(selected['REGIONID'], selected['RRP'], bands), bands)
+    pd.testing.assert_frame_equal(from_sql, from_numpy, check_exact=False, rtol=1e-9)
+
+
+def test_sql_totals_with_open_and_gapped_bands(prices):
+    con = duckdb.connect()
+    con.register('prices_df', prices.rename(columns=str.lower))
+    sql, params = band_totals_sql('prices_df', ['QLD1'], TAB_BANDS)
+    params += [prices['SETTLEMENTDATE'].min(), prices['SETTLEMENTDATE'].max()]
+    totals = con.execute(sql, params).fetchdf()
+
+    qld = prices[prices['REGIONID'] == 'QLD1']
+    expected = band_totals(qld['REGIONID'], qld['RRP'], TAB_BANDS)
+    merged = totals.merge(expected, on=['region', 'band'], suffixes=('_sql', '_np'))
+    assert len(merged) == len(expected) == len(totals)
+    np.testing.assert_array_equal(merged['count_sql'], merged['count_np'])
+    np.testing.assert_allclose(merged['sum_rrp_sql'], merged['sum_rrp_np'])
@@ -0,0 +1,146 @@
+"""
+Tests for HybridQueryManager result streaming.
+
+Runs against in-memory DuckDB connections (and one temporary database file
+for the external mode), so no data files are needed.
+"""
+import os
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from aemo_dashboard.shared.hybrid_query_manager import HybridQueryManager, SmartCache
+
+
+@pytest.fixture
+def manager():
+    conn = duckdb.connect(':memory:')
+    conn.execute("""
+        CREATE VIEW readings AS
+        SELECT range AS id, range * 0.5 AS value
+        FROM range(25000)
+    """)
+    m = HybridQueryManager.__new__(HybridQueryManager)
+    m.conn = conn
+    m.cache = SmartCache(max_size_mb=10)
+    m._query_count = 0
+    yield m
+    conn.close()
+
+
+def test_chunks_come_from_one_execution_in_order(manager):
+    chunks = list(manager.query_chunks("SELECT * FROM readings ORDER BY id", chunk_size=4096))
+
+    assert all(len(c) <= 4096 for c in chunks)
+    combined = pd.concat(chunks, ignore_index=True)
+    assert combined['id'].tolist() == list(range(25000))
+    # No paging clauses are added to the query text
+    assert len(chunks) >= 25000 // 4096
+
+
+def test_stream_arrow_batches_and_progress(manager):
+    seen = []
+    batches = list(manager.query_stream(
+        "SELECT * FROM readings WHERE id % 2 = 0",
+        batch_size=5000,
+        as_arrow=True,
+        progress_callback=seen.append,
+    ))
+
+    assert all(isinstance(b, pa.RecordBatch) for b in batches)
+    assert sum(b.num_rows for b in batches) == 12500
+    assert seen == sorted(seen)
+    assert seen[-1] == 12500
+
+
+def test_shared_connection_usable_while_streaming(manager):
+    stream = manager.query_chunks("SELECT * FROM readings ORDER BY id", chunk_size=1000)
+    first = next(stream)
+
+    # Another query on the shared connection does not invalidate the stream
+    assert manager.conn.execute("SELECT COUNT(*) FROM readings").fetchone()[0] == 25000
+
+    rest = pd.concat(list(stream), ignore_index=True)
+    assert len(first) + len(rest) == 25000
+
+
+def test_query_with_progress_reaches_100(manager):
+    progress = []
+    df = manager.query_with_progress("SELECT * FROM readings", chunk_size=3000,
+                                     progress_callback=progress.append)
+
+    assert len(df) == 25000
+    assert progress[-1] == 100
+    assert manager.query_with_progress("SELECT * FROM readings WHERE id < 0").empty
+
+
+def test_empty_result_keeps_columns(manager):
+    df = manager.query_with_progress("SELECT id, value FROM readings WHERE id < 0")
+    expected = manager.conn.execute("SELECT id, value FROM readings WHERE id < 0").df()
+
+    assert df.empty
+    assert list(df.columns) == ['id', 'value']
+    pd.testing.assert_series_equal(df.dtypes, expected.dtypes)
+
+    # With a progress callback (which counts rows first) too
+    df = manager.query_with_progress("SELECT id, value FROM readings WHERE id < 0",
+                                     progress_callback=lambda pct: None)
+    assert list(df.columns) == ['id', 'value']
+
+
+def test_sum_and_decimal_columns_match_df(manager):
+    query = """
+        SELECT id % 7 AS bucket,
+               SUM(id) AS total,
+               SUM(id::INTEGER) AS int_total,
+               CAST(AVG(value) AS DECIMAL(12, 3)) AS avg_value
+        FROM readings GROUP BY 1 ORDER BY 1
+    """
+    expected = manager.conn.execute(query).df()
+
+    for df in (manager.query_with_progress(query, chunk_size=3),
+               pd.concat(manager.query_chunks(query, chunk_size=3), ignore_index=True)):
+        pd.testing.assert_series_equal(df.dtypes, expected.dtypes)
+        pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.fixture
+def external_manager(tmp_path, monkeypatch):
+    """A manager on the data service's external mode (AEMO_DUCKDB_PATH)"""
+    from aemo_dashboard.shared import hybrid_query_manager
+    from data_service.shared_data_duckdb import DuckDBDataService
+
+    path = tmp_path / 'collector.duckdb'
+    conn = duckdb.connect(str(path))
+    conn.execute("CREATE TABLE duid_info AS SELECT 'BW01' AS duid")
+    conn.execute("CREATE TABLE readings AS SELECT range AS id, range * 0.5 AS value FROM range(25000)")
+    conn.close()
+    monkeypatch.setenv('AEMO_DUCKDB_PATH', str(path))
+    monkeypatch.setattr(DuckDBDataService, '_instance', None)
+    service = DuckDBDataService()
+    monkeypatch.setattr(hybrid_query_manager, 'duckdb_data_service', service)
+
+    m = HybridQueryManager.__new__(HybridQueryManager)
+    m.cache = SmartCache(max_size_mb=10)
+    m._query_count = 0
+    assert service.uses_external_db
+    return m
+
+
+def test_streaming_through_external_duckdb(external_manager):
+    progress = []
+    df = external_manager.query_with_progress("SELECT * FROM readings WHERE id < ?", chunk_size=3000,
+                                              progress_callback=progress.append, params=[10000])
+    assert len(df) == 10000
+    assert progress[-1] == 100
+
+    chunks = list(external_manager.query_chunks("SELECT * FROM readings ORDER BY id", chunk_size=4096))
+    assert pd.concat(chunks, ignore_index=True)['id'].tolist() == list(range(25000))
+    # A stream abandoned part way closes its connection: a read-write
+    # connection to the file cannot open next to a read-only one
+    stream = external_manager.query_stream("SELECT * FROM readings", batch_size=1000)
+    next(stream)
+    stream.close()
+    duckdb.connect(os.environ['AEMO_DUCKDB_PATH']).close()
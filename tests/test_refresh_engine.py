@@ -0,0 +1,177 @@
+"""
+Tests for the shared cross-session refresh engine.
+
+Checks that sessions showing the same (region, date window) share one fetch
+per cycle, that payloads fan out to every subscriber, and that per-cycle
+metrics report how many sessions each fetch served.
+"""
+import gc
+
+import pytest
+
+from aemo_dashboard.generation.refresh_engine import SharedRefreshEngine
+
+
+class FakeSession:
+    """Minimal subscriber implementing the refresh engine protocol"""
+
+    fetch_calls = 0
+
+    def __init__(self, region, time_range='1'):
+        self.region = region
+        self.time_range = time_range
+        self.applied = []
+
+    def refresh_key(self):
+        return (self.region, self.time_range)
+
+    def fetch_refresh_payload(self, key):
+        FakeSession.fetch_calls += 1
+        return {'key': key, 'rows': 42}
+
+    def apply_refresh_payload(self, payload):
+        self.applied.append(payload)
+
+
+class FakeDocument:
+    """Records next-tick callbacks like a Bokeh document would queue them"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def add_next_tick_callback(self, callback):
+        self.callbacks.append(callback)
+
+
+@pytest.fixture
+def engine():
+    FakeSession.fetch_calls = 0
+    eng = SharedRefreshEngine(interval=3600)
+    # Don't start the background thread; cycles are driven by the tests
+    eng.start = lambda: None
+    yield eng
+    eng.stop()
+
+
+def test_sessions_with_same_key_share_one_fetch(engine):
+    sessions = [FakeSession('NSW1') for _ in range(15)]
+    for s in sessions:
+        engine.subscribe(s)
+
+    cycle = engine.run_cycle()
+
+    assert FakeSession.fetch_calls == 1
+    assert cycle['fetches'] == 1
+    assert cycle['sessions'] == 15
+    assert cycle['fetches_saved'] == 14
+    assert cycle['keys'][0]['sessions_served'] == 15
+    assert all(s.applied == [{'key': ('NSW1', '1'), 'rows': 42}] for s in sessions)
+
+
+def test_distinct_keys_fetched_once_each(engine):
+    subs = [FakeSession('NSW1'), FakeSession('NSW1'), FakeSession('VIC1'), FakeSession('NSW1', '7')]
+    for s in subs:
+        engine.subscribe(s)
+
+    cycle = engine.run_cycle()
+
+    assert FakeSession.fetch_calls == 3
+    served = {m['key']: m['sessions_served'] for m in cycle['keys']}
+    assert served == {('NSW1', '1'): 2, ('VIC1', '1'): 1, ('NSW1', '7'): 1}
+
+
+def test_payload_dispatched_through_document(engine):
+    session = FakeSession('SA1')
+    doc = FakeDocument()
+    engine.subscribe(session, document=doc)
+
+    engine.run_cycle()
+
+    # Nothing applied until the document runs its next tick
+    assert session.applied == []
+    assert len(doc.callbacks) == 1
+    doc.callbacks[0]()
+    assert session.applied[0]['key'] == ('SA1', '1')
+
+
+def test_unsubscribe_and_garbage_collected_sessions_dropped(engine):
+    kept = FakeSession('QLD1')
+    removed = FakeSession('QLD1')
+    token = engine.subscribe(removed)
+    engine.subscribe(kept)
+    engine.subscribe(FakeSession('QLD1'))  # no strong reference kept
+    gc.collect()
+
+    engine.unsubscribe(token)
+    cycle = engine.run_cycle()
+
+    assert engine.subscriber_count == 1
+    assert cycle['sessions'] == 1
+    assert removed.applied == []
+
+
+def test_fetch_error_recorded_and_other_keys_still_served(engine):
+    class BrokenSession(FakeSession):
+        def fetch_refresh_payload(self, key):
+            raise RuntimeError('duckdb unavailable')
+
+    broken = BrokenSession('TAS1')
+    ok = FakeSession('VIC1')
+    engine.subscribe(broken)
+    engine.subscribe(ok)
+
+    cycle = engine.run_cycle()
+
+    errors = {m['key']: m['error'] for m in cycle['keys']}
+    assert errors[('TAS1', '1')] == 'duckdb unavailable'
+    assert errors[('VIC1', '1')] is None
+    assert broken.applied == []
+    assert len(ok.applied) == 1
+
+
+def test_get_metrics_summarises_recent_cycles(engine):
+    for _ in range(4):
+        engine.subscribe(FakeSession('NSW1'))
+    sessions = [FakeSession('NSW1') for _ in range(4)]
+    for s in sessions:
+        engine.subscribe(s)
+
+    engine.run_cycle()
+    engine.run_cycle()
+    metrics = engine.get_metrics()
+
+    assert metrics['cycles'] == 2
+    assert metrics['subscribers'] == 4
+    assert metrics['avg_sessions_per_fetch'] == 4.0
+    assert len(metrics['recent_cycles']) == 2
+    assert metrics['last_cycle']['cycle'] == 2
+
+
+@pytest.mark.parametrize('copy_on_write', [True, False])
+def test_shared_frames_are_private_to_each_session(monkeypatch, copy_on_write):
+    import pandas as pd
+
+    from aemo_dashboard.generation import gen_dash
+    from aemo_dashboard.shared import hybrid_query_manager
+
+    monkeypatch.setattr(hybrid_query_manager, '_copy_on_write_enabled',
+                        lambda: copy_on_write)
+    shared = pd.DataFrame({'mw': [1.0, None]})
+    payload = {'key': ('NSW1', '1'), 'generation': shared}
+    sessions = []
+    for _ in range(2):
+        dash = gen_dash.EnergyDashboard.__new__(gen_dash.EnergyDashboard)
+        dash._shared_refresh_payload = payload
+        monkeypatch.setattr(dash, 'refresh_key', lambda: ('NSW1', '1'), raising=False)
+        sessions.append(dash)
+
+    mine = sessions[0]._get_shared_refresh_data('generation')
+    mine['mw'] = mine['mw'].fillna(0) * 2
+    mine.fillna(-1, inplace=True)
+    mine['extra'] = 1
+
+    theirs = sessions[1]._get_shared_refresh_data('generation')
+    assert list(theirs.columns) == ['mw']
+    assert theirs['mw'].iloc[0] == 1.0 and pd.isna(theirs['mw'].iloc[1])
+    assert list(shared.columns) == ['mw'] and pd.isna(shared['mw'].iloc[1])
+    assert sessions[1]._get_shared_refresh_data('key') == ('NSW1', '1')
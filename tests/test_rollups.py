@@ -0,0 +1,128 @@
+"""
+Tests for the incrementally maintained hourly/daily/monthly rollups and
+point-budget resolution selection.
+"""
+from datetime import datetime
+
+import duckdb
+import pandas as pd
+import pytest
+
+from aemo_dashboard.shared.resolution_manager import DataResolutionManager
+from aemo_dashboard.shared.rollups import ROLLUP_LEVELS, RollupManager, rollup_table
+
+START = pd.Timestamp('2025-01-30')
+REGIONS = ('NSW1', 'VIC1')
+
+
+def _add_prices(conn, start, periods):
+    conn.execute(f"""
+        INSERT INTO prices_30min
+        SELECT TIMESTAMP '{start}' + INTERVAL (i * 30) MINUTE, r, (i % 97) * 1.5 + len(r)
+        FROM range({periods}) t(i), (VALUES {', '.join(f"('{r}')" for r in REGIONS)}) v(r)
+    """)
+
+
+@pytest.fixture
+def conn():
+    c = duckdb.connect(':memory:')
+    c.execute("CREATE TABLE prices_30min (settlementdate TIMESTAMP, regionid VARCHAR, rrp DOUBLE)")
+    _add_prices(c, START, 48 * 5)  # 30 Jan - 3 Feb, crosses a month boundary
+    yield c
+    c.close()
+
+
+def _expected(conn, unit):
+    return conn.execute(f"""
+        SELECT date_trunc('{unit}', settlementdate) AS settlementdate, regionid, AVG(rrp) AS rrp
+        FROM prices_30min GROUP BY ALL ORDER BY ALL
+    """).df()
+
+
+def _actual(conn, level):
+    return conn.execute(f"""
+        SELECT settlementdate, regionid, rrp FROM {rollup_table('price', level)} ORDER BY ALL
+    """).df()
+
+
+def _assert_matches_source(conn):
+    for level, unit in zip(ROLLUP_LEVELS, ('hour', 'day', 'month')):
+        pd.testing.assert_frame_equal(_actual(conn, level), _expected(conn, unit))
+
+
+def test_initial_build_matches_source(conn):
+    manager = RollupManager(conn)
+
+    latest = manager.refresh(['price'])['price']
+
+    assert latest == START + pd.Timedelta(minutes=30 * (48 * 5 - 1))
+    assert manager.available_levels('price') == ROLLUP_LEVELS
+    assert manager.available_levels('generation') == ()
+    _assert_matches_source(conn)
+
+
+def test_incremental_refresh_only_touches_new_periods(conn):
+    manager = RollupManager(conn)
+    manager.refresh(['price'])
+    # Tag an old hourly row: a refresh must leave closed periods alone
+    conn.execute("UPDATE prices_hourly SET n = -1 WHERE settlementdate = TIMESTAMP '2025-01-30 00:00'")
+
+    # The next cycle lands mid-hour, then later completes the hour and day
+    _add_prices(conn, START + pd.Timedelta(days=5), 1)
+    manager.refresh(['price'])
+    _add_prices(conn, START + pd.Timedelta(days=5, minutes=30), 47)
+    manager.refresh(['price'])
+
+    assert conn.execute(
+        "SELECT n FROM prices_hourly WHERE settlementdate = TIMESTAMP '2025-01-30 00:00' LIMIT 1"
+    ).fetchone()[0] == -1
+    _assert_matches_source(conn)
+
+
+def test_refresh_without_new_data_is_a_no_op(conn):
+    manager = RollupManager(conn)
+    manager.refresh(['price'])
+
+    assert manager.refresh(['price']) == {'price': None}
+
+
+def test_budget_resolution_steps_up_to_coarsest_needed():
+    manager = DataResolutionManager()
+    start = datetime(2020, 1, 1)
+
+    def pick(end, levels=ROLLUP_LEVELS, budget=5000):
+        return manager.get_budget_resolution(start, end, 'price', max_points=budget,
+                                             available_levels=levels)
+
+    assert pick(datetime(2020, 3, 1)) == '30min'      # 2,880 half hours
+    assert pick(datetime(2020, 6, 1)) == 'hourly'     # 7,300 half hours, 3,650 hours
+    assert pick(datetime(2024, 1, 1)) == 'daily'
+    assert pick(datetime(2024, 1, 1), budget=100) == 'monthly'
+    # Without rollups the 30-minute data is still used
+    assert pick(datetime(2024, 1, 1), levels=()) == '30min'
+
+
+def test_refresh_runs_its_own_transaction(conn):
+    manager = RollupManager(conn)
+    # Another user of the shared connection is mid-transaction
+    conn.execute("BEGIN TRANSACTION")
+
+    assert manager.refresh(['price'])['price'] is not None
+
+    conn.execute("ROLLBACK")
+    _assert_matches_source(conn)
+
+
+def test_no_rollups_against_external_duckdb(monkeypatch):
+    from data_service.shared_data_duckdb import duckdb_data_service
+    monkeypatch.setattr(type(duckdb_data_service), 'uses_external_db', property(lambda self: True))
+    manager = RollupManager()
+
+    assert manager.refresh() == {}
+    assert manager.rebuild('price') is None
+    assert manager.available_levels('price') == ()
+
+    import aemo_dashboard.shared.rollups as rollups
+    monkeypatch.setattr(rollups, 'rollup_manager', manager)
+    assert DataResolutionManager().get_budget_resolution(
+        datetime(2020, 1, 1), datetime(2024, 1, 1), 'price', max_points=5000) == '30min'
@@ -0,0 +1,190 @@
+"""
+Tests for SmartCache read-only views, single-flight loading and counters.
+"""
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aemo_dashboard.shared.hybrid_query_manager import SmartCache
+
+
+def make_frame(rows=1000):
+    return pd.DataFrame({
+        'settlementdate': pd.date_range('2025-08-20', periods=rows, freq='5min'),
+        'scadavalue': np.arange(rows, dtype=float),
+        'duid': ['BW01'] * rows,
+    })
+
+
+def test_read_only_hits_share_memory_without_copying():
+    cache = SmartCache(max_size_mb=10, read_only=True)
+    cache.put('k', make_frame())
+
+    a = cache.get('k')
+    b = cache.get('k')
+
+    assert np.shares_memory(a['scadavalue'].to_numpy(), b['scadavalue'].to_numpy())
+
+
+def test_read_only_view_cannot_corrupt_cache():
+    cache = SmartCache(max_size_mb=10, read_only=True)
+    source = make_frame()
+    cache.put('k', source)
+
+    view = cache.get('k')
+    try:
+        view.loc[0, 'scadavalue'] = -1.0
+    except ValueError:
+        pass  # write-protected buffers on pandas without Copy-on-Write
+    source.loc[1, 'scadavalue'] = -1.0
+
+    fresh = cache.get('k')
+    assert fresh.loc[0, 'scadavalue'] == 0.0
+    assert fresh.loc[1, 'scadavalue'] == 1.0
+
+
+def test_write_protected_snapshot_without_copy_on_write(monkeypatch):
+    from aemo_dashboard.shared import hybrid_query_manager
+    monkeypatch.setattr(hybrid_query_manager, '_copy_on_write_enabled', lambda: False)
+    cache = SmartCache(max_size_mb=10, read_only=True)
+    source = make_frame()
+    cache.put('k', source)
+
+    stored = cache.get('k')
+    pd.testing.assert_frame_equal(stored, source)
+    assert not stored['scadavalue'].to_numpy().flags.writeable
+
+
+def test_copy_mode_returns_independent_frames():
+    cache = SmartCache(max_size_mb=10)
+    cache.put('k', make_frame())
+
+    a = cache.get('k')
+    a.loc[0, 'scadavalue'] = -1.0
+
+    assert cache.get('k').loc[0, 'scadavalue'] == 0.0
+    assert not cache.get_stats()['read_only']
+
+
+def test_concurrent_misses_compute_once():
+    cache = SmartCache(max_size_mb=10, read_only=True)
+    calls = []
+    start = threading.Barrier(8)
+
+    def load():
+        calls.append(1)
+        time.sleep(0.2)
+        return make_frame()
+
+    results = []
+
+    def worker():
+        start.wait()
+        results.append(cache.get_or_compute('k', load))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(len(r) == 1000 for r in results)
+
+    stats = cache.get_stats()
+    assert stats['misses'] == 1
+    assert stats['coalesced'] == 7
+    assert stats['in_flight'] == 0
+
+    cache.get_or_compute('k', load)
+    assert cache.get_stats()['hits'] == 1
+
+
+def test_failed_load_propagates_to_waiters_and_is_not_cached():
+    cache = SmartCache(max_size_mb=10)
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError('duckdb down')
+
+    errors = []
+
+    def waiter():
+        started.wait()
+        try:
+            cache.get_or_compute('k', failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('k', failing)
+    t.join()
+
+    assert errors == ['duckdb down']
+    assert cache.get('k') is None
+
+
+def test_empty_results_optional_and_eviction_counted():
+    df = make_frame(5000)
+    size_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+    cache = SmartCache(max_size_mb=1, read_only=True)
+    cache.max_size_bytes = int(size_mb * 1.5 * 1024 * 1024)
+
+    assert cache.get_or_compute('empty', pd.DataFrame, cache_empty=False).empty
+    assert cache.get('empty') is None
+
+    cache.put('a', df)
+    cache.put('b', df)
+
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 1
+
+
+def mutate_like_the_tabs(df):
+    """In-place edits dashboard callers make to query results"""
+    df.loc[0, 'scadavalue'] = -1.0
+    df.iloc[1, df.columns.get_loc('scadavalue')] = -2.0
+    df['scadavalue'] = df['scadavalue'].where(df.index != 5)
+    df.fillna({'scadavalue': 0.0}, inplace=True)
+    return df
+
+
+@pytest.mark.parametrize('copy_on_write', [True, False])
+def test_manager_results_stay_writable(monkeypatch, copy_on_write):
+    from aemo_dashboard.shared import hybrid_query_manager
+    from aemo_dashboard.shared.hybrid_query_manager import HybridQueryManager
+    # False: pandas 2.x without Copy-on-Write (the uv.lock pin)
+    monkeypatch.setattr(hybrid_query_manager, '_copy_on_write_enabled', lambda: copy_on_write)
+    manager = HybridQueryManager(cache_size_mb=10)
+    assert manager.cache.read_only is copy_on_write
+
+    first = manager.cache.get_or_compute('k', make_frame)
+    mutate_like_the_tabs(first)
+    again = manager.cache.get('k')
+    mutate_like_the_tabs(again)
+
+    assert first.loc[0, 'scadavalue'] == -1.0
+    assert manager.cache.get('k').loc[0, 'scadavalue'] == 0.0
+
+
+@pytest.mark.skipif(int(pd.__version__.split('.')[0]) >= 3, reason='pandas 2.x semantics')
+def test_read_only_is_opt_in_on_pandas_2():
+    from aemo_dashboard.shared.hybrid_query_manager import HybridQueryManager
+    manager = HybridQueryManager(cache_size_mb=10)
+    manager.cache.put('k', make_frame())
+    mutate_like_the_tabs(manager.cache.get('k'))
+
+    protected = SmartCache(max_size_mb=10, read_only=True)
+    protected.put('k', make_frame())
+    if not pd.options.mode.copy_on_write:
+        with pytest.raises(ValueError, match='read-only'):
+            protected.get('k').loc[0, 'scadavalue'] = -1.0
@@ -0,0 +1,139 @@
+"""
+Tests for the batched smoothers (aemo_dashboard.shared.smoothing).
+
+loess is compared against statsmodels' lowess, which the dashboard called
+directly before; ewm, moving_average and smooth_groups against the pandas
+groupby loops they replace.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.nonparametric.smoothers_lowess import lowess
+
+from aemo_dashboard.shared import smoothing
+from aemo_dashboard.shared.smoothing import (
+    ewm, loess, loess_cache_stats, moving_average, smooth_groups, window_loess,
+)
+
+
+def noisy(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(n, dtype=float)
+    return x, 80 + 30 * np.sin(x / 40) + rng.normal(0, 15, n)
+
+
+def reference(y, x, it=0, **kw):
+    return lowess(y, x, it=it, return_sorted=False, **kw)
+
+
+@pytest.mark.parametrize('frac,it,delta', [
+    (0.05, 0, 0.0),
+    (0.1, 3, 0.0),
+    (0.02, 0, 8.0),
+    (0.3, 1, 2.5),
+])
+def test_loess_matches_statsmodels(frac, it, delta):
+    x, y = noisy(800)
+    np.testing.assert_allclose(loess(y, x, frac=frac, it=it, delta=delta),
+                               reference(y, x, frac=frac, it=it, delta=delta), atol=1e-9)
+
+
+def test_loess_uneven_unsorted_x_with_ties():
+    rng = np.random.default_rng(1)
+    x = np.round(rng.uniform(0, 100, 600), 1)
+    y = np.sin(x / 10) + rng.normal(0, 0.2, 600)
+    np.testing.assert_allclose(loess(y, x, frac=0.1), reference(y, x, frac=0.1), atol=1e-9)
+    np.testing.assert_allclose(loess(y, x, frac=0.1, delta=1.0),
+                               reference(y, x, frac=0.1, delta=1.0), atol=1e-9)
+
+
+def test_loess_epoch_second_x():
+    # The penetration and insights tabs smooth daily series against epoch seconds
+    dates = pd.date_range('2020-01-01', periods=900, freq='D')
+    x = dates.astype(np.int64) / 1e9
+    _, y = noisy(900)
+    np.testing.assert_allclose(loess(y, x, frac=0.05), reference(y, x, frac=0.05), rtol=1e-8)
+
+
+def test_loess_missing_values_come_back_nan():
+    x, y = noisy(300)
+    y[[0, 50, 51, 200]] = np.nan
+    out = loess(y, x, frac=0.1)
+    assert np.isnan(out[[0, 50, 51, 200]]).all()
+    np.testing.assert_allclose(out, reference(y, x, frac=0.1), atol=1e-9)
+
+
+def test_loess_rows_match_single_series():
+    x, _ = noisy(500)
+    ys = np.stack([noisy(500, seed)[1] for seed in range(4)])
+    ys[2, 100:110] = np.nan
+    out = loess(ys, x, frac=0.05, delta=5.0)
+    for row, y in zip(out, ys):
+        np.testing.assert_allclose(row, loess(y, x, frac=0.05, delta=5.0), atol=1e-12)
+
+
+def test_loess_tiny_inputs():
+    assert loess(np.array([])).shape == (0,)
+    np.testing.assert_allclose(loess([3.0]), [3.0])
+    np.testing.assert_allclose(loess([1.0, 2.0, 4.0], frac=1.0),
+                               reference(np.array([1.0, 2.0, 4.0]), np.arange(3.0), frac=1.0))
+    with pytest.raises(ValueError):
+        loess([1.0, 2.0], frac=1.5)
+
+
+def test_loess_cache_reuses_results():
+    smoothing.clear_loess_cache()
+    x, y = noisy(200)
+    before = loess_cache_stats()
+    first = loess(y, x, frac=0.1, cache_key=('prices', 'NSW1', 'v1'))
+    first[:] = 0  # callers get a copy
+    second = loess(y, x, frac=0.1, cache_key=('prices', 'NSW1', 'v1'))
+    loess(y, x, frac=0.2, cache_key=('prices', 'NSW1', 'v1'))
+
+    stats = loess_cache_stats()
+    assert stats['hits'] - before['hits'] == 1
+    assert stats['misses'] - before['misses'] == 2
+    np.testing.assert_allclose(second, loess(y, x, frac=0.1))
+
+
+def test_window_loess_matches_api_smoother():
+    from aemo_dashboard.api.downsample import loess as api_loess
+    x, y = noisy(400)
+    np.testing.assert_allclose(window_loess(x, y, 0.05), api_loess(x.tolist(), y.tolist(), 0.05))
+
+
+def test_ewm_and_moving_average_match_pandas():
+    _, y = noisy(300)
+    y[10] = np.nan
+    s = pd.Series(y)
+    np.testing.assert_allclose(ewm(y, alpha=0.3), s.ewm(alpha=0.3).mean())
+    np.testing.assert_allclose(ewm(y, span=30, adjust=False), s.ewm(span=30, adjust=False).mean())
+    np.testing.assert_allclose(moving_average(y, 7, center=True), s.rolling(7, center=True).mean())
+
+
+def test_smooth_groups_matches_groupby_loop():
+    rng = np.random.default_rng(2)
+    # Interleaved regions, as in a long-format price frame
+    df = pd.DataFrame({
+        'region': rng.permutation(np.repeat(['NSW1', 'QLD1', 'SA1', 'VIC1'], [120, 120, 80, 120])),
+        'price': rng.normal(80, 20, 440),
+    })
+    df.loc[:4, 'region'] = None
+
+    out = smooth_groups(df['price'], df['region'], moving_average, window=7, center=True)
+    expected = df['price'].copy()
+    for _, group in df.groupby('region'):
+        expected[group.index] = group['price'].rolling(7, center=True).mean()
+    np.testing.assert_allclose(out, expected)
+
+    out = smooth_groups(df['price'], df['region'], loess, frac=0.1,
+                        delta=lambda n: 0.01 * n)
+    for _, group in df.groupby('region'):
+        values = group['price'].to_numpy()
+        np.testing.assert_allclose(
+            out[df.index.get_indexer(group.index)],
+            reference(values, np.arange(len(values), dtype=float), frac=0.1, delta=0.01 * len(values)),
+            atol=1e-9,
+        )
+    # Rows without a group are left as they were
+    np.testing.assert_array_equal(out[:5], df['price'].to_numpy()[:5])
@@ -0,0 +1,247 @@
+"""
+Tests for the shared parameterised SQL layer (aemo_dashboard.shared.sql).
+
+Runs against in-memory DuckDB connections, so no data files are needed.
+"""
+from datetime import datetime, timedelta, timezone
+
+import duckdb
+import pandas as pd
+import pytest
+
+from aemo_dashboard.shared import sql
+from aemo_dashboard.shared.hybrid_query_manager import HybridQueryManager, SmartCache
+from aemo_dashboard.shared.sql import Where, bind, execute, statement
+
+
+@pytest.fixture
+def conn():
+    conn = duckdb.connect(':memory:')
+    conn.execute("""
+        CREATE TABLE generation AS
+        SELECT TIMESTAMP '2025-01-01' + INTERVAL (range * 5) MINUTE AS settlementdate,
+               CASE range % 3 WHEN 0 THEN 'BW01' WHEN 1 THEN 'ER01' ELSE 'O''BRIEN1' END AS duid,
+               range * 1.0 AS scadavalue
+        FROM range(288)
+    """)
+    yield conn
+    conn.close()
+
+
+def test_where_keeps_clause_and_param_order():
+    start, end = datetime(2025, 1, 1), datetime(2025, 1, 2)
+    where = Where().between('settlementdate', start, end).isin('duid', ['A', 'B']).eq('region', 'NSW1')
+
+    assert str(where) == 'settlementdate >= ? AND settlementdate <= ? AND duid IN (?, ?) AND region = ?'
+    assert where.params == [start, end, 'A', 'B', 'NSW1']
+    assert 'settlementdate < ?' in str(Where().between('settlementdate', start, end, end_inclusive=False))
+
+
+def test_empty_where_and_empty_in_list():
+    assert str(Where()) == 'TRUE'
+    where = Where().isin('duid', [])
+    assert str(where) == 'FALSE'
+    assert where.params == []
+
+
+def test_bind_drops_timezone_and_unwraps_timestamps():
+    aware = datetime(2025, 1, 1, 12, tzinfo=timezone(timedelta(hours=10)))
+    assert bind(aware) == datetime(2025, 1, 1, 12)
+    assert bind(pd.Timestamp('2025-01-01 12:00', tz='Australia/Brisbane')) == datetime(2025, 1, 1, 12)
+    assert bind('NSW1') == 'NSW1'
+
+
+def test_bound_window_and_quoted_values(conn):
+    where = Where().between('settlementdate', pd.Timestamp('2025-01-01 00:00'),
+                            pd.Timestamp('2025-01-01 01:00')).isin('duid', ["O'BRIEN1", 'BW01'])
+    df = execute(conn, f"SELECT * FROM generation WHERE {where} ORDER BY settlementdate", where.params).df()
+
+    assert set(df['duid']) == {"O'BRIEN1", 'BW01'}
+    assert df['settlementdate'].min() >= pd.Timestamp('2025-01-01 00:00')
+    assert df['settlementdate'].max() <= pd.Timestamp('2025-01-01 01:00')
+
+
+def test_statement_is_parsed_once_and_reused_across_connections(conn):
+    query = "SELECT COUNT(*) FROM generation WHERE duid = ? AND scadavalue >= ?"
+    before = sql.statement_cache_stats()
+
+    first = execute(conn, query, ['BW01', 0]).fetchone()[0]
+    second = execute(conn, query, ['ER01', 0]).fetchone()[0]
+    other = duckdb.connect(':memory:')
+    try:
+        other.execute("CREATE TABLE generation AS SELECT 'BW01' AS duid, 1.0 AS scadavalue")
+        third = execute(other, query, ['BW01', 0]).fetchone()[0]
+    finally:
+        other.close()
+
+    stats = sql.statement_cache_stats()
+    assert (first, second, third) == (96, 96, 1)
+    assert stats['misses'] - before['misses'] == 1
+    assert stats['hits'] - before['hits'] == 2
+
+
+def test_statement_rejects_multiple_statements():
+    with pytest.raises(ValueError):
+        statement("SELECT 1; SELECT 2")
+
+
+def test_query_with_progress_binds_params(conn):
+    manager = HybridQueryManager.__new__(HybridQueryManager)
+    manager.conn = conn
+    manager.cache = SmartCache(max_size_mb=10)
+    manager._query_count = 0
+    seen = []
+
+    where = Where().isin('duid', ['ER01'])
+    df = manager.query_with_progress(f"SELECT * FROM generation WHERE {where}", chunk_size=10,
+                                     progress_callback=seen.append, params=where.params)
+
+    assert len(df) == 96
+    assert set(df['duid']) == {'ER01'}
+    assert seen[-1] == 100
+
+
+def test_fuel_relatives_binds_region_and_window():
+    from aemo_dashboard.prices.fuel_relatives import _build_fuel_relatives_query, query_fuel_relatives
+
+    sql_text, params = _build_fuel_relatives_query("O'NSW1", datetime(2020, 1, 1), datetime(2025, 1, 2))
+    assert "O'NSW1" not in sql_text and '2020-01-01' not in sql_text
+    assert sql_text.count('?') == len(params)
+
+    conn = duckdb.connect(':memory:')
+    conn.execute("""
+        CREATE TABLE generation_30min AS
+        SELECT TIMESTAMP '2025-01-01' + INTERVAL (range * 30) MINUTE AS settlementdate,
+               CASE WHEN range % 2 = 0 THEN 'W1' ELSE 'C1' END AS duid, 10.0 + range AS scadavalue
+        FROM range(96)
+    """)
+    conn.execute("CREATE TABLE duid_mapping AS SELECT * FROM (VALUES "
+                 "('W1', 'Wind', 'O''NSW1'), ('C1', 'Coal', 'O''NSW1')) t(duid, fuel, region)")
+    conn.execute("""
+        CREATE TABLE prices_30min AS
+        SELECT TIMESTAMP '2025-01-01' + INTERVAL (range * 30) MINUTE AS settlementdate,
+               'O''NSW1' AS regionid, 50.0 + range AS rrp
+        FROM range(96)
+    """)
+
+    daily = query_fuel_relatives(conn, "O'NSW1")
+
+    assert list(daily.index) == list(pd.date_range('2025-01-01', periods=2, freq='D'))
+    assert {'Flat Load', 'Wind', 'Coal'} <= set(daily.columns)
+    assert daily.loc['2025-01-01', 'Flat Load'] == pytest.approx(50.0 + 23.5)
+
+
+@pytest.fixture
+def curtailment(tmp_path, monkeypatch):
+    from aemo_dashboard.curtailment.curtailment_query_manager import CurtailmentQueryManager
+
+    times = pd.date_range('2025-01-01', periods=288, freq='5min')
+    pd.DataFrame({
+        'settlementdate': times.repeat(2), 'regionid': ["O'SA1", 'VIC1'] * 288,
+        'solar_uigf': 10.0, 'solar_cleared': 8.0, 'solar_curtailment': 2.0,
+        'wind_uigf': 20.0, 'wind_cleared': 15.0, 'wind_curtailment': 5.0, 'total_curtailment': 7.0,
+    }).to_parquet(tmp_path / 'regional.parquet')
+    pd.DataFrame({
+        'settlementdate': times.repeat(2), 'duid': ["O'DUID", 'BW01'] * 288,
+        'uigf': 10.0, 'totalcleared': 8.0, 'curtailment': 2.0,
+    }).to_parquet(tmp_path / 'duid.parquet')
+    pd.DataFrame({'settlementdate': times, 'regionid': "O'SA1", 'rrp': -5.0}).to_parquet(tmp_path / 'prices.parquet')
+
+    manager = CurtailmentQueryManager.__new__(CurtailmentQueryManager)
+    manager.conn = duckdb.connect(':memory:')
+    manager.curtailment_regional_path = tmp_path / 'regional.parquet'
+    manager.curtailment_duid_path = tmp_path / 'duid.parquet'
+    manager.prices_path = tmp_path / 'prices.parquet'
+    manager.duid_to_region = {"O'DUID": "O'SA1", 'BW01': 'VIC1'}
+    manager.cache, manager.cache_timestamps, manager.cache_ttl = {}, {}, 300
+    # tests/api/conftest.py points AEMO_DUCKDB_PATH at its snapshot; the
+    # views here are over the parquet files above
+    monkeypatch.delenv('AEMO_DUCKDB_PATH', raising=False)
+    manager._create_views()
+    yield manager
+    manager.conn.close()
+
+
+def test_curtailment_queries_bind_values(curtailment):
+    start, end = datetime(2025, 1, 1), datetime(2025, 1, 1, 11, 55)
+
+    regional = curtailment.query_curtailment_data(start, end, region="O'SA1", resolution='5min')
+    assert len(regional) == 144 and set(regional['region']) == {"O'SA1"}
+
+    fuels = curtailment.query_fuel_summary(start, end, region="O'SA1").set_index('fuel')
+    assert fuels.loc['Wind', 'curtailment_mwh'] == pytest.approx(144 * 5.0 / 12)
+
+    series = curtailment.query_duid_timeseries(start, end, "O'DUID", resolution='hourly')
+    assert len(series) == 12 and set(series['duid']) == {"O'DUID"}
+
+    top = curtailment.query_top_duids(start, end, region="O'SA1", curtailment_type='economic')
+    assert list(top['duid']) == ["O'DUID"]
+
+
+def test_generation_queries_bind_values(conn):
+    from aemo_dashboard.generation.generation_query_manager import GenerationQueryManager
+
+    conn.execute("""
+        CREATE TABLE capacity_utilization_30min AS
+        SELECT TIMESTAMP '2025-01-01' + INTERVAL (range * 30) MINUTE AS settlementdate,
+               'Wind' AS fuel_type, 'O''SA1' AS region,
+               50.0 AS total_generation_mw, 100.0 AS total_capacity_mw, 50.0 AS utilization_pct
+        FROM range(48)
+    """)
+    conn.execute("CREATE TABLE duid_mapping AS SELECT * FROM (VALUES "
+                 "('W1', 'Wind', 'O''SA1', 100.0), ('C1', 'Coal', 'VIC1', 500.0)) t(duid, fuel, region, capacity_mw)")
+    manager = GenerationQueryManager.__new__(GenerationQueryManager)
+    manager.query_manager = HybridQueryManager.__new__(HybridQueryManager)
+    manager.query_manager.conn = conn
+    manager.query_manager.cache = SmartCache(max_size_mb=10)
+    manager.query_manager.versioned_cache_key = lambda key, end, tables: (key, None)
+
+    util = manager.query_capacity_utilization(datetime(2025, 1, 1), datetime(2025, 1, 1, 5, 30), region="O'SA1")
+    assert len(util) == 12
+    assert manager.query_fuel_capacities("O'SA1") == {'Wind': 100.0}
+    assert manager.query_fuel_capacities('NEM') == {'Wind': 100.0, 'Coal': 500.0}
+
+
+def test_coal_analysis_binds_days_and_duids():
+    from aemo_dashboard.station.coal_analysis import CoalAnalysis
+
+    analysis = CoalAnalysis.__new__(CoalAnalysis)
+    analysis.conn = duckdb.connect(':memory:')
+    analysis.conn.execute("""
+        CREATE VIEW scada AS
+        SELECT TIMESTAMP '2025-01-01' + INTERVAL (range * 30) MINUTE AS settlementdate,
+               CASE WHEN range % 2 = 0 THEN 'O''BW01' ELSE 'OTHER' END AS duid, 100.0 AS scadavalue
+        FROM range(144)
+    """)
+    analysis.conn.execute("""
+        CREATE VIEW prices AS
+        SELECT TIMESTAMP '2025-01-01' + INTERVAL (range * 30) MINUTE AS settlementdate,
+               'NSW1' AS region, 50.0 AS price
+        FROM range(144)
+    """)
+    analysis.coal_duids = ["O'BW01"]
+    analysis.coal_info = pd.DataFrame({'DUID': ["O'BW01"], 'Site Name': ["O'Bayswater"]})
+    analysis.duid_to_region = {"O'BW01": 'NSW1'}
+    analysis.duid_to_station = {"O'BW01": "O'Bayswater"}
+    analysis.station_capacity = {"O'Bayswater": 200.0}
+    analysis.interval_hours = 0.5
+
+    # 2025-01-02 13:00 selects whole days up to midnight, as the date strings did
+    metrics = analysis.calculate_station_metrics(datetime(2025, 1, 1), datetime(2025, 1, 2, 13))
+    assert metrics.set_index('station').loc["O'Bayswater", 'generation_mwh'] == pytest.approx(24 * 100 * 0.5)
+    assert analysis.get_daily_capacity_factor(["O'Bayswater"])['date'].nunique() == 3
+    hourly = analysis.get_hourly_pattern(["O'Bayswater"], datetime(2025, 1, 1), datetime(2025, 1, 2))
+    assert len(hourly) == 24
+
+
+def test_view_query_builders_bind_dates():
+    from aemo_dashboard.shared.duckdb_views import get_aggregation_query, get_integrated_data_query
+
+    start, end = datetime(2025, 1, 1), datetime(2025, 1, 2)
+    query, params = get_integrated_data_query(start, end, '5min', ['settlementdate'])
+    assert '2025' not in query and params == [start, end]
+    assert 'FROM integrated_data_5min' in query
+
+    query, params = get_aggregation_query('daily', ['fuel_type'], end_date=end)
+    assert query == "SELECT * FROM daily_by_fuel WHERE date <= ? ORDER BY date" and params == [end]
+    assert get_aggregation_query('hourly', ['duid']) == ("SELECT * FROM integrated_data_30min ORDER BY settlementdate", [])
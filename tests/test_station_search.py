@@ -0,0 +1,81 @@
+"""
+Tests for the n-gram indexed StationSearchEngine search.
+"""
+import pandas as pd
+import pytest
+from fuzzywuzzy import fuzz
+
+from aemo_dashboard.station.station_search import StationSearchEngine
+
+GEN_INFO = pd.DataFrame([
+    ('BW01', 'Bayswater', 'AGL Energy', 'NSW1', 685.0),
+    ('BW02', 'Bayswater', 'AGL Energy', 'NSW1', 685.0),
+    ('ER01', 'Eraring', 'Origin Energy', 'NSW1', 720.0),
+    ('ER02', 'Eraring', 'Origin Energy', 'NSW1', 720.0),
+    ('LYA1', 'Loy Yang A', 'AGL Energy', 'VIC1', 560.0),
+    ('LYA2', 'Loy Yang A', 'AGL Energy', 'VIC1', 560.0),
+    ('HPR1', 'Hornsdale Power Reserve', 'Neoen', 'SA1', 150.0),
+    ('TALWA1', 'Tallawarra', 'EnergyAustralia', 'NSW1', 440.0),
+], columns=['DUID', 'Site Name', 'Owner', 'Region', 'Capacity(MW)'])
+
+
+@pytest.fixture
+def engine():
+    return StationSearchEngine(GEN_INFO)
+
+
+def _full_scan(engine, query, min_score=60):
+    """DUIDs the previous per-entry scan returned, best first"""
+    query = query.lower()
+    scored = []
+    for entry in engine.search_index:
+        score = max(fuzz.partial_ratio(query, entry['duid'].lower()),
+                    fuzz.partial_ratio(query, entry['station_name'].lower()),
+                    fuzz.partial_ratio(query, entry['searchable_text']))
+        if query.upper() == entry['duid'].upper():
+            score = 100
+        if score >= min_score:
+            scored.append((entry['duid'], score))
+    scored.sort(key=lambda hit: hit[1], reverse=True)
+    return scored
+
+
+@pytest.mark.parametrize('query', ['bays', 'bayswater', 'er01', 'loy yang', 'hornsdale', 'agl'])
+def test_matches_full_scan(engine, query):
+    results = [(r['duid'], r['score']) for r in engine.fuzzy_search(query, limit=10)]
+    full = _full_scan(engine, query)
+
+    # Same scores and order; only marginal matches sharing no n-gram with the query drop out
+    assert results == [hit for hit in full if hit in results]
+    assert [hit for hit in full if hit[1] >= 80] == [hit for hit in results if hit[1] >= 80]
+
+
+def test_results_are_copies_and_repeat_from_cache(engine):
+    first = engine.fuzzy_search('eraring')
+    first[0]['station_name'] = 'changed'
+
+    again = engine.fuzzy_search('eraring')
+    assert again[0]['station_name'] == 'Eraring'
+    assert again[0]['score'] == 100
+    assert 'score' not in engine.search_index[2]
+
+
+def test_replacing_index_rebuilds_search(engine):
+    assert engine.fuzzy_search('bayswater')[0]['duid'] == 'BW01'
+
+    engine.search_index = [e for e in engine.search_index if not e['duid'].startswith('BW')]
+
+    assert all(not r['duid'].startswith('BW') for r in engine.fuzzy_search('bayswater'))
+
+
+def test_station_mode_searches_station_index(engine):
+    results = engine.fuzzy_search('loy yang', mode='station')
+    assert results[0]['station_base'] == 'LYA'
+    assert results[0]['duids'] == ['LYA1', 'LYA2']
+
+
+def test_suggestions_use_prefixes(engine):
+    assert engine.get_suggestions('er') == ['Eraring (ER01)', 'Eraring (ER02)']
+    assert engine.get_suggestions('tal') == ['Tallawarra (TALWA1)']
+    assert engine.get_suggestions('b', limit=1) == ['Bayswater (BW01)']
+    assert engine.get_suggestions('zz') == []